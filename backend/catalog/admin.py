@@ -35,6 +35,7 @@ class CatalogItemAdmin(admin.ModelAdmin):
     )
     search_fields = ('name', 'sku', 'description', 'category', 'condition')
     list_filter = ('vendor', 'category', 'condition')
+    ordering = ('name', 'id')
     fieldsets = (
         ('Owner & Identification', {'fields': ('user', 'vendor', 'name', 'sku')}),
         ('Inventory & Presentation', {'fields': ('product', 'quantity', 'image_url', 'category', 'condition')}),
@@ -0,0 +1,214 @@
+"""
+Precompiled ``.values()`` row mappers for read-only list responses.
+
+A mapper is compiled once from a ``ModelSerializer`` instance and then turns
+plain ``.values()`` rows into the exact dicts ``serializer.data`` would build,
+without instantiating models or walking DRF's per-field machinery. To-many
+relations are loaded with one extra ``.values()`` query each.
+
+Fields whose representation cannot be derived (e.g. a SerializerMethodField
+without a ``ManyRelation`` spec) make compilation fail with
+``UnsupportedField`` so callers can fall back to the serializer.
+"""
+
+from collections import defaultdict
+from typing import Any, Callable, Dict, Iterable, List, Mapping, Optional, Sequence
+
+from django.conf import settings
+from django.utils import timezone
+from rest_framework import ISO_8601, serializers
+from rest_framework.settings import api_settings
+
+from backend.core.utils import first_per_group
+
+# Field classes whose to_representation returns DB values unchanged.
+_IDENTITY_FIELD_TYPES = frozenset(
+    {
+        serializers.BooleanField,
+        serializers.CharField,
+        serializers.ChoiceField,
+        serializers.EmailField,
+        serializers.IntegerField,
+        serializers.ReadOnlyField,
+        serializers.SlugField,
+        serializers.URLField,
+    }
+)
+
+_COLUMN, _DATETIME, _NESTED, _MANY = range(4)
+
+
+class UnsupportedField(Exception):
+    """Raised when a serializer field cannot be rendered from ``.values()`` rows."""
+
+
+class ManyRelation:
+    """
+    Describe a to-many relation rendered as a list of related rows.
+
+    ``converters`` maps a column to a callable applied to non-null values.
+    Rows are ordered by ``order_by`` within each parent and, with ``limit``,
+    capped at that many per parent. When ``mapper`` is given it renders each
+    related row instead of ``columns``/``converters``.
+    """
+
+    def __init__(
+        self,
+        *,
+        relation: str,
+        columns: Sequence[str],
+        converters: Optional[Mapping[str, Callable[[Any], Any]]] = None,
+        order_by: Sequence[str] = ("id",),
+        limit: Optional[int] = None,
+        mapper: Optional["RowMapper"] = None,
+    ):
+        self.relation = relation
+        self.columns = tuple(columns)
+        self.converters = dict(converters or {})
+        self.order_by = tuple(order_by)
+        self.limit = limit
+        self.mapper = mapper
+
+
+def _is_plain_iso_datetime(field: serializers.Field) -> bool:
+    """True when DateTimeField.to_representation reduces to isoformat in the current timezone."""
+    if type(field) is not serializers.DateTimeField or hasattr(field, "timezone") or not settings.USE_TZ:
+        return False
+    output_format = getattr(field, "format", api_settings.DATETIME_FORMAT)
+    return isinstance(output_format, str) and output_format.lower() == ISO_8601
+
+
+def _format_datetime(value, tz, fallback: Callable[[Any], Any]) -> str:
+    # Same steps as DateTimeField.to_representation, with the timezone looked up once per page.
+    if not timezone.is_aware(value):
+        return fallback(value)
+    value = value.astimezone(tz).isoformat()
+    if value.endswith("+00:00"):
+        value = value[:-6] + "Z"
+    return value
+
+
+def _converter(field: serializers.Field) -> Optional[Callable[[Any], Any]]:
+    field_type = type(field)
+    if field_type in _IDENTITY_FIELD_TYPES:
+        return None
+    if field_type is serializers.JSONField and not field.binary:
+        return None
+    if field_type in (serializers.DecimalField, serializers.DateTimeField, serializers.DateField):
+        return field.to_representation
+    raise UnsupportedField(f"{field.field_name}: {field_type.__name__}")
+
+
+class RowMapper:
+    """Map ``.values()`` rows of ``model`` to a serializer's representation."""
+
+    def __init__(
+        self,
+        serializer: serializers.ModelSerializer,
+        *,
+        method_fields: Optional[Mapping[str, ManyRelation]] = None,
+        many_options: Optional[Mapping[str, Mapping[str, Any]]] = None,
+        prefix: str = "",
+    ):
+        """
+        ``method_fields`` supplies the relation behind each SerializerMethodField;
+        ``many_options`` passes ``order_by``/``limit`` for nested list fields by name.
+        """
+        self.model = serializer.Meta.model
+        self.prefix = prefix
+        self.pk_key = f"{prefix}{self.model._meta.pk.attname}"
+        self.columns: List[str] = [self.pk_key]
+        self.plan: List[tuple] = []
+        method_fields = method_fields or {}
+        many_options = many_options or {}
+
+        for name, field in serializer.fields.items():
+            if field.write_only:
+                continue
+            source = field.source.replace(".", "__")
+            if isinstance(field, serializers.ListSerializer):
+                child_mapper = RowMapper(field.child)
+                relation = ManyRelation(
+                    relation=source, columns=child_mapper.columns, mapper=child_mapper, **many_options.get(name, {})
+                )
+                self.plan.append((name, _MANY, relation, None))
+            elif isinstance(field, serializers.ModelSerializer):
+                nested = RowMapper(field, prefix=f"{prefix}{source}__")
+                self.columns.extend(nested.columns)
+                self.plan.append((name, _NESTED, nested.pk_key, nested))
+            elif isinstance(field, serializers.SerializerMethodField):
+                if name not in method_fields:
+                    raise UnsupportedField(f"{name}: SerializerMethodField")
+                self.plan.append((name, _MANY, method_fields[name], None))
+            elif isinstance(field, serializers.PrimaryKeyRelatedField):
+                # ``.values("<fk>")`` yields the raw id, which is what the field renders.
+                key = f"{prefix}{source}"
+                self.columns.append(key)
+                self.plan.append((name, _COLUMN, key, None))
+            elif _is_plain_iso_datetime(field):
+                key = f"{prefix}{source}"
+                self.columns.append(key)
+                self.plan.append((name, _DATETIME, key, field.to_representation))
+            else:
+                key = f"{prefix}{source}"
+                self.columns.append(key)
+                self.plan.append((name, _COLUMN, key, _converter(field)))
+
+        self.many_relations = [relation for _, kind, relation, _ in self.plan if kind == _MANY]
+        if prefix and self.many_relations:
+            raise UnsupportedField(f"{prefix}: nested to-many relations")
+
+    def values(self, queryset):
+        """Turn a model queryset into a ``.values()`` queryset carrying every needed column."""
+        return queryset.prefetch_related(None).values(*dict.fromkeys(self.columns))
+
+    def map_rows(self, rows: Iterable[Mapping[str, Any]]) -> List[Dict[str, Any]]:
+        rows = list(rows)
+        tz = timezone.get_current_timezone()
+        children = {
+            id(relation): self._load_children(relation, [row[self.pk_key] for row in rows], tz)
+            for relation in self.many_relations
+        }
+        return [self._map(row, children, tz) for row in rows]
+
+    def _map(self, row: Mapping[str, Any], children: Mapping[int, Mapping[Any, list]], tz) -> Dict[str, Any]:
+        out = {}
+        for name, kind, key, extra in self.plan:
+            if kind == _COLUMN:
+                value = row[key]
+                out[name] = value if extra is None or value is None else extra(value)
+            elif kind == _DATETIME:
+                value = row[key]
+                out[name] = None if value is None else _format_datetime(value, tz, extra)
+            elif kind == _NESTED:
+                out[name] = None if row[key] is None else extra._map(row, children, tz)
+            else:
+                out[name] = children[id(key)].get(row[self.pk_key], [])
+        return out
+
+    def _load_children(self, relation: ManyRelation, parent_ids: List[Any], tz) -> Dict[Any, list]:
+        grouped: Dict[Any, list] = defaultdict(list)
+        if not parent_ids:
+            return grouped
+        remote = self.model._meta.get_field(relation.relation)
+        parent_key = remote.field.name
+        rows = remote.related_model.objects.filter(**{f"{parent_key}__in": parent_ids})
+        if relation.limit:
+            rows = first_per_group(rows, group_by=parent_key, order_by=relation.order_by, limit=relation.limit)
+        rows = rows.order_by(parent_key, *relation.order_by).values(parent_key, *dict.fromkeys(relation.columns))
+        if relation.mapper is not None:
+            for row in rows:
+                grouped[row[parent_key]].append(relation.mapper._map(row, {}, tz))
+            return grouped
+
+        converters = relation.converters
+        for row in rows:
+            entry = {column: row[column] for column in relation.columns}
+            for column, convert in converters.items():
+                if entry[column] is not None:
+                    entry[column] = convert(entry[column])
+            grouped[row[parent_key]].append(entry)
+        return grouped
+
+
+__all__ = ["ManyRelation", "RowMapper", "UnsupportedField"]
@@ -1,11 +1,22 @@
 """Inventory domain serializers."""
 
+import json
 from urllib.parse import urlparse
 
 from django.conf import settings
 from rest_framework import serializers
 
-from backend.catalog.models import CardMetadata, CatalogItem, CatalogMedia, Era, Product, Set, Store
+from backend.catalog.models import (
+    CardMetadata,
+    CatalogItem,
+    CatalogMedia,
+    CatalogMediaType,
+    Era,
+    Product,
+    Set,
+    Store,
+)
+from backend.catalog.selectors.external_ids import MAX_EXTERNAL_ID_LOOKUP
 from backend.catalog.services.create_item import create_item
 from backend.catalog.services.update_item import update_item
 
@@ -39,6 +50,14 @@ class ProductSerializer(serializers.ModelSerializer):
         read_only_fields = fields
 
 
+class ReferenceCatalogSerializer(serializers.Serializer):
+    """Full reference catalog dump (eras, sets and products)."""
+    version = serializers.CharField(read_only=True)
+    eras = EraSerializer(many=True, read_only=True)
+    sets = SetSerializer(many=True, read_only=True)
+    products = ProductSerializer(many=True, read_only=True)
+
+
 class CardMetadataSerializer(serializers.ModelSerializer):
     """Serializer for the CardMetadata nested object."""
 
@@ -68,10 +87,42 @@ class CardMetadataSerializer(serializers.ModelSerializer):
             'game_genre',
         ]
 
+    def validate_external_ids(self, value):
+        if value in (None, "", {}):
+            return None
+        if isinstance(value, str):
+            # Older clients posted the JSON-encoded string the text column used to hold.
+            try:
+                value = json.loads(value)
+            except ValueError as exc:
+                raise serializers.ValidationError("External IDs must be a JSON object.") from exc
+        if not isinstance(value, dict):
+            raise serializers.ValidationError("External IDs must be an object keyed by provider.")
+        normalized = {}
+        for provider, external_id in value.items():
+            if external_id is None or isinstance(external_id, (dict, list, bool)):
+                raise serializers.ValidationError(f"Invalid external ID for provider '{provider}'.")
+            normalized[str(provider)] = str(external_id)
+        return normalized
+
 
 class CatalogMediaSerializer(serializers.ModelSerializer):
     """Serializer for media associated with collectibles."""
 
+    # Filled in by the media processing job; null until it has run.
+    thumbnail_url = serializers.CharField(
+        source="metadata.derivatives.thumb.url",
+        read_only=True,
+        allow_null=True,
+        help_text="WebP thumbnail for grids and lists.",
+    )
+    derivatives = serializers.JSONField(
+        source="metadata.derivatives",
+        read_only=True,
+        allow_null=True,
+        help_text="Generated WebP variants keyed by name, each with url/width/height/size_kb.",
+    )
+
     class Meta:
         model = CatalogMedia
         fields = [
@@ -84,12 +135,24 @@ class CatalogMediaSerializer(serializers.ModelSerializer):
             "height",
             "size_kb",
             "metadata",
+            "thumbnail_url",
+            "derivatives",
             "created_at",
             "updated_at",
         ]
         read_only_fields = ("id", "created_at", "updated_at")
 
 
+class CatalogMediaUploadSerializer(serializers.Serializer):
+    """Attach a confirmed direct upload (see /api/v1/core/uploads/) to an item."""
+
+    token = serializers.CharField()
+    media_type = serializers.ChoiceField(choices=CatalogMediaType.choices, required=False)
+    is_primary = serializers.BooleanField(required=False, default=False)
+    width = serializers.IntegerField(min_value=0, required=False, allow_null=True)
+    height = serializers.IntegerField(min_value=0, required=False, allow_null=True)
+
+
 class CatalogItemSerializer(serializers.ModelSerializer):
     """Serializer for the CatalogItem model with nested card details support."""
 
@@ -159,6 +222,14 @@ class CatalogItemSerializer(serializers.ModelSerializer):
             'updated_at',
         )
 
+    def __init__(self, *args, fields=None, **kwargs):
+        """Accept an optional ``fields`` collection to emit a sparse representation."""
+        super().__init__(*args, **kwargs)
+        if fields is not None:
+            for name in list(self.fields):
+                if name not in fields and not self.fields[name].write_only:
+                    self.fields.pop(name)
+
     def validate_quantity(self, value: int) -> int:
         if value < 0:
             raise serializers.ValidationError("Quantity cannot be negative.")
@@ -248,4 +319,75 @@ class CatalogItemSerializer(serializers.ModelSerializer):
         ]
 
 
-__all__ = ['CardMetadataSerializer', 'CatalogItemSerializer', 'CatalogMediaSerializer']
+class CatalogItemSummarySerializer(serializers.ModelSerializer):
+    """Compact read-only item payload for lookups that only need identity and stock."""
+
+    class Meta:
+        model = CatalogItem
+        fields = ['id', 'sku', 'name', 'store', 'quantity', 'price', 'status']
+        read_only_fields = fields
+
+
+class CatalogVariantSummarySerializer(serializers.Serializer):
+    id = serializers.IntegerField()
+    condition = serializers.CharField(allow_null=True)
+    grade = serializers.CharField(allow_null=True)
+    quantity = serializers.IntegerField()
+    price_adjustment = serializers.DecimalField(max_digits=10, decimal_places=2)
+
+
+class CatalogItemScanSerializer(serializers.Serializer):
+    """Compact payload returned by the POS scan lookup."""
+
+    id = serializers.IntegerField()
+    sku = serializers.CharField()
+    name = serializers.CharField()
+    store = serializers.IntegerField()
+    quantity = serializers.IntegerField()
+    price = serializers.DecimalField(max_digits=10, decimal_places=2)
+    status = serializers.CharField()
+    image_url = serializers.URLField(allow_null=True)
+    variants = CatalogVariantSummarySerializer(many=True)
+
+
+class ExternalIdLookupSerializer(serializers.Serializer):
+    """Request payload for resolving items by external marketplace IDs."""
+
+    provider = serializers.CharField(max_length=50, help_text="Marketplace key, e.g. 'tcgplayer'.")
+    ids = serializers.ListField(
+        child=serializers.CharField(max_length=100),
+        min_length=1,
+        max_length=MAX_EXTERNAL_ID_LOOKUP,
+        help_text=f"External IDs to resolve (max {MAX_EXTERNAL_ID_LOOKUP}).",
+    )
+
+
+class ExternalIdLookupResponseSerializer(serializers.Serializer):
+    provider = serializers.CharField()
+    matches = serializers.DictField(child=CatalogItemSummarySerializer(many=True))
+    missing = serializers.ListField(child=serializers.CharField())
+
+
+class FacetBucketSerializer(serializers.Serializer):
+    value = serializers.JSONField(allow_null=True)
+    label = serializers.CharField(allow_null=True)
+    count = serializers.IntegerField()
+
+
+class CatalogFacetsSerializer(serializers.Serializer):
+    total = serializers.IntegerField()
+    facets = serializers.DictField(child=FacetBucketSerializer(many=True))
+
+
+__all__ = [
+    'CardMetadataSerializer',
+    'CatalogFacetsSerializer',
+    'CatalogItemScanSerializer',
+    'CatalogItemSerializer',
+    'CatalogItemSummarySerializer',
+    'CatalogMediaSerializer',
+    'CatalogMediaUploadSerializer',
+    'ExternalIdLookupResponseSerializer',
+    'ExternalIdLookupSerializer',
+    'ReferenceCatalogSerializer',
+]
@@ -1,13 +1,21 @@
 from django.urls import include, path
 from rest_framework import routers
 
-from backend.catalog.api.viewsets import CatalogItemViewSet, ProductViewSet, SetViewSet
+from backend.catalog.api.viewsets import (
+    CatalogItemViewSet,
+    EraViewSet,
+    ProductViewSet,
+    ReferenceCatalogView,
+    SetViewSet,
+)
 
 router = routers.DefaultRouter()
 router.register(r'catalog/items', CatalogItemViewSet, basename='catalog-item')
+router.register(r'catalog/eras', EraViewSet, basename='catalog-era')
 router.register(r'catalog/sets', SetViewSet, basename='catalog-set')
 router.register(r'catalog/products', ProductViewSet, basename='catalog-product')
 
 urlpatterns = [
+    path('catalog/reference/', ReferenceCatalogView.as_view(), name='catalog-reference'),
     path('', include(router.urls)),
 ]
@@ -1,40 +1,207 @@
 """Inventory domain viewsets."""
 
+import time
+from functools import cache, lru_cache
+from typing import Optional
+
 from django.conf import settings
-from rest_framework import viewsets
-from rest_framework.exceptions import NotFound, PermissionDenied
+from django.db import transaction
+from django.utils.cache import patch_cache_control
+from django.utils.http import parse_etags
+from drf_spectacular.utils import OpenApiParameter, extend_schema, extend_schema_view
+from rest_framework import status, viewsets
+from rest_framework.decorators import action
+from rest_framework.exceptions import NotFound, PermissionDenied, ValidationError
+from rest_framework.filters import SearchFilter
 from rest_framework.permissions import IsAuthenticated
+from rest_framework.response import Response
+from rest_framework.views import APIView
 
-from backend.catalog.api.serializers import CatalogItemSerializer, ProductSerializer, SetSerializer
-from backend.catalog.models import CatalogItem, Product, Set
+from backend.catalog.api.row_mappers import ManyRelation, RowMapper, UnsupportedField
+from backend.catalog.api.serializers import (
+    CatalogFacetsSerializer,
+    CatalogItemScanSerializer,
+    CatalogItemSerializer,
+    CatalogItemSummarySerializer,
+    CatalogMediaSerializer,
+    CatalogMediaUploadSerializer,
+    EraSerializer,
+    ExternalIdLookupResponseSerializer,
+    ExternalIdLookupSerializer,
+    ProductSerializer,
+    ReferenceCatalogSerializer,
+    SetSerializer,
+)
+from backend.catalog.models import CatalogItem, Era, Product, Set
+from backend.catalog.selectors.external_ids import find_items_by_external_ids
+from backend.catalog.selectors.facets import FACETS, get_item_facets, parse_facets
 from backend.catalog.selectors.get_item import get_item
-from backend.catalog.selectors.list_items import list_items
+from backend.catalog.selectors.list_cache import get_list_page, list_page_key, set_list_page
+from backend.catalog.selectors.list_items import (
+    LIST_MEDIA_ORDER,
+    MEDIA_ORDER,
+    list_items,
+    parse_field_selection,
+)
+from backend.catalog.selectors.reference_data import ReferenceCatalog, get_reference_catalog
+from backend.catalog.selectors.scan import scan_item
 from backend.catalog.services.create_item import create_item
 from backend.catalog.services.delete_item import delete_item
+from backend.catalog.services.media import add_item_media
 from backend.catalog.services.update_item import update_item
+from backend.core.direct_uploads import DirectUploadError, media_payload, verify_upload
+from backend.core.filters import FieldFilterBackend
+from backend.core.instrumentation import metrics
 from backend.core.permissions import VendorScopedPermission, resolve_user_store, resolve_user_vendor
 from backend.org.api.permissions import HasStoreAccess, user_has_store_access
 from backend.org.services.store_defaults import ensure_default_store
 
 
-class SetViewSet(viewsets.ReadOnlyModelViewSet):
+def _not_modified(request, catalog: ReferenceCatalog) -> bool:
+    etags = parse_etags(request.headers.get('If-None-Match', ''))
+    return '*' in etags or catalog.etag in etags
+
+
+def _reference_response(request, catalog: ReferenceCatalog, build) -> Response:
+    """``build()``'s response with the catalog's validators, or a 304 if the client is current."""
+    response = Response(status=status.HTTP_304_NOT_MODIFIED) if _not_modified(request, catalog) else build()
+    response['ETag'] = catalog.etag
+    # Same data for every user, but the endpoints sit behind authentication.
+    patch_cache_control(response, private=True, max_age=settings.CATALOG_REFERENCE_MAX_AGE)
+    return response
+
+
+class ReferenceDataViewSet(viewsets.ReadOnlyModelViewSet):
+    """
+    Read-only reference data served from the cached catalog.
+
+    Unfiltered pages and detail lookups come from ``get_reference_catalog()``
+    and cost no queries once the catalog version is cached. Requests using
+    ``filterset_fields`` or ``?search=`` query the database instead (a count
+    and a page). Exact filters are served by btree indexes; ``?search=`` runs
+    ``UPPER(col) LIKE '%term%'`` on each of ``search_fields``, which the
+    ``*_trgm`` trigram indexes on those columns serve.
+    """
+
+    permission_classes = [IsAuthenticated]
+    filter_backends = [FieldFilterBackend, SearchFilter]
+    reference_kind: str = ''
+
+    def _is_filtered(self, request) -> bool:
+        params = request.query_params
+        return bool(params.get(SearchFilter.search_param)) or any(
+            params.get(field) for field in self.filterset_fields
+        )
+
+    def list(self, request, *args, **kwargs):
+        catalog = get_reference_catalog()
+
+        def build():
+            if self._is_filtered(request):
+                return super(ReferenceDataViewSet, self).list(request, *args, **kwargs)
+            rows = getattr(catalog, self.reference_kind)
+            page = self.paginate_queryset(rows)
+            if page is not None:
+                return self.get_paginated_response(page)
+            return Response(rows)
+
+        return _reference_response(request, catalog, build)
+
+    def retrieve(self, request, *args, **kwargs):
+        catalog = get_reference_catalog()
+        row = catalog.get(self.reference_kind, kwargs.get(self.lookup_field))
+        if row is None:
+            raise NotFound()
+        return _reference_response(request, catalog, lambda: Response(row))
+
+
+class EraViewSet(ReferenceDataViewSet):
+    """ReadOnly ViewSet for Eras."""
+    queryset = Era.objects.all().order_by('name', 'id')
+    serializer_class = EraSerializer
+    reference_kind = 'eras'
+    filterset_fields = ['slug', 'name']
+    search_fields = ['name']
+
+
+class SetViewSet(ReferenceDataViewSet):
     """ReadOnly ViewSet for Sets."""
-    queryset = Set.objects.all().order_by('-release_date')
+    queryset = Set.objects.select_related('era').order_by('-release_date', 'id')
     serializer_class = SetSerializer
-    permission_classes = [IsAuthenticated]
-    filterset_fields = ['name', 'code', 'era']
+    reference_kind = 'sets'
+    filterset_fields = ['name', 'code', 'era', 'era__slug']
     search_fields = ['name', 'code']
 
 
-class ProductViewSet(viewsets.ReadOnlyModelViewSet):
+class ProductViewSet(ReferenceDataViewSet):
     """ReadOnly ViewSet for Products."""
-    queryset = Product.objects.all().order_by('name')
+    queryset = Product.objects.select_related('set__era').order_by('name', 'id')
     serializer_class = ProductSerializer
-    permission_classes = [IsAuthenticated]
-    filterset_fields = ['set', 'type']
+    reference_kind = 'products'
+    filterset_fields = ['set', 'set__code', 'type', 'name']
     search_fields = ['name']
 
 
+class ReferenceCatalogView(APIView):
+    """Every era, set and product in one cacheable response."""
+
+    permission_classes = [IsAuthenticated]
+
+    @extend_schema(responses={200: ReferenceCatalogSerializer}, summary="Full reference catalog dump")
+    def get(self, request):
+        catalog = get_reference_catalog()
+        return _reference_response(request, catalog, lambda: Response(catalog.payload))
+
+
+@cache
+def _readable_item_fields() -> frozenset:
+    return frozenset(
+        name for name, field in CatalogItemSerializer().fields.items() if not field.write_only
+    )
+
+
+# Row-mapper equivalent of CatalogItemSerializer.get_variants.
+_VARIANT_ROWS = ManyRelation(
+    relation="variants",
+    columns=("id", "condition", "grade", "quantity", "price_adjustment"),
+    converters={"price_adjustment": str},
+)
+
+
+@lru_cache(maxsize=64)
+def _item_row_mapper(selection: Optional[frozenset], image_limit: Optional[int] = None) -> Optional[RowMapper]:
+    """Compile the list row mapper for a field selection, or None if it cannot be mapped."""
+    try:
+        return RowMapper(
+            CatalogItemSerializer(fields=selection),
+            method_fields={"variants": _VARIANT_ROWS},
+            # Same images per row as list_items' prefetch.
+            many_options={
+                "images": {"order_by": LIST_MEDIA_ORDER if image_limit else MEDIA_ORDER, "limit": image_limit}
+            },
+        )
+    except UnsupportedField:
+        return None
+
+
+_FIELD_SELECTION_PARAMETERS = [
+    OpenApiParameter(
+        "fields",
+        str,
+        description="Comma-separated fields to return (e.g. id,name,sku,price,image_url).",
+    ),
+    OpenApiParameter(
+        "expand",
+        str,
+        description="Comma-separated nested relations to include: card_details, images, variants, product_details.",
+    ),
+]
+
+
+@extend_schema_view(
+    list=extend_schema(parameters=_FIELD_SELECTION_PARAMETERS),
+    retrieve=extend_schema(parameters=_FIELD_SELECTION_PARAMETERS),
+)
 class CatalogItemViewSet(viewsets.ModelViewSet):
     """Inventory CRUD viewset with vendor scoping rules."""
 
@@ -44,17 +211,208 @@ class CatalogItemViewSet(viewsets.ModelViewSet):
     def get_queryset(self):
         return list_items(user=getattr(self.request, 'user', None), filters=self.request.query_params)
 
+    def list(self, request, *args, **kwargs):
+        if not getattr(settings, 'CATALOG_LIST_CACHE', False):
+            return self._list_page(request, *args, **kwargs)
+        vendor = resolve_user_vendor(request.user)
+        if vendor is None:
+            return self._list_page(request, *args, **kwargs)
+
+        started = time.perf_counter()
+        key = list_page_key(vendor.id, request.query_params)
+        cached = get_list_page(key)
+        if cached is not None:
+            elapsed = (time.perf_counter() - started) * 1000
+            metrics.incr('catalog.list_cache.hit')
+            metrics.observe('catalog.list_cache.hit_ms', elapsed)
+            metrics.incr('catalog.list_cache.saved_ms', max(metrics.mean_ms('catalog.list_cache.miss_ms') - elapsed, 0))
+            return Response(cached)
+
+        response = self._list_page(request, *args, **kwargs)
+        if response.status_code == status.HTTP_200_OK:
+            set_list_page(key, response.data)
+        metrics.incr('catalog.list_cache.miss')
+        metrics.observe('catalog.list_cache.miss_ms', (time.perf_counter() - started) * 1000)
+        return response
+
+    def _list_page(self, request, *args, **kwargs):
+        mapper = None
+        if getattr(settings, 'CATALOG_FAST_LIST', False):
+            selection = self._field_selection()
+            mapper = _item_row_mapper(
+                frozenset(selection) if selection is not None else None,
+                getattr(settings, 'CATALOG_LIST_IMAGE_LIMIT', 0) or None,
+            )
+        if mapper is None:
+            return super().list(request, *args, **kwargs)
+
+        queryset = mapper.values(self.filter_queryset(self.get_queryset()))
+        page = self.paginate_queryset(queryset)
+        if page is not None:
+            return self.get_paginated_response(mapper.map_rows(page))
+        return Response(mapper.map_rows(queryset))
+
+    def get_serializer(self, *args, **kwargs):
+        selection = self._field_selection()
+        if selection is not None:
+            kwargs.setdefault('fields', selection)
+        return super().get_serializer(*args, **kwargs)
+
+    def _field_selection(self):
+        """Sparse fieldset requested via ``fields``/``expand`` (reads only)."""
+        request = getattr(self, 'request', None)
+        if request is None or request.method != 'GET':
+            return None
+        readable = _readable_item_fields()
+        selection = parse_field_selection(request.query_params, all_fields=set(readable))
+        if selection is None:
+            return None
+        unknown = selection - readable
+        if unknown:
+            raise ValidationError({"fields": f"Unknown fields: {', '.join(sorted(unknown))}."})
+        return selection
+
     def get_object(self):
         lookup_value = self.kwargs.get(self.lookup_field)
         if lookup_value is None:
             raise NotFound("CatalogItem identifier is missing.")
+        filters = None
+        if self.request.method == 'GET':
+            params = self.request.query_params
+            filters = {key: params[key] for key in ('fields', 'expand') if key in params}
         try:
-            obj = get_item(user=self.request.user, item_id=lookup_value)
+            obj = get_item(user=self.request.user, item_id=lookup_value, filters=filters)
         except CatalogItem.DoesNotExist as exc:
             raise NotFound(str(exc)) from exc
         self.check_object_permissions(self.request, obj)
         return obj
 
+    @extend_schema(
+        methods=["GET"],
+        parameters=[
+            OpenApiParameter("provider", str, required=True, description="Marketplace key, e.g. tcgplayer."),
+            OpenApiParameter("ids", str, required=True, description="Comma-separated external IDs."),
+        ],
+        responses={200: ExternalIdLookupResponseSerializer},
+        summary="Resolve items by external marketplace ID",
+    )
+    @extend_schema(
+        methods=["POST"],
+        request=ExternalIdLookupSerializer,
+        responses={200: ExternalIdLookupResponseSerializer},
+        summary="Batch-resolve items by external marketplace ID",
+    )
+    @action(detail=False, methods=["get", "post"], url_path="lookup-external")
+    def lookup_external(self, request):
+        if request.method == "POST":
+            data = request.data
+        else:
+            raw_ids = request.query_params.get("ids", "")
+            data = {
+                "provider": request.query_params.get("provider"),
+                "ids": [value for value in raw_ids.split(",") if value.strip()],
+            }
+        lookup = ExternalIdLookupSerializer(data=data)
+        lookup.is_valid(raise_exception=True)
+        provider = lookup.validated_data["provider"]
+        requested = lookup.validated_data["ids"]
+
+        matches = find_items_by_external_ids(user=request.user, provider=provider, external_ids=requested)
+        return Response(
+            {
+                "provider": provider,
+                "matches": {
+                    external_id: CatalogItemSummarySerializer(items, many=True).data
+                    for external_id, items in matches.items()
+                },
+                "missing": [
+                    external_id
+                    for external_id in dict.fromkeys(requested)
+                    if external_id not in matches
+                ],
+            }
+        )
+
+    @extend_schema(
+        parameters=[
+            OpenApiParameter(
+                "facets",
+                str,
+                description=f"Comma-separated facets to count (default all): {', '.join(FACETS)}.",
+            ),
+            OpenApiParameter("store", int, description="Same filter as the list endpoint."),
+            OpenApiParameter("search", str, description="Same filter as the list endpoint."),
+            OpenApiParameter("category", str, description="Same filter as the list endpoint."),
+            OpenApiParameter("status", str, description="Same filter as the list endpoint."),
+            OpenApiParameter("language", str, description="Same filter as the list endpoint."),
+            OpenApiParameter("market_region", str, description="Same filter as the list endpoint."),
+        ],
+        responses={200: CatalogFacetsSerializer},
+        summary="Facet counts for the current list filters",
+    )
+    @action(detail=False, methods=["get"], url_path="facets")
+    def facets(self, request):
+        try:
+            names = parse_facets(request.query_params.get("facets"))
+        except ValueError as exc:
+            raise ValidationError({"facets": str(exc)}) from exc
+        return Response(get_item_facets(user=request.user, filters=request.query_params, facets=names))
+
+    @extend_schema(
+        parameters=[
+            OpenApiParameter("code", str, required=True, description="Scanned SKU or external ID."),
+            OpenApiParameter("provider", str, description="Treat the code as this marketplace's ID."),
+            OpenApiParameter("variant", int, description="Only return this variant of the item."),
+        ],
+        responses={200: CatalogItemScanSerializer},
+        summary="Resolve a scanned barcode/SKU",
+    )
+    @action(detail=False, methods=["get"], url_path="scan")
+    def scan(self, request):
+        params = request.query_params
+        code = (params.get("code") or "").strip()
+        if not code:
+            raise ValidationError({"code": "A scanned code is required."})
+        try:
+            payload = scan_item(user=request.user, code=code, provider=params.get("provider") or None)
+        except CatalogItem.MultipleObjectsReturned as exc:
+            return Response({"detail": str(exc)}, status=status.HTTP_409_CONFLICT)
+        if payload is None:
+            raise NotFound("No catalog item matches that code.")
+
+        variant_id = params.get("variant")
+        if variant_id:
+            variants = [v for v in payload["variants"] if str(v["id"]) == variant_id]
+            if not variants:
+                raise NotFound("That variant does not belong to the scanned item.")
+            payload = {**payload, "variants": variants}
+        return Response(payload)
+
+    @extend_schema(
+        request=CatalogMediaUploadSerializer,
+        responses={201: CatalogMediaSerializer},
+        summary="Attach a direct upload to an item",
+        description="Verifies the uploaded object (size and content type) and adds it to the item's gallery.",
+    )
+    @action(detail=True, methods=["post"], url_path="media")
+    def attach_media(self, request, pk=None):
+        item = self.get_object()
+        serializer = CatalogMediaUploadSerializer(data=request.data)
+        serializer.is_valid(raise_exception=True)
+        data = dict(serializer.validated_data)
+        try:
+            # The token is used up only if the media row is created too.
+            with transaction.atomic():
+                upload = verify_upload(token=data.pop("token"), user_id=request.user.id)
+                if not upload["url"].startswith("http"):
+                    upload["url"] = request.build_absolute_uri(upload["url"])
+                media = add_item_media(item=item, payload=media_payload(upload, **data))
+        except DirectUploadError as exc:
+            return Response({"error": str(exc)}, status=status.HTTP_400_BAD_REQUEST)
+        except ValueError as exc:
+            raise ValidationError({"images": str(exc)}) from exc
+        return Response(CatalogMediaSerializer(media).data, status=status.HTTP_201_CREATED)
+
     def perform_create(self, serializer):
         payload = dict(serializer.validated_data)
         card_details_data = payload.pop('card_metadata', None)
@@ -8,3 +8,6 @@ class CatalogConfig(AppConfig):
     # database tables remain intact while the code lives under backend/.
     label = 'collectibles'
     verbose_name = 'Inventory Domain'
+
+    def ready(self):
+        from backend.catalog import checks, signals  # noqa: F401
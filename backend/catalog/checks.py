@@ -0,0 +1,24 @@
+"""System checks for catalog settings."""
+
+from django.conf import settings
+from django.core.checks import Warning, register
+
+PER_PROCESS_CACHES = (
+    "django.core.cache.backends.dummy.DummyCache",
+    "django.core.cache.backends.locmem.LocMemCache",
+)
+
+
+@register()
+def check_list_cache_backend(app_configs, **kwargs):
+    """The list cache's version bumps must reach every worker."""
+    backend = settings.CACHES.get("default", {}).get("BACKEND")
+    if settings.CATALOG_LIST_CACHE and backend in PER_PROCESS_CACHES:
+        return [
+            Warning(
+                "CATALOG_LIST_CACHE is on but the default cache is per process.",
+                hint="Set REDIS_URL; otherwise workers keep serving pages another worker invalidated.",
+                id="collectibles.W001",
+            )
+        ]
+    return []
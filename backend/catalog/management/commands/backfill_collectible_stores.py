@@ -1,7 +1,11 @@
-from django.core.management.base import BaseCommand
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connection, transaction
+from django.db.models import Count
 
 from backend.catalog.models import CatalogItem
-from backend.org.models import Store, Vendor
+from backend.org.models import Store
+
+DEFAULT_BATCH_SIZE = 1000
 
 
 class Command(BaseCommand):
@@ -13,37 +17,106 @@ class Command(BaseCommand):
             action="store_true",
             help="Report planned updates without writing to the database.",
         )
+        parser.add_argument(
+            "--batch-size",
+            type=int,
+            default=DEFAULT_BATCH_SIZE,
+            help=f"Rows updated per transaction (default: {DEFAULT_BATCH_SIZE}).",
+        )
+        parser.add_argument(
+            "--start-after-id",
+            type=int,
+            default=0,
+            help="Resume from the collectible id reported by a previous run.",
+        )
 
-    def handle(self, *, dry_run: bool, **options):
-        updated = 0
-        missing_store = 0
-        store_cache: dict[int, Store] = {}
+    def handle(self, *, dry_run: bool, batch_size: int, start_after_id: int, **options):
+        if batch_size <= 0:
+            raise CommandError("--batch-size must be a positive integer.")
+
+        orphans = CatalogItem.objects.filter(
+            store__isnull=True,
+            vendor__isnull=False,
+            id__gt=start_after_id,
+        )
+        first_stores = self._resolve_first_stores(orphans)
 
-        qs = CatalogItem.objects.filter(store__isnull=True, vendor__isnull=False).select_related(
-            "vendor"
+        missing_store = 0
+        missing_rows = (
+            orphans.exclude(vendor_id__in=list(first_stores))
+            .values("vendor_id")
+            .annotate(total=Count("id"))
+            .order_by("vendor_id")
         )
-        for collectible in qs.iterator():
-            vendor_id = collectible.vendor_id
-            if vendor_id is None:
-                continue
-            store = store_cache.get(vendor_id)
-            if store is None:
-                store = Vendor.objects.get(id=vendor_id).stores.order_by("id").first()
-                store_cache[vendor_id] = store
-            if store is None:
-                missing_store += 1
-                self.stdout.write(
-                    self.style.WARNING(f"Vendor {vendor_id} has no store for collectible {collectible.id}")
+        for row in missing_rows:
+            missing_store += row["total"]
+            self.stdout.write(
+                self.style.WARNING(
+                    f"Vendor {row['vendor_id']} has no store for {row['total']} collectibles"
                 )
-                continue
-            if dry_run:
-                updated += 1
-                continue
-            collectible.store = store
-            collectible.save(update_fields=["store"])
-            updated += 1
+            )
+
+        if dry_run:
+            updated = orphans.filter(vendor_id__in=list(first_stores)).count()
+        else:
+            updated = self._backfill(first_stores, batch_size=batch_size, start_after_id=start_after_id)
 
         status = "DRY-RUN " if dry_run else ""
         self.stdout.write(self.style.SUCCESS(f"{status}Backfill complete. {updated} collectibles processed."))
         if missing_store:
             self.stdout.write(self.style.WARNING(f"{missing_store} collectibles skipped because vendor has no store."))
+
+    def _resolve_first_stores(self, orphans) -> dict[int, int]:
+        """Map vendor id -> lowest store id for every vendor with orphaned collectibles."""
+        rows = (
+            Store.objects.filter(vendor_id__in=orphans.values("vendor_id"))
+            .order_by("vendor_id", "id")
+            .distinct("vendor_id")
+            .values_list("vendor_id", "id")
+        )
+        return dict(rows)
+
+    def _backfill(self, first_stores: dict[int, int], *, batch_size: int, start_after_id: int) -> int:
+        """
+        Walk orphaned rows in primary-key order, updating one short transaction per batch.
+
+        Each batch is an ``UPDATE ... FROM`` joined against the vendor -> store map, so
+        row locks are only held for ``batch_size`` rows at a time and an interrupted run
+        can be resumed with ``--start-after-id``.
+        """
+        if not first_stores:
+            return 0
+
+        quote = connection.ops.quote_name
+        table = quote(CatalogItem._meta.db_table)
+        sql = f"""
+            WITH batch AS (
+                SELECT id, vendor_id FROM {table}
+                WHERE store_id IS NULL AND vendor_id = ANY(%s) AND id > %s
+                ORDER BY id
+                LIMIT %s
+            ),
+            first_store(vendor_id, store_id) AS (
+                SELECT * FROM unnest(%s::bigint[], %s::bigint[])
+            )
+            UPDATE {table} AS item
+            SET store_id = first_store.store_id
+            FROM batch JOIN first_store ON first_store.vendor_id = batch.vendor_id
+            WHERE item.id = batch.id
+            RETURNING item.id
+        """
+        vendor_ids = list(first_stores)
+        store_ids = [first_stores[vendor_id] for vendor_id in vendor_ids]
+
+        updated = 0
+        last_id = start_after_id
+        while True:
+            with transaction.atomic(), connection.cursor() as cursor:
+                cursor.execute(sql, [vendor_ids, last_id, batch_size, vendor_ids, store_ids])
+                ids = [row[0] for row in cursor.fetchall()]
+            if not ids:
+                break
+            updated += len(ids)
+            last_id = max(ids)
+            self.stdout.write(f"Updated {updated} collectibles (resume with --start-after-id {last_id})")
+        return updated
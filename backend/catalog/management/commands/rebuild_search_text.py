@@ -0,0 +1,114 @@
+from concurrent.futures import ThreadPoolExecutor
+
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connection
+
+from backend.catalog.services.search_text import (
+    drop_search_text_trigger,
+    install_search_text_trigger,
+    rebuild_search_text,
+    split_id_ranges,
+)
+
+DEFAULT_BATCH_SIZE = 1000
+
+
+class Command(BaseCommand):
+    help = "Recompute CatalogItem.search_text in batches and optionally manage the Postgres trigger."
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--dry-run",
+            action="store_true",
+            help="Count stale rows without writing to the database.",
+        )
+        parser.add_argument(
+            "--batch-size",
+            type=int,
+            default=DEFAULT_BATCH_SIZE,
+            help=f"Rows read and written per batch (default: {DEFAULT_BATCH_SIZE}).",
+        )
+        parser.add_argument(
+            "--workers",
+            type=int,
+            default=1,
+            help="Rebuild disjoint id ranges in parallel, one DB connection per worker.",
+        )
+        parser.add_argument(
+            "--start-after-id",
+            type=int,
+            default=0,
+            help="Resume from the item id reported by a previous run.",
+        )
+        trigger = parser.add_mutually_exclusive_group()
+        trigger.add_argument(
+            "--install-trigger",
+            action="store_true",
+            help="Install a Postgres trigger so bulk_create/update/raw SQL keep search_text correct.",
+        )
+        trigger.add_argument(
+            "--drop-trigger",
+            action="store_true",
+            help="Remove the search_text trigger.",
+        )
+
+    def handle(
+        self,
+        *,
+        dry_run: bool,
+        batch_size: int,
+        workers: int,
+        start_after_id: int,
+        install_trigger: bool,
+        drop_trigger: bool,
+        **options,
+    ):
+        if batch_size <= 0:
+            raise CommandError("--batch-size must be a positive integer.")
+        if workers <= 0:
+            raise CommandError("--workers must be a positive integer.")
+
+        if install_trigger or drop_trigger:
+            if connection.vendor != "postgresql":
+                raise CommandError("The search_text trigger requires PostgreSQL.")
+            if dry_run:
+                self.stdout.write("[DRY-RUN] Skipping trigger changes.")
+            elif install_trigger:
+                install_search_text_trigger()
+                self.stdout.write(self.style.SUCCESS("Installed search_text trigger."))
+            else:
+                drop_search_text_trigger()
+                self.stdout.write(self.style.SUCCESS("Dropped search_text trigger."))
+
+        ranges = split_id_ranges(partitions=workers, start_after_id=start_after_id)
+        if len(ranges) <= 1:
+            changed = sum(self._rebuild_range(rng, batch_size, dry_run, close=False) for rng in ranges)
+        else:
+            with ThreadPoolExecutor(max_workers=len(ranges)) as pool:
+                futures = [
+                    pool.submit(self._rebuild_range, rng, batch_size, dry_run, True) for rng in ranges
+                ]
+                changed = sum(future.result() for future in futures)
+
+        status = "DRY-RUN " if dry_run else ""
+        self.stdout.write(self.style.SUCCESS(f"{status}Rebuild complete. {changed} items had stale search_text."))
+
+    def _rebuild_range(self, id_range, batch_size: int, dry_run: bool, close: bool) -> int:
+        start_after_id, end_id = id_range
+
+        def report(changed: int, last_id: int) -> None:
+            if changed:
+                self.stdout.write(f"Rebuilt {changed} items through id {last_id}")
+
+        try:
+            return rebuild_search_text(
+                start_after_id=start_after_id,
+                end_id=end_id,
+                batch_size=batch_size,
+                dry_run=dry_run,
+                on_batch=report,
+            )
+        finally:
+            if close:
+                # Worker threads own their connection; release it before the thread exits.
+                connection.close()
@@ -0,0 +1,50 @@
+import json
+
+import django.contrib.postgres.indexes
+from django.db import migrations, models
+
+
+def normalize_external_ids(apps, schema_editor):
+    """Rewrite legacy text values so the column can be cast to jsonb safely."""
+    CardMetadata = apps.get_model("collectibles", "CardMetadata")
+    rows = CardMetadata.objects.exclude(external_ids__isnull=True).values_list("id", "external_ids")
+    for pk, raw in rows.iterator():
+        try:
+            parsed = json.loads(raw) if raw else None
+        except (TypeError, ValueError):
+            parsed = None
+        normalized = json.dumps(parsed) if isinstance(parsed, dict) and parsed else None
+        if normalized != raw:
+            CardMetadata.objects.filter(pk=pk).update(external_ids=normalized)
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ("collectibles", "0023_accessory_era_product_catalogitem_product_set_and_more"),
+    ]
+
+    operations = [
+        # The trigram index from 0006 cannot serve exact id lookups and blocks the type change.
+        migrations.RunSQL(
+            sql="DROP INDEX IF EXISTS carddetails_external_gin;",
+            reverse_sql=migrations.RunSQL.noop,
+        ),
+        migrations.RunPython(normalize_external_ids, migrations.RunPython.noop),
+        migrations.AlterField(
+            model_name="cardmetadata",
+            name="external_ids",
+            field=models.JSONField(
+                blank=True,
+                help_text='Marketplace IDs keyed by provider, e.g. {"tcgplayer": "12345"}.',
+                null=True,
+            ),
+        ),
+        migrations.AddIndex(
+            model_name="cardmetadata",
+            index=django.contrib.postgres.indexes.GinIndex(
+                fields=["external_ids"],
+                name="card_metadata_ext_ids_gin",
+                opclasses=["jsonb_path_ops"],
+            ),
+        ),
+    ]
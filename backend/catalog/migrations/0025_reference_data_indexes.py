@@ -0,0 +1,25 @@
+# Generated by Django 5.0.6 on 2026-10-19 06:43
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("collectibles", "0024_cardmetadata_external_ids_jsonb"),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name="product",
+            index=models.Index(fields=["set", "type"], name="collectible_set_id_fc19a1_idx"),
+        ),
+        migrations.AddIndex(
+            model_name="product",
+            index=models.Index(fields=["name"], name="collectible_name_31a622_idx"),
+        ),
+        migrations.AddIndex(
+            model_name="set",
+            index=models.Index(fields=["name"], name="collectible_name_6a3b2c_idx"),
+        ),
+    ]
@@ -0,0 +1,99 @@
+# Generated by Django 5.0.6 on 2026-10-19 07:01
+
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("collectibles", "0025_reference_data_indexes"),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.AlterModelOptions(
+            name="catalogitem",
+            options={"verbose_name": "Catalog Item", "verbose_name_plural": "Catalog Items"},
+        ),
+        migrations.RemoveIndex(
+            model_name="catalogitem",
+            name="catalog_ite_vendor__0b6c03_idx",
+        ),
+        migrations.RemoveIndex(
+            model_name="catalogitem",
+            name="catalog_ite_vendor__3cf1ce_idx",
+        ),
+        migrations.RemoveIndex(
+            model_name="catalogitem",
+            name="catalog_ite_vendor__241ccf_idx",
+        ),
+        migrations.AddIndex(
+            model_name="catalogitem",
+            index=models.Index(
+                fields=["vendor", "created_at", "id"], name="item_vendor_created_idx"
+            ),
+        ),
+        migrations.AddIndex(
+            model_name="catalogitem",
+            index=models.Index(
+                fields=["vendor", "updated_at", "id"], name="item_vendor_updated_idx"
+            ),
+        ),
+        migrations.AddIndex(
+            model_name="catalogitem",
+            index=models.Index(fields=["vendor", "price", "id"], name="item_vendor_price_idx"),
+        ),
+        migrations.AddIndex(
+            model_name="catalogitem",
+            index=models.Index(fields=["vendor", "name", "id"], name="item_vendor_name_idx"),
+        ),
+        migrations.AddIndex(
+            model_name="catalogitem",
+            index=models.Index(
+                fields=["vendor", "store", "created_at", "id"], name="item_store_created_idx"
+            ),
+        ),
+        migrations.AddIndex(
+            model_name="catalogitem",
+            index=models.Index(
+                fields=["vendor", "store", "updated_at", "id"], name="item_store_updated_idx"
+            ),
+        ),
+        migrations.AddIndex(
+            model_name="catalogitem",
+            index=models.Index(
+                fields=["vendor", "store", "price", "id"], name="item_store_price_idx"
+            ),
+        ),
+        migrations.AddIndex(
+            model_name="catalogitem",
+            index=models.Index(
+                fields=["vendor", "store", "name", "id"], name="item_store_name_idx"
+            ),
+        ),
+        migrations.AddIndex(
+            model_name="catalogitem",
+            index=models.Index(
+                fields=["vendor", "category", "created_at", "id"], name="item_category_created_idx"
+            ),
+        ),
+        migrations.AddIndex(
+            model_name="catalogitem",
+            index=models.Index(
+                fields=["vendor", "category", "updated_at", "id"], name="item_category_updated_idx"
+            ),
+        ),
+        migrations.AddIndex(
+            model_name="catalogitem",
+            index=models.Index(
+                fields=["vendor", "category", "price", "id"], name="item_category_price_idx"
+            ),
+        ),
+        migrations.AddIndex(
+            model_name="catalogitem",
+            index=models.Index(
+                fields=["vendor", "category", "name", "id"], name="item_category_name_idx"
+            ),
+        ),
+    ]
@@ -0,0 +1,35 @@
+# Generated by Django 5.0.6 on 2026-10-19 07:56
+
+import django.contrib.postgres.indexes
+import django.db.models.functions.text
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("collectibles", "0026_list_sort_indexes"),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name="catalogitem",
+            index=models.Index(
+                django.contrib.postgres.indexes.OpClass(
+                    django.db.models.functions.text.Reverse("image_url"), name="text_pattern_ops"
+                ),
+                name="item_image_url_suffix_idx",
+            ),
+        ),
+        migrations.AddIndex(
+            model_name="catalogmedia",
+            index=models.Index(
+                django.contrib.postgres.indexes.OpClass(
+                    django.db.models.functions.text.Reverse("url"), name="text_pattern_ops"
+                ),
+                name="catalog_media_url_suffix_idx",
+            ),
+        ),
+    ]
@@ -0,0 +1,54 @@
+# Generated by Django 5.0.6 on 2026-10-19 08:00
+
+import django.contrib.postgres.indexes
+import django.db.models.functions.text
+from django.contrib.postgres.operations import TrigramExtension
+from django.db import migrations
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("collectibles", "0027_content_reference_indexes"),
+    ]
+
+    operations = [
+        # gin_trgm_ops; pg_trgm is a trusted extension, so the database owner can create it.
+        TrigramExtension(),
+        migrations.AddIndex(
+            model_name="era",
+            index=django.contrib.postgres.indexes.GinIndex(
+                django.contrib.postgres.indexes.OpClass(
+                    django.db.models.functions.text.Upper("name"), name="gin_trgm_ops"
+                ),
+                name="era_name_trgm",
+            ),
+        ),
+        migrations.AddIndex(
+            model_name="product",
+            index=django.contrib.postgres.indexes.GinIndex(
+                django.contrib.postgres.indexes.OpClass(
+                    django.db.models.functions.text.Upper("name"), name="gin_trgm_ops"
+                ),
+                name="product_name_trgm",
+            ),
+        ),
+        migrations.AddIndex(
+            model_name="set",
+            index=django.contrib.postgres.indexes.GinIndex(
+                django.contrib.postgres.indexes.OpClass(
+                    django.db.models.functions.text.Upper("name"), name="gin_trgm_ops"
+                ),
+                name="set_name_trgm",
+            ),
+        ),
+        migrations.AddIndex(
+            model_name="set",
+            index=django.contrib.postgres.indexes.GinIndex(
+                django.contrib.postgres.indexes.OpClass(
+                    django.db.models.functions.text.Upper("code"), name="gin_trgm_ops"
+                ),
+                name="set_code_trgm",
+            ),
+        ),
+    ]
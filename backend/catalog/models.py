@@ -1,7 +1,9 @@
 """Inventory domain models."""
 
 from django.conf import settings
+from django.contrib.postgres.indexes import GinIndex, OpClass
 from django.db import models
+from django.db.models.functions import Reverse, Upper
 
 from backend.org.models import Store, Vendor
 
@@ -11,6 +13,10 @@ class Era(models.Model):
     slug = models.SlugField(unique=True)
     start_year = models.IntegerField(null=True, blank=True)
     end_year = models.IntegerField(null=True, blank=True)
+    updated_at = models.DateTimeField(auto_now=True)
+
+    class Meta:
+        indexes = [GinIndex(OpClass(Upper("name"), name="gin_trgm_ops"), name="era_name_trgm")]
 
     def __str__(self):
         return self.name
@@ -22,6 +28,16 @@ class Set(models.Model):
     code = models.CharField(max_length=50, unique=True, help_text="e.g. SWSH01")
     release_date = models.DateField(null=True, blank=True)
     card_count = models.IntegerField(default=0)
+    updated_at = models.DateTimeField(auto_now=True)
+
+    class Meta:
+        # ``code`` is unique and ``era`` a foreign key, so both are indexed already.
+        indexes = [
+            models.Index(fields=["name"]),
+            # ?search= runs UPPER(col) LIKE '%term%', which only trigram indexes can serve.
+            GinIndex(OpClass(Upper("name"), name="gin_trgm_ops"), name="set_name_trgm"),
+            GinIndex(OpClass(Upper("code"), name="gin_trgm_ops"), name="set_code_trgm"),
+        ]
 
     def __str__(self):
         return f"{self.name} ({self.code})"
@@ -43,6 +59,15 @@ class Product(models.Model):
     type = models.CharField(max_length=50, choices=PRODUCT_TYPES)
     configuration = models.JSONField(default=dict, blank=True)
     release_date = models.DateField(null=True, blank=True)
+    updated_at = models.DateTimeField(auto_now=True)
+
+    class Meta:
+        indexes = [
+            # "All booster boxes in a set" is one index scan; also serves plain set lookups.
+            models.Index(fields=["set", "type"]),
+            models.Index(fields=["name"]),
+            GinIndex(OpClass(Upper("name"), name="gin_trgm_ops"), name="product_name_trgm"),
+        ]
 
     def __str__(self):
         return self.name
@@ -161,17 +186,30 @@ class CatalogItem(models.Model):
     class Meta:
         verbose_name = "Catalog Item"
         verbose_name_plural = "Catalog Items"
-        ordering = ["name"]
         db_table = "catalog_item"
         indexes = [
-            models.Index(fields=["vendor", "store"]),
-            models.Index(fields=["vendor", "category"]),
             models.Index(fields=["store", "category"]),
             models.Index(fields=["name"]),
             models.Index(fields=["sku"]),
             models.Index(fields=["search_text"]),
             models.Index(fields=["category", "created_at"]),
-            models.Index(fields=["vendor", "-created_at"]),
+            # List pages: one index per scope (vendor, vendor + store, vendor +
+            # category) and sort_by, ending in the id tie-breaker of order_items.
+            # Descending pages scan them backwards.
+            models.Index(fields=["vendor", "created_at", "id"], name="item_vendor_created_idx"),
+            models.Index(fields=["vendor", "updated_at", "id"], name="item_vendor_updated_idx"),
+            models.Index(fields=["vendor", "price", "id"], name="item_vendor_price_idx"),
+            models.Index(fields=["vendor", "name", "id"], name="item_vendor_name_idx"),
+            models.Index(fields=["vendor", "store", "created_at", "id"], name="item_store_created_idx"),
+            models.Index(fields=["vendor", "store", "updated_at", "id"], name="item_store_updated_idx"),
+            models.Index(fields=["vendor", "store", "price", "id"], name="item_store_price_idx"),
+            models.Index(fields=["vendor", "store", "name", "id"], name="item_store_name_idx"),
+            models.Index(fields=["vendor", "category", "created_at", "id"], name="item_category_created_idx"),
+            models.Index(fields=["vendor", "category", "updated_at", "id"], name="item_category_updated_idx"),
+            models.Index(fields=["vendor", "category", "price", "id"], name="item_category_price_idx"),
+            models.Index(fields=["vendor", "category", "name", "id"], name="item_category_name_idx"),
+            # Reversed URL prefix matches: the content store's indexed "ends with key" lookup.
+            models.Index(OpClass(Reverse("image_url"), name="text_pattern_ops"), name="item_image_url_suffix_idx"),
         ]
 
     def __str__(self):
@@ -182,16 +220,28 @@ class CatalogItem(models.Model):
         """Backward compatible alias for card_metadata."""
         return getattr(self, "card_metadata", None)
 
+    @staticmethod
+    def build_search_text(*, name=None, sku=None, description=None, category=None) -> str:
+        """Compose the denormalized search_text value from its source fields."""
+        parts = [name or "", sku or "", description or "", category or ""]
+        return " ".join(part for part in parts if part).strip()
+
     @classmethod
     def update_search_text(cls, instance):
         """Denormalize fields into search_text for fast icontains filters."""
-        parts = [
-            instance.name or "",
-            instance.sku or "",
-            instance.description or "",
-            instance.category or "",
-        ]
-        instance.search_text = " ".join(part for part in parts if part).strip()
+        instance.search_text = cls.build_search_text(
+            name=instance.name,
+            sku=instance.sku,
+            description=instance.description,
+            category=instance.category,
+        )
+
+    @classmethod
+    def from_db(cls, db, field_names, values):
+        instance = super().from_db(db, field_names, values)
+        # The stored vendor, so a save can tell a vendor move apart (see catalog.signals).
+        instance._loaded_vendor_id = instance.__dict__.get("vendor_id")
+        return instance
 
     def save(self, *args, **kwargs):
         self.update_search_text(self)
@@ -274,10 +324,10 @@ class CardMetadata(models.Model):
         null=True,
         help_text="Human-readable condition (e.g., Mint, Near Mint).",
     )
-    external_ids = models.TextField(
+    external_ids = models.JSONField(
         blank=True,
         null=True,
-        help_text="JSON string of external IDs (portable across DBs)",
+        help_text="Marketplace IDs keyed by provider, e.g. {\"tcgplayer\": \"12345\"}.",
     )
     last_estimated_at = models.DateTimeField(blank=True, null=True)
     language = models.CharField(max_length=50, blank=True, null=True)
@@ -366,6 +416,14 @@ class CardMetadata(models.Model):
         verbose_name = "Card Metadata"
         verbose_name_plural = "Card Metadata"
         db_table = "catalog_card_metadata"
+        indexes = [
+            # jsonb_path_ops keeps the index small and serves `@>` containment lookups.
+            GinIndex(
+                fields=["external_ids"],
+                opclasses=["jsonb_path_ops"],
+                name="card_metadata_ext_ids_gin",
+            ),
+        ]
 
     def __str__(self):
         from django.core.exceptions import ObjectDoesNotExist
@@ -383,23 +441,20 @@ class CardMetadata(models.Model):
 
     def get_external_ids(self):
         """Return external_ids as a dict if possible, otherwise empty dict."""
-        import json
-
-        if not self.external_ids:
-            return {}
-        try:
-            return json.loads(self.external_ids)
-        except Exception:
-            return {}
+        if isinstance(self.external_ids, dict):
+            return self.external_ids
+        return {}
 
     def set_external_ids(self, data):
         """Set external_ids from a dict or JSON-serializable object."""
         import json
 
         try:
-            self.external_ids = json.dumps(data)
+            json.dumps(data)
         except Exception:
             self.external_ids = None
+        else:
+            self.external_ids = data
 
 class CatalogMediaType(models.TextChoices):
     PRIMARY = "primary", "Primary Image"
@@ -463,6 +518,10 @@ class CatalogMedia(models.Model):
     class Meta:
         unique_together = ("item", "sort_order")
         db_table = "catalog_media"
+        indexes = [
+            # Reversed URL prefix matches: the content store's indexed "ends with key" lookup.
+            models.Index(OpClass(Reverse("url"), name="text_pattern_ops"), name="catalog_media_url_suffix_idx"),
+        ]
 
     def __str__(self):
         return f"{self.item.sku} media ({self.get_media_type_display()})"
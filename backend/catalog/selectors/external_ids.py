@@ -0,0 +1,54 @@
+"""Selectors for resolving inventory items by external marketplace IDs."""
+
+import operator
+from functools import reduce
+from typing import Dict, Iterable, List
+
+from django.db.models import Q
+
+from backend.catalog.models import CatalogItem
+from backend.catalog.selectors.list_items import order_items, scoped_items
+
+MAX_EXTERNAL_ID_LOOKUP = 1000
+
+
+def _containment_filter(provider: str, external_id: str) -> Q:
+    """`@>` containment so the jsonb_path_ops GIN index on external_ids is used."""
+    condition = Q(card_metadata__external_ids__contains={provider: external_id})
+    # Legacy rows may hold numeric IDs; match those without a second query.
+    if external_id.isdigit() and str(int(external_id)) == external_id:
+        condition |= Q(card_metadata__external_ids__contains={provider: int(external_id)})
+    return condition
+
+
+def find_items_by_external_ids(
+    *,
+    user,
+    provider: str,
+    external_ids: Iterable[str],
+) -> Dict[str, List[CatalogItem]]:
+    """
+    Map each requested external ID to the user's catalog items carrying it.
+
+    All IDs are resolved in a single query; IDs without a match are omitted.
+    """
+    wanted = list(dict.fromkeys(str(value).strip() for value in external_ids if str(value).strip()))
+    if not provider or not wanted:
+        return {}
+    if len(wanted) > MAX_EXTERNAL_ID_LOOKUP:
+        raise ValueError(f"A maximum of {MAX_EXTERNAL_ID_LOOKUP} external IDs can be looked up at once.")
+
+    condition = reduce(operator.or_, (_containment_filter(provider, value) for value in wanted))
+    queryset = order_items(scoped_items(user=user).select_related("card_metadata").filter(condition), {})
+
+    wanted_set = set(wanted)
+    matches: Dict[str, List[CatalogItem]] = {}
+    for item in queryset:
+        value = item.card_metadata.get_external_ids().get(provider)
+        key = str(value) if value is not None else None
+        if key in wanted_set:
+            matches.setdefault(key, []).append(item)
+    return matches
+
+
+__all__ = ["find_items_by_external_ids", "MAX_EXTERNAL_ID_LOOKUP"]
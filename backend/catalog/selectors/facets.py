@@ -0,0 +1,123 @@
+"""Facet counts for the catalog list filters."""
+
+from typing import Any, Dict, List, Mapping, Optional, Sequence
+
+from django.conf import settings
+from django.db import connection
+from django.db.models import F
+
+from backend.catalog.models import CardMetadata, CatalogItem
+from backend.catalog.selectors.list_items import filter_items, filter_signature, scoped_items
+from backend.core.cache import LocalTTLCache
+from backend.core.permissions import resolve_user_vendor
+
+# Facet name -> (value path, label path or None) relative to CatalogItem.
+FACETS = {
+    "category": ("category", None),
+    "status": ("status", None),
+    "condition": ("condition", None),
+    "language": ("card_metadata__language", None),
+    "market_region": ("card_metadata__market_region", None),
+    "rarity": ("card_metadata__rarity", None),
+    "store": ("store_id", "store__name"),
+}
+
+# Labels for facets whose values come from model choices.
+_CHOICE_LABELS = {
+    "category": dict(CatalogItem._meta.get_field("category").choices),
+    "status": dict(CatalogItem._meta.get_field("status").choices),
+    "rarity": dict(CardMetadata._meta.get_field("rarity").choices),
+}
+
+# Entries expire quickly instead of being invalidated on every stock change.
+facet_cache = LocalTTLCache(
+    maxsize=getattr(settings, "CATALOG_FACET_CACHE_SIZE", 1024),
+    ttl=getattr(settings, "CATALOG_FACET_CACHE_TTL", 30),
+)
+
+
+def parse_facets(value: Optional[str]) -> List[str]:
+    """Facet names from a comma-separated ``facets`` param; every facet when empty. Raises ValueError."""
+    requested = [name.strip() for name in str(value or "").split(",") if name.strip()]
+    if not requested:
+        return list(FACETS)
+    unknown = sorted(set(requested) - set(FACETS))
+    if unknown:
+        raise ValueError(f"Unknown facets: {', '.join(unknown)}.")
+    return [name for name in FACETS if name in requested]
+
+
+def _count_facets(queryset, facets: Sequence[str]) -> Dict[str, Any]:
+    """
+    Count every facet over ``queryset`` in one ``GROUP BY GROUPING SETS`` query.
+
+    Each facet is one grouping set; the empty set ``()`` adds the total. The
+    ``GROUPING()`` flag of a facet's column tells which set produced a row.
+    """
+    columns: Dict[str, F] = {}
+    sets = []
+    for index, name in enumerate(facets):
+        value_path, label_path = FACETS[name]
+        columns[f"f{index}"] = F(value_path)
+        group = [f'"f{index}"']
+        if label_path:
+            columns[f"l{index}"] = F(label_path)
+            group.append(f'"l{index}"')
+        sets.append(f"({', '.join(group)})")
+
+    inner_sql, params = queryset.order_by().values(**columns).query.sql_with_params()
+    selected = ", ".join(f'"{alias}"' for alias in columns)
+    flags = ", ".join(f'GROUPING("f{index}")' for index in range(len(facets)))
+    sql = (
+        f"SELECT {flags}, {selected}, COUNT(*) FROM ({inner_sql}) AS facet_rows "
+        f"GROUP BY GROUPING SETS ({', '.join(sets)}, ())"
+    )
+    with connection.cursor() as cursor:
+        cursor.execute(sql, params)
+        rows = cursor.fetchall()
+
+    aliases = list(columns)
+    result: Dict[str, Any] = {"total": 0, "facets": {name: [] for name in facets}}
+    for row in rows:
+        grouping, values, count = row[: len(facets)], dict(zip(aliases, row[len(facets):-1])), row[-1]
+        grouped = [index for index, flag in enumerate(grouping) if flag == 0]
+        if not grouped:
+            result["total"] = count
+            continue
+        index = grouped[0]
+        name = facets[index]
+        value = values[f"f{index}"]
+        label = values.get(f"l{index}") or _CHOICE_LABELS.get(name, {}).get(value, value)
+        result["facets"][name].append({"value": value, "label": label, "count": count})
+    for buckets in result["facets"].values():
+        # Most common first; "no value" last among equal counts.
+        buckets.sort(key=lambda bucket: (-bucket["count"], bucket["value"] is None, bucket["value"] or ""))
+    return result
+
+
+def get_item_facets(*, user, filters: Mapping[str, Any] | None = None, facets: Sequence[str] = ()) -> Dict[str, Any]:
+    """
+    Facet counts for the items ``list_items`` would return with ``filters``.
+
+    Returns ``{"total": n, "facets": {name: [{"value", "label", "count"}, ...]}}``
+    for each requested facet (all of them by default). Results are cached per
+    vendor (or user) and filter set for ``CATALOG_FACET_CACHE_TTL`` seconds.
+    """
+    params = filters or {}
+    facets = list(facets) or list(FACETS)
+    if user is None or not getattr(user, "is_authenticated", False):
+        return {"total": 0, "facets": {name: [] for name in facets}}
+
+    vendor = resolve_user_vendor(user)
+    scope = ("vendor", vendor.id) if vendor is not None else ("user", user.id)
+    cache_key = (scope, tuple(facets), filter_signature(params))
+    cached = facet_cache.get(cache_key)
+    if cached is not None:
+        return cached
+
+    result = _count_facets(filter_items(scoped_items(user=user), params), facets)
+    facet_cache.set(cache_key, result)
+    return result
+
+
+__all__ = ["FACETS", "facet_cache", "get_item_facets", "parse_facets"]
@@ -5,12 +5,20 @@ from typing import Any, Dict
 from django.core.exceptions import ObjectDoesNotExist
 
 from backend.catalog.models import CatalogItem
-from backend.catalog.selectors.list_items import list_items
+from backend.catalog.selectors.list_items import hydrate_items, item_selection, scoped_items
 
 
 def get_item(*, user, item_id: Any, filters: Dict[str, Any] | None = None) -> CatalogItem:
-    """Return a single catalog item scoped to the provided user."""
-    queryset = list_items(user=user, filters=filters)
+    """
+    Return a single catalog item scoped to the provided user.
+
+    Only ``fields``/``expand`` in ``filters`` apply. Vendor and store are joined
+    for the object permission checks; the gallery is loaded in full.
+    """
+    queryset = hydrate_items(
+        scoped_items(user=user).select_related("vendor", "store"),
+        item_selection(filters or {}),
+    )
     try:
         return queryset.get(pk=item_id)
     except ObjectDoesNotExist as exc:
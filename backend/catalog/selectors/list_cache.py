@@ -0,0 +1,98 @@
+"""
+Opt-in cache of serialized ``GET /catalog/items/`` pages.
+
+Pages are stored in the shared Django cache under the vendor, the normalized
+query params and the vendor's *catalog version*. Saves and deletes of items,
+card metadata, variants and media call :func:`bump_catalog_version` from
+``backend.catalog.signals``, so a write makes every cached page of that vendor
+unreachable at once; stale entries simply expire. Writes that send no signals
+(``QuerySet.update()``, ``bulk_create``, ``bulk_update``) call it directly.
+
+Versions only reach other workers through a shared cache (``REDIS_URL``), so
+the cache warns at startup when ``CACHES`` is per process (see
+``backend.catalog.checks``).
+Hits, misses and the time they took are recorded in
+``backend.core.instrumentation.metrics`` under ``catalog.list_cache.*``.
+"""
+
+import hashlib
+import time
+from typing import Any, Iterable, Mapping, Optional
+
+from django.conf import settings
+from django.core.cache import cache
+from django.db import transaction
+
+from backend.catalog.selectors.list_items import filter_signature
+
+# Params besides the filters that change a page's content.
+PAGE_PARAMS = ("sort_by", "sort_order", "limit", "offset")
+SELECTION_PARAMS = ("fields", "expand")
+
+
+def _version_key(vendor_id: int) -> str:
+    return f"catalog:list:version:{vendor_id}"
+
+
+def catalog_version(vendor_id: int) -> int:
+    """The vendor's current catalog version (starts at 1)."""
+    key = _version_key(vendor_id)
+    version = cache.get(key)
+    if version is None:
+        cache.add(key, 1, timeout=None)
+        version = cache.get(key, 1)
+    return version
+
+
+def _bump(vendor_ids: Iterable[Optional[int]]) -> None:
+    for vendor_id in set(vendor_ids):
+        if vendor_id is None:
+            continue
+        try:
+            cache.incr(_version_key(vendor_id))
+        except ValueError:
+            # Missing key: start a version no cached page can carry.
+            cache.set(_version_key(vendor_id), int(time.time()), timeout=None)
+
+
+def bump_catalog_version(*vendor_ids: Optional[int]) -> None:
+    """Invalidate the cached list pages of the given vendors (a no-op while the cache is off)."""
+    if not settings.CATALOG_LIST_CACHE:
+        return
+    vendor_ids = tuple(vendor_ids)
+    _bump(vendor_ids)
+    # A reader may cache pre-commit data in between; bump again once the write is visible.
+    transaction.on_commit(lambda: _bump(vendor_ids))
+
+
+def _normalize(params: Mapping[str, Any]) -> tuple:
+    page = tuple((name, str(params.get(name)).strip()) for name in PAGE_PARAMS if params.get(name))
+    selection = tuple(
+        (name, ",".join(sorted({part.strip() for part in str(params.get(name)).split(",") if part.strip()})))
+        for name in SELECTION_PARAMS
+        if name in params
+    )
+    return filter_signature(params) + page + selection
+
+
+def list_page_key(vendor_id: int, params: Mapping[str, Any]) -> str:
+    """Cache key for a vendor's list page with these query params."""
+    digest = hashlib.sha256(repr(_normalize(params)).encode()).hexdigest()[:32]
+    return f"catalog:list:{vendor_id}:{catalog_version(vendor_id)}:{digest}"
+
+
+def get_list_page(key: str) -> Optional[Any]:
+    return cache.get(key)
+
+
+def set_list_page(key: str, data: Any) -> None:
+    cache.set(key, data, timeout=settings.CATALOG_LIST_CACHE_TTL)
+
+
+__all__ = [
+    "bump_catalog_version",
+    "catalog_version",
+    "get_list_page",
+    "list_page_key",
+    "set_list_page",
+]
@@ -1,69 +1,225 @@
-"""Selectors for listing inventory items scoped to the user."""
+"""
+Selectors for listing inventory items scoped to the user.
 
-from typing import Any, Mapping
+``list_items`` is composed from building blocks that other selectors reuse so
+each caller pays only for what it renders: ``scoped_items`` (visibility),
+``filter_items`` (list query params), ``order_items`` (``sort_by``) and
+``hydrate_items`` (joins, ordered/limited prefetches and deferred columns for
+the selected fields).
+"""
 
-from django.db.models import Q, QuerySet
+from typing import Any, Mapping, Optional, Set
 
-from backend.catalog.models import CatalogItem
+from django.conf import settings
+from django.db.models import Prefetch, Q, QuerySet
+
+from backend.catalog.models import CatalogItem, CatalogMedia, CatalogVariant
 from backend.core.permissions import resolve_user_vendor
+from backend.core.utils import first_per_group
+
+# Nested serializer fields and the relations they need hydrated.
+NESTED_FIELD_RELATIONS = {
+    "card_details": ("select_related", "card_metadata"),
+    "product_details": ("select_related", "product__set__era"),
+    "images": ("prefetch_related", "media"),
+    "variants": ("prefetch_related", "variants"),
+}
+
+# Gallery order on detail views, and on list rows where the primary image comes first.
+MEDIA_ORDER = ("sort_order", "id")
+LIST_MEDIA_ORDER = ("-is_primary", "sort_order", "id")
+VARIANT_ORDER = ("id",)
+
+# Serializer fields backed by a plain column that can be deferred when not requested.
+DEFERRABLE_FIELDS = {
+    "name",
+    "sku",
+    "description",
+    "search_text",
+    "condition",
+    "category",
+    "status",
+    "image_url",
+    "quantity",
+    "intake_price",
+    "price",
+    "projected_price",
+    "created_at",
+    "updated_at",
+}
+
+# Query params list_items filters on (as opposed to field selection, sorting and paging).
+FILTER_PARAMS = (
+    "store",
+    "store_id",
+    "vendor",
+    "vendor_id",
+    "search",
+    "q",
+    "category",
+    "status",
+    "language",
+    "market_region",
+)
+
+
+def filter_signature(params: Mapping[str, Any]) -> tuple:
+    """Hashable, order-independent summary of the filters in ``params``."""
+    return tuple(
+        (name, str(params.get(name)).strip()) for name in FILTER_PARAMS if str(params.get(name) or "").strip()
+    )
 
 
-def list_items(*, user, filters: Mapping[str, Any] | None = None) -> QuerySet:
-    """Return catalog items scoped to the requesting user's vendor or user."""
-    base_qs = CatalogItem.objects.select_related("vendor", "store", "card_metadata").prefetch_related(
-        "media",
-        "variants",
-    )
+def _split_param(value: Any) -> Set[str]:
+    return {part.strip() for part in str(value or "").split(",") if part.strip()}
+
 
+def parse_field_selection(params: Mapping[str, Any], *, all_fields: Set[str]) -> Optional[Set[str]]:
+    """
+    Resolve ``fields``/``expand`` query params into the set of fields to emit.
+
+    ``fields`` lists the fields to return. ``expand`` lists nested relations to include;
+    on its own it means "every scalar field plus these relations". Returns None when
+    neither param is present (full representation).
+    """
+    has_fields = "fields" in params
+    has_expand = "expand" in params
+    if not has_fields and not has_expand:
+        return None
+    if has_fields:
+        selected = _split_param(params.get("fields"))
+    else:
+        selected = set(all_fields) - set(NESTED_FIELD_RELATIONS)
+    return selected | _split_param(params.get("expand"))
+
+
+def _prefetch(relation: str, *, media_limit: Optional[int]) -> Prefetch:
+    if relation == "media":
+        if media_limit:
+            media = first_per_group(
+                CatalogMedia.objects.all(), group_by="item_id", order_by=LIST_MEDIA_ORDER, limit=media_limit
+            )
+            return Prefetch("media", queryset=media)
+        return Prefetch("media", queryset=CatalogMedia.objects.order_by(*MEDIA_ORDER))
+    return Prefetch("variants", queryset=CatalogVariant.objects.order_by(*VARIANT_ORDER))
+
+
+def hydrate_items(
+    queryset: QuerySet, selection: Optional[Set[str]] = None, *, media_limit: Optional[int] = None
+) -> QuerySet:
+    """
+    Join/prefetch only the relations the selected fields render and defer unused columns.
+
+    ``selection`` is the output of :func:`parse_field_selection` (None renders
+    everything). ``media_limit`` caps the images prefetched per item, primary
+    image first; None loads the whole gallery in display order.
+    """
+    select_related = []
+    prefetch_related = []
+    for field, (kind, relation) in NESTED_FIELD_RELATIONS.items():
+        if selection is not None and field not in selection:
+            continue
+        if kind == "select_related":
+            select_related.append(relation)
+        else:
+            prefetch_related.append(_prefetch(relation, media_limit=media_limit))
+
+    if select_related:
+        queryset = queryset.select_related(*select_related)
+    if prefetch_related:
+        queryset = queryset.prefetch_related(*prefetch_related)
+    if selection is not None:
+        deferred = sorted(DEFERRABLE_FIELDS - selection)
+        if deferred:
+            queryset = queryset.defer(*deferred)
+    return queryset
+
+
+def scoped_items(*, user) -> QuerySet:
+    """Items the user may see: their vendor's, or their own when they have no vendor. No joins."""
     if user is None or not getattr(user, "is_authenticated", False):
-        return base_qs.none()
+        return CatalogItem.objects.none()
 
     vendor = resolve_user_vendor(user)
     if vendor is not None:
-        scoped = base_qs.filter(vendor=vendor)
-    else:
-        scoped = base_qs.filter(user=user)
-    
-    params = filters or {}
+        return CatalogItem.objects.filter(vendor=vendor)
+    return CatalogItem.objects.filter(user=user)
 
+
+def filter_items(queryset: QuerySet, params: Mapping[str, Any]) -> QuerySet:
+    """Apply the list filters in ``params`` (see ``FILTER_PARAMS``)."""
     store_id = params.get("store") or params.get("store_id")
     if store_id:
-        scoped = scoped.filter(store_id=store_id)
+        queryset = queryset.filter(store_id=store_id)
 
     vendor_id = params.get("vendor") or params.get("vendor_id")
     if vendor_id:
-        scoped = scoped.filter(vendor_id=vendor_id)
+        queryset = queryset.filter(vendor_id=vendor_id)
 
     search = (params.get("search") or params.get("q") or "").strip()
     if search:
-        scoped = scoped.filter(Q(search_text__icontains=search) | Q(sku__iexact=search))
+        queryset = queryset.filter(Q(search_text__icontains=search) | Q(sku__iexact=search))
 
     category = params.get("category")
     if category:
-        scoped = scoped.filter(category__exact=category)
+        queryset = queryset.filter(category__exact=category)
 
     status = params.get("status")
     if status:
-        scoped = scoped.filter(status__exact=status)
-    
+        queryset = queryset.filter(status__exact=status)
+
     language = params.get("language")
     if language:
-        scoped = scoped.filter(card_metadata__language__iexact=language)
-    
+        queryset = queryset.filter(card_metadata__language__iexact=language)
+
     market_region = params.get("market_region")
     if market_region:
-        scoped = scoped.filter(card_metadata__market_region__iexact=market_region)
+        queryset = queryset.filter(card_metadata__market_region__iexact=market_region)
+    return queryset
+
 
+def order_items(queryset: QuerySet, params: Mapping[str, Any]) -> QuerySet:
+    """
+    Order by ``sort_by``/``sort_order`` (default newest first), then ``id``.
 
+    ``id`` runs in the same direction so pages are stable and every ordering
+    matches one of ``CatalogItem``'s list indexes.
+    """
     sort_by = params.get("sort_by", "created_at")
     sort_order = params.get("sort_order", "desc")
     valid_sort_fields = {"name", "created_at", "updated_at", "price"}
     if sort_by not in valid_sort_fields:
         sort_by = "created_at"
     prefix = "-" if sort_order in {"desc", "descending"} else ""
-    scoped = scoped.order_by(f"{prefix}{sort_by}")
+    return queryset.order_by(f"{prefix}{sort_by}", f"{prefix}id")
 
-    return scoped
 
+def item_selection(params: Mapping[str, Any]) -> Optional[Set[str]]:
+    """The serializer fields a request selects via ``fields``/``expand`` (None for all)."""
+    return parse_field_selection(params, all_fields=DEFERRABLE_FIELDS | set(NESTED_FIELD_RELATIONS))
 
-__all__ = ["list_items"]
+
+def list_items(*, user, filters: Mapping[str, Any] | None = None) -> QuerySet:
+    """
+    Return catalog items scoped to the requesting user's vendor or user.
+
+    Rows carry at most ``CATALOG_LIST_IMAGE_LIMIT`` images each (primary first;
+    0 keeps whole galleries).
+    """
+    params = filters or {}
+    queryset = order_items(filter_items(scoped_items(user=user), params), params)
+    media_limit = getattr(settings, "CATALOG_LIST_IMAGE_LIMIT", 0) or None
+    return hydrate_items(queryset, item_selection(params), media_limit=media_limit)
+
+
+__all__ = [
+    "FILTER_PARAMS",
+    "filter_items",
+    "filter_signature",
+    "hydrate_items",
+    "item_selection",
+    "list_items",
+    "order_items",
+    "parse_field_selection",
+    "scoped_items",
+]
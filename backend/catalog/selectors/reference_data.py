@@ -0,0 +1,136 @@
+"""
+Cached reference catalog: eras, sets and products.
+
+The reference data changes a few times a year, so it is serialized once per
+catalog *version* and kept in two places: the Django cache (so with a shared
+cache one worker builds it for everyone) and a per-process copy (so most
+requests do not leave the worker at all). The version is a fingerprint of the
+tables themselves (row counts and latest ``updated_at``), so a write from any
+process, such as ``seed_reference_data``, is seen by every worker without a
+shared cache. Workers re-read it at most every ``CATALOG_REFERENCE_VERSION_TTL``
+seconds; saving or deleting an era, set or product also drops the local copy
+of the worker that made the change (see ``backend.catalog.signals``). Writes
+through ``QuerySet.update()`` must set ``updated_at`` themselves.
+"""
+
+import hashlib
+import threading
+import time
+from typing import Any, Dict, Optional
+
+from django.conf import settings
+from django.core.cache import cache
+from django.db import transaction
+from django.db.models import Count, Max
+
+from backend.catalog.models import Era, Product, Set
+
+ERA_FIELDS = ("id", "name", "slug", "start_year", "end_year")
+SET_FIELDS = ("id", "name", "code", "release_date", "card_count", "era_id")
+PRODUCT_FIELDS = ("id", "name", "type", "configuration", "release_date", "set_id")
+
+
+def _payload_key(version: str) -> str:
+    return f"catalog:reference:{version}"
+
+
+class ReferenceCatalog:
+    """One serialized version of the reference data, indexed for detail lookups."""
+
+    def __init__(self, payload: Dict[str, Any]):
+        self.version: str = payload["version"]
+        self.payload = payload
+        self.eras = payload["eras"]
+        self.sets = payload["sets"]
+        self.products = payload["products"]
+        self._by_id = {
+            name: {row["id"]: row for row in payload[name]} for name in ("eras", "sets", "products")
+        }
+
+    @property
+    def etag(self) -> str:
+        return f'W/"reference-{self.version}"'
+
+    def get(self, kind: str, pk) -> Optional[Dict[str, Any]]:
+        try:
+            return self._by_id[kind].get(int(pk))
+        except (TypeError, ValueError):
+            return None
+
+
+_local_lock = threading.Lock()
+_local: Dict[str, Any] = {"catalog": None, "checked_at": 0.0}
+
+
+def _date(value) -> Optional[str]:
+    return value.isoformat() if value is not None else None
+
+
+def _build_payload(version: str) -> Dict[str, Any]:
+    """Serialize the catalog in the shape of the Era/Set/Product serializers, one query per table."""
+    eras = {row["id"]: row for row in Era.objects.order_by("name", "id").values(*ERA_FIELDS)}
+    sets = {}
+    for row in Set.objects.order_by("-release_date", "id").values(*SET_FIELDS):
+        era_id = row.pop("era_id")
+        sets[row["id"]] = {**row, "release_date": _date(row["release_date"]), "era": eras.get(era_id)}
+    products = []
+    for row in Product.objects.order_by("name", "id").values(*PRODUCT_FIELDS):
+        set_id = row.pop("set_id")
+        products.append({**row, "release_date": _date(row["release_date"]), "set": sets.get(set_id)})
+    return {
+        "version": version,
+        "eras": list(eras.values()),
+        "sets": list(sets.values()),
+        "products": products,
+    }
+
+
+def reference_version() -> str:
+    """Fingerprint of the reference tables: row count and latest ``updated_at`` of each."""
+    parts = []
+    for model in (Era, Set, Product):
+        stats = model.objects.aggregate(rows=Count("id"), changed=Max("updated_at"))
+        parts.append(f"{stats['rows']}:{_date(stats['changed'])}")
+    return hashlib.sha256("|".join(parts).encode()).hexdigest()[:16]
+
+
+def get_reference_catalog() -> ReferenceCatalog:
+    """The serialized reference catalog, built at most once per version."""
+    now = time.monotonic()
+    with _local_lock:
+        catalog = _local["catalog"]
+        fresh = now - _local["checked_at"] < settings.CATALOG_REFERENCE_VERSION_TTL
+        if catalog is not None and fresh:
+            return catalog
+
+    version = reference_version()
+    if catalog is None or catalog.version != version:
+        payload = cache.get(_payload_key(version))
+        if payload is None:
+            payload = _build_payload(version)
+            cache.set(_payload_key(version), payload, timeout=settings.CATALOG_REFERENCE_CACHE_TIMEOUT)
+        catalog = ReferenceCatalog(payload)
+
+    with _local_lock:
+        _local.update(catalog=catalog, checked_at=now)
+    return catalog
+
+
+def _drop_local() -> None:
+    with _local_lock:
+        _local.update(catalog=None, checked_at=0.0)
+
+
+def invalidate_reference_catalog() -> None:
+    """Re-check the catalog version on this worker's next read."""
+    _drop_local()
+    # A reader may rebuild from pre-commit data in between; drop it again once the write is visible.
+    transaction.on_commit(_drop_local)
+
+
+__all__ = [
+    "ReferenceCatalog",
+    "get_reference_catalog",
+    "invalidate_reference_catalog",
+    "reference_version",
+]
@@ -0,0 +1,123 @@
+"""Selector for point-of-sale barcode/SKU scans."""
+
+import threading
+from typing import Any, Dict, Optional
+
+from django.conf import settings
+from django.core.signals import setting_changed
+from django.db import transaction
+from django.dispatch import receiver
+
+from backend.catalog.models import CatalogItem, CatalogVariant
+from backend.catalog.selectors.external_ids import find_items_by_external_ids
+from backend.core.cache import LocalTTLCache
+from backend.core.permissions import resolve_user_vendor
+
+SCAN_ITEM_FIELDS = ("id", "sku", "name", "store_id", "quantity", "price", "status", "image_url")
+SCAN_VARIANT_FIELDS = ("id", "condition", "grade", "quantity", "price_adjustment")
+
+_scan_cache: Optional[LocalTTLCache] = None
+_scan_cache_lock = threading.Lock()
+
+
+def get_scan_cache() -> LocalTTLCache:
+    """The worker's scan cache, built from the current settings on first use."""
+    global _scan_cache
+    if _scan_cache is None:
+        with _scan_cache_lock:
+            if _scan_cache is None:
+                _scan_cache = LocalTTLCache(
+                    maxsize=getattr(settings, "CATALOG_SCAN_CACHE_SIZE", 2048),
+                    ttl=getattr(settings, "CATALOG_SCAN_CACHE_TTL", 10),
+                )
+    return _scan_cache
+
+
+@receiver(setting_changed)
+def _reset_scan_cache(*, setting, **kwargs):
+    global _scan_cache
+    if setting in ("CATALOG_SCAN_CACHE_SIZE", "CATALOG_SCAN_CACHE_TTL"):
+        _scan_cache = None
+
+
+def _to_payload(row: Dict[str, Any], variants) -> Dict[str, Any]:
+    return {
+        "id": row["id"],
+        "sku": row["sku"],
+        "name": row["name"],
+        "store": row["store_id"],
+        "quantity": row["quantity"],
+        "price": str(row["price"]),
+        "status": row["status"],
+        "image_url": row["image_url"],
+        "variants": [
+            {**variant, "price_adjustment": str(variant["price_adjustment"])} for variant in variants
+        ],
+    }
+
+
+def scan_item(*, user, code: str, provider: Optional[str] = None) -> Optional[Dict[str, Any]]:
+    """
+    Resolve a scanned code to a compact item payload, or None when nothing matches.
+
+    Without ``provider`` the code is matched exactly against the unique ``sku`` index;
+    with one it is treated as that marketplace's external ID. Raises
+    ``CatalogItem.MultipleObjectsReturned`` when an external ID maps to several items.
+    """
+    code = (code or "").strip()
+    if not code or user is None or not getattr(user, "is_authenticated", False):
+        return None
+
+    vendor = resolve_user_vendor(user)
+    scope = ("vendor", vendor.id) if vendor is not None else ("user", user.id)
+    cache_key = (scope, provider or "sku", code)
+    # Misses are never cached, so newly created items resolve immediately.
+    cached = get_scan_cache().get(cache_key)
+    if cached is not None:
+        return cached
+
+    if provider:
+        matches = find_items_by_external_ids(user=user, provider=provider, external_ids=[code]).get(code, [])
+        if len(matches) > 1:
+            raise CatalogItem.MultipleObjectsReturned(
+                f"External ID {code} matches {len(matches)} items: "
+                + ", ".join(item.sku for item in matches)
+            )
+        lookup = {"id": matches[0].id} if matches else None
+    else:
+        lookup = {"sku": code}
+    if lookup is None:
+        return None
+
+    items = CatalogItem.objects.filter(**lookup)
+    items = items.filter(vendor=vendor) if vendor is not None else items.filter(user=user)
+    row = items.values(*SCAN_ITEM_FIELDS).first()
+    if row is None:
+        return None
+
+    variants = CatalogVariant.objects.filter(item_id=row["id"]).order_by("id").values(*SCAN_VARIANT_FIELDS)
+    payload = _to_payload(row, variants)
+    get_scan_cache().set(cache_key, payload)
+    return payload
+
+
+def _evict(item_ids) -> None:
+    get_scan_cache().delete_where(lambda key, payload: payload["id"] in item_ids)
+
+
+def invalidate_scan_cache(*item_ids: Optional[int]) -> None:
+    """
+    Evict every cached scan payload for the given items.
+
+    Model signals cover single-row saves; services that write items with
+    ``QuerySet.update()``, ``bulk_create`` or ``bulk_update`` call this directly.
+    """
+    item_ids = frozenset(item_id for item_id in item_ids if item_id is not None)
+    if not item_ids:
+        return
+    _evict(item_ids)
+    # A concurrent reader may re-cache pre-commit data; evict again once the write is visible.
+    transaction.on_commit(lambda: _evict(item_ids))
+
+
+__all__ = ["get_scan_cache", "invalidate_scan_cache", "scan_item"]
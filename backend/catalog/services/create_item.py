@@ -7,6 +7,7 @@ from django.db import transaction
 from backend.catalog.models import CardMetadata, CatalogItem, StockLedger
 from backend.catalog.services.media import sync_item_media
 from backend.catalog.services.variants import sync_item_variants
+from backend.core.content_store import update_references
 from backend.core.validators import validate_image_url
 
 
@@ -24,6 +25,7 @@ def create_item(
         validate_image_url(image_url)
     with transaction.atomic():
         item = CatalogItem.objects.create(**payload)
+        update_references(added=[item.image_url])
         if card_details_data:
             CardMetadata.objects.create(item=item, **card_details_data)
         if media_payloads is not None:
@@ -1,11 +1,21 @@
 """Service for deleting inventory items."""
 
+from django.db import transaction
+
 from backend.catalog.models import CatalogItem
+from backend.catalog.services.media import schedule_media_cleanup
+from backend.core.content_store import update_references
 
 
+@transaction.atomic
 def delete_item(*, instance: CatalogItem) -> None:
-    """Delete the provided CatalogItem."""
+    """Delete the provided CatalogItem and queue cleanup of its stored images."""
+    media = list(instance.media.values("url", "metadata"))
+    update_references(removed=[entry["url"] for entry in media] + [instance.image_url])
+    if instance.image_url:
+        media.append({"url": instance.image_url})
     instance.delete()
+    schedule_media_cleanup(media)
 
 
 __all__ = ["delete_item"]
@@ -1,12 +1,70 @@
 """Services for managing inventory media records."""
 
-from typing import Any, Dict, List, Optional
+from typing import Any, Dict, Iterable, List, Optional
 
 from django.db import transaction
 
 from backend.catalog.models import CatalogItem, CatalogMedia, CatalogMediaType
+from backend.catalog.selectors.list_cache import bump_catalog_version
+from backend.catalog.services.media_processing import schedule_media_processing
+from backend.core.content_store import update_references
+from backend.core.storage_cleanup import delete_objects_or_raise, storage_object_for
+from backend.jobs.services.enqueue import enqueue
 
 MAX_MEDIA_PER_ITEM = 6
+DELETE_REMOTE_MEDIA_JOB = "catalog.delete_remote_media"
+
+
+def _storage_objects(media: Iterable[Dict[str, Any]]) -> List[Dict[str, str]]:
+    """
+    Bucket/key (plus URL) of each stored object behind ``{"url", "metadata"}`` entries,
+    including the derivatives recorded in their metadata.
+    """
+    objects, seen = [], set()
+    for entry in media:
+        metadata = entry.get("metadata") or {}
+        candidates = [(entry.get("url"), metadata)]
+        candidates += [(derivative.get("url"), derivative) for derivative in (metadata.get("derivatives") or {}).values()]
+        for url, location in candidates:
+            obj = storage_object_for(url, location)
+            if obj and (obj["bucket"], obj["key"]) not in seen:
+                seen.add((obj["bucket"], obj["key"]))
+                objects.append({**obj, "url": url})
+    return objects
+
+
+def schedule_media_cleanup(media: Iterable[Dict[str, Any]], *, keep: Iterable[Dict[str, Any]] = ()) -> None:
+    """
+    Queue deletion of the stored objects behind ``media`` that ``keep`` does not reference.
+
+    Call inside the transaction that drops the rows so the job only runs if it commits.
+    """
+    kept = {(obj["bucket"], obj["key"]) for obj in _storage_objects(keep)}
+    objects = [obj for obj in _storage_objects(media) if (obj["bucket"], obj["key"]) not in kept]
+    if objects:
+        enqueue(DELETE_REMOTE_MEDIA_JOB, {"objects": objects})
+
+
+def delete_unreferenced_media(*, objects: List[Dict[str, str]]) -> None:
+    """
+    Delete stored objects no catalog row points at any more; runs in the job worker.
+
+    Items may share an image URL (copied listings, demo data), so objects still
+    referenced by another item's media or ``image_url`` are left alone.
+    """
+    urls = [obj["url"] for obj in objects if obj.get("url")]
+    referenced = set(CatalogMedia.objects.filter(url__in=urls).values_list("url", flat=True))
+    referenced.update(CatalogItem.objects.filter(image_url__in=urls).values_list("image_url", flat=True))
+    delete_objects_or_raise([obj for obj in objects if obj.get("url") not in referenced])
+
+
+def _set_image_url(item: CatalogItem, url: Optional[str]) -> None:
+    """Save ``item.image_url`` and move its content store reference to the new URL."""
+    previous = item.image_url
+    item.image_url = url
+    item.save(update_fields=["image_url"])
+    if previous != url:
+        update_references(added=[url], removed=[previous])
 
 
 @transaction.atomic
@@ -25,12 +83,18 @@ def sync_item_media(
     if len(media_payloads) > MAX_MEDIA_PER_ITEM:
         raise ValueError(f"A maximum of {MAX_MEDIA_PER_ITEM} images are allowed per item.")
 
+    bump_catalog_version(item.vendor_id)
+    existing = list(CatalogMedia.objects.filter(item=item).values("url", "metadata"))
     CatalogMedia.objects.filter(item=item).delete()
+    schedule_media_cleanup(existing, keep=media_payloads)
+    update_references(
+        added=[payload.get("url") for payload in media_payloads],
+        removed=[entry["url"] for entry in existing],
+    )
     
     # Immediately clear image_url if payloads is empty
     if not media_payloads:
-        item.image_url = None
-        item.save(update_fields=["image_url"])
+        _set_image_url(item, None)
         return
 
     new_media: List[CatalogMedia] = []
@@ -53,6 +117,7 @@ def sync_item_media(
         )
 
     CatalogMedia.objects.bulk_create(new_media)
+    schedule_media_processing(new_media)
 
     first_media = CatalogMedia.objects.filter(item=item).order_by("sort_order", "id").first()
     has_primary = any(media.is_primary for media in new_media)
@@ -63,13 +128,58 @@ def sync_item_media(
     
     # Update CatalogItem.image_url to use the primary image URL
     primary_media = CatalogMedia.objects.filter(item=item, is_primary=True).first()
-    if primary_media:
-        item.image_url = primary_media.url
-    else:
-        # If all media cleared or no primary, clear image_url
-        item.image_url = None
-    
-    item.save(update_fields=["image_url"])
+    # If all media cleared or no primary, clear image_url
+    _set_image_url(item, primary_media.url if primary_media else None)
+
+
+@transaction.atomic
+def add_item_media(*, item: CatalogItem, payload: Dict[str, Any]) -> CatalogMedia:
+    """
+    Append one image to an item's gallery (used by confirmed direct uploads).
+
+    Re-adding a URL the item already has returns the existing row. The first
+    image, or one flagged ``is_primary``, becomes the primary and the item's
+    ``image_url``.
+    """
+    # Lock the item so concurrent confirms cannot exceed the gallery limit.
+    item.image_url = CatalogItem.objects.select_for_update().values_list("image_url", flat=True).get(pk=item.pk)
+    existing = CatalogMedia.objects.filter(item=item, url=payload["url"]).first()
+    if existing is not None:
+        return existing
+
+    gallery = list(CatalogMedia.objects.filter(item=item).values_list("sort_order", "is_primary"))
+    if len(gallery) >= MAX_MEDIA_PER_ITEM:
+        raise ValueError(f"A maximum of {MAX_MEDIA_PER_ITEM} images are allowed per item.")
+    media_type = payload.get("media_type") or CatalogMediaType.GALLERY
+    if media_type not in CatalogMediaType.values:
+        raise ValueError(f"Unsupported media type {media_type}")
+
+    is_primary = bool(payload.get("is_primary")) or not any(primary for _, primary in gallery)
+    if is_primary:
+        CatalogMedia.objects.filter(item=item, is_primary=True).update(is_primary=False)
+    media = CatalogMedia.objects.create(
+        item=item,
+        media_type=media_type,
+        url=payload["url"],
+        sort_order=payload.get("sort_order", max((order for order, _ in gallery), default=-1) + 1),
+        is_primary=is_primary,
+        width=payload.get("width"),
+        height=payload.get("height"),
+        size_kb=payload.get("size_kb"),
+        metadata=payload.get("metadata") or {},
+    )
+    schedule_media_processing([media])
+    bump_catalog_version(item.vendor_id)
+    update_references(added=[media.url])
+    if is_primary:
+        _set_image_url(item, media.url)
+    return media
 
 
-__all__ = ["sync_item_media", "MAX_MEDIA_PER_ITEM"]
+__all__ = [
+    "sync_item_media",
+    "add_item_media",
+    "schedule_media_cleanup",
+    "delete_unreferenced_media",
+    "MAX_MEDIA_PER_ITEM",
+]
@@ -0,0 +1,159 @@
+"""
+Derivative images (thumbnails, WebP) and metadata for catalog media.
+
+New ``CatalogMedia`` rows queue :data:`PROCESS_MEDIA_JOB`. The job reads each
+source image from our storage, renders the ``CATALOG_MEDIA_DERIVATIVES`` sizes
+as WebP in the image process pool (``backend.core.image_processing``), saves
+them next to the originals and records them on the row::
+
+    metadata["derivatives"] = {"thumb": {"url", "path", "bucket", "width", "height", "size_kb"}, ...}
+
+together with the upright ``width``/``height``, ``size_kb`` and the EXIF
+orientation. Images hosted elsewhere are never fetched.
+"""
+
+import logging
+from contextlib import closing
+from typing import Dict, Iterable, List, Optional
+from urllib.parse import urlsplit
+
+from botocore.exceptions import ClientError
+from django.conf import settings
+from django.core.files.base import ContentFile
+from django.core.files.storage import default_storage
+from django.db import transaction
+
+from backend.catalog.models import CatalogMedia
+from backend.catalog.selectors.list_cache import bump_catalog_version
+from backend.core.image_processing import ImageProcessingError, process_images
+from backend.core.storage_cleanup import storage_object_for
+from backend.core.storage_client import get_storage_client
+from backend.jobs.services.enqueue import enqueue
+
+logger = logging.getLogger(__name__)
+
+PROCESS_MEDIA_JOB = "catalog.process_media"
+
+
+def schedule_media_processing(media: Iterable[CatalogMedia]) -> None:
+    """Queue derivative generation for rows that do not have derivatives yet."""
+    if not settings.CATALOG_MEDIA_PROCESSING:
+        return
+    media_ids = [row.pk for row in media if not (row.metadata or {}).get("derivatives")]
+    if media_ids:
+        enqueue(PROCESS_MEDIA_JOB, {"media_ids": media_ids})
+
+
+def _local_name(url: str) -> Optional[str]:
+    """Storage name of a URL served by the local ``MEDIA_URL``, if it is one."""
+    path = urlsplit(url).path
+    media_url = urlsplit(settings.MEDIA_URL).path
+    if media_url and path.startswith(media_url) and len(path) > len(media_url):
+        return path[len(media_url):]
+    return None
+
+
+def _read_source(media: CatalogMedia) -> Optional[bytes]:
+    """Bytes of the stored original, or None when it is not in our storage or too large."""
+    limit = settings.CATALOG_MEDIA_MAX_SOURCE_BYTES
+    client = get_storage_client()
+    if client is not None:
+        obj = storage_object_for(media.url, media.metadata)
+        if obj is None:
+            return None
+        try:
+            response = client.get_object(Bucket=obj["bucket"], Key=obj["key"])
+        except ClientError as exc:
+            if exc.response.get("Error", {}).get("Code") in ("NoSuchKey", "404"):
+                return None
+            raise
+        with closing(response["Body"]) as body:
+            return body.read() if response["ContentLength"] <= limit else None
+
+    name = _local_name(media.url)
+    if name is None or not default_storage.exists(name) or default_storage.size(name) > limit:
+        return None
+    with default_storage.open(name, "rb") as handle:
+        return handle.read()
+
+
+def _save_derivatives(media: CatalogMedia, rendered: Dict) -> Dict[str, Dict]:
+    bucket = getattr(settings, "AWS_STORAGE_BUCKET_NAME", None) if get_storage_client() else None
+    saved = {}
+    for name, derivative in rendered["derivatives"].items():
+        path = default_storage.save(
+            f"derivatives/catalog/{media.pk}/{name}.webp", ContentFile(derivative["data"])
+        )
+        entry = {
+            "url": default_storage.url(path),
+            "path": path,
+            "width": derivative["width"],
+            "height": derivative["height"],
+            "size_kb": max(1, round(len(derivative["data"]) / 1024)),
+            "content_type": "image/webp",
+        }
+        if bucket:
+            entry["bucket"] = bucket
+        saved[name] = entry
+    return saved
+
+
+def _record(media: CatalogMedia, source_size: int, rendered: Dict, derivatives: Dict[str, Dict]) -> bool:
+    """Store the results on the row; False when it was deleted or repointed meanwhile."""
+    with transaction.atomic():
+        current = CatalogMedia.objects.select_for_update().filter(pk=media.pk, url=media.url).first()
+        if current is None:
+            return False
+        current.metadata = {
+            **(current.metadata or {}),
+            "derivatives": derivatives,
+            "exif_orientation": rendered["orientation"],
+            "format": rendered["format"],
+        }
+        current.width = rendered["width"]
+        current.height = rendered["height"]
+        current.size_kb = max(1, round(source_size / 1024))
+        current.save(update_fields=["metadata", "width", "height", "size_kb", "updated_at"])
+    return True
+
+
+def process_media(*, media_ids: List[int]) -> int:
+    """Generate derivatives for ``media_ids``; returns how many rows were updated."""
+    from backend.catalog.services.media import schedule_media_cleanup
+
+    pending = [
+        row for row in CatalogMedia.objects.filter(pk__in=media_ids).select_related("item").order_by("pk")
+        if not (row.metadata or {}).get("derivatives")
+    ]
+    sources = []
+    for row in pending:
+        data = _read_source(row)
+        if data is not None:
+            sources.append((row, data))
+    if not sources:
+        return 0
+
+    results = process_images(
+        [data for _, data in sources],
+        settings.CATALOG_MEDIA_DERIVATIVES,
+        settings.CATALOG_MEDIA_WEBP_QUALITY,
+    )
+    updated = 0
+    vendor_ids = set()
+    for (row, data), rendered in zip(sources, results):
+        if isinstance(rendered, ImageProcessingError):
+            logger.warning("Skipping derivatives for media %s: %s", row.pk, rendered)
+            continue
+        derivatives = _save_derivatives(row, rendered)
+        if _record(row, len(data), rendered, derivatives):
+            updated += 1
+            vendor_ids.add(row.item.vendor_id)
+        else:
+            with transaction.atomic():
+                schedule_media_cleanup([{"url": entry["url"], "metadata": entry} for entry in derivatives.values()])
+    # New derivative URLs change the list output.
+    bump_catalog_version(*vendor_ids)
+    return updated
+
+
+__all__ = ["PROCESS_MEDIA_JOB", "process_media", "schedule_media_processing"]
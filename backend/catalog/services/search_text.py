@@ -0,0 +1,148 @@
+"""Services for rebuilding and maintaining the denormalized CatalogItem.search_text."""
+
+from typing import Callable, List, Optional, Tuple
+
+from django.db import connection, transaction
+from django.db.models import Max, Min
+
+from backend.catalog.models import CatalogItem
+from backend.catalog.selectors.list_cache import bump_catalog_version
+from backend.catalog.selectors.scan import invalidate_scan_cache
+
+SEARCH_TEXT_SOURCE_FIELDS = ("name", "sku", "description", "category")
+SEARCH_TEXT_TRIGGER = "catalog_item_search_text_trg"
+SEARCH_TEXT_FUNCTION = "catalog_item_search_text"
+
+# Mirrors CatalogItem.build_search_text: skip empty parts, join with a space, trim.
+_INSTALL_TRIGGER_SQL = """
+CREATE OR REPLACE FUNCTION {function}() RETURNS trigger AS $$
+BEGIN
+    NEW.search_text := btrim(
+        concat_ws(
+            ' ',
+            NULLIF(NEW.name, ''),
+            NULLIF(NEW.sku, ''),
+            NULLIF(NEW.description, ''),
+            NULLIF(NEW.category, '')
+        ),
+        E' \\t\\n\\r\\f\\v'
+    );
+    RETURN NEW;
+END;
+$$ LANGUAGE plpgsql;
+DROP TRIGGER IF EXISTS {trigger} ON {table};
+CREATE TRIGGER {trigger}
+    BEFORE INSERT OR UPDATE OF name, sku, description, category, search_text ON {table}
+    FOR EACH ROW EXECUTE FUNCTION {function}();
+"""
+
+_DROP_TRIGGER_SQL = """
+DROP TRIGGER IF EXISTS {trigger} ON {table};
+DROP FUNCTION IF EXISTS {function}();
+"""
+
+
+def _format_sql(template: str) -> str:
+    quote = connection.ops.quote_name
+    return template.format(
+        function=quote(SEARCH_TEXT_FUNCTION),
+        trigger=quote(SEARCH_TEXT_TRIGGER),
+        table=quote(CatalogItem._meta.db_table),
+    )
+
+
+def rebuild_search_text(
+    *,
+    start_after_id: int = 0,
+    end_id: Optional[int] = None,
+    batch_size: int = 1000,
+    dry_run: bool = False,
+    on_batch: Optional[Callable[[int, int], None]] = None,
+) -> int:
+    """
+    Recompute search_text for items with ``start_after_id < id <= end_id``.
+
+    Rows are walked in primary-key batches and only stale rows are written, each batch
+    in its own short transaction. ``on_batch(changed, last_id)`` is called after every
+    batch so callers can report progress. Returns the number of stale rows found.
+    """
+    changed_total = 0
+    last_id = start_after_id
+    while True:
+        qs = CatalogItem.objects.filter(id__gt=last_id).order_by("id")
+        if end_id is not None:
+            qs = qs.filter(id__lte=end_id)
+        columns = ("id", "vendor_id", *SEARCH_TEXT_SOURCE_FIELDS, "search_text")
+        rows = list(qs.values_list(*columns)[:batch_size])
+        if not rows:
+            break
+
+        stale: List[CatalogItem] = []
+        vendor_ids = set()
+        for pk, vendor_id, name, sku, description, category, current in rows:
+            expected = CatalogItem.build_search_text(
+                name=name, sku=sku, description=description, category=category
+            )
+            if expected != current:
+                stale.append(CatalogItem(id=pk, search_text=expected))
+                vendor_ids.add(vendor_id)
+
+        if stale and not dry_run:
+            with transaction.atomic():
+                CatalogItem.objects.bulk_update(stale, ["search_text"])
+                # bulk_update sends no post_save, so invalidate the read caches here.
+                invalidate_scan_cache(*(item.id for item in stale))
+                bump_catalog_version(*vendor_ids)
+
+        changed_total += len(stale)
+        last_id = rows[-1][0]
+        if on_batch is not None:
+            on_batch(len(stale), last_id)
+    return changed_total
+
+
+def split_id_ranges(*, partitions: int, start_after_id: int = 0) -> List[Tuple[int, int]]:
+    """Split the CatalogItem id space into contiguous ``(start_after_id, end_id)`` ranges."""
+    bounds = CatalogItem.objects.filter(id__gt=start_after_id).aggregate(low=Min("id"), high=Max("id"))
+    low, high = bounds["low"], bounds["high"]
+    if low is None:
+        return []
+    partitions = max(1, partitions)
+    span = -(-(high - low + 1) // partitions)
+    ranges = []
+    lower = low - 1
+    while lower < high:
+        upper = min(lower + span, high)
+        ranges.append((lower, upper))
+        lower = upper
+    return ranges
+
+
+def install_search_text_trigger() -> None:
+    """Install a Postgres trigger that keeps search_text correct for bulk/raw writes."""
+    with connection.cursor() as cursor:
+        cursor.execute(_format_sql(_INSTALL_TRIGGER_SQL))
+
+
+def drop_search_text_trigger() -> None:
+    """Remove the search_text trigger and its function."""
+    with connection.cursor() as cursor:
+        cursor.execute(_format_sql(_DROP_TRIGGER_SQL))
+
+
+def search_text_trigger_installed() -> bool:
+    with connection.cursor() as cursor:
+        cursor.execute(
+            "SELECT 1 FROM pg_trigger WHERE tgname = %s AND tgrelid = %s::regclass",
+            [SEARCH_TEXT_TRIGGER, CatalogItem._meta.db_table],
+        )
+        return cursor.fetchone() is not None
+
+
+__all__ = [
+    "rebuild_search_text",
+    "split_id_ranges",
+    "install_search_text_trigger",
+    "drop_search_text_trigger",
+    "search_text_trigger_installed",
+]
@@ -7,6 +7,7 @@ from django.db import transaction
 from backend.catalog.models import CardMetadata, CatalogItem, StockLedger
 from backend.catalog.services.media import sync_item_media
 from backend.catalog.services.variants import sync_item_variants
+from backend.core.content_store import update_references
 from backend.core.validators import validate_image_url
 
 
@@ -21,12 +22,15 @@ def update_item(
     """Update a CatalogItem (and optional CardMetadata) inside a transaction."""
     with transaction.atomic():
         previous_quantity = getattr(instance, "quantity", 0) or 0
+        previous_image_url = instance.image_url
         image_url = data.get("image_url")
         if image_url:
             validate_image_url(image_url)
         for attr, value in data.items():
             setattr(instance, attr, value)
         instance.save()
+        if instance.image_url != previous_image_url:
+            update_references(added=[instance.image_url], removed=[previous_image_url])
 
         if card_details_data is not None:
             card_metadata = getattr(instance, "card_metadata", None)
@@ -5,6 +5,8 @@ from typing import Any, Dict, List, Optional
 from django.db import transaction
 
 from backend.catalog.models import CatalogItem, CatalogVariant
+from backend.catalog.selectors.list_cache import bump_catalog_version
+from backend.catalog.selectors.scan import invalidate_scan_cache
 
 
 @transaction.atomic
@@ -20,6 +22,7 @@ def sync_item_variants(
     if variants_payload is None:
         return
 
+    bump_catalog_version(item.vendor_id)
     CatalogVariant.objects.filter(item=item).delete()
 
     if not variants_payload:
@@ -38,6 +41,8 @@ def sync_item_variants(
         )
 
     CatalogVariant.objects.bulk_create(new_variants)
+    # bulk_create sends no post_save, so evict the cached scan payload here.
+    invalidate_scan_cache(item.id)
 
 
 __all__ = ["sync_item_variants"]
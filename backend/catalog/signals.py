@@ -0,0 +1,65 @@
+"""Signal handlers that keep catalog read caches coherent with writes."""
+
+from django.conf import settings
+from django.db.models.signals import post_delete, post_save
+from django.dispatch import receiver
+
+from backend.catalog.models import (
+    CardMetadata,
+    CatalogItem,
+    CatalogMedia,
+    CatalogVariant,
+    Era,
+    Product,
+    Set,
+)
+from backend.catalog.selectors.list_cache import bump_catalog_version
+from backend.catalog.selectors.reference_data import invalidate_reference_catalog
+from backend.catalog.selectors.scan import invalidate_scan_cache
+
+
+def _invalidate_item(item_id) -> None:
+    invalidate_scan_cache(item_id)
+
+
+def _item_vendor_id(instance):
+    """Vendor of a child row's item, without a query when the item is already loaded."""
+    if type(instance).item.is_cached(instance):
+        return instance.item.vendor_id
+    return CatalogItem.objects.filter(pk=instance.item_id).values_list("vendor_id", flat=True).first()
+
+
+@receiver(post_save, sender=CatalogItem)
+@receiver(post_delete, sender=CatalogItem)
+def invalidate_item_caches(sender, instance, **kwargs):
+    _invalidate_item(instance.pk)
+    # A vendor move also invalidates the pages of the vendor the item left.
+    bump_catalog_version(getattr(instance, "_loaded_vendor_id", None), instance.vendor_id)
+    instance._loaded_vendor_id = instance.vendor_id
+
+
+@receiver(post_save, sender=CatalogVariant)
+@receiver(post_delete, sender=CatalogVariant)
+@receiver(post_save, sender=CardMetadata)
+@receiver(post_delete, sender=CardMetadata)
+def invalidate_parent_item_caches(sender, instance, **kwargs):
+    _invalidate_item(instance.item_id)
+    if settings.CATALOG_LIST_CACHE:
+        bump_catalog_version(_item_vendor_id(instance))
+
+
+@receiver(post_save, sender=CatalogMedia)
+@receiver(post_delete, sender=CatalogMedia)
+def invalidate_media_item_caches(sender, instance, **kwargs):
+    if settings.CATALOG_LIST_CACHE:
+        bump_catalog_version(_item_vendor_id(instance))
+
+
+@receiver(post_save, sender=Era)
+@receiver(post_delete, sender=Era)
+@receiver(post_save, sender=Set)
+@receiver(post_delete, sender=Set)
+@receiver(post_save, sender=Product)
+@receiver(post_delete, sender=Product)
+def invalidate_reference_caches(sender, instance, **kwargs):
+    invalidate_reference_catalog()
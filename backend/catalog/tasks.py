@@ -0,0 +1,15 @@
+"""Background job handlers for the catalog domain."""
+
+from backend.catalog.services.media import DELETE_REMOTE_MEDIA_JOB, delete_unreferenced_media
+from backend.catalog.services.media_processing import PROCESS_MEDIA_JOB, process_media
+from backend.jobs.registry import job
+
+
+@job(DELETE_REMOTE_MEDIA_JOB)
+def delete_remote_media(*, objects: list) -> None:
+    delete_unreferenced_media(objects=objects)
+
+
+@job(PROCESS_MEDIA_JOB)
+def process_catalog_media(*, media_ids: list) -> None:
+    process_media(media_ids=media_ids)
@@ -0,0 +1,109 @@
+import pytest
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+from rest_framework.test import APIClient
+
+from backend.catalog.models import CardMetadata
+from backend.catalog.selectors.external_ids import (
+    MAX_EXTERNAL_ID_LOOKUP,
+    find_items_by_external_ids,
+)
+from backend.catalog.tests.factories import CardMetadataFactory, CatalogItemFactory, UserFactory
+from backend.catalog.tests.utils import ensure_vendor_admin
+
+URL = "/api/v1/catalog/items/lookup-external/"
+
+
+def _card(vendor, store, sku, external_ids):
+    item = CatalogItemFactory.create(vendor=vendor, store=store, sku=sku)
+    CardMetadataFactory.create(item=item, external_ids=external_ids)
+    return item
+
+
+@pytest.mark.django_db
+def test_lookup_external_get_resolves_single_id():
+    user = UserFactory.create()
+    vendor, store = ensure_vendor_admin(user)
+    item = _card(vendor, store, "EXT-1", {"tcgplayer": "501", "cardmarket": "77"})
+    _card(vendor, store, "EXT-2", {"tcgplayer": "502"})
+    client = APIClient()
+    client.force_authenticate(user=user)
+
+    resp = client.get(URL, {"provider": "tcgplayer", "ids": "501"})
+
+    assert resp.status_code == 200
+    body = resp.json()
+    assert body["provider"] == "tcgplayer"
+    assert [match["sku"] for match in body["matches"]["501"]] == [item.sku]
+    assert body["missing"] == []
+
+
+@pytest.mark.django_db
+def test_lookup_external_post_batch_reports_missing_and_scopes_to_vendor():
+    user = UserFactory.create()
+    vendor, store = ensure_vendor_admin(user)
+    _card(vendor, store, "EXT-3", {"tcgplayer": "601"})
+    _card(vendor, store, "EXT-4", {"tcgplayer": 602})
+    foreign = CatalogItemFactory.create(sku="EXT-FOREIGN")
+    CardMetadataFactory.create(item=foreign, external_ids={"tcgplayer": "603"})
+    client = APIClient()
+    client.force_authenticate(user=user)
+
+    resp = client.post(URL, {"provider": "tcgplayer", "ids": ["601", "602", "603"]}, format="json")
+
+    assert resp.status_code == 200
+    body = resp.json()
+    assert set(body["matches"]) == {"601", "602"}
+    assert body["missing"] == ["603"]
+
+
+@pytest.mark.django_db
+def test_lookup_external_rejects_oversized_batches():
+    user = UserFactory.create()
+    ensure_vendor_admin(user)
+    client = APIClient()
+    client.force_authenticate(user=user)
+
+    ids = [str(value) for value in range(MAX_EXTERNAL_ID_LOOKUP + 1)]
+    resp = client.post(URL, {"provider": "tcgplayer", "ids": ids}, format="json")
+
+    assert resp.status_code == 400
+
+
+@pytest.mark.django_db
+def test_find_items_by_external_ids_uses_single_item_query():
+    user = UserFactory.create()
+    vendor, store = ensure_vendor_admin(user)
+    for idx in range(3):
+        _card(vendor, store, f"EXT-Q{idx}", {"tcgplayer": str(700 + idx)})
+
+    with CaptureQueriesContext(connection) as ctx:
+        matches = find_items_by_external_ids(
+            user=user, provider="tcgplayer", external_ids=["700", "701", "702"]
+        )
+
+    item_queries = [q for q in ctx.captured_queries if "catalog_card_metadata" in q["sql"]]
+    assert len(item_queries) == 1
+    assert "@>" in item_queries[0]["sql"]
+    assert sorted(matches) == ["700", "701", "702"]
+
+
+@pytest.mark.django_db
+def test_card_details_accepts_legacy_json_string_external_ids():
+    user = UserFactory.create()
+    _, store = ensure_vendor_admin(user)
+    client = APIClient()
+    client.force_authenticate(user=user)
+
+    payload = {
+        "name": "Legacy Client Card",
+        "sku": "EXT-LEGACY",
+        "quantity": 1,
+        "store": store.id,
+        "card_details": {"external_ids": '{"tcgplayer": 42}'},
+    }
+    resp = client.post("/api/v1/catalog/items/", payload, format="json")
+
+    assert resp.status_code == 201
+    assert resp.json()["card_details"]["external_ids"] == {"tcgplayer": "42"}
+    assert CardMetadata.objects.get(item__sku="EXT-LEGACY").external_ids == {"tcgplayer": "42"}
@@ -0,0 +1,104 @@
+import pytest
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+from rest_framework.test import APIClient
+
+from backend.catalog.selectors.facets import facet_cache
+from backend.catalog.tests.factories import (
+    CardMetadataFactory,
+    CatalogItemFactory,
+    StoreFactory,
+    UserFactory,
+)
+from backend.catalog.tests.utils import ensure_vendor_admin
+
+URL = "/api/v1/catalog/items/facets/"
+
+pytestmark = pytest.mark.django_db
+
+
+@pytest.fixture(autouse=True)
+def _clear_facet_cache():
+    facet_cache.clear()
+    yield
+    facet_cache.clear()
+
+
+@pytest.fixture
+def inventory():
+    user = UserFactory.create()
+    vendor, store = ensure_vendor_admin(user)
+    annex = StoreFactory.create(vendor=vendor, name="Annex")
+    cards = [
+        CatalogItemFactory.create(vendor=vendor, store=store, status="active"),
+        CatalogItemFactory.create(vendor=vendor, store=store, status="archived", condition="Played"),
+        CatalogItemFactory.create(vendor=vendor, store=annex, status="active"),
+    ]
+    CardMetadataFactory.create(item=cards[0], language="Japanese", market_region="JP", rarity="rare")
+    CardMetadataFactory.create(item=cards[1], language="English", market_region="US", rarity="rare")
+    CatalogItemFactory.create(vendor=vendor, store=annex, category="clothing")
+    # Another vendor's stock never shows up.
+    CatalogItemFactory.create(category="video_game")
+
+    client = APIClient()
+    client.force_authenticate(user=user)
+    return client, store, annex
+
+
+def test_counts_every_facet_in_one_query(inventory):
+    client, store, annex = inventory
+    with CaptureQueriesContext(connection) as queries:
+        response = client.get(URL)
+    assert response.status_code == 200
+    assert sum("GROUPING SETS" in query["sql"] for query in queries.captured_queries) == 1
+
+    body = response.json()
+    assert body["total"] == 4
+    facets = body["facets"]
+    assert facets["category"] == [
+        {"value": "pokemon_card", "label": "Pokémon Card", "count": 3},
+        {"value": "clothing", "label": "Clothing", "count": 1},
+    ]
+    assert {bucket["value"]: bucket["count"] for bucket in facets["status"]} == {"active": 3, "archived": 1}
+    assert {bucket["value"]: bucket["count"] for bucket in facets["condition"]} == {"Near Mint": 3, "Played": 1}
+    assert facets["rarity"] == [
+        {"value": "rare", "label": "Rare", "count": 2},
+        {"value": None, "label": None, "count": 2},
+    ]
+    assert {bucket["value"]: bucket["count"] for bucket in facets["language"]} == {
+        "English": 1,
+        "Japanese": 1,
+        None: 2,
+    }
+    assert facets["store"] == [
+        {"value": store.id, "label": store.name, "count": 2},
+        {"value": annex.id, "label": "Annex", "count": 2},
+    ]
+
+
+def test_counts_follow_the_list_filters(inventory):
+    client, store, _ = inventory
+    body = client.get(URL, {"store": store.id, "status": "active", "facets": "language,market_region"}).json()
+    assert body["total"] == 1
+    assert set(body["facets"]) == {"language", "market_region"}
+    assert body["facets"]["market_region"] == [{"value": "JP", "label": "JP", "count": 1}]
+
+
+def test_results_are_cached_per_filter_set(inventory):
+    client, store, _ = inventory
+    client.get(URL, {"status": "active", "sort_by": "name"})
+
+    CatalogItemFactory.create(vendor=store.vendor, store=store, status="active")
+    with CaptureQueriesContext(connection) as queries:
+        cached = client.get(URL, {"status": "active", "limit": 10}).json()
+    assert not any("GROUPING SETS" in query["sql"] for query in queries.captured_queries)
+    assert cached["total"] == 3
+
+    assert client.get(URL, {"status": "archived"}).json()["total"] == 1
+
+
+def test_unknown_facets_are_rejected(inventory):
+    client, _, _ = inventory
+    response = client.get(URL, {"facets": "category,colour"})
+    assert response.status_code == 400
+    assert "colour" in response.json()["facets"]
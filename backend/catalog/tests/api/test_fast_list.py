@@ -0,0 +1,133 @@
+import datetime
+from decimal import Decimal
+
+import pytest
+from django.db import connection
+from django.test.utils import CaptureQueriesContext, override_settings
+from rest_framework.test import APIClient
+
+from backend.catalog.api.viewsets import _item_row_mapper
+from backend.catalog.models import CatalogMedia, Era, Product, Set
+from backend.catalog.tests.factories import (
+    CardMetadataFactory,
+    CatalogItemFactory,
+    CatalogVariantFactory,
+    UserFactory,
+)
+from backend.catalog.tests.utils import ensure_vendor_admin
+
+URL = "/api/v1/catalog/items/"
+
+
+@pytest.fixture
+def catalog_client():
+    user = UserFactory.create()
+    vendor, store = ensure_vendor_admin(user)
+    era = Era.objects.create(name="Sword & Shield", slug="swsh", start_year=2020)
+    card_set = Set.objects.create(era=era, name="Rebel Clash", code="SWSH02", release_date=datetime.date(2020, 5, 1))
+    boxed = Product.objects.create(set=card_set, name="Booster Box", type="booster_box", configuration={"packs": 36})
+    loose = Product.objects.create(name="Sleeves", type="accessory")
+
+    rich = CatalogItemFactory.create(
+        vendor=vendor, store=store, product=boxed, description=None, price=Decimal("249.90"), image_url="https://cdn.example.com/a.jpg"
+    )
+    CardMetadataFactory.create(
+        item=rich,
+        psa_grade=Decimal("9.5"),
+        external_ids={"tcgplayer": "123"},
+        last_estimated_at=datetime.datetime(2024, 3, 4, 5, 6, 7, 891011, tzinfo=datetime.timezone.utc),
+        rarity="rare",
+    )
+    CatalogMedia.objects.create(item=rich, url="https://cdn.example.com/b.jpg", sort_order=1, width=640, metadata={"alt": "Back"})
+    CatalogMedia.objects.create(
+        item=rich,
+        url="https://cdn.example.com/f.jpg",
+        sort_order=0,
+        is_primary=True,
+        media_type="primary",
+        metadata={"derivatives": {"thumb": {"url": "https://cdn.example.com/f-thumb.webp", "width": 320, "height": 447}}},
+    )
+    CatalogVariantFactory.create(item=rich, condition="Raw", grade=None, price_adjustment=Decimal("-2.50"))
+    CatalogVariantFactory.create(item=rich, condition="PSA 10", quantity=3)
+
+    CatalogItemFactory.create(vendor=vendor, store=store, product=loose, name="Ultra Pro Sleeves", category="accessory")
+    CatalogItemFactory.create_batch(3, vendor=vendor, store=store)
+
+    client = APIClient()
+    client.force_authenticate(user=user)
+    return client
+
+
+def _fetch_both(client, params=None):
+    fast = client.get(URL, params or {})
+    with override_settings(CATALOG_FAST_LIST=False):
+        slow = client.get(URL, params or {})
+    assert fast.status_code == slow.status_code == 200
+    return fast, slow
+
+
+@pytest.mark.django_db
+@pytest.mark.parametrize(
+    "params",
+    [
+        {},
+        {"sort_by": "name", "sort_order": "asc"},
+        {"limit": 2, "offset": 1},
+        {"category": "accessory"},
+        {"fields": "id,name,price,images"},
+        {"expand": "variants,card_details"},
+        {"fields": "id,product_details,updated_at"},
+    ],
+)
+def test_fast_list_is_byte_identical_to_serializer(catalog_client, params):
+    fast, slow = _fetch_both(catalog_client, params)
+    assert fast.content == slow.content
+
+
+@pytest.mark.django_db
+@override_settings(CATALOG_LIST_IMAGE_LIMIT=0)
+def test_fast_list_renders_nested_relations(catalog_client):
+    fast, slow = _fetch_both(catalog_client, {"sort_by": "price", "sort_order": "desc"})
+    rich = fast.json()["results"][0]
+
+    assert rich["card_details"]["psa_grade"] == "9.5"
+    assert rich["card_details"]["last_estimated_at"] == "2024-03-04T05:06:07.891011Z"
+    assert rich["product_details"]["set"]["era"]["slug"] == "swsh"
+    # Whole galleries come in display order.
+    assert [image["sort_order"] for image in rich["images"]] == [0, 1]
+    assert [variant["price_adjustment"] for variant in rich["variants"]] == ["-2.50", "1.00"]
+    assert fast.content == slow.content
+
+
+@pytest.mark.django_db
+def test_list_rows_carry_only_the_primary_image_by_default(catalog_client):
+    fast, slow = _fetch_both(catalog_client, {"sort_by": "price", "sort_order": "desc", "fields": "id,images"})
+    rich = fast.json()["results"][0]
+    assert [image["url"] for image in rich["images"]] == ["https://cdn.example.com/f.jpg"]
+    assert fast.content == slow.content
+
+
+@pytest.mark.django_db
+def test_fast_list_query_count_is_constant(catalog_client):
+    assert _item_row_mapper(None) is not None
+
+    with CaptureQueriesContext(connection) as small:
+        catalog_client.get(URL)
+    CatalogItemFactory.create_batch(10, vendor=CatalogItemFactory._meta.model.objects.first().vendor)
+    with CaptureQueriesContext(connection) as large:
+        catalog_client.get(URL)
+
+    assert len(large.captured_queries) == len(small.captured_queries)
+
+
+@pytest.mark.django_db
+@override_settings(CATALOG_LIST_IMAGE_LIMIT=0)
+def test_fast_list_exposes_media_derivatives(catalog_client):
+    fast, slow = _fetch_both(catalog_client, {"fields": "id,images"})
+    images = [image for item in fast.json()["results"] for image in item["images"]]
+    by_url = {image["url"]: image for image in images}
+    assert by_url["https://cdn.example.com/f.jpg"]["thumbnail_url"] == "https://cdn.example.com/f-thumb.webp"
+    assert by_url["https://cdn.example.com/f.jpg"]["derivatives"]["thumb"]["width"] == 320
+    assert by_url["https://cdn.example.com/b.jpg"]["thumbnail_url"] is None
+    assert by_url["https://cdn.example.com/b.jpg"]["derivatives"] is None
+    assert fast.content == slow.content
@@ -0,0 +1,76 @@
+import pytest
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+from rest_framework.test import APIClient
+
+from backend.catalog.tests.factories import CatalogItemFactory, CatalogVariantFactory, UserFactory
+from backend.catalog.tests.utils import ensure_vendor_admin
+
+URL = "/api/v1/catalog/items/"
+
+
+@pytest.fixture
+def vendor_client():
+    user = UserFactory.create()
+    vendor, store = ensure_vendor_admin(user)
+    client = APIClient()
+    client.force_authenticate(user=user)
+    CatalogItemFactory.create_batch(2, vendor=vendor, store=store, description="Long description")
+    return client, vendor, store
+
+
+def _results(resp):
+    body = resp.json()
+    return body["results"] if isinstance(body, dict) and "results" in body else body
+
+
+@pytest.mark.django_db
+def test_fields_param_prunes_payload_and_skips_relations(vendor_client):
+    client, _, _ = vendor_client
+
+    with CaptureQueriesContext(connection) as ctx:
+        resp = client.get(URL, {"fields": "id,name,sku,price,image_url"})
+
+    assert resp.status_code == 200
+    assert all(set(row) == {"id", "name", "sku", "price", "image_url"} for row in _results(resp))
+    item_sql = [q["sql"] for q in ctx.captured_queries if 'FROM "catalog_item"' in q["sql"]]
+    assert item_sql
+    assert not any('"catalog_item"."search_text"' in sql for sql in item_sql)
+    assert not any("catalog_card_metadata" in sql for sql in item_sql)
+    assert not [q for q in ctx.captured_queries if 'FROM "catalog_media"' in q["sql"]]
+    assert not [q for q in ctx.captured_queries if 'FROM "catalog_variant"' in q["sql"]]
+
+
+@pytest.mark.django_db
+def test_expand_alone_keeps_scalars_and_only_requested_relations(vendor_client):
+    client, vendor, store = vendor_client
+    item = CatalogItemFactory.create(vendor=vendor, store=store)
+    CatalogVariantFactory.create(item=item)
+
+    resp = client.get(URL, {"expand": "variants"})
+
+    rows = _results(resp)
+    assert resp.status_code == 200
+    assert all("variants" in row and "sku" in row for row in rows)
+    assert not any({"images", "card_details", "product_details"} & set(row) for row in rows)
+
+
+@pytest.mark.django_db
+def test_retrieve_honours_fields_and_rejects_unknown(vendor_client):
+    client, vendor, store = vendor_client
+    item = CatalogItemFactory.create(vendor=vendor, store=store)
+
+    resp = client.get(f"{URL}{item.pk}/", {"fields": "id,quantity"})
+    assert resp.status_code == 200
+    assert resp.json() == {"id": item.pk, "quantity": item.quantity}
+
+    assert client.get(URL, {"fields": "id,secret"}).status_code == 400
+
+
+@pytest.mark.django_db
+def test_full_payload_unchanged_without_selection(vendor_client):
+    client, _, _ = vendor_client
+
+    row = _results(client.get(URL))[0]
+
+    assert {"search_text", "card_details", "images", "variants", "product_details"} <= set(row)
@@ -0,0 +1,202 @@
+import pytest
+from django.core.cache import cache
+from django.db import connection
+from django.test.utils import CaptureQueriesContext, override_settings
+from rest_framework.test import APIClient
+
+from backend.catalog.checks import check_list_cache_backend
+from backend.catalog.models import CatalogItem, CatalogMedia
+from backend.catalog.selectors.list_cache import catalog_version, list_page_key
+from backend.catalog.services.delete_item import delete_item
+from backend.catalog.services.search_text import rebuild_search_text
+from backend.catalog.services.transfer_stock import transfer_stock
+from backend.catalog.services.update_item import update_item
+from backend.catalog.services.variants import sync_item_variants
+from backend.catalog.tests.factories import (
+    CatalogItemFactory,
+    StoreFactory,
+    UserFactory,
+    VendorFactory,
+)
+from backend.catalog.tests.utils import ensure_vendor_admin
+from backend.core.instrumentation import metrics
+
+URL = "/api/v1/catalog/items/"
+
+pytestmark = pytest.mark.django_db
+
+
+@pytest.fixture(autouse=True)
+def _list_cache():
+    cache.clear()
+    metrics.reset()
+    with override_settings(CATALOG_LIST_CACHE=True):
+        yield
+    cache.clear()
+
+
+@pytest.fixture
+def inventory():
+    user = UserFactory.create()
+    vendor, store = ensure_vendor_admin(user)
+    items = CatalogItemFactory.create_batch(3, vendor=vendor, store=store)
+    client = APIClient()
+    client.force_authenticate(user=user)
+    return client, vendor, store, items
+
+
+def _queries(client, params=None):
+    with CaptureQueriesContext(connection) as ctx:
+        body = client.get(URL, params or {}).json()
+    return body, len(ctx.captured_queries)
+
+
+def test_repeated_pages_are_served_from_the_cache(inventory):
+    client, *_ = inventory
+    first, first_queries = _queries(client, {"limit": 2})
+    second, second_queries = _queries(client, {"limit": 2})
+
+    assert second == first
+    assert second_queries < first_queries
+    snapshot = metrics.snapshot()
+    assert snapshot["counters"]["catalog.list_cache.hit"] == 1
+    assert snapshot["counters"]["catalog.list_cache.miss"] == 1
+    assert snapshot["timers"]["catalog.list_cache.miss_ms"]["count"] == 1
+
+
+def test_keys_ignore_param_order_and_irrelevant_params(inventory):
+    _, vendor, *_ = inventory
+    key = list_page_key(vendor.id, {"fields": "name,id", "status": "active", "limit": "2"})
+    assert key == list_page_key(vendor.id, {"limit": "2", "status": "active", "fields": "id,name", "_": "1"})
+    assert key != list_page_key(vendor.id, {"fields": "name,id", "status": "archived", "limit": "2"})
+
+
+@pytest.mark.parametrize(
+    "write",
+    [
+        lambda item, store: update_item(instance=item, data={"name": "Renamed"}),
+        lambda item, store: delete_item(instance=item),
+        lambda item, store: transfer_stock(item=item, to_store=StoreFactory.create(vendor=item.vendor)),
+        lambda item, store: sync_item_variants(item=item, variants_payload=[{"condition": "NM", "quantity": 2}]),
+    ],
+    ids=["update", "delete", "transfer", "variants"],
+)
+def test_catalog_writes_invalidate_the_vendors_pages(inventory, write):
+    client, vendor, store, items = inventory
+    before = client.get(URL).json()
+    version = catalog_version(vendor.id)
+
+    write(items[0], store)
+
+    assert catalog_version(vendor.id) > version
+    after = client.get(URL).json()
+    assert after != before
+    assert metrics.snapshot()["counters"].get("catalog.list_cache.hit") is None
+
+
+def _set_name(item, name):
+    item.name = name
+    item.save()
+
+
+@pytest.mark.parametrize(
+    "write",
+    [
+        lambda item: _set_name(item, "Edited in the admin"),
+        lambda item: item.delete(),
+        lambda item: CatalogMedia.objects.create(item=item, url="https://cdn.example.com/admin.jpg"),
+    ],
+    ids=["save", "delete", "media"],
+)
+def test_model_writes_outside_the_services_invalidate_the_vendors_pages(inventory, write):
+    client, vendor, _, items = inventory
+    client.get(URL)
+    version = catalog_version(vendor.id)
+
+    write(CatalogItem.objects.get(pk=items[0].pk))
+
+    assert catalog_version(vendor.id) > version
+    client.get(URL)
+    assert metrics.snapshot()["counters"].get("catalog.list_cache.hit") is None
+
+
+def test_moving_an_item_invalidates_both_vendors(inventory):
+    _, vendor, _, items = inventory
+    other = VendorFactory.create()
+    versions = catalog_version(vendor.id), catalog_version(other.id)
+
+    item = CatalogItem.objects.get(pk=items[0].pk)
+    item.vendor = other
+    item.save()
+
+    assert catalog_version(vendor.id) > versions[0]
+    assert catalog_version(other.id) > versions[1]
+
+
+def test_search_text_rebuild_invalidates_the_vendors_pages(inventory):
+    client, vendor, _, items = inventory
+    CatalogItem.objects.filter(pk=items[0].pk).update(search_text="stale")
+    client.get(URL)
+    version = catalog_version(vendor.id)
+
+    assert rebuild_search_text() == 1
+
+    assert catalog_version(vendor.id) > version
+
+
+def test_created_items_show_up_immediately(inventory):
+    client, vendor, store, _ = inventory
+    assert client.get(URL).json()["count"] == 3
+    response = client.post(URL, {"name": "New card", "sku": "NEW-1", "quantity": 1, "store": store.id}, format="json")
+    assert response.status_code == 201, response.content
+    assert client.get(URL).json()["count"] == 4
+
+
+def test_other_vendors_writes_keep_the_cache(inventory):
+    client, vendor, *_ = inventory
+    client.get(URL)
+    other = CatalogItemFactory.create()
+    update_item(instance=other, data={"name": "Elsewhere"})
+
+    client.get(URL)
+    assert metrics.snapshot()["counters"]["catalog.list_cache.hit"] == 1
+
+
+def test_writes_skip_the_version_bump_while_the_cache_is_off(inventory):
+    _, vendor, _, items = inventory
+    version = catalog_version(vendor.id)
+    with override_settings(CATALOG_LIST_CACHE=False), CaptureQueriesContext(connection) as ctx:
+        CatalogMedia.objects.create(item_id=items[0].pk, url="https://cdn.example.com/off.jpg")
+        _set_name(CatalogItem.objects.get(pk=items[0].pk), "Renamed")
+
+    assert catalog_version(vendor.id) == version
+    # The insert, the item lookup and its update: no vendor lookups.
+    assert len(ctx.captured_queries) == 3
+
+
+def test_per_process_caches_are_flagged():
+    assert [warning.id for warning in check_list_cache_backend(None)] == ["collectibles.W001"]
+    redis = {"default": {"BACKEND": "django.core.cache.backends.redis.RedisCache", "LOCATION": "redis://"}}
+    with override_settings(CACHES=redis):
+        assert check_list_cache_backend(None) == []
+    with override_settings(CATALOG_LIST_CACHE=False):
+        assert check_list_cache_backend(None) == []
+
+
+def test_cache_is_opt_in(inventory):
+    client, *_ = inventory
+    with override_settings(CATALOG_LIST_CACHE=False):
+        client.get(URL)
+        client.get(URL)
+    assert metrics.snapshot()["counters"] == {}
+
+
+def test_metrics_endpoint_is_staff_only(inventory):
+    client, *_ = inventory
+    client.get(URL)
+    assert client.get("/api/v1/core/metrics/").status_code == 403
+
+    staff = APIClient()
+    staff.force_authenticate(user=UserFactory.create(is_staff=True))
+    body = staff.get("/api/v1/core/metrics/").json()
+    assert body["counters"]["catalog.list_cache.miss"] == 1
@@ -0,0 +1,192 @@
+from io import StringIO
+
+import pytest
+from django.core.cache import cache
+from django.core.management import call_command
+from django.db import connection
+from django.test.utils import CaptureQueriesContext, override_settings
+from django.utils import timezone
+from rest_framework.test import APIClient
+
+from backend.catalog.api.serializers import ProductSerializer, SetSerializer
+from backend.catalog.models import Era, Product, Set
+from backend.catalog.selectors import reference_data
+from backend.catalog.tests.factories import UserFactory
+from backend.core.query_plans import capture_plans, plan_regressions
+
+pytestmark = pytest.mark.django_db
+
+
+@pytest.fixture(autouse=True)
+def _clear_reference_cache():
+    cache.clear()
+    reference_data._local.update(catalog=None, checked_at=0.0)
+    yield
+    cache.clear()
+    reference_data._local.update(catalog=None, checked_at=0.0)
+
+
+@pytest.fixture
+def client():
+    client = APIClient()
+    client.force_authenticate(user=UserFactory.create())
+    return client
+
+
+@pytest.fixture
+def seeded():
+    call_command("seed_reference_data", stdout=StringIO())
+
+
+def test_cached_payload_matches_the_serializers(client, seeded):
+    sets = client.get("/api/v1/catalog/sets/").json()["results"]
+    products = client.get("/api/v1/catalog/products/").json()["results"]
+
+    expected_sets = SetSerializer(Set.objects.order_by("-release_date", "id"), many=True).data
+    expected_products = ProductSerializer(Product.objects.order_by("name", "id"), many=True).data
+    assert sets == [dict(row) for row in expected_sets]
+    assert products == [dict(row) for row in expected_products]
+    assert products[0]["set"]["era"]["slug"] in {"swsh", "sv"}
+
+
+def test_reference_pages_are_served_without_queries_once_cached(client, seeded):
+    client.get("/api/v1/catalog/reference/")
+    set_id = Set.objects.get(code="SV03").pk
+
+    with CaptureQueriesContext(connection) as queries:
+        eras = client.get("/api/v1/catalog/eras/")
+        detail = client.get(f"/api/v1/catalog/sets/{set_id}/")
+        missing = client.get("/api/v1/catalog/products/999999/")
+    assert len(queries) == 0
+    assert eras.json()["count"] == 2
+    assert detail.json()["code"] == "SV03"
+    assert missing.status_code == 404
+
+
+def test_dump_has_validators_and_revalidates(client, seeded):
+    response = client.get("/api/v1/catalog/reference/")
+    assert response.status_code == 200
+    body = response.json()
+    assert (len(body["eras"]), len(body["sets"]), len(body["products"])) == (2, 3, 4)
+    assert "max-age=3600" in response["Cache-Control"] and "private" in response["Cache-Control"]
+
+    etag = response["ETag"]
+    assert etag == f'W/"reference-{body["version"]}"'
+    again = client.get("/api/v1/catalog/reference/", HTTP_IF_NONE_MATCH=etag)
+    assert again.status_code == 304
+    assert again["ETag"] == etag
+
+
+def test_saves_and_seeding_invalidate_the_catalog(client, seeded):
+    with override_settings(CATALOG_REFERENCE_VERSION_TTL=3600):
+        first = client.get("/api/v1/catalog/reference/")
+
+        evolving = Set.objects.get(code="SWSH07")
+        evolving.name = "Evolving Skies (renamed)"
+        evolving.save()
+        renamed = client.get("/api/v1/catalog/reference/")
+        assert renamed["ETag"] != first["ETag"]
+        assert "Evolving Skies (renamed)" in {row["name"] for row in renamed.json()["sets"]}
+        assert client.get("/api/v1/catalog/reference/", HTTP_IF_NONE_MATCH=first["ETag"]).status_code == 200
+
+        Product.objects.filter(name__startswith="Evolving").delete()
+        call_command("seed_reference_data", stdout=StringIO())
+        reseeded = client.get("/api/v1/catalog/reference/")
+        assert reseeded["ETag"] != renamed["ETag"]
+        assert len(reseeded.json()["products"]) == 4
+
+
+def test_other_processes_writes_are_picked_up_without_a_shared_cache(client, seeded):
+    with override_settings(CATALOG_REFERENCE_VERSION_TTL=0):
+        version = client.get("/api/v1/catalog/reference/").json()["version"]
+        # Another process (a worker, seed_reference_data) wrote the table; no signal reached this one.
+        cache.clear()
+        Set.objects.filter(code="SV03").update(name="Obsidian Flames (renamed)", updated_at=timezone.now())
+
+        body = client.get("/api/v1/catalog/reference/").json()
+        assert body["version"] != version
+        assert "Obsidian Flames (renamed)" in {row["name"] for row in body["sets"]}
+
+
+def test_reference_endpoints_require_authentication(seeded):
+    assert APIClient().get("/api/v1/catalog/reference/").status_code == 401
+
+
+def test_products_filter_by_type_and_set_code(client, seeded):
+    response = client.get("/api/v1/catalog/products/", {"type": "booster_box", "set__code": "SWSH07"})
+    assert [row["name"] for row in response.json()["results"]] == ["Evolving Skies Booster Box"]
+    assert "ETag" in response
+
+    both = client.get("/api/v1/catalog/products/", {"type": "etb,booster_pack"}).json()
+    assert both["count"] == 3
+
+
+def test_sets_search_and_era_filter(client, seeded):
+    found = client.get("/api/v1/catalog/sets/", {"search": "skies"}).json()["results"]
+    assert [row["code"] for row in found] == ["SWSH07"]
+
+    swsh = client.get("/api/v1/catalog/sets/", {"era__slug": "swsh"}).json()["results"]
+    assert [row["code"] for row in swsh] == ["SWSH07", "SWSH045"]
+
+    assert client.get("/api/v1/catalog/eras/", {"slug": "sv"}).json()["count"] == 1
+    assert client.get("/api/v1/catalog/sets/", {"era": "not-a-number"}).status_code == 400
+
+
+def _reference_plans(client, url, params):
+    # Build the cached catalog first: its full-table reads are not under test.
+    reference_data.get_reference_catalog()
+    plans = capture_plans(lambda: client.get(url, params))
+    assert plans
+    assert plan_regressions(plans, max_cost=1e6) == []
+    return plans
+
+
+@pytest.fixture
+def large_catalog(seeded):
+    """Enough reference rows that the planner picks the same indexes as in production."""
+    era = Era.objects.create(name="Filler", slug="filler")
+    Era.objects.bulk_create(Era(name=f"Era {n}", slug=f"era-{n}") for n in range(2000))
+    sets = Set.objects.bulk_create(Set(era=era, name=f"Set {n}", code=f"FILL{n}") for n in range(2000))
+    Product.objects.bulk_create(
+        Product(set=sets[n % 2000], name=f"Product {n}", type=["etb", "tin", "booster_box"][n % 3])
+        for n in range(6000)
+    )
+    with connection.cursor() as cursor:
+        for table in ("collectibles_era", "collectibles_set", "collectibles_product"):
+            cursor.execute(f"ANALYZE {table}")
+
+
+pg_only = pytest.mark.skipif(connection.vendor != "postgresql", reason="EXPLAIN (FORMAT JSON) needs Postgres")
+
+
+@pg_only
+def test_set_and_type_filter_reads_products_by_index(client, large_catalog):
+    plans = _reference_plans(client, "/api/v1/catalog/products/", {"type": "booster_box", "set__code": "SWSH07"})
+
+    for plan in plans:
+        # One index answers both conditions, so products are not filtered after the fact.
+        conditions = [node["Index Cond"] for node in plan.nodes if "set_id" in node.get("Index Cond", "")]
+        assert len(conditions) == 1 and "type" in conditions[0]
+
+
+@pg_only
+@pytest.mark.parametrize(
+    "url, indexes",
+    [
+        ("/api/v1/catalog/eras/", {"era_name_trgm"}),
+        ("/api/v1/catalog/sets/", {"set_name_trgm", "set_code_trgm"}),
+        ("/api/v1/catalog/products/", {"product_name_trgm"}),
+    ],
+)
+def test_search_is_served_by_trigram_indexes(client, large_catalog, url, indexes):
+    with connection.cursor() as cursor:
+        cursor.execute(
+            "SELECT EXISTS (SELECT 1 FROM pg_amop JOIN pg_opclass ON opcfamily = amopfamily"
+            " WHERE opcname = 'gin_trgm_ops' AND amopopr = '~~(text,text)'::regoperator)"
+        )
+        if not cursor.fetchone()[0]:
+            pytest.skip("this server's pg_trgm cannot index LIKE")
+    plans = _reference_plans(client, url, {"search": "skies"})
+
+    for plan in plans:
+        assert indexes <= set(plan.index_names)
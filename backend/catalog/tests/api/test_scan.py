@@ -0,0 +1,123 @@
+import pytest
+from django.db import connection
+from django.test.utils import CaptureQueriesContext, override_settings
+from rest_framework.test import APIClient
+
+from backend.catalog.selectors.scan import get_scan_cache
+from backend.catalog.services.variants import sync_item_variants
+from backend.catalog.tests.factories import (
+    CardMetadataFactory,
+    CatalogItemFactory,
+    CatalogVariantFactory,
+    UserFactory,
+)
+from backend.catalog.tests.utils import ensure_vendor_admin
+
+URL = "/api/v1/catalog/items/scan/"
+
+
+@pytest.fixture(autouse=True)
+def _clear_scan_cache():
+    get_scan_cache().clear()
+    yield
+    get_scan_cache().clear()
+
+
+@pytest.fixture
+def vendor_client():
+    user = UserFactory.create()
+    vendor, store = ensure_vendor_admin(user)
+    client = APIClient()
+    client.force_authenticate(user=user)
+    return client, vendor, store
+
+
+@pytest.mark.django_db
+def test_scan_returns_compact_payload_for_exact_sku(vendor_client):
+    client, vendor, store = vendor_client
+    item = CatalogItemFactory.create(vendor=vendor, store=store, sku="SCAN-001", quantity=4)
+    variant = CatalogVariantFactory.create(item=item, condition="Raw", quantity=2)
+
+    resp = client.get(URL, {"code": "SCAN-001"})
+
+    assert resp.status_code == 200
+    body = resp.json()
+    assert body["id"] == item.id
+    assert body["store"] == store.id
+    assert body["price"] == "10.00"
+    assert body["variants"] == [
+        {
+            "id": variant.id,
+            "condition": "Raw",
+            "grade": variant.grade,
+            "quantity": 2,
+            "price_adjustment": "1.00",
+        }
+    ]
+    assert "search_text" not in body
+
+
+@pytest.mark.django_db
+def test_scan_serves_repeat_lookups_from_cache_and_invalidates_on_save(vendor_client):
+    client, vendor, store = vendor_client
+    item = CatalogItemFactory.create(vendor=vendor, store=store, sku="SCAN-002", quantity=4)
+    client.get(URL, {"code": "SCAN-002"})
+
+    with CaptureQueriesContext(connection) as ctx:
+        resp = client.get(URL, {"code": "SCAN-002"})
+    assert resp.json()["quantity"] == 4
+    assert not [q for q in ctx.captured_queries if "catalog_item" in q["sql"]]
+
+    item.quantity = 1
+    item.save()
+
+    assert client.get(URL, {"code": "SCAN-002"}).json()["quantity"] == 1
+
+
+@pytest.mark.django_db
+def test_scan_cache_follows_bulk_variant_writes(vendor_client):
+    client, vendor, store = vendor_client
+    item = CatalogItemFactory.create(vendor=vendor, store=store, sku="SCAN-005")
+    assert client.get(URL, {"code": "SCAN-005"}).json()["variants"] == []
+
+    sync_item_variants(item=item, variants_payload=[{"condition": "Raw", "quantity": 3}])
+
+    assert [v["quantity"] for v in client.get(URL, {"code": "SCAN-005"}).json()["variants"]] == [3]
+
+
+@pytest.mark.django_db
+def test_scan_cache_is_built_from_current_settings(vendor_client):
+    client, vendor, store = vendor_client
+    CatalogItemFactory.create(vendor=vendor, store=store, sku="SCAN-006")
+    with override_settings(CATALOG_SCAN_CACHE_TTL=0):
+        client.get(URL, {"code": "SCAN-006"})
+        assert len(get_scan_cache()) == 0
+    client.get(URL, {"code": "SCAN-006"})
+    assert len(get_scan_cache()) == 1
+
+@pytest.mark.django_db
+def test_scan_filters_variant_and_rejects_unknown_variant(vendor_client):
+    client, vendor, store = vendor_client
+    item = CatalogItemFactory.create(vendor=vendor, store=store, sku="SCAN-003")
+    raw = CatalogVariantFactory.create(item=item, condition="Raw")
+    CatalogVariantFactory.create(item=item, condition="PSA 10")
+
+    resp = client.get(URL, {"code": "SCAN-003", "variant": raw.id})
+    assert [v["id"] for v in resp.json()["variants"]] == [raw.id]
+
+    assert client.get(URL, {"code": "SCAN-003", "variant": 999999}).status_code == 404
+
+
+@pytest.mark.django_db
+def test_scan_resolves_external_id_and_scopes_to_vendor(vendor_client):
+    client, vendor, store = vendor_client
+    item = CatalogItemFactory.create(vendor=vendor, store=store, sku="SCAN-004")
+    CardMetadataFactory.create(item=item, external_ids={"tcgplayer": "9001"})
+    CatalogItemFactory.create(sku="SCAN-FOREIGN")
+
+    resp = client.get(URL, {"code": "9001", "provider": "tcgplayer"})
+    assert resp.status_code == 200
+    assert resp.json()["sku"] == "SCAN-004"
+
+    assert client.get(URL, {"code": "SCAN-FOREIGN"}).status_code == 404
+    assert client.get(URL).status_code == 400
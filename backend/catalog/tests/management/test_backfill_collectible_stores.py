@@ -1,4 +1,5 @@
 import contextlib
+from io import StringIO
 
 import pytest
 from django.core.management import call_command
@@ -48,3 +49,52 @@ def test_backfill_collectible_stores_respects_dry_run():
         collectible.refresh_from_db()
         assert collectible.store_id is None
         CatalogItem.objects.filter(pk=collectible.pk).update(store=store)
+
+
+@pytest.mark.django_db(transaction=True)
+def test_backfill_collectible_stores_processes_in_batches():
+    vendor = VendorFactory.create()
+    first_store = Store.objects.create(vendor=vendor, name="First")
+    Store.objects.create(vendor=vendor, name="Second")
+    collectibles = CatalogItemFactory.create_batch(5, vendor=vendor, store=first_store)
+    ids = [collectible.pk for collectible in collectibles]
+    out = StringIO()
+
+    with temporarily_allow_null_store():
+        CatalogItem.objects.filter(pk__in=ids).update(store=None)
+
+        call_command("backfill_collectible_stores", batch_size=2, stdout=out)
+
+        assert not CatalogItem.objects.filter(pk__in=ids, store__isnull=True).exists()
+        assert set(CatalogItem.objects.filter(pk__in=ids).values_list("store_id", flat=True)) == {
+            first_store.pk
+        }
+    output = out.getvalue()
+    assert "5 collectibles processed" in output
+    assert f"--start-after-id {max(ids)}" in output
+
+
+@pytest.mark.django_db(transaction=True)
+def test_backfill_collectible_stores_resumes_and_reports_vendors_without_store():
+    vendor = VendorFactory.create()
+    store = Store.objects.create(vendor=vendor, name="Main")
+    older, newer = CatalogItemFactory.create_batch(2, vendor=vendor, store=store)
+    storeless = CatalogItemFactory.create()
+    out = StringIO()
+
+    with temporarily_allow_null_store():
+        CatalogItem.objects.filter(pk__in=[older.pk, newer.pk, storeless.pk]).update(store=None)
+        storeless.vendor.stores.all().delete()
+
+        call_command("backfill_collectible_stores", start_after_id=older.pk, stdout=out)
+
+        older.refresh_from_db()
+        newer.refresh_from_db()
+        assert older.store_id is None
+        assert newer.store_id == store.pk
+        CatalogItem.objects.filter(pk=older.pk).update(store=store)
+        CatalogItem.objects.filter(pk=storeless.pk).delete()
+
+    output = out.getvalue()
+    assert f"Vendor {storeless.vendor_id} has no store for 1 collectibles" in output
+    assert "1 collectibles skipped because vendor has no store." in output
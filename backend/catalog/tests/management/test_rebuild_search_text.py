@@ -0,0 +1,66 @@
+from io import StringIO
+
+import pytest
+from django.core.management import call_command
+
+from backend.catalog.models import CatalogItem
+from backend.catalog.services.search_text import search_text_trigger_installed
+from backend.catalog.tests.factories import CatalogItemFactory, StoreFactory
+
+
+@pytest.mark.django_db
+def test_rebuild_search_text_fixes_rows_written_by_queryset_update():
+    item = CatalogItemFactory.create(name="Old Name", sku="RB-001")
+    fresh = CatalogItemFactory.create(name="Fresh", sku="RB-002")
+    CatalogItem.objects.filter(pk=item.pk).update(name="Charizard Holo")
+    out = StringIO()
+
+    call_command("rebuild_search_text", batch_size=1, stdout=out)
+
+    item.refresh_from_db()
+    assert item.search_text == "Charizard Holo RB-001 pokemon_card"
+    assert CatalogItem.objects.get(pk=fresh.pk).search_text == fresh.search_text
+    assert "1 items had stale search_text" in out.getvalue()
+
+
+@pytest.mark.django_db
+def test_rebuild_search_text_dry_run_does_not_write():
+    item = CatalogItemFactory.create(name="Before", sku="RB-003")
+    CatalogItem.objects.filter(pk=item.pk).update(search_text="")
+
+    call_command("rebuild_search_text", dry_run=True, stdout=StringIO())
+
+    item.refresh_from_db()
+    assert item.search_text == ""
+
+
+@pytest.mark.django_db(transaction=True)
+def test_rebuild_search_text_parallel_workers_cover_all_ranges():
+    items = CatalogItemFactory.create_batch(6)
+    CatalogItem.objects.update(search_text="stale")
+
+    call_command("rebuild_search_text", workers=3, batch_size=2, stdout=StringIO())
+
+    for item in items:
+        item.refresh_from_db()
+        assert item.search_text == CatalogItem.build_search_text(
+            name=item.name, sku=item.sku, description=item.description, category=item.category
+        )
+
+
+@pytest.mark.django_db
+def test_search_text_trigger_covers_bulk_create():
+    call_command("rebuild_search_text", install_trigger=True, stdout=StringIO())
+    assert search_text_trigger_installed()
+
+    store = StoreFactory.create()
+    CatalogItem.objects.bulk_create(
+        [CatalogItem(name="Bulk Pikachu", sku="RB-BULK", vendor=store.vendor, store=store)]
+    )
+    assert CatalogItem.objects.get(sku="RB-BULK").search_text == "Bulk Pikachu RB-BULK"
+
+    CatalogItem.objects.filter(sku="RB-BULK").update(description="  promo  ")
+    assert CatalogItem.objects.get(sku="RB-BULK").search_text == "Bulk Pikachu RB-BULK   promo"
+
+    call_command("rebuild_search_text", drop_trigger=True, stdout=StringIO())
+    assert not search_text_trigger_installed()
@@ -1,12 +1,16 @@
 import pytest
 from django.core.exceptions import ObjectDoesNotExist
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
 
+from backend.catalog.models import CatalogMedia
 from backend.catalog.selectors.get_item import get_item
 from backend.catalog.selectors.list_items import list_items
 from backend.catalog.selectors.search_items import search_items
 from backend.catalog.tests.factories import (
     CardMetadataFactory,
     CatalogItemFactory,
+    CatalogVariantFactory,
     UserFactory,
     VendorFactory,
 )
@@ -147,3 +151,47 @@ def test_search_items_enforces_min_length():
 
     results = search_items(user=user, query="Char")
     assert results.count() == 1
+
+
+@pytest.mark.django_db
+def test_callers_only_load_the_relations_they_render():
+    vendor = VendorFactory.create()
+    item = CatalogItemFactory.create(vendor=vendor)
+    for order in (2, 0, 1):
+        CatalogMedia.objects.create(item=item, url=f"https://cdn.example.com/{order}.jpg", sort_order=order)
+    CatalogVariantFactory.create(item=item)
+    user = UserFactory.create()
+    VendorMember.objects.create(vendor=vendor, user=user, role=VendorMemberRole.ADMIN, is_active=True)
+
+    # Detail with a sparse fieldset: one query, with vendor/store joined for permission checks.
+    with CaptureQueriesContext(connection) as queries:
+        sparse = get_item(user=user, item_id=item.pk, filters={"fields": "id,name"})
+        assert (sparse.vendor, sparse.store) == (vendor, item.store)
+    sql = [query["sql"] for query in queries.captured_queries]
+    assert not any("catalog_media" in statement for statement in sql)
+    assert sum('FROM "catalog_item"' in statement for statement in sql) == 1
+
+    # Full detail: the whole gallery, in display order.
+    full = get_item(user=user, item_id=item.pk)
+    assert [media.sort_order for media in full.media.all()] == [0, 1, 2]
+
+
+@pytest.mark.django_db
+def test_list_items_prefetches_a_limited_gallery(settings):
+    settings.CATALOG_LIST_IMAGE_LIMIT = 2
+    vendor = VendorFactory.create()
+    first, second = CatalogItemFactory.create_batch(2, vendor=vendor)
+    for item in (first, second):
+        CatalogMedia.objects.create(item=item, url=f"https://cdn.example.com/{item.pk}-a.jpg", sort_order=0)
+        CatalogMedia.objects.create(item=item, url=f"https://cdn.example.com/{item.pk}-b.jpg", sort_order=1)
+        CatalogMedia.objects.create(
+            item=item, url=f"https://cdn.example.com/{item.pk}-p.jpg", sort_order=2, is_primary=True
+        )
+    user = UserFactory.create()
+    VendorMember.objects.create(vendor=vendor, user=user, role=VendorMemberRole.ADMIN, is_active=True)
+
+    items = list(list_items(user=user, filters={"expand": "images"}))
+    assert {item.pk: [media.sort_order for media in item.media.all()] for item in items} == {
+        first.pk: [2, 0],
+        second.pk: [2, 0],
+    }
@@ -0,0 +1,95 @@
+import json
+
+import pytest
+from django.db import connection, transaction
+
+from backend.catalog.models import CatalogItem
+from backend.catalog.selectors.list_items import list_items
+from backend.catalog.tests.factories import CatalogItemFactory, StoreFactory, UserFactory
+from backend.catalog.tests.utils import ensure_vendor_admin
+
+pytestmark = pytest.mark.django_db
+
+# (scope, sort_by) -> the index the first page should be read from.
+EXPECTED_INDEXES = {
+    ("vendor", "created_at"): "item_vendor_created_idx",
+    ("vendor", "updated_at"): "item_vendor_updated_idx",
+    ("vendor", "price"): "item_vendor_price_idx",
+    ("vendor", "name"): "item_vendor_name_idx",
+    ("store", "created_at"): "item_store_created_idx",
+    ("store", "updated_at"): "item_store_updated_idx",
+    ("store", "price"): "item_store_price_idx",
+    ("store", "name"): "item_store_name_idx",
+    ("category", "created_at"): "item_category_created_idx",
+    ("category", "updated_at"): "item_category_updated_idx",
+    ("category", "price"): "item_category_price_idx",
+    ("category", "name"): "item_category_name_idx",
+}
+
+
+@pytest.fixture
+def listing():
+    user = UserFactory.create()
+    vendor, store = ensure_vendor_admin(user)
+    stores = [store, StoreFactory.create(vendor=vendor), StoreFactory.create(vendor=vendor)]
+    categories = ["pokemon_card", "clothing", "video_game", "other"]
+    CatalogItem.objects.bulk_create(
+        CatalogItemFactory.build(vendor=vendor, store=stores[n % 3], category=categories[n % 4], sku=f"PLAN-{n}")
+        for n in range(200)
+    )
+    # Other tenants' stock, so the vendor column is selective as in production.
+    others = [StoreFactory.create() for _ in range(3)]
+    CatalogItem.objects.bulk_create(
+        CatalogItemFactory.build(vendor=other.vendor, store=other, category=categories[n % 4], sku=f"OTHER-{n}")
+        for n, other in enumerate(others * 200)
+    )
+    with connection.cursor() as cursor:
+        # Statistics let the planner prefer the narrowest matching index.
+        cursor.execute("ANALYZE catalog_item")
+    return user, store
+
+
+def _nodes(plan):
+    yield plan
+    for child in plan.get("Plans", ()):
+        yield from _nodes(child)
+
+
+def _page_plan(queryset):
+    sql, params = queryset[:50].query.sql_with_params()
+    with transaction.atomic(), connection.cursor() as cursor:
+        # Small test tables make a full sort look cheap. With sorts and seq scans
+        # priced out, a Sort node only shows up when no index serves the order.
+        cursor.execute("SET LOCAL enable_seqscan = off")
+        cursor.execute("SET LOCAL enable_sort = off")
+        cursor.execute(f"EXPLAIN (FORMAT JSON) {sql}", params)
+        plan = cursor.fetchone()[0]
+    if isinstance(plan, str):
+        plan = json.loads(plan)
+    return list(_nodes(plan[0]["Plan"]))
+
+
+@pytest.mark.parametrize("sort_order", ["asc", "desc"])
+@pytest.mark.parametrize("scope, sort_by", sorted(EXPECTED_INDEXES))
+def test_list_pages_are_index_range_scans(listing, scope, sort_by, sort_order):
+    user, store = listing
+    filters = {"sort_by": sort_by, "sort_order": sort_order}
+    if scope == "store":
+        filters["store"] = store.id
+    elif scope == "category":
+        filters["category"] = "pokemon_card"
+
+    nodes = _page_plan(list_items(user=user, filters=filters))
+
+    assert [node["Node Type"] for node in nodes if node["Node Type"] in {"Sort", "Incremental Sort"}] == []
+    scans = [node for node in nodes if node.get("Relation Name") == "catalog_item"]
+    assert [(scan["Node Type"], scan["Index Name"]) for scan in scans] == [
+        ("Index Scan", EXPECTED_INDEXES[scope, sort_by])
+    ]
+    assert scans[0]["Scan Direction"] == ("Backward" if sort_order == "desc" else "Forward")
+
+
+def test_orderings_break_ties_by_id(listing):
+    user, _ = listing
+    query = str(list_items(user=user, filters={"sort_by": "price", "sort_order": "desc"}).query)
+    assert query.endswith('ORDER BY "catalog_item"."price" DESC, "catalog_item"."id" DESC')
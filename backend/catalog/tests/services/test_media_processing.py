@@ -0,0 +1,120 @@
+from io import BytesIO
+
+import boto3
+import pytest
+from django.core.files.base import ContentFile
+from django.core.files.storage import default_storage
+from django.test.utils import override_settings
+from moto import mock_aws
+from PIL import Image
+
+from backend.catalog.models import CatalogMedia
+from backend.catalog.services.media import add_item_media, sync_item_media
+from backend.catalog.services.media_processing import process_media
+from backend.catalog.tests.factories import CatalogItemFactory
+from backend.core.image_processing import EXIF_ORIENTATION
+from backend.jobs.services.worker import run_pending_jobs
+
+pytestmark = pytest.mark.django_db
+
+
+def _jpeg(size=(900, 600), orientation=None):
+    exif = Image.Exif()
+    if orientation:
+        exif[EXIF_ORIENTATION] = orientation
+    buffer = BytesIO()
+    Image.new("RGB", size, (20, 90, 200)).save(buffer, "JPEG", exif=exif.tobytes())
+    return buffer.getvalue()
+
+
+@pytest.fixture
+def local_media(tmp_path):
+    with override_settings(
+        MEDIA_ROOT=str(tmp_path),
+        IMAGE_PROCESSING_WORKERS=0,
+        CATALOG_MEDIA_DERIVATIVES={"thumb": 300, "display": 600},
+    ):
+        yield tmp_path
+
+
+def test_new_media_gets_derivatives_and_dimensions(local_media):
+    name = default_storage.save("uploads/card.jpg", ContentFile(_jpeg(orientation=8)))
+    item = CatalogItemFactory.create()
+    sync_item_media(item=item, media_payloads=[{"url": f"http://testserver/media/{name}"}])
+
+    assert run_pending_jobs() == 1
+    media = CatalogMedia.objects.get(item=item)
+    assert (media.width, media.height) == (600, 900)
+    assert media.size_kb >= 1
+    assert media.metadata["exif_orientation"] == 8
+    thumb = media.metadata["derivatives"]["thumb"]
+    assert (thumb["width"], thumb["height"]) == (200, 300)
+    assert thumb["url"].endswith(".webp")
+    assert Image.open(local_media / thumb["path"]).format == "WEBP"
+    assert media.metadata["derivatives"]["display"]["height"] == 600
+
+    # Rows that already have derivatives are not processed again.
+    add_item_media(item=item, payload={"url": media.url})
+    assert run_pending_jobs() == 0
+
+
+def test_external_and_broken_images_are_skipped(local_media):
+    name = default_storage.save("uploads/broken.jpg", ContentFile(b"not a jpeg"))
+    item = CatalogItemFactory.create()
+    sync_item_media(
+        item=item,
+        media_payloads=[{"url": "https://cdn.example.com/elsewhere.jpg"}, {"url": f"http://testserver/media/{name}"}],
+    )
+
+    assert process_media(media_ids=list(item.media.values_list("pk", flat=True))) == 0
+    assert all(media.metadata == {} for media in item.media.all())
+
+
+def test_processing_disabled(local_media):
+    item = CatalogItemFactory.create()
+    with override_settings(CATALOG_MEDIA_PROCESSING=False):
+        add_item_media(item=item, payload={"url": "http://testserver/media/uploads/a.jpg"})
+    assert run_pending_jobs() == 0
+
+
+@pytest.fixture
+def s3(monkeypatch):
+    with mock_aws(), override_settings(
+        AWS_STORAGE_BUCKET_NAME="media",
+        AWS_QUERYSTRING_AUTH=False,
+        IMAGE_PROCESSING_WORKERS=0,
+        STORAGES={
+            "default": {"BACKEND": "storages.backends.s3boto3.S3Boto3Storage"},
+            "staticfiles": {"BACKEND": "django.contrib.staticfiles.storage.StaticFilesStorage"},
+        },
+    ):
+        client = boto3.client("s3", region_name="us-east-1")
+        client.create_bucket(Bucket="media")
+        client.put_object(Bucket="media", Key="uploads/card.jpg", Body=_jpeg())
+        monkeypatch.setattr("backend.catalog.services.media_processing.get_storage_client", lambda: client)
+        monkeypatch.setattr("backend.core.storage_cleanup.get_storage_client", lambda: client)
+        yield client
+
+
+def _keys(client):
+    return sorted(obj["Key"] for obj in client.list_objects_v2(Bucket="media").get("Contents", []))
+
+
+def test_s3_derivatives_are_stored_and_cleaned_up_with_the_media(s3):
+    item = CatalogItemFactory.create()
+    payload = {
+        "url": "https://media.s3.amazonaws.com/uploads/card.jpg",
+        "metadata": {"bucket": "media", "path": "uploads/card.jpg"},
+    }
+    sync_item_media(item=item, media_payloads=[payload])
+    assert run_pending_jobs() == 1
+
+    media = CatalogMedia.objects.get(item=item)
+    derivatives = media.metadata["derivatives"]
+    assert derivatives["thumb"]["bucket"] == "media"
+    assert s3.head_object(Bucket="media", Key=derivatives["display"]["path"])["ContentType"] == "image/webp"
+    assert len(_keys(s3)) == 3
+
+    sync_item_media(item=item, media_payloads=[])
+    assert run_pending_jobs() == 1
+    assert _keys(s3) == []
@@ -1,7 +1,14 @@
+import boto3
 import pytest
+from django.test.utils import override_settings
+from moto import mock_aws
 
+from backend.catalog.services.delete_item import delete_item
 from backend.catalog.services.media import MAX_MEDIA_PER_ITEM, sync_item_media
 from backend.catalog.tests.factories import CatalogItemFactory
+from backend.jobs.services.worker import run_pending_jobs
+
+STORAGE_URL = "https://storage.test/s3/media"
 
 
 @pytest.mark.django_db
@@ -68,3 +75,49 @@ def test_sync_item_media_unsupported_type():
 
     with pytest.raises(ValueError, match="Unsupported media type invalid_type"):
         sync_item_media(item=collectible, media_payloads=payloads)
+
+
+@pytest.fixture
+def s3(monkeypatch):
+    with mock_aws(), override_settings(
+        AWS_STORAGE_BUCKET_NAME="media", AWS_S3_ENDPOINT_URL="https://storage.test/s3", CATALOG_MEDIA_PROCESSING=False
+    ):
+        client = boto3.client("s3", region_name="us-east-1")
+        client.create_bucket(Bucket="media")
+        for name in ("a.png", "b.png", "shared.png"):
+            client.put_object(Bucket="media", Key=f"items/{name}", Body=b"png")
+        monkeypatch.setattr("backend.core.storage_cleanup.get_storage_client", lambda: client)
+        yield client
+
+
+def _stored_keys(client):
+    return sorted(obj["Key"] for obj in client.list_objects_v2(Bucket="media").get("Contents", []))
+
+
+@pytest.mark.django_db
+def test_sync_item_media_deletes_dropped_objects_after_commit(s3):
+    collectible = CatalogItemFactory.create()
+    sync_item_media(
+        item=collectible,
+        media_payloads=[{"url": f"{STORAGE_URL}/items/a.png"}, {"url": f"{STORAGE_URL}/items/b.png"}],
+    )
+    assert run_pending_jobs() == 0
+
+    sync_item_media(item=collectible, media_payloads=[{"url": f"{STORAGE_URL}/items/b.png"}])
+    assert _stored_keys(s3) == ["items/a.png", "items/b.png", "items/shared.png"]
+
+    assert run_pending_jobs() == 1
+    assert _stored_keys(s3) == ["items/b.png", "items/shared.png"]
+
+
+@pytest.mark.django_db
+def test_delete_item_keeps_objects_other_items_still_use(s3):
+    shared = f"{STORAGE_URL}/items/shared.png"
+    collectible = CatalogItemFactory.create()
+    sync_item_media(item=collectible, media_payloads=[{"url": f"{STORAGE_URL}/items/a.png"}, {"url": shared}])
+    CatalogItemFactory.create(image_url=shared)
+
+    delete_item(instance=collectible)
+
+    assert run_pending_jobs() == 1
+    assert _stored_keys(s3) == ["items/b.png", "items/shared.png"]
@@ -6,3 +6,10 @@ class CoreConfig(AppConfig):
     name = 'backend.core'
     label = 'backend_core'
     verbose_name = 'Backend Core'
+
+    def ready(self):
+        from django.db.backends.signals import connection_created
+
+        from backend.core.profiling import install_slow_query_logger
+
+        connection_created.connect(install_slow_query_logger, dispatch_uid="core.slow_query_logger")
@@ -0,0 +1,58 @@
+"""
+Async-capable DRF views.
+
+DRF 3.15 only ships synchronous views. ``AsyncAPIView`` keeps DRF's request
+wrapping, authentication, permissions, throttling and exception handling, but
+awaits ``async def`` handlers so I/O-bound endpoints (storage uploads, email,
+remote deletes) do not pin a worker thread while they wait. DRF's sync
+``initial()`` and any sync handlers (e.g. ``options``) run via
+``sync_to_async`` because they may query the database.
+
+Under WSGI Django runs these views in a per-request event loop, so they stay
+correct; the concurrency gains need the ASGI entry point (see README).
+"""
+
+from asgiref.sync import iscoroutinefunction, sync_to_async
+from rest_framework.generics import GenericAPIView
+from rest_framework.views import APIView
+
+
+class AsyncDispatchMixin:
+    """Replace ``APIView.dispatch`` with a coroutine that awaits async handlers."""
+
+    # Django marks the view callable as a coroutine when this is true.
+    view_is_async = True
+
+    async def dispatch(self, request, *args, **kwargs):
+        self.args = args
+        self.kwargs = kwargs
+        request = self.initialize_request(request, *args, **kwargs)
+        self.request = request
+        self.headers = self.default_response_headers
+
+        try:
+            await sync_to_async(self.initial)(request, *args, **kwargs)
+
+            if request.method.lower() in self.http_method_names:
+                handler = getattr(self, request.method.lower(), self.http_method_not_allowed)
+            else:
+                handler = self.http_method_not_allowed
+            if not iscoroutinefunction(handler):
+                handler = sync_to_async(handler)
+            response = await handler(request, *args, **kwargs)
+        except Exception as exc:
+            response = self.handle_exception(exc)
+
+        self.response = self.finalize_response(request, response, *args, **kwargs)
+        return self.response
+
+
+class AsyncAPIView(AsyncDispatchMixin, APIView):
+    """``APIView`` whose ``async def`` handlers are awaited."""
+
+
+class AsyncGenericAPIView(AsyncDispatchMixin, GenericAPIView):
+    """``GenericAPIView`` whose ``async def`` handlers are awaited."""
+
+
+__all__ = ["AsyncAPIView", "AsyncGenericAPIView", "AsyncDispatchMixin"]
@@ -0,0 +1,272 @@
+"""
+Resumable uploads sent in fixed-size chunks.
+
+Protocol (see the ``/api/v1/core/uploads/chunked/`` views):
+
+1. **init** - :func:`start_upload` records the file's name, type and size and
+   fixes ``chunk_size``. With S3 storage it opens a multipart upload. A user
+   can have at most ``CHUNKED_UPLOAD_MAX_OPEN_PER_USER`` unfinished uploads.
+2. **chunk** - :func:`write_chunk` stores the bytes at ``offset`` (a multiple
+   of ``chunk_size``) as S3 part ``offset // chunk_size + 1`` or by writing
+   them at that offset into a part file under ``CHUNKED_UPLOAD_TEMP_DIR``,
+   created with the first chunk. Only one chunk is held in memory.
+   Chunks that were already received are acknowledged without being written
+   again, and :attr:`ChunkedUpload.missing_chunks` tells a resuming client
+   which offsets it still has to send.
+3. **complete** - :func:`complete_upload` completes the multipart upload or
+   streams the part file into ``default_storage`` and returns the public URL.
+
+Uploads that are not completed within ``CHUNKED_UPLOAD_EXPIRY`` seconds are
+aborted by a delayed job, which also discards their parts.
+"""
+
+import os
+import uuid
+from datetime import timedelta
+
+from botocore.exceptions import ClientError
+from django.conf import settings
+from django.contrib.auth import get_user_model
+from django.core.files import File
+from django.core.files.storage import default_storage
+from django.db import transaction
+from django.utils import timezone
+
+from backend.core.models import ChunkedUpload, ChunkedUploadBackend, ChunkedUploadStatus
+from backend.core.storage_client import get_storage_client
+from backend.jobs.services.enqueue import enqueue
+
+EXPIRE_UPLOAD_JOB = "core.expire_chunked_upload"
+# S3 rejects multipart parts below 5 MiB (except the last one).
+S3_MIN_PART_SIZE = 5 * 1024 * 1024
+# Read size when copying a chunk from the request body to disk.
+COPY_BUFFER_SIZE = 64 * 1024
+
+
+class ChunkedUploadError(ValueError):
+    """The request does not fit the upload's state (bad offset, size, missing chunks...)."""
+
+
+def _s3():
+    client = get_storage_client()
+    bucket = getattr(settings, "AWS_STORAGE_BUCKET_NAME", None)
+    if client is None or not bucket:
+        return None, None
+    return client, bucket
+
+
+def _part_path(upload: ChunkedUpload) -> str:
+    return os.path.join(settings.CHUNKED_UPLOAD_TEMP_DIR, f"{upload.pk}.part")
+
+
+def start_upload(*, user, filename: str, content_type: str, size: int) -> ChunkedUpload:
+    """Validate the declared file and open a chunked upload for it."""
+    content_type = (content_type or "").split(";", 1)[0].strip().lower()
+    if content_type not in settings.CHUNKED_UPLOAD_CONTENT_TYPES:
+        raise ChunkedUploadError(f"Unsupported content type: {content_type or 'missing'}")
+    if size <= 0 or size > settings.CHUNKED_UPLOAD_MAX_SIZE:
+        raise ChunkedUploadError(f"File size must be between 1 and {settings.CHUNKED_UPLOAD_MAX_SIZE} bytes.")
+
+    ext = os.path.splitext(filename or "")[1].lstrip(".").lower() or "bin"
+    upload = ChunkedUpload(
+        user=user,
+        filename=filename,
+        content_type=content_type,
+        size=size,
+        chunk_size=settings.CHUNKED_UPLOAD_CHUNK_SIZE,
+        key=f"uploads/{uuid.uuid4()}.{ext}",
+        expires_at=timezone.now() + timedelta(seconds=settings.CHUNKED_UPLOAD_EXPIRY),
+    )
+
+    with transaction.atomic():
+        # Lock the user so concurrent inits cannot both slip under the cap.
+        get_user_model().objects.select_for_update().filter(pk=user.pk).first()
+        open_uploads = ChunkedUpload.objects.filter(
+            user=user, status=ChunkedUploadStatus.UPLOADING, expires_at__gt=timezone.now()
+        ).count()
+        if open_uploads >= settings.CHUNKED_UPLOAD_MAX_OPEN_PER_USER:
+            raise ChunkedUploadError(
+                f"Too many unfinished uploads ({open_uploads}); complete or cancel one first."
+            )
+
+        client, bucket = _s3()
+        if client is not None:
+            upload.backend = ChunkedUploadBackend.S3
+            upload.bucket = bucket
+            upload.chunk_size = max(upload.chunk_size, S3_MIN_PART_SIZE)
+            params = {"Bucket": bucket, "Key": upload.key, "ContentType": content_type}
+            cache_control = (getattr(settings, "AWS_S3_OBJECT_PARAMETERS", None) or {}).get("CacheControl")
+            if cache_control:
+                params["CacheControl"] = cache_control
+            upload.multipart_upload_id = client.create_multipart_upload(**params)["UploadId"]
+        else:
+            # The part file is created by the first chunk, not reserved here.
+            upload.backend = ChunkedUploadBackend.LOCAL
+
+        upload.save()
+        enqueue(
+            EXPIRE_UPLOAD_JOB,
+            {"upload_id": str(upload.pk)},
+            delay=timedelta(seconds=settings.CHUNKED_UPLOAD_EXPIRY),
+        )
+    return upload
+
+
+def _ensure_uploading(upload: ChunkedUpload) -> None:
+    if upload.status != ChunkedUploadStatus.UPLOADING:
+        raise ChunkedUploadError(f"Upload is {upload.status}.")
+    if upload.expires_at <= timezone.now():
+        raise ChunkedUploadError("Upload has expired.")
+
+
+def _copy_to_part_file(upload: ChunkedUpload, offset: int, stream, length: int) -> None:
+    written = 0
+    os.makedirs(settings.CHUNKED_UPLOAD_TEMP_DIR, exist_ok=True)
+    # Chunks arrive in any order and in parallel: open without truncating.
+    fd = os.open(_part_path(upload), os.O_RDWR | os.O_CREAT, 0o600)
+    with os.fdopen(fd, "r+b") as handle:
+        handle.seek(offset)
+        while written < length:
+            data = stream.read(min(COPY_BUFFER_SIZE, length - written))
+            if not data:
+                break
+            handle.write(data)
+            written += len(data)
+    if written != length:
+        raise ChunkedUploadError(f"Chunk at offset {offset} was cut off after {written} of {length} bytes.")
+
+
+def _upload_part(upload: ChunkedUpload, index: int, stream, length: int) -> str:
+    body = stream.read(length)
+    if len(body) != length:
+        raise ChunkedUploadError(f"Chunk at offset {index * upload.chunk_size} was cut off.")
+    client, _ = _s3()
+    response = client.upload_part(
+        Bucket=upload.bucket,
+        Key=upload.key,
+        UploadId=upload.multipart_upload_id,
+        PartNumber=index + 1,
+        Body=body,
+    )
+    return response["ETag"]
+
+
+def write_chunk(*, upload: ChunkedUpload, offset: int, stream, length: int) -> ChunkedUpload:
+    """
+    Store the ``length`` bytes read from ``stream`` as the chunk starting at ``offset``.
+
+    Every chunk except the last must be exactly ``chunk_size`` bytes. Re-sent
+    chunks (a retry after a lost response) are acknowledged without being
+    read or stored again. Returns the refreshed upload.
+    """
+    _ensure_uploading(upload)
+    if offset < 0 or offset >= upload.size or offset % upload.chunk_size:
+        raise ChunkedUploadError(f"Offset must be a multiple of {upload.chunk_size} below {upload.size}.")
+    index = offset // upload.chunk_size
+    expected = min(upload.chunk_size, upload.size - offset)
+    if length != expected:
+        raise ChunkedUploadError(f"Chunk at offset {offset} must be {expected} bytes, got {length}.")
+    if str(index) in upload.parts:
+        return upload
+
+    part = {"size": length}
+    if upload.backend == ChunkedUploadBackend.S3:
+        part["etag"] = _upload_part(upload, index, stream, length)
+    else:
+        _copy_to_part_file(upload, offset, stream, length)
+
+    # Chunks may arrive in parallel; merge under a row lock.
+    with transaction.atomic():
+        upload = ChunkedUpload.objects.select_for_update().get(pk=upload.pk)
+        _ensure_uploading(upload)
+        upload.parts[str(index)] = part
+        upload.save(update_fields=["parts", "updated_at"])
+    return upload
+
+
+def complete_upload(*, upload: ChunkedUpload) -> ChunkedUpload:
+    """Assemble the received chunks into the final object; safe to retry once complete."""
+    with transaction.atomic():
+        upload = ChunkedUpload.objects.select_for_update().get(pk=upload.pk)
+        if upload.status == ChunkedUploadStatus.COMPLETE:
+            return upload
+        _ensure_uploading(upload)
+        missing = upload.missing_chunks
+        if missing:
+            offsets = ", ".join(str(index * upload.chunk_size) for index in missing[:20])
+            raise ChunkedUploadError(f"{len(missing)} chunk(s) missing, at offsets {offsets}.")
+
+        if upload.backend == ChunkedUploadBackend.S3:
+            client, _ = _s3()
+            client.complete_multipart_upload(
+                Bucket=upload.bucket,
+                Key=upload.key,
+                UploadId=upload.multipart_upload_id,
+                MultipartUpload={
+                    "Parts": [
+                        {"ETag": upload.parts[str(index)]["etag"], "PartNumber": index + 1}
+                        for index in upload.received_chunks
+                    ]
+                },
+            )
+            name = upload.key
+        else:
+            path = _part_path(upload)
+            with open(path, "rb") as handle:
+                # default_storage reads the file in chunks; it is never loaded whole.
+                name = default_storage.save(upload.key, File(handle, name=upload.filename))
+            os.remove(path)
+
+        upload.key = name
+        upload.url = default_storage.url(name)
+        upload.status = ChunkedUploadStatus.COMPLETE
+        upload.save(update_fields=["key", "url", "status", "updated_at"])
+    return upload
+
+
+def _discard_parts(upload: ChunkedUpload) -> None:
+    if upload.backend == ChunkedUploadBackend.S3:
+        client, _ = _s3()
+        if client is None:
+            return
+        try:
+            client.abort_multipart_upload(
+                Bucket=upload.bucket, Key=upload.key, UploadId=upload.multipart_upload_id
+            )
+        except ClientError as exc:
+            if exc.response.get("Error", {}).get("Code") != "NoSuchUpload":
+                raise
+    else:
+        try:
+            os.remove(_part_path(upload))
+        except FileNotFoundError:
+            pass
+
+
+def abort_upload(*, upload: ChunkedUpload) -> None:
+    """Cancel an unfinished upload and discard its chunks; completed uploads are left alone."""
+    with transaction.atomic():
+        upload = ChunkedUpload.objects.select_for_update().get(pk=upload.pk)
+        if upload.status != ChunkedUploadStatus.UPLOADING:
+            return
+        _discard_parts(upload)
+        upload.status = ChunkedUploadStatus.ABORTED
+        upload.save(update_fields=["status", "updated_at"])
+
+
+def expire_upload(upload_id: str) -> None:
+    """Job entry point: abort the upload if it is still unfinished."""
+    upload = ChunkedUpload.objects.filter(pk=upload_id).first()
+    if upload is not None:
+        abort_upload(upload=upload)
+
+
+__all__ = [
+    "ChunkedUploadError",
+    "EXPIRE_UPLOAD_JOB",
+    "abort_upload",
+    "complete_upload",
+    "expire_upload",
+    "start_upload",
+    "write_chunk",
+]
@@ -0,0 +1,287 @@
+"""
+Content-addressed uploads: identical files are stored once and reference counted.
+
+``UploadFileView`` installs :class:`HashingUploadHandler`, which feeds every
+chunk of the multipart body through SHA-256 while Django parses it, so the
+digest is known without a second pass over the file. :func:`find_upload`
+looks the digest up in the :class:`~backend.core.models.StoredObject` index;
+on a hit the existing URL is returned and nothing is written. New files are
+saved under :func:`content_key` and registered with :func:`register_upload`.
+
+Services that add or drop media rows call :func:`update_references` with the
+URLs involved. Objects whose count reaches zero are not deleted right away:
+:func:`collect_unreferenced_objects` removes them in batches once they have
+been unreferenced for ``CONTENT_STORE_GRACE_PERIOD`` seconds, after checking
+the ``CONTENT_STORE_REFERENCES`` columns once more. The per-row cleanup jobs
+(``delete_objects_or_raise``) leave indexed objects to this collector.
+"""
+
+import hashlib
+import os
+from collections import Counter
+from datetime import timedelta
+from typing import Dict, Iterable, List, Optional, Set
+
+from django.apps import apps
+from django.conf import settings
+from django.core.files.storage import default_storage
+from django.core.files.uploadhandler import FileUploadHandler
+from django.db import IntegrityError, transaction
+from django.db.models import Case, F, Q, When
+from django.db.models.functions import Reverse
+from django.utils import timezone
+
+from backend.core.models import CONTENT_KEY_RE, StoredObject
+from backend.core.storage_cleanup import StorageCleanupError, delete_objects, storage_object_for
+from backend.core.storage_client import get_storage_client
+from backend.jobs.models import Job, JobStatus
+from backend.jobs.services.enqueue import enqueue
+
+COLLECT_JOB = "core.collect_unreferenced_objects"
+
+
+class HashingUploadHandler(FileUploadHandler):
+    """
+    Upload handler that hashes each file as it streams in and passes the data on unchanged.
+
+    Insert it before Django's default handlers; the digests end up in
+    ``digests`` keyed by form field name.
+    """
+
+    def __init__(self, request=None):
+        super().__init__(request)
+        self.digests: Dict[str, str] = {}
+        self._hash = None
+
+    def new_file(self, *args, **kwargs):
+        super().new_file(*args, **kwargs)
+        self._hash = hashlib.sha256()
+
+    def receive_data_chunk(self, raw_data, start):
+        self._hash.update(raw_data)
+        return raw_data
+
+    def file_complete(self, file_size):
+        self.digests[self.field_name] = self._hash.hexdigest()
+        # Let the next handler build the UploadedFile.
+        return None
+
+
+def install_hashing_handler(request) -> HashingUploadHandler:
+    """Hash uploads on ``request``; must run before ``request.FILES`` is accessed."""
+    handler = HashingUploadHandler(request)
+    request.upload_handlers.insert(0, handler)
+    return handler
+
+
+def content_key(sha256: str, filename: str) -> str:
+    """Storage name for content with the given digest."""
+    ext = os.path.splitext(filename or "")[1].lstrip(".").lower()
+    if not ext.isalnum():
+        ext = "bin"
+    return f"uploads/{sha256}.{ext}"
+
+
+def _storage_key(url: Optional[str]) -> Optional[str]:
+    """Storage name of a content-addressed object behind ``url``, if it is one."""
+    if not url:
+        return None
+    obj = storage_object_for(url)
+    if obj is not None:
+        key = obj["key"]
+    else:
+        path = url.split("?", 1)[0]
+        marker = f"{settings.MEDIA_URL.rstrip('/')}/"
+        key = path.split(marker, 1)[1] if marker in path else path.lstrip("/")
+    return key if CONTENT_KEY_RE.match(key) else None
+
+
+def _claim_existing(**lookup) -> Optional[StoredObject]:
+    """
+    Lock the matching object and restart its grace period if it is unreferenced.
+
+    The collector deletes under the same row lock, so the object returned here
+    was not collected and gets a full grace period to be attached. ``None`` if
+    there is no such object (or the collector just removed it).
+    """
+    with transaction.atomic():
+        stored = StoredObject.objects.select_for_update().filter(**lookup).first()
+        if stored is not None and stored.ref_count <= 0:
+            stored.orphaned_at = timezone.now()
+            stored.save(update_fields=["orphaned_at", "updated_at"])
+    return stored
+
+
+def find_upload(sha256: str) -> Optional[StoredObject]:
+    """Existing object with this digest, if any, kept alive for another grace period."""
+    return _claim_existing(sha256=sha256)
+
+
+def register_upload(*, sha256: str, key: str, size: int, content_type: str = "") -> StoredObject:
+    """
+    Index a freshly saved object under its digest.
+
+    If a concurrent upload of the same bytes registered first, the copy at
+    ``key`` is deleted and the winner returned. New objects start unreferenced
+    (within the grace period) until a media row points at them.
+    """
+    try:
+        with transaction.atomic():
+            stored = StoredObject.objects.create(
+                sha256=sha256,
+                key=key,
+                size=size,
+                content_type=content_type or "",
+                orphaned_at=timezone.now(),
+            )
+    except IntegrityError:
+        stored = _claim_existing(sha256=sha256)
+        if stored is None:
+            # The winner was collected in the meantime; index this copy instead.
+            return register_upload(sha256=sha256, key=key, size=size, content_type=content_type)
+        if stored.key != key:
+            default_storage.delete(key)
+        return stored
+    schedule_collection()
+    return stored
+
+
+def update_references(*, added: Iterable[Optional[str]] = (), removed: Iterable[Optional[str]] = ()) -> None:
+    """
+    Adjust reference counts for media rows pointing at ``added``/``removed`` URLs.
+
+    Call inside the transaction that creates or drops the rows. URLs that are
+    not content-addressed uploads are ignored without a query.
+    """
+    delta: Counter = Counter()
+    for url in added:
+        key = _storage_key(url)
+        if key:
+            delta[key] += 1
+    for url in removed:
+        key = _storage_key(url)
+        if key:
+            delta[key] -= 1
+    delta = Counter({key: change for key, change in delta.items() if change})
+    if not delta:
+        return
+
+    objects = StoredObject.objects.filter(key__in=list(delta))
+    objects.update(
+        ref_count=Case(*(When(key=key, then=F("ref_count") + change) for key, change in delta.items()))
+    )
+    objects.filter(ref_count__gt=0).exclude(orphaned_at=None).update(orphaned_at=None)
+    if objects.filter(ref_count__lte=0, orphaned_at=None).update(orphaned_at=timezone.now()):
+        schedule_collection()
+
+
+def schedule_collection(delay: Optional[timedelta] = None) -> None:
+    """Queue the collector unless a run is already queued."""
+    if Job.objects.filter(name=COLLECT_JOB, status=JobStatus.QUEUED).exists():
+        return
+    if delay is None:
+        delay = timedelta(seconds=settings.CONTENT_STORE_GRACE_PERIOD)
+    enqueue(COLLECT_JOB, delay=delay)
+
+
+def _live_references(batch: List[StoredObject]) -> Counter:
+    """
+    How many rows in ``CONTENT_STORE_REFERENCES`` still point at each object.
+
+    A URL references a key when it ends with it. Each column has an index on
+    its reversed value (``text_pattern_ops``), so the match is run as indexed
+    prefix lookups on ``REVERSE(column)`` rather than ``LIKE '%key'`` scans.
+    """
+    counts: Counter = Counter()
+    keys = [stored.key for stored in batch]
+    for reference in settings.CONTENT_STORE_REFERENCES:
+        app_label, model_name, field = reference.split(".")
+        model = apps.get_model(app_label, model_name)
+        query = Q()
+        for key in keys:
+            query |= Q(_reversed_url__startswith=key[::-1])
+        rows = model._default_manager.annotate(_reversed_url=Reverse(field)).filter(query)
+        for url in rows.values_list(field, flat=True):
+            path = url.split("?", 1)[0]
+            counts.update(key for key in keys if path.endswith(key))
+    return counts
+
+
+def _delete_stored(batch: List[StoredObject]) -> Set[str]:
+    """Delete the objects from storage; returns the keys that could not be deleted."""
+    client = get_storage_client()
+    if client is None:
+        for stored in batch:
+            default_storage.delete(stored.key)
+        return set()
+    bucket = settings.AWS_STORAGE_BUCKET_NAME
+    failures = delete_objects([{"bucket": bucket, "key": stored.key} for stored in batch], client=client)
+    return {failure["key"] for failure in failures}
+
+
+def collect_unreferenced_objects(*, batch_size: Optional[int] = None) -> int:
+    """
+    Delete objects that have been unreferenced for the grace period; returns how many.
+
+    Works through batches of ``CONTENT_STORE_GC_BATCH_SIZE`` rows, each
+    removed with batched storage deletes. Objects that turn out to be still
+    referenced get their count repaired instead. Raises
+    :class:`StorageCleanupError` after the run if some deletes failed, so the
+    job is retried.
+    """
+    batch_size = batch_size or settings.CONTENT_STORE_GC_BATCH_SIZE
+    grace = timedelta(seconds=settings.CONTENT_STORE_GRACE_PERIOD)
+    cutoff = timezone.now() - grace
+    collected = 0
+    failed_ids: List[int] = []
+    failures: List[Dict[str, str]] = []
+    while True:
+        with transaction.atomic():
+            batch = list(
+                StoredObject.objects.select_for_update(skip_locked=True)
+                .filter(ref_count__lte=0, orphaned_at__lte=cutoff)
+                .exclude(pk__in=failed_ids)
+                .order_by("orphaned_at", "id")[:batch_size]
+            )
+            if not batch:
+                break
+            live = _live_references(batch)
+            for stored in batch:
+                if live[stored.key]:
+                    StoredObject.objects.filter(pk=stored.pk).update(ref_count=live[stored.key], orphaned_at=None)
+            dead = [stored for stored in batch if not live[stored.key]]
+            failed = _delete_stored(dead)
+            # The batch is still locked, so no upload or reference can have claimed these rows since.
+            StoredObject.objects.filter(
+                pk__in=[stored.pk for stored in dead if stored.key not in failed], ref_count__lte=0
+            ).delete()
+            collected += len(dead) - len(failed)
+            for stored in dead:
+                if stored.key in failed:
+                    failed_ids.append(stored.pk)
+                    failures.append({"bucket": getattr(settings, "AWS_STORAGE_BUCKET_NAME", ""), "key": stored.key})
+
+    next_orphan = (
+        StoredObject.objects.filter(ref_count__lte=0, orphaned_at__gt=cutoff)
+        .order_by("orphaned_at")
+        .values_list("orphaned_at", flat=True)
+        .first()
+    )
+    if next_orphan is not None:
+        schedule_collection(delay=max(next_orphan + grace - timezone.now(), timedelta()))
+    if failures:
+        raise StorageCleanupError(failures)
+    return collected
+
+
+__all__ = [
+    "COLLECT_JOB",
+    "HashingUploadHandler",
+    "collect_unreferenced_objects",
+    "content_key",
+    "find_upload",
+    "install_hashing_handler",
+    "register_upload",
+    "schedule_collection",
+    "update_references",
+]
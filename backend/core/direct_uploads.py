@@ -0,0 +1,246 @@
+"""
+Direct-to-storage uploads with presigned URLs.
+
+Instead of streaming the file through a Django worker, the client:
+
+1. asks for an upload slot (:func:`create_upload_slot`) declaring the file's
+   name, content type and size, and gets a presigned ``PUT`` URL plus a signed
+   token. Content type and length are signed headers, so the bucket rejects
+   any other body;
+2. uploads the bytes straight to the S3-compatible bucket;
+3. confirms with the token (:func:`verify_upload`). The server checks the
+   stored object with a ``HEAD`` request and only then registers it as
+   ``CatalogMedia``/``UserMedia``.
+
+Each slot is a :class:`~backend.core.models.DirectUpload` row. The token is
+signed with ``SECRET_KEY`` and names that row; confirming uses it up, so a
+token cannot be replayed to attach the same object elsewhere. Slots nobody
+confirms are expired by a delayed job that deletes the uploaded object.
+"""
+
+import os
+import uuid
+from datetime import timedelta
+from typing import Any, Dict
+
+from botocore.exceptions import BotoCoreError, ClientError
+from django.conf import settings
+from django.core import signing
+from django.core.files.storage import default_storage
+from django.db import transaction
+from django.utils import timezone
+
+from backend.core.models import DirectUpload, DirectUploadStatus
+from backend.core.storage_client import get_storage_client
+from backend.jobs.services.enqueue import enqueue
+
+UPLOAD_TOKEN_SALT = "backend.core.direct_uploads"
+EXPIRE_SLOT_JOB = "core.expire_direct_upload"
+
+
+class DirectUploadError(ValueError):
+    """The upload slot or the uploaded object is not acceptable."""
+
+
+class DirectUploadsUnavailable(DirectUploadError):
+    """Presigned uploads need S3-compatible storage, which is not configured."""
+
+
+class DirectUploadRejected(DirectUploadError):
+    """The uploaded object does not match its slot and was deleted."""
+
+
+def _media_type(content_type: str) -> str:
+    return (content_type or "").split(";", 1)[0].strip().lower()
+
+
+def _storage():
+    client = get_storage_client()
+    bucket = getattr(settings, "AWS_STORAGE_BUCKET_NAME", None)
+    if client is None or not bucket:
+        raise DirectUploadsUnavailable(
+            "Direct uploads need S3-compatible storage; use /api/v1/core/upload/ instead."
+        )
+    return client, bucket
+
+
+def _confirm_window() -> int:
+    # Allow a confirm that starts just before the presigned URL expires.
+    return settings.DIRECT_UPLOAD_EXPIRY * 2
+
+
+def create_upload_slot(*, user_id: int, filename: str, content_type: str, size: int) -> Dict[str, Any]:
+    """
+    Validate the declared file and presign a ``PUT`` for a fresh object key.
+
+    The returned ``headers`` must be sent with the upload; they are part of the
+    signature, so the stored object gets the declared content type and size.
+    """
+    content_type = _media_type(content_type)
+    if content_type not in settings.DIRECT_UPLOAD_CONTENT_TYPES:
+        raise DirectUploadError(f"Unsupported content type: {content_type or 'missing'}")
+    if size <= 0 or size > settings.DIRECT_UPLOAD_MAX_SIZE:
+        raise DirectUploadError(f"File size must be between 1 and {settings.DIRECT_UPLOAD_MAX_SIZE} bytes.")
+
+    client, bucket = _storage()
+    ext = os.path.splitext(filename or "")[1].lstrip(".").lower() or "bin"
+    key = f"uploads/{uuid.uuid4()}.{ext}"
+    expires_in = settings.DIRECT_UPLOAD_EXPIRY
+    params = {"Bucket": bucket, "Key": key, "ContentType": content_type, "ContentLength": size}
+    headers = {"Content-Type": content_type, "Content-Length": str(size)}
+    cache_control = (getattr(settings, "AWS_S3_OBJECT_PARAMETERS", None) or {}).get("CacheControl")
+    if cache_control:
+        params["CacheControl"] = cache_control
+        headers["Cache-Control"] = cache_control
+
+    upload_url = client.generate_presigned_url("put_object", Params=params, ExpiresIn=expires_in)
+    with transaction.atomic():
+        slot = DirectUpload.objects.create(
+            user_id=user_id,
+            bucket=bucket,
+            key=key,
+            content_type=content_type,
+            size=size,
+            expires_at=timezone.now() + timedelta(seconds=_confirm_window()),
+        )
+        enqueue(EXPIRE_SLOT_JOB, {"slot_id": str(slot.pk)}, delay=timedelta(seconds=_confirm_window()))
+    token = signing.dumps({"u": user_id, "id": str(slot.pk)}, salt=UPLOAD_TOKEN_SALT)
+    return {
+        "token": token,
+        "upload_url": upload_url,
+        "method": "PUT",
+        "headers": headers,
+        "key": key,
+        "expires_in": expires_in,
+    }
+
+
+def _delete_quietly(client, bucket: str, key: str) -> None:
+    try:
+        client.delete_object(Bucket=bucket, Key=key)
+    except (ClientError, BotoCoreError):
+        pass
+
+
+def claim_upload(*, token: str, user_id: int) -> DirectUpload:
+    """
+    Use up the slot named by ``token``; a token can only be claimed once.
+
+    Pair with :func:`inspect_upload` and hand any error it raises to
+    :func:`release_upload`, as :func:`verify_upload` does.
+    """
+    try:
+        data = signing.loads(token, salt=UPLOAD_TOKEN_SALT, max_age=_confirm_window())
+    except signing.BadSignature as exc:
+        raise DirectUploadError("Invalid or expired upload token.") from exc
+    if data.get("u") != user_id:
+        raise DirectUploadError("Invalid or expired upload token.")
+
+    with transaction.atomic():
+        slot = DirectUpload.objects.select_for_update().filter(pk=data["id"], user_id=user_id).first()
+        if slot is None or slot.status == DirectUploadStatus.EXPIRED or slot.expires_at <= timezone.now():
+            raise DirectUploadError("Invalid or expired upload token.")
+        if slot.status != DirectUploadStatus.PENDING:
+            raise DirectUploadError(f"This upload was already {slot.status}.")
+        slot.status = DirectUploadStatus.CONFIRMED
+        slot.save(update_fields=["status", "updated_at"])
+    return slot
+
+
+def inspect_upload(slot: DirectUpload) -> Dict[str, Any]:
+    """
+    Check the uploaded object against its slot and return its storage details.
+
+    A ``HEAD`` request confirms the object exists with the declared size and
+    content type. Objects that do not match are deleted so rejected uploads do
+    not linger in the bucket. Makes no database queries, so it can run in a
+    worker thread.
+    """
+    client, _ = _storage()
+    bucket, key = slot.bucket, slot.key
+    try:
+        head = client.head_object(Bucket=bucket, Key=key)
+    except ClientError as exc:
+        if exc.response.get("Error", {}).get("Code") in ("404", "NoSuchKey", "NotFound"):
+            raise DirectUploadError("The file has not been uploaded yet.") from exc
+        raise
+
+    size = head.get("ContentLength")
+    content_type = _media_type(head.get("ContentType"))
+    if size != slot.size or content_type != slot.content_type:
+        _delete_quietly(client, bucket, key)
+        raise DirectUploadRejected(
+            f"Uploaded file does not match the upload slot (got {size} bytes of {content_type or 'unknown type'})."
+        )
+
+    return {
+        "bucket": bucket,
+        "key": key,
+        "url": default_storage.url(key),
+        "size": size,
+        "content_type": content_type,
+    }
+
+
+def release_upload(slot: DirectUpload, error: Exception) -> None:
+    """Reopen a slot whose check failed so it can be confirmed again, unless its object was rejected."""
+    status = DirectUploadStatus.REJECTED if isinstance(error, DirectUploadRejected) else DirectUploadStatus.PENDING
+    DirectUpload.objects.filter(pk=slot.pk, status=DirectUploadStatus.CONFIRMED).update(
+        status=status, updated_at=timezone.now()
+    )
+
+
+def verify_upload(*, token: str, user_id: int) -> Dict[str, Any]:
+    """Claim the slot named by ``token`` and check its object (see :func:`inspect_upload`)."""
+    slot = claim_upload(token=token, user_id=user_id)
+    try:
+        return inspect_upload(slot)
+    except Exception as exc:
+        release_upload(slot, exc)
+        raise
+
+
+def expire_upload_slot(slot_id: str) -> None:
+    """Job entry point: delete the object of a slot that was never confirmed."""
+    with transaction.atomic():
+        slot = (
+            DirectUpload.objects.select_for_update()
+            .filter(pk=slot_id, status=DirectUploadStatus.PENDING)
+            .first()
+        )
+        if slot is None:
+            return
+        client = get_storage_client()
+        if client is not None:
+            _delete_quietly(client, slot.bucket, slot.key)
+        slot.status = DirectUploadStatus.EXPIRED
+        slot.save(update_fields=["status", "updated_at"])
+
+
+def media_payload(upload: Dict[str, Any], **fields) -> Dict[str, Any]:
+    """Media row payload (``CatalogMedia``/``UserMedia``) for a verified upload."""
+    return {
+        **fields,
+        "url": upload["url"],
+        "size_kb": max(1, round(upload["size"] / 1024)),
+        "metadata": {
+            "bucket": upload["bucket"],
+            "path": upload["key"],
+            "content_type": upload["content_type"],
+        },
+    }
+
+
+__all__ = [
+    "DirectUploadError",
+    "DirectUploadRejected",
+    "DirectUploadsUnavailable",
+    "EXPIRE_SLOT_JOB",
+    "claim_upload",
+    "create_upload_slot",
+    "expire_upload_slot",
+    "inspect_upload",
+    "media_payload",
+    "release_upload",
+    "verify_upload",
+]
@@ -0,0 +1,51 @@
+"""Query-parameter filtering for DRF views (a small subset of django-filter)."""
+
+from django.core.exceptions import ValidationError as DjangoValidationError
+from rest_framework.exceptions import ValidationError
+from rest_framework.filters import BaseFilterBackend
+
+
+class FieldFilterBackend(BaseFilterBackend):
+    """
+    Exact-match filters for the fields a view lists in ``filterset_fields``.
+
+    ``?type=etb&set__code=SV03`` becomes ``filter(type="etb", set__code="SV03")``;
+    a comma-separated value matches any of the values (``__in``). Parameters not
+    in ``filterset_fields`` are ignored.
+    """
+
+    def get_filter_fields(self, view):
+        return list(getattr(view, "filterset_fields", None) or [])
+
+    def filter_queryset(self, request, queryset, view):
+        lookups = {}
+        for field in self.get_filter_fields(view):
+            raw = request.query_params.get(field)
+            if raw is None or raw == "":
+                continue
+            values = [value.strip() for value in raw.split(",") if value.strip()]
+            if len(values) > 1:
+                lookups[f"{field}__in"] = values
+            elif values:
+                lookups[field] = values[0]
+        if not lookups:
+            return queryset
+        try:
+            return queryset.filter(**lookups)
+        except (DjangoValidationError, ValueError, TypeError) as exc:
+            raise ValidationError({"detail": f"Invalid filter value: {exc}"}) from exc
+
+    def get_schema_operation_parameters(self, view):
+        return [
+            {
+                "name": field,
+                "required": False,
+                "in": "query",
+                "description": f"Filter by {field.replace('__', ' ')}; comma-separate values to match any.",
+                "schema": {"type": "string"},
+            }
+            for field in self.get_filter_fields(view)
+        ]
+
+
+__all__ = ["FieldFilterBackend"]
@@ -0,0 +1,128 @@
+"""
+CPU-bound image work (decode, EXIF orientation, resize, WebP encode).
+
+:func:`render_derivatives` is a pure function over bytes so it can run in a
+separate process: :func:`process_images` fans a batch of images out over a
+``ProcessPoolExecutor`` with ``IMAGE_PROCESSING_WORKERS`` processes, keeping
+Pillow's decode/encode off the job worker's thread and using several cores
+for galleries. With ``IMAGE_PROCESSING_WORKERS = 0`` everything runs in-process.
+"""
+
+import multiprocessing
+import threading
+from concurrent.futures import ProcessPoolExecutor
+from io import BytesIO
+from typing import Any, Dict, List, Mapping, Optional
+
+from django.conf import settings
+from PIL import Image, ImageOps, UnidentifiedImageError
+
+# EXIF tag holding the camera orientation (1-8).
+EXIF_ORIENTATION = 0x0112
+# Orientations that swap width and height once applied.
+_TRANSPOSED_ORIENTATIONS = {5, 6, 7, 8}
+
+_pool: Optional[ProcessPoolExecutor] = None
+_pool_lock = threading.Lock()
+
+
+class ImageProcessingError(ValueError):
+    """The source bytes are not an image Pillow can decode."""
+
+
+def render_derivatives(data: bytes, sizes: Mapping[str, int], quality: int = 80) -> Dict[str, Any]:
+    """
+    Decode ``data`` and render one WebP per ``sizes`` entry (name -> longest edge).
+
+    Images are turned upright according to their EXIF orientation first and
+    are never upscaled. Returns the upright ``width``/``height``, the EXIF
+    ``orientation``, the source ``format`` and ``derivatives`` as
+    ``{name: {"data", "width", "height"}}``.
+    """
+    try:
+        image = Image.open(BytesIO(data))
+    except (UnidentifiedImageError, OSError, Image.DecompressionBombError) as exc:
+        raise ImageProcessingError(str(exc)) from exc
+
+    with image:
+        source_format = image.format
+        orientation = image.getexif().get(EXIF_ORIENTATION, 1)
+        width, height = image.size
+        if orientation in _TRANSPOSED_ORIENTATIONS:
+            width, height = height, width
+        if sizes and source_format == "JPEG":
+            # Let libjpeg decode at a reduced scale; it never goes below the requested box.
+            edge = max(sizes.values())
+            image.draft("RGB", (edge, edge))
+        try:
+            # Decoding happens here; truncated files fail at this point.
+            upright = ImageOps.exif_transpose(image)
+            has_alpha = upright.mode in ("RGBA", "LA", "PA") or "transparency" in upright.info
+            upright = upright.convert("RGBA" if has_alpha else "RGB")
+        except OSError as exc:
+            raise ImageProcessingError(str(exc)) from exc
+
+    derivatives = {}
+    for name, edge in sizes.items():
+        resized = upright.copy()
+        resized.thumbnail((edge, edge), Image.Resampling.LANCZOS)
+        buffer = BytesIO()
+        resized.save(buffer, "WEBP", quality=quality, method=4)
+        derivatives[name] = {"data": buffer.getvalue(), "width": resized.width, "height": resized.height}
+
+    return {
+        "width": width,
+        "height": height,
+        "orientation": orientation,
+        "format": source_format,
+        "derivatives": derivatives,
+    }
+
+
+def _render_or_error(data: bytes, sizes: Mapping[str, int], quality: int):
+    # Exceptions from worker processes are pickled; return them as values instead.
+    try:
+        return render_derivatives(data, sizes, quality)
+    except ImageProcessingError as exc:
+        return exc
+
+
+def _get_pool(workers: int) -> ProcessPoolExecutor:
+    global _pool
+    with _pool_lock:
+        if _pool is None:
+            # "spawn" avoids forking a process that holds DB connections and boto3 pools.
+            _pool = ProcessPoolExecutor(max_workers=workers, mp_context=multiprocessing.get_context("spawn"))
+        return _pool
+
+
+def shutdown_pool() -> None:
+    """Stop the worker processes (they are restarted on next use)."""
+    global _pool
+    with _pool_lock:
+        if _pool is not None:
+            _pool.shutdown()
+            _pool = None
+
+
+def process_images(sources: List[bytes], sizes: Mapping[str, int], quality: int = 80) -> List[Any]:
+    """
+    Run :func:`render_derivatives` for each source, in the process pool when enabled.
+
+    Returns results in input order; an undecodable source yields its
+    :class:`ImageProcessingError` instead of a result.
+    """
+    workers = settings.IMAGE_PROCESSING_WORKERS
+    if workers <= 0 or len(sources) == 0:
+        return [_render_or_error(data, sizes, quality) for data in sources]
+    pool = _get_pool(workers)
+    futures = [pool.submit(_render_or_error, data, dict(sizes), quality) for data in sources]
+    return [future.result() for future in futures]
+
+
+__all__ = [
+    "ImageProcessingError",
+    "process_images",
+    "render_derivatives",
+    "shutdown_pool",
+]
@@ -0,0 +1,71 @@
+"""
+Minimal in-process metrics: named counters and timers.
+
+Each worker process keeps its own figures; ``GET /api/v1/core/metrics/``
+(staff only) returns the current process's snapshot. Names are dotted,
+e.g. ``catalog.list_cache.hit``.
+"""
+
+import os
+import threading
+import time
+from contextlib import contextmanager
+from typing import Dict, Iterator
+
+
+class Metrics:
+    """Thread-safe counters (``incr``) and timers (``observe``, in milliseconds)."""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._counters: Dict[str, float] = {}
+        self._timers: Dict[str, Dict[str, float]] = {}
+        self._started = time.time()
+
+    def incr(self, name: str, value: float = 1) -> None:
+        with self._lock:
+            self._counters[name] = self._counters.get(name, 0) + value
+
+    def observe(self, name: str, ms: float) -> None:
+        with self._lock:
+            timer = self._timers.setdefault(name, {"count": 0, "total_ms": 0.0, "max_ms": 0.0})
+            timer["count"] += 1
+            timer["total_ms"] += ms
+            timer["max_ms"] = max(timer["max_ms"], ms)
+
+    @contextmanager
+    def timer(self, name: str) -> Iterator[None]:
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.observe(name, (time.perf_counter() - start) * 1000)
+
+    def mean_ms(self, name: str) -> float:
+        with self._lock:
+            timer = self._timers.get(name)
+            return timer["total_ms"] / timer["count"] if timer and timer["count"] else 0.0
+
+    def snapshot(self) -> Dict[str, object]:
+        with self._lock:
+            return {
+                "pid": os.getpid(),
+                "since": self._started,
+                "counters": dict(self._counters),
+                "timers": {
+                    name: {**timer, "mean_ms": timer["total_ms"] / timer["count"] if timer["count"] else 0.0}
+                    for name, timer in self._timers.items()
+                },
+            }
+
+    def reset(self) -> None:
+        with self._lock:
+            self._counters.clear()
+            self._timers.clear()
+            self._started = time.time()
+
+
+metrics = Metrics()
+
+
+__all__ = ["Metrics", "metrics"]
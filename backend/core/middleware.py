@@ -0,0 +1,204 @@
+"""
+Response compression for API payloads.
+
+``CompressionMiddleware`` replaces Django's ``GZipMiddleware``: it negotiates
+brotli or gzip from ``Accept-Encoding``, only touches compressible content
+types above ``COMPRESSION_MIN_SIZE`` bytes, and compresses streaming responses
+incrementally (sync and async iterators alike).
+
+Brotli support is optional and enabled when the ``brotli`` package is
+installed. HTML is only ever gzipped so it keeps Django's random-filename
+padding against BREACH-style attacks on the CSRF token.
+"""
+
+import zlib
+
+from django.conf import settings
+from django.utils.cache import patch_vary_headers
+from django.utils.deprecation import MiddlewareMixin
+from django.utils.text import compress_string
+
+try:
+    import brotli
+
+    BROTLI_AVAILABLE = True
+except ImportError:
+    brotli = None
+    BROTLI_AVAILABLE = False
+
+DEFAULT_MIN_SIZE = 1024
+DEFAULT_BROTLI_QUALITY = 4
+# Same level django.utils.text.compress_string uses for non-streaming bodies.
+GZIP_LEVEL = 6
+DEFAULT_STREAM_FLUSH_SIZE = 64 * 1024
+
+# Content types worth compressing; everything else (images, archives, video) is
+# already compressed or binary and is passed through untouched.
+COMPRESSIBLE_TYPES = {
+    "application/javascript",
+    "application/json",
+    "application/msgpack",
+    "application/vnd.oai.openapi",
+    "application/vnd.oai.openapi+json",
+    "application/xml",
+    "application/yaml",
+    "image/svg+xml",
+}
+
+
+def is_compressible(content_type: str) -> bool:
+    media_type = (content_type or "").split(";", 1)[0].strip().lower()
+    if not media_type:
+        return False
+    return (
+        media_type.startswith("text/")
+        or media_type in COMPRESSIBLE_TYPES
+        or media_type.endswith("+json")
+        or media_type.endswith("+xml")
+    )
+
+
+def parse_accept_encoding(header: str) -> dict:
+    """Map each coding in an ``Accept-Encoding`` header to its q-value."""
+    codings = {}
+    for part in (header or "").split(","):
+        coding, *params = [piece.strip() for piece in part.split(";")]
+        if not coding:
+            continue
+        quality = 1.0
+        for param in params:
+            name, _, value = param.partition("=")
+            if name.strip().lower() == "q":
+                try:
+                    quality = float(value)
+                except ValueError:
+                    quality = 0.0
+        codings[coding.lower()] = quality
+    return codings
+
+
+def choose_encoding(header: str, *, allow_brotli: bool = True):
+    """Pick ``br`` or ``gzip`` for the client, preferring brotli on ties; None if neither."""
+    codings = parse_accept_encoding(header)
+    wildcard = codings.get("*", 0.0)
+    candidates = ["br", "gzip"] if allow_brotli and BROTLI_AVAILABLE else ["gzip"]
+    best, best_quality = None, 0.0
+    for coding in candidates:
+        quality = codings.get(coding, wildcard)
+        if quality > best_quality:
+            best, best_quality = coding, quality
+    return best
+
+
+class _StreamCompressor:
+    """Incremental compressor that syncs output every ``flush_size`` input bytes."""
+
+    def __init__(self, encoding: str, *, brotli_quality: int, flush_size: int):
+        if encoding == "br":
+            self._compressor = brotli.Compressor(mode=brotli.MODE_TEXT, quality=brotli_quality)
+            self._process = self._compressor.process
+            self._flush = self._compressor.flush
+            self._finish = self._compressor.finish
+        else:
+            self._compressor = zlib.compressobj(GZIP_LEVEL, zlib.DEFLATED, zlib.MAX_WBITS | 16)
+            self._process = self._compressor.compress
+            self._flush = lambda: self._compressor.flush(zlib.Z_SYNC_FLUSH)
+            self._finish = self._compressor.flush
+        self._flush_size = flush_size
+        self._pending = 0
+
+    def compress(self, chunk: bytes) -> bytes:
+        data = self._process(chunk)
+        self._pending += len(chunk)
+        if self._pending >= self._flush_size:
+            # Hand buffered output to the client instead of holding it until the end.
+            self._pending = 0
+            data += self._flush()
+        return data
+
+    def finish(self) -> bytes:
+        return self._finish()
+
+
+class CompressionMiddleware(MiddlewareMixin):
+    """Content-negotiated brotli/gzip compression with a size threshold."""
+
+    max_random_bytes = 100
+
+    def __init__(self, get_response):
+        super().__init__(get_response)
+        self.min_size = getattr(settings, "COMPRESSION_MIN_SIZE", DEFAULT_MIN_SIZE)
+        self.brotli_quality = getattr(settings, "COMPRESSION_BROTLI_QUALITY", DEFAULT_BROTLI_QUALITY)
+        self.flush_size = getattr(settings, "COMPRESSION_STREAM_FLUSH_SIZE", DEFAULT_STREAM_FLUSH_SIZE)
+
+    def process_response(self, request, response):
+        if response.has_header("Content-Encoding") or response.has_header("Content-Range"):
+            return response
+        if response.status_code < 200 or response.status_code in (204, 304):
+            return response
+        content_type = response.get("Content-Type", "")
+        if not is_compressible(content_type):
+            return response
+        if not response.streaming and len(response.content) < self.min_size:
+            return response
+
+        patch_vary_headers(response, ("Accept-Encoding",))
+        is_html = content_type.lower().startswith("text/html")
+        encoding = choose_encoding(request.META.get("HTTP_ACCEPT_ENCODING", ""), allow_brotli=not is_html)
+        if encoding is None:
+            return response
+
+        if response.streaming:
+            response.streaming_content = self._compress_stream(response, encoding)
+            # The compressed size is unknown until the stream is consumed.
+            del response.headers["Content-Length"]
+        else:
+            compressed = self._compress_bytes(response.content, encoding)
+            if len(compressed) >= len(response.content):
+                return response
+            response.content = compressed
+            response.headers["Content-Length"] = str(len(compressed))
+
+        # A strong ETag no longer matches the encoded bytes (RFC 9110 Section 8.8.1).
+        etag = response.get("ETag")
+        if etag and etag.startswith('"'):
+            response.headers["ETag"] = "W/" + etag
+        response.headers["Content-Encoding"] = encoding
+        return response
+
+    def _compress_bytes(self, content: bytes, encoding: str) -> bytes:
+        if encoding == "br":
+            return brotli.compress(content, mode=brotli.MODE_TEXT, quality=self.brotli_quality)
+        return compress_string(content, max_random_bytes=self.max_random_bytes)
+
+    def _compress_stream(self, response, encoding: str):
+        compressor = _StreamCompressor(
+            encoding,
+            brotli_quality=self.brotli_quality,
+            flush_size=self.flush_size,
+        )
+        # Bind the current iterator now; the caller replaces streaming_content.
+        original = response.streaming_content
+
+        if response.is_async:
+
+            async def compressed_async():
+                async for chunk in original:
+                    data = compressor.compress(chunk)
+                    if data:
+                        yield data
+                yield compressor.finish()
+
+            return compressed_async()
+
+        def compressed():
+            for chunk in original:
+                data = compressor.compress(chunk)
+                if data:
+                    yield data
+            yield compressor.finish()
+
+        return compressed()
+
+
+__all__ = ["CompressionMiddleware", "choose_encoding", "is_compressible", "parse_accept_encoding"]
@@ -0,0 +1,78 @@
+# Generated by Django 5.0.6 on 2026-10-19 06:26
+
+import django.db.models.deletion
+import uuid
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    initial = True
+
+    dependencies = [
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="ChunkedUpload",
+            fields=[
+                (
+                    "id",
+                    models.UUIDField(
+                        default=uuid.uuid4, editable=False, primary_key=True, serialize=False
+                    ),
+                ),
+                ("filename", models.CharField(max_length=255)),
+                ("content_type", models.CharField(max_length=100)),
+                ("size", models.PositiveBigIntegerField()),
+                ("chunk_size", models.PositiveIntegerField()),
+                (
+                    "backend",
+                    models.CharField(
+                        choices=[("local", "Local disk"), ("s3", "S3 multipart")], max_length=8
+                    ),
+                ),
+                (
+                    "key",
+                    models.CharField(
+                        help_text="Storage name of the assembled file.", max_length=255
+                    ),
+                ),
+                ("bucket", models.CharField(blank=True, default="", max_length=255)),
+                ("multipart_upload_id", models.CharField(blank=True, default="", max_length=1024)),
+                ("parts", models.JSONField(blank=True, default=dict)),
+                (
+                    "status",
+                    models.CharField(
+                        choices=[
+                            ("uploading", "Uploading"),
+                            ("complete", "Complete"),
+                            ("aborted", "Aborted"),
+                        ],
+                        default="uploading",
+                        max_length=16,
+                    ),
+                ),
+                ("url", models.URLField(blank=True, default="", max_length=1024)),
+                ("expires_at", models.DateTimeField()),
+                ("created_at", models.DateTimeField(auto_now_add=True)),
+                ("updated_at", models.DateTimeField(auto_now=True)),
+                (
+                    "user",
+                    models.ForeignKey(
+                        on_delete=django.db.models.deletion.CASCADE,
+                        related_name="chunked_uploads",
+                        to=settings.AUTH_USER_MODEL,
+                    ),
+                ),
+            ],
+            options={
+                "ordering": ["-created_at"],
+                "indexes": [
+                    models.Index(fields=["user", "status"], name="core_chunked_user_status_idx")
+                ],
+            },
+        ),
+    ]
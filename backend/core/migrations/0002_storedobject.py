@@ -0,0 +1,46 @@
+# Generated by Django 5.0.6 on 2026-10-19 06:33
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("backend_core", "0001_initial"),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="StoredObject",
+            fields=[
+                (
+                    "id",
+                    models.BigAutoField(
+                        auto_created=True, primary_key=True, serialize=False, verbose_name="ID"
+                    ),
+                ),
+                ("sha256", models.CharField(max_length=64, unique=True)),
+                (
+                    "key",
+                    models.CharField(
+                        help_text="Storage name of the object.", max_length=255, unique=True
+                    ),
+                ),
+                ("size", models.PositiveBigIntegerField()),
+                ("content_type", models.CharField(blank=True, default="", max_length=100)),
+                ("ref_count", models.IntegerField(default=0)),
+                ("orphaned_at", models.DateTimeField(blank=True, null=True)),
+                ("created_at", models.DateTimeField(auto_now_add=True)),
+                ("updated_at", models.DateTimeField(auto_now=True)),
+            ],
+            options={
+                "indexes": [
+                    models.Index(
+                        condition=models.Q(("ref_count__lte", 0)),
+                        fields=["orphaned_at", "id"],
+                        name="core_stored_orphaned_idx",
+                    )
+                ],
+            },
+        ),
+    ]
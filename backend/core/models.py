@@ -0,0 +1,142 @@
+"""Models shared across apps."""
+
+import re
+import uuid
+
+from django.conf import settings
+from django.db import models
+
+
+class ChunkedUploadStatus(models.TextChoices):
+    UPLOADING = "uploading", "Uploading"
+    COMPLETE = "complete", "Complete"
+    ABORTED = "aborted", "Aborted"
+
+
+class ChunkedUploadBackend(models.TextChoices):
+    LOCAL = "local", "Local disk"
+    S3 = "s3", "S3 multipart"
+
+
+class ChunkedUpload(models.Model):
+    """
+    A resumable upload sent in fixed-size chunks (see ``backend.core.chunked_uploads``).
+
+    ``parts`` maps each received chunk index to its size (and ETag for S3
+    multipart uploads), so a client resuming after a dropped connection only
+    sends the chunks that are missing.
+    """
+
+    id = models.UUIDField(primary_key=True, default=uuid.uuid4, editable=False)
+    user = models.ForeignKey(settings.AUTH_USER_MODEL, on_delete=models.CASCADE, related_name="chunked_uploads")
+    filename = models.CharField(max_length=255)
+    content_type = models.CharField(max_length=100)
+    size = models.PositiveBigIntegerField()
+    chunk_size = models.PositiveIntegerField()
+    backend = models.CharField(max_length=8, choices=ChunkedUploadBackend.choices)
+    key = models.CharField(max_length=255, help_text="Storage name of the assembled file.")
+    bucket = models.CharField(max_length=255, blank=True, default="")
+    multipart_upload_id = models.CharField(max_length=1024, blank=True, default="")
+    parts = models.JSONField(default=dict, blank=True)
+    status = models.CharField(
+        max_length=16, choices=ChunkedUploadStatus.choices, default=ChunkedUploadStatus.UPLOADING
+    )
+    url = models.URLField(max_length=1024, blank=True, default="")
+    expires_at = models.DateTimeField()
+    created_at = models.DateTimeField(auto_now_add=True)
+    updated_at = models.DateTimeField(auto_now=True)
+
+    class Meta:
+        ordering = ["-created_at"]
+        indexes = [models.Index(fields=["user", "status"], name="core_chunked_user_status_idx")]
+
+    def __str__(self):
+        return f"{self.filename} ({self.status})"
+
+    @property
+    def total_chunks(self) -> int:
+        return max(1, -(-self.size // self.chunk_size))
+
+    @property
+    def received_chunks(self) -> list:
+        return sorted(int(index) for index in self.parts)
+
+    @property
+    def missing_chunks(self) -> list:
+        received = set(self.received_chunks)
+        return [index for index in range(self.total_chunks) if index not in received]
+
+    @property
+    def received_bytes(self) -> int:
+        return sum(part["size"] for part in self.parts.values())
+
+
+class DirectUploadStatus(models.TextChoices):
+    PENDING = "pending", "Pending"
+    CONFIRMED = "confirmed", "Confirmed"
+    REJECTED = "rejected", "Rejected"
+    EXPIRED = "expired", "Expired"
+
+
+class DirectUpload(models.Model):
+    """
+    A presigned upload slot (see ``backend.core.direct_uploads``).
+
+    The slot's token can be confirmed once. Slots still ``pending`` at
+    ``expires_at`` are expired by a delayed job, which deletes whatever the
+    client uploaded, so abandoned uploads do not stay in the bucket.
+    """
+
+    id = models.UUIDField(primary_key=True, default=uuid.uuid4, editable=False)
+    user = models.ForeignKey(settings.AUTH_USER_MODEL, on_delete=models.CASCADE, related_name="direct_uploads")
+    bucket = models.CharField(max_length=255)
+    key = models.CharField(max_length=255, unique=True, help_text="Storage name the client uploads to.")
+    content_type = models.CharField(max_length=100)
+    size = models.PositiveBigIntegerField()
+    status = models.CharField(
+        max_length=16, choices=DirectUploadStatus.choices, default=DirectUploadStatus.PENDING
+    )
+    expires_at = models.DateTimeField()
+    created_at = models.DateTimeField(auto_now_add=True)
+    updated_at = models.DateTimeField(auto_now=True)
+
+    def __str__(self):
+        return f"{self.key} ({self.status})"
+
+
+# Storage names of content-addressed uploads (``uploads/<sha256>.<ext>``, plus
+# the ``_<random>`` suffix storages add when a name is taken).
+CONTENT_KEY_RE = re.compile(r"^uploads/[0-9a-f]{64}(_[0-9A-Za-z]+)?\.[0-9a-z]+$")
+
+
+class StoredObject(models.Model):
+    """
+    A content-addressed upload, stored once however many rows use the same bytes.
+
+    ``ref_count`` counts the media rows pointing at the object. Once it drops to
+    zero the object is stamped ``orphaned_at`` and garbage collected after
+    ``CONTENT_STORE_GRACE_PERIOD`` unless something references it again (see
+    ``backend.core.content_store``).
+    """
+
+    sha256 = models.CharField(max_length=64, unique=True)
+    key = models.CharField(max_length=255, unique=True, help_text="Storage name of the object.")
+    size = models.PositiveBigIntegerField()
+    content_type = models.CharField(max_length=100, blank=True, default="")
+    ref_count = models.IntegerField(default=0)
+    orphaned_at = models.DateTimeField(null=True, blank=True)
+    created_at = models.DateTimeField(auto_now_add=True)
+    updated_at = models.DateTimeField(auto_now=True)
+
+    class Meta:
+        indexes = [
+            # Garbage collection scans unreferenced objects, oldest first.
+            models.Index(
+                fields=["orphaned_at", "id"],
+                name="core_stored_orphaned_idx",
+                condition=models.Q(ref_count__lte=0),
+            ),
+        ]
+
+    def __str__(self):
+        return f"{self.key} ({self.ref_count} refs)"
@@ -0,0 +1,106 @@
+"""Pagination that avoids exact ``COUNT(*)`` over large result sets."""
+
+import json
+from typing import Optional
+
+from django.conf import settings
+from django.db import DatabaseError, connections
+from django.db.models import QuerySet
+from rest_framework.pagination import LimitOffsetPagination
+from rest_framework.response import Response
+
+
+def estimate_count(queryset: QuerySet) -> Optional[int]:
+    """The Postgres planner's row estimate for ``queryset``, or None when unavailable."""
+    connection = connections[queryset.db]
+    if connection.vendor != "postgresql":
+        return None
+    try:
+        sql, params = queryset.order_by().query.sql_with_params()
+        with connection.cursor() as cursor:
+            cursor.execute(f"EXPLAIN (FORMAT JSON) {sql}", params)
+            plan = cursor.fetchone()[0]
+    except DatabaseError:
+        return None
+    if isinstance(plan, str):
+        plan = json.loads(plan)
+    return int(plan[0]["Plan"]["Plan Rows"])
+
+
+class EstimatedCountPagination(LimitOffsetPagination):
+    """
+    Limit/offset pagination whose ``count`` is exact for small results and estimated for big ones.
+
+    The count first runs as ``COUNT(*)`` over at most
+    ``PAGINATION_EXACT_COUNT_THRESHOLD + 1`` rows, so results up to the threshold
+    get an exact count at a bounded cost. Beyond that the planner's estimate is
+    used and ``count_is_estimate`` is true; ``next`` is then decided by fetching
+    one extra row rather than from the count.
+    """
+
+    def get_count(self, queryset) -> int:
+        self.count_is_estimate = False
+        threshold = settings.PAGINATION_EXACT_COUNT_THRESHOLD
+        if not isinstance(queryset, QuerySet) or threshold <= 0:
+            return super().get_count(queryset)
+
+        bounded = queryset.order_by()[: threshold + 1].count()
+        if bounded <= threshold:
+            return bounded
+        estimate = estimate_count(queryset)
+        if estimate is None:
+            return queryset.count()
+        self.count_is_estimate = True
+        return max(estimate, bounded)
+
+    def paginate_queryset(self, queryset, request, view=None):
+        self.limit = self.get_limit(request)
+        if self.limit is None:
+            return None
+
+        self.count = self.get_count(queryset)
+        self.offset = self.get_offset(request)
+        self.request = request
+        if not self.count_is_estimate:
+            if self.count > self.limit and self.template is not None:
+                self.display_page_controls = True
+            if self.count == 0 or self.offset > self.count:
+                return []
+            return list(queryset[self.offset : self.offset + self.limit])
+
+        rows = list(queryset[self.offset : self.offset + self.limit + 1])
+        self.has_next = len(rows) > self.limit
+        # Never report fewer rows than the client can already see.
+        self.count = max(self.count, self.offset + len(rows))
+        if self.template is not None:
+            self.display_page_controls = True
+        return rows[: self.limit]
+
+    def get_next_link(self):
+        if getattr(self, "count_is_estimate", False) and not self.has_next:
+            return None
+        return super().get_next_link()
+
+    def get_paginated_response(self, data):
+        return Response(
+            {
+                "count": self.count,
+                "count_is_estimate": self.count_is_estimate,
+                "next": self.get_next_link(),
+                "previous": self.get_previous_link(),
+                "results": data,
+            }
+        )
+
+    def get_paginated_response_schema(self, schema):
+        response_schema = super().get_paginated_response_schema(schema)
+        response_schema["required"].append("count_is_estimate")
+        response_schema["properties"]["count_is_estimate"] = {
+            "type": "boolean",
+            "example": False,
+            "description": "True when count is the planner's estimate rather than an exact count.",
+        }
+        return response_schema
+
+
+__all__ = ["EstimatedCountPagination", "estimate_count"]
@@ -0,0 +1,50 @@
+"""
+Request parsers matching ``backend.core.renderers``.
+
+``FastJSONParser`` decodes with orjson when it is installed and otherwise
+behaves exactly like DRF's ``JSONParser``. ``MessagePackParser`` accepts
+``Content-Type: application/msgpack`` bodies when msgpack is available.
+"""
+
+from django.conf import settings
+from rest_framework.exceptions import ParseError
+from rest_framework.parsers import BaseParser, JSONParser
+
+from backend.core.renderers import MSGPACK_AVAILABLE, ORJSON_AVAILABLE, MessagePackRenderer
+
+if ORJSON_AVAILABLE:
+    import orjson
+
+if MSGPACK_AVAILABLE:
+    import msgpack
+
+
+class FastJSONParser(JSONParser):
+    """Drop-in ``JSONParser`` backed by orjson when available."""
+
+    def parse(self, stream, media_type=None, parser_context=None):
+        encoding = (parser_context or {}).get("encoding", settings.DEFAULT_CHARSET)
+        if not ORJSON_AVAILABLE or not self.strict or encoding.lower() not in ("utf-8", "utf8"):
+            return super().parse(stream, media_type, parser_context)
+        try:
+            # orjson rejects NaN/Infinity just like DRF's strict parse_constant.
+            return orjson.loads(stream.read())
+        except orjson.JSONDecodeError as exc:
+            raise ParseError(f"JSON parse error - {exc}")
+
+
+class MessagePackParser(BaseParser):
+    """Parse MessagePack request bodies (requires the optional ``msgpack`` package)."""
+
+    media_type = MessagePackRenderer.media_type
+
+    def parse(self, stream, media_type=None, parser_context=None):
+        if not MSGPACK_AVAILABLE:
+            raise ParseError("MessagePack payloads are not supported by this server.")
+        try:
+            return msgpack.unpackb(stream.read(), raw=False, strict_map_key=False)
+        except (ValueError, msgpack.ExtraData, msgpack.FormatError, msgpack.StackError) as exc:
+            raise ParseError(f"MessagePack parse error - {exc}")
+
+
+__all__ = ["FastJSONParser", "MessagePackParser"]
@@ -0,0 +1,243 @@
+"""
+Slow-query logging and an opt-in sampling profiler.
+
+Every database connection gets :func:`log_slow_queries` as an execute wrapper
+(installed on ``connection_created``). Statements slower than
+``SLOW_QUERY_THRESHOLD_MS`` are logged as warnings together with the endpoint,
+user and vendor of the current request and the first ``backend`` frame that
+sent them.
+
+``ProfilingMiddleware`` records that request context. With
+``PROFILING_ENABLED``, staff requests carrying the ``PROFILING_HEADER`` header
+are also sampled every ``PROFILING_INTERVAL_MS``. The middleware authenticates
+the request itself before sampling, so other clients cannot start the sampler. The stacks are written in
+collapsed ("folded") format to ``PROFILING_DIR``, ready for ``flamegraph.pl``
+or speedscope, under a root frame of ``orm``, ``serializer`` or ``view``. The
+response names the file in ``X-Profile-Id`` and reports the same split in
+``Server-Timing``.
+"""
+
+import logging
+import os
+import sys
+import threading
+import time
+import uuid
+from collections import Counter
+from contextvars import ContextVar
+from typing import Dict, List, Optional, Tuple
+
+from django.conf import settings
+from django.db import DatabaseError
+from rest_framework.exceptions import APIException
+from rest_framework.request import Request
+from rest_framework.settings import api_settings
+
+from backend.core.instrumentation import metrics
+
+logger = logging.getLogger(__name__)
+
+_BACKEND_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+_request: ContextVar = ContextVar("profiling_request", default=None)
+# Set while a slow query is reported, so the lookups it needs are not timed themselves.
+_reporting: ContextVar[bool] = ContextVar("slow_query_reporting", default=False)
+
+PROFILE_CATEGORIES = ("view", "serializer", "orm")
+_SERIALIZER_MODULES = ("rest_framework.serializers", "rest_framework.fields", "rest_framework.relations")
+
+
+def _endpoint(request) -> Optional[str]:
+    if request is None:
+        return None
+    match = getattr(request, "resolver_match", None)
+    # Router routes are regexes; drop the anchors.
+    route = match.route.replace("^", "").replace("$", "") if match is not None else request.path
+    return f"{request.method} {route}"
+
+
+def _request_owner(request) -> Tuple[Optional[int], Optional[int]]:
+    """(user id, vendor id) of an authenticated request."""
+    from backend.core.permissions import resolve_user_vendor
+
+    user = getattr(request, "user", None)
+    if user is None or not getattr(user, "is_authenticated", False):
+        return None, None
+    try:
+        vendor = resolve_user_vendor(user)
+    except DatabaseError:
+        vendor = None
+    return user.pk, getattr(vendor, "pk", None)
+
+
+def _is_staff_request(request) -> bool:
+    """Authenticate with the API's authenticators; the view has not done so yet."""
+    drf_request = Request(request)
+    for authenticator_class in api_settings.DEFAULT_AUTHENTICATION_CLASSES:
+        try:
+            result = authenticator_class().authenticate(drf_request)
+        except APIException:
+            return False
+        if result is not None:
+            return bool(getattr(result[0], "is_staff", False))
+    return False
+
+
+def _origin() -> Optional[str]:
+    """The innermost ``backend`` frame outside this module, as ``path:line in function``."""
+    frame = sys._getframe(1)
+    while frame is not None:
+        filename = frame.f_code.co_filename
+        if filename.startswith(_BACKEND_DIR) and filename != __file__:
+            return f"{os.path.relpath(filename, _BACKEND_DIR)}:{frame.f_lineno} in {frame.f_code.co_name}"
+        frame = frame.f_back
+    return None
+
+
+def _report_slow_query(sql: str, duration_ms: float) -> None:
+    token = _reporting.set(True)
+    try:
+        request = _request.get()
+        user_id, vendor_id = _request_owner(request)
+        endpoint, origin = _endpoint(request), _origin()
+        statement = str(sql)[: settings.SLOW_QUERY_MAX_SQL_LENGTH]
+        metrics.incr("db.slow_queries")
+        metrics.observe("db.slow_query_ms", duration_ms)
+        logger.warning(
+            "Slow query (%.0f ms) endpoint=%s user=%s vendor=%s origin=%s: %s",
+            duration_ms,
+            endpoint,
+            user_id,
+            vendor_id,
+            origin,
+            statement,
+            extra={
+                "duration_ms": round(duration_ms, 1),
+                "endpoint": endpoint,
+                "user_id": user_id,
+                "vendor_id": vendor_id,
+                "origin": origin,
+                "sql": statement,
+            },
+        )
+    finally:
+        _reporting.reset(token)
+
+
+def log_slow_queries(execute, sql, params, many, context):
+    """Execute wrapper that reports statements slower than ``SLOW_QUERY_THRESHOLD_MS``."""
+    threshold = settings.SLOW_QUERY_THRESHOLD_MS
+    if not threshold or _reporting.get():
+        return execute(sql, params, many, context)
+    started = time.perf_counter()
+    try:
+        return execute(sql, params, many, context)
+    finally:
+        duration_ms = (time.perf_counter() - started) * 1000
+        if duration_ms >= threshold:
+            _report_slow_query(sql, duration_ms)
+
+
+def install_slow_query_logger(*, connection, **kwargs) -> None:
+    """``connection_created`` receiver adding :func:`log_slow_queries` to the connection."""
+    if log_slow_queries not in connection.execute_wrappers:
+        connection.execute_wrappers.append(log_slow_queries)
+
+
+def _category(modules: List[str]) -> str:
+    if any(module.startswith("django.db") for module in modules):
+        return "orm"
+    if any(
+        module.startswith(_SERIALIZER_MODULES) or module.endswith(("serializers", "row_mappers"))
+        for module in modules
+    ):
+        return "serializer"
+    return "view"
+
+
+class _Sampler:
+    """Samples one thread's stack on a background thread until stopped."""
+
+    def __init__(self, thread_id: int, interval: float):
+        self.thread_id = thread_id
+        self.interval = interval
+        self.stacks: Counter = Counter()
+        self._stop = threading.Event()
+        self._thread = threading.Thread(target=self._run, name="request-profiler", daemon=True)
+
+    def start(self) -> None:
+        self._thread.start()
+
+    def stop(self) -> None:
+        self._stop.set()
+        self._thread.join()
+
+    def _run(self) -> None:
+        while not self._stop.wait(self.interval):
+            frame = sys._current_frames().get(self.thread_id)
+            modules, labels = [], []
+            while frame is not None:
+                module = frame.f_globals.get("__name__", "?")
+                modules.append(module)
+                labels.append(f"{module}.{frame.f_code.co_qualname}")
+                frame = frame.f_back
+            if labels:
+                self.stacks[(_category(modules), ";".join(reversed(labels)))] += 1
+
+    def timings(self) -> Dict[str, float]:
+        """Milliseconds sampled per category."""
+        totals = {category: 0.0 for category in PROFILE_CATEGORIES}
+        for (category, _), count in self.stacks.items():
+            totals[category] += count * self.interval * 1000
+        return totals
+
+    def folded(self) -> str:
+        return "".join(
+            f"{category};{stack} {count}\n" for (category, stack), count in sorted(self.stacks.items())
+        )
+
+
+def _write_profile(request, sampler: _Sampler) -> str:
+    slug = "".join(char if char.isalnum() else "_" for char in request.path.strip("/"))[:80]
+    stamp = time.strftime("%Y%m%dT%H%M%S")
+    profile_id = f"{stamp}-{uuid.uuid4().hex[:8]}-{request.method.lower()}-{slug}.folded"
+    os.makedirs(settings.PROFILING_DIR, exist_ok=True)
+    with open(os.path.join(settings.PROFILING_DIR, profile_id), "w") as handle:
+        handle.write(sampler.folded())
+    return profile_id
+
+
+class ProfilingMiddleware:
+    """Records the request for slow-query reports and samples opted-in staff requests."""
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+
+    def __call__(self, request):
+        token = _request.set(request)
+        try:
+            if (
+                settings.PROFILING_ENABLED
+                and request.headers.get(settings.PROFILING_HEADER)
+                and _is_staff_request(request)
+            ):
+                return self._profile(request)
+            return self.get_response(request)
+        finally:
+            _request.reset(token)
+
+    def _profile(self, request):
+        sampler = _Sampler(threading.get_ident(), settings.PROFILING_INTERVAL_MS / 1000)
+        sampler.start()
+        try:
+            response = self.get_response(request)
+        finally:
+            sampler.stop()
+        response["X-Profile-Id"] = _write_profile(request, sampler)
+        response["Server-Timing"] = ", ".join(
+            f"{category};dur={duration:.1f}" for category, duration in sampler.timings().items()
+        )
+        metrics.incr("profiling.requests")
+        return response
+
+
+__all__ = ["ProfilingMiddleware", "install_slow_query_logger", "log_slow_queries"]
@@ -0,0 +1,91 @@
+"""
+``EXPLAIN`` helpers for query plan regression tests (Postgres only).
+
+:func:`capture_plans` runs a selector, records every ``SELECT`` it sends and
+explains each one with ``EXPLAIN (FORMAT JSON)``. Sequential scans are priced
+out while explaining, so a ``Seq Scan`` in a captured plan means no index can
+serve that query at all, whatever the table sizes. :func:`plan_regressions`
+turns the plans into readable failures::
+
+    plans = capture_plans(lambda: list(list_items(user=user)))
+    assert plan_regressions(plans, max_cost=500) == []
+"""
+
+import json
+from dataclasses import dataclass
+from typing import Any, Callable, Dict, Iterator, List, Sequence
+
+from django.db import connections, transaction
+from django.test.utils import CaptureQueriesContext
+
+
+@dataclass(frozen=True)
+class QueryPlan:
+    sql: str
+    plan: Dict[str, Any]
+
+    @property
+    def nodes(self) -> Iterator[Dict[str, Any]]:
+        return plan_nodes(self.plan)
+
+    @property
+    def cost(self) -> float:
+        return float(self.plan["Total Cost"])
+
+    @property
+    def seq_scans(self) -> List[str]:
+        """Relations read by sequential scans."""
+        return [node.get("Relation Name", "?") for node in self.nodes if node["Node Type"] == "Seq Scan"]
+
+    @property
+    def index_names(self) -> List[str]:
+        return [node["Index Name"] for node in self.nodes if "Index Name" in node]
+
+
+def plan_nodes(plan: Dict[str, Any]) -> Iterator[Dict[str, Any]]:
+    """The plan node and all of its children, depth first."""
+    yield plan
+    for child in plan.get("Plans", ()):
+        yield from plan_nodes(child)
+
+
+def explain(sql: str, params: Sequence[Any] | None = None, *, using: str = "default") -> Dict[str, Any]:
+    """The root node of ``EXPLAIN (FORMAT JSON)`` for ``sql``, with sequential scans disabled."""
+    connection = connections[using]
+    with transaction.atomic(using=using), connection.cursor() as cursor:
+        cursor.execute("SELECT set_config('enable_seqscan', 'off', true)")
+        try:
+            cursor.execute(f"EXPLAIN (FORMAT JSON) {sql}", params)
+            plan = cursor.fetchone()[0]
+        finally:
+            # SET LOCAL outlives a released savepoint: restore it for the caller's transaction.
+            cursor.execute("SELECT set_config('enable_seqscan', 'on', true)")
+    if isinstance(plan, str):
+        plan = json.loads(plan)
+    return plan[0]["Plan"]
+
+
+def capture_plans(run: Callable[[], Any], *, using: str = "default") -> List[QueryPlan]:
+    """Call ``run`` and explain every ``SELECT`` it executed, in order."""
+    with CaptureQueriesContext(connections[using]) as ctx:
+        run()
+    statements = [query["sql"] for query in ctx.captured_queries]
+    return [
+        QueryPlan(sql=sql, plan=explain(sql, using=using))
+        for sql in statements
+        if sql.lstrip().upper().startswith(("SELECT", "WITH"))
+    ]
+
+
+def plan_regressions(plans: Sequence[QueryPlan], *, max_cost: float) -> List[str]:
+    """One message per plan with a sequential scan or a total cost above ``max_cost``."""
+    problems = []
+    for plan in plans:
+        if plan.seq_scans:
+            problems.append(f"Seq Scan on {', '.join(plan.seq_scans)}: {plan.sql}")
+        if plan.cost > max_cost:
+            problems.append(f"Cost {plan.cost:.0f} exceeds {max_cost:.0f}: {plan.sql}")
+    return problems
+
+
+__all__ = ["QueryPlan", "capture_plans", "explain", "plan_nodes", "plan_regressions"]
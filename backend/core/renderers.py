@@ -0,0 +1,91 @@
+"""
+Response renderers for the REST API.
+
+``FastJSONRenderer`` produces JSON equivalent to DRF's ``JSONRenderer`` but
+encodes with orjson when it is installed. Strings, integers, datetimes and
+string-coerced decimals come out byte for byte the same; floats (including
+``Decimal`` values DRF renders as floats) may be spelled differently, e.g.
+``1e16`` rather than ``1e+16``, but parse to the same value. ``MessagePackRenderer`` offers a
+compact binary alternative for clients that send ``Accept: application/msgpack``.
+
+Both libraries are optional: without orjson the JSON renderer falls back to
+DRF's encoder, and the MessagePack renderer is only registered when msgpack
+is importable (see ``API_RENDERER_CLASSES`` in settings).
+"""
+
+from rest_framework.renderers import BaseRenderer, JSONRenderer
+from rest_framework.settings import api_settings
+from rest_framework.utils.encoders import JSONEncoder
+
+try:
+    import orjson
+
+    ORJSON_AVAILABLE = True
+except ImportError:
+    orjson = None
+    ORJSON_AVAILABLE = False
+
+try:
+    import msgpack
+
+    MSGPACK_AVAILABLE = True
+except ImportError:
+    msgpack = None
+    MSGPACK_AVAILABLE = False
+
+
+# DRF escapes these two separators for JavaScript compatibility; keep parity.
+_LINE_SEPARATOR = "\u2028".encode()
+_PARAGRAPH_SEPARATOR = "\u2029".encode()
+
+# Datetimes, dates and times are passed through to DRF's encoder so the ``Z``
+# suffix and microsecond formatting match ``JSONRenderer`` exactly.
+_ORJSON_OPTIONS = (orjson.OPT_NON_STR_KEYS | orjson.OPT_PASSTHROUGH_DATETIME) if ORJSON_AVAILABLE else 0
+
+
+def _orjson_compatible() -> bool:
+    # orjson output is compact, unescaped UTF-8 and never emits NaN/Infinity,
+    # which matches DRF only under its default JSON settings.
+    return ORJSON_AVAILABLE and api_settings.STRICT_JSON and api_settings.UNICODE_JSON and api_settings.COMPACT_JSON
+
+
+class FastJSONRenderer(JSONRenderer):
+    """Drop-in ``JSONRenderer`` backed by orjson when available."""
+
+    def render(self, data, accepted_media_type=None, renderer_context=None):
+        if data is None:
+            return b""
+        renderer_context = renderer_context or {}
+        if not _orjson_compatible() or self.get_indent(accepted_media_type, renderer_context):
+            # orjson only supports two-space indentation; pretty output is not a hot path.
+            return super().render(data, accepted_media_type, renderer_context)
+
+        try:
+            ret = orjson.dumps(data, default=self.encoder_class().default, option=_ORJSON_OPTIONS)
+        except TypeError:
+            # e.g. integers beyond 64 bits, which the stdlib encoder can still represent.
+            return super().render(data, accepted_media_type, renderer_context)
+
+        if _LINE_SEPARATOR in ret or _PARAGRAPH_SEPARATOR in ret:
+            ret = ret.replace(_LINE_SEPARATOR, b"\\u2028").replace(_PARAGRAPH_SEPARATOR, b"\\u2029")
+        return ret
+
+
+class MessagePackRenderer(BaseRenderer):
+    """Render responses as MessagePack (requires the optional ``msgpack`` package)."""
+
+    media_type = "application/msgpack"
+    format = "msgpack"
+    charset = None
+    render_style = "binary"
+    encoder_class = JSONEncoder
+
+    def render(self, data, accepted_media_type=None, renderer_context=None):
+        if not MSGPACK_AVAILABLE:
+            raise RuntimeError("msgpack is not installed; remove MessagePackRenderer from the renderer classes.")
+        if data is None:
+            return b""
+        return msgpack.packb(data, default=self.encoder_class().default, use_bin_type=True)
+
+
+__all__ = ["FastJSONRenderer", "MessagePackRenderer", "ORJSON_AVAILABLE", "MSGPACK_AVAILABLE"]
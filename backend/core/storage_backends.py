@@ -20,6 +20,8 @@ Usage:
 import os
 from typing import Optional
 
+from backend.core.storage_client import storage_client_config, storage_transfer_config
+
 # Import will fail if django-storages not installed
 # This is intentional - only needed when USE_SUPABASE_STORAGE=True
 try:
@@ -104,6 +106,11 @@ class SupabaseStorage(S3Boto3Storage):
             "CacheControl": "max-age=86400",  # Cache for 1 day
         }
 
+        # Pooled keep-alive connections, adaptive retries and multipart
+        # thresholds shared with the other storage clients (STORAGE_* settings).
+        self.client_config = storage_client_config()
+        self.transfer_config = storage_transfer_config()
+
         # Custom domain (optional - for cleaner URLs)
         custom_domain = os.environ.get("SUPABASE_STORAGE_CUSTOM_DOMAIN")
         if custom_domain:
@@ -0,0 +1,161 @@
+"""
+Batched deletion of objects from S3-compatible storage (Supabase).
+
+Services collect the bucket/key pairs behind media rows they delete and queue a
+job; the job calls :func:`delete_objects`, which groups keys per bucket into
+``DeleteObjects`` requests of up to 1000 keys, sends them from a small thread
+pool and retries only the keys a response reports as failed.
+"""
+
+import logging
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import Dict, Iterable, List, Optional
+from urllib.parse import unquote
+
+from botocore.exceptions import BotoCoreError, ClientError
+from django.conf import settings
+
+from backend.core.models import CONTENT_KEY_RE, StoredObject
+from backend.core.storage_client import get_storage_client
+
+logger = logging.getLogger(__name__)
+
+# S3 DeleteObjects accepts at most 1000 keys per request.
+MAX_KEYS_PER_REQUEST = 1000
+# Errors that mean the object is already gone.
+_MISSING_CODES = {"NoSuchKey", "NotFound", "404"}
+
+
+def storage_object_for(url: Optional[str], metadata: Optional[dict] = None) -> Optional[Dict[str, str]]:
+    """
+    Bucket/key of the stored object behind a media row, or None if it is not ours.
+
+    Prefers the ``bucket``/``path`` recorded in ``metadata`` at upload time and
+    falls back to recognising URLs served from the configured bucket.
+    """
+    metadata = metadata or {}
+    bucket = metadata.get("bucket") or getattr(settings, "AWS_STORAGE_BUCKET_NAME", None)
+    if not bucket:
+        return None
+    if metadata.get("path"):
+        return {"bucket": bucket, "key": metadata["path"]}
+    if not url:
+        return None
+
+    prefixes = []
+    custom_domain = getattr(settings, "AWS_S3_CUSTOM_DOMAIN", None)
+    if custom_domain:
+        prefixes.append(f"https://{custom_domain.strip('/')}/")
+    endpoint = getattr(settings, "AWS_S3_ENDPOINT_URL", None)
+    if endpoint:
+        prefixes.append(f"{endpoint.rstrip('/')}/{bucket}/")
+    for prefix in prefixes:
+        if url.startswith(prefix) and len(url) > len(prefix):
+            return {"bucket": bucket, "key": unquote(url[len(prefix):].split("?", 1)[0])}
+    return None
+
+
+def _batches(objects: Iterable[Dict[str, str]]):
+    keys_by_bucket: Dict[str, Dict[str, None]] = {}
+    for obj in objects:
+        # Dict keys dedupe while keeping the caller's order.
+        keys_by_bucket.setdefault(obj["bucket"], {})[obj["key"]] = None
+    for bucket, unique_keys in keys_by_bucket.items():
+        keys = list(unique_keys)
+        for start in range(0, len(keys), MAX_KEYS_PER_REQUEST):
+            yield bucket, keys[start:start + MAX_KEYS_PER_REQUEST]
+
+
+def _delete_batch(client, bucket: str, keys: List[str], max_attempts: int) -> List[Dict[str, str]]:
+    """Delete one batch, retrying the keys that failed; returns the keys still failing."""
+    pending = keys
+    errors: Dict[str, str] = {}
+    for attempt in range(max_attempts):
+        if attempt:
+            time.sleep(settings.STORAGE_DELETE_RETRY_DELAY * (2 ** (attempt - 1)))
+        try:
+            response = client.delete_objects(
+                Bucket=bucket,
+                Delete={"Objects": [{"Key": key} for key in pending], "Quiet": True},
+            )
+        except (ClientError, BotoCoreError) as exc:
+            errors = {key: str(exc) for key in pending}
+            continue
+        errors = {
+            error["Key"]: error.get("Code", "")
+            for error in response.get("Errors", [])
+            if error.get("Code") not in _MISSING_CODES
+        }
+        pending = [key for key in pending if key in errors]
+        if not pending:
+            return []
+    for key in pending:
+        logger.warning("Failed to delete storage object %s/%s: %s", bucket, key, errors.get(key))
+    return [{"bucket": bucket, "key": key} for key in pending]
+
+
+def delete_objects(
+    objects: Iterable[Dict[str, str]],
+    *,
+    client,
+    max_workers: Optional[int] = None,
+    max_attempts: Optional[int] = None,
+) -> List[Dict[str, str]]:
+    """
+    Delete ``{"bucket", "key"}`` objects in batches; returns the ones that could not be deleted.
+
+    At most ``STORAGE_DELETE_CONCURRENCY`` batches are in flight at once. Keys
+    that are already gone count as deleted, so callers can safely retry.
+    """
+    batches = list(_batches(objects))
+    if not batches:
+        return []
+    max_attempts = max_attempts or settings.STORAGE_DELETE_MAX_ATTEMPTS
+    workers = min(max_workers or settings.STORAGE_DELETE_CONCURRENCY, len(batches))
+    if workers <= 1:
+        results = [_delete_batch(client, bucket, keys, max_attempts) for bucket, keys in batches]
+    else:
+        with ThreadPoolExecutor(max_workers=workers) as pool:
+            results = list(
+                pool.map(lambda batch: _delete_batch(client, batch[0], batch[1], max_attempts), batches)
+            )
+    return [failed for batch_failures in results for failed in batch_failures]
+
+
+class StorageCleanupError(RuntimeError):
+    """Raised by cleanup jobs when some objects survive every attempt, so the job is retried."""
+
+    def __init__(self, failures: List[Dict[str, str]]):
+        self.failures = failures
+        sample = ", ".join(f"{obj['bucket']}/{obj['key']}" for obj in failures[:10])
+        super().__init__(f"Failed to delete {len(failures)} storage object(s): {sample}")
+
+
+def delete_objects_or_raise(objects: Iterable[Dict[str, str]], *, client=None) -> None:
+    """
+    Job entry point: delete ``objects`` with the shared client, raising if any remain.
+
+    Deduplicated uploads (``StoredObject`` rows) may back other media, so they
+    are skipped here and left to ``content_store.collect_unreferenced_objects``.
+    """
+    client = client or get_storage_client()
+    if not client:
+        return
+    objects = list(objects)
+    candidates = [obj["key"] for obj in objects if CONTENT_KEY_RE.match(obj["key"])]
+    if candidates:
+        indexed = set(StoredObject.objects.filter(key__in=candidates).values_list("key", flat=True))
+        objects = [obj for obj in objects if obj["key"] not in indexed]
+    failures = delete_objects(objects, client=client)
+    if failures:
+        raise StorageCleanupError(failures)
+
+
+__all__ = [
+    "MAX_KEYS_PER_REQUEST",
+    "StorageCleanupError",
+    "delete_objects",
+    "delete_objects_or_raise",
+    "storage_object_for",
+]
@@ -0,0 +1,116 @@
+"""
+Shared, tuned S3 client configuration for Supabase Storage.
+
+boto3's defaults keep at most 10 pooled connections per client, use the
+"legacy" retry mode without client-side rate limiting, leave TCP keepalive off
+and start multipart uploads at 8 MB with 10 threads. Under a threaded or
+async server that runs many uploads and the batched deletes at once, the pool
+runs out and every extra request opens a fresh TLS connection. Everything that
+talks to storage builds its client from here so pool size, retries, timeouts
+and multipart thresholds are configured in one place (``STORAGE_*`` settings).
+
+``SupabaseStorage`` keeps django-storages' per-thread boto3 resources but uses
+:func:`storage_client_config` and :func:`storage_transfer_config`; services
+that call S3 directly share the process-wide client from
+:func:`get_storage_client`.
+"""
+
+import threading
+from typing import Optional
+
+import boto3
+from boto3.s3.transfer import TransferConfig
+from botocore.config import Config
+from django.conf import settings
+
+_storage_client: Optional[object] = None
+_storage_client_lock = threading.Lock()
+
+
+def storage_client_config(**overrides) -> Config:
+    """botocore ``Config`` with the pooled, keep-alive, adaptive-retry settings."""
+    options = {
+        "max_pool_connections": settings.STORAGE_MAX_POOL_CONNECTIONS,
+        "retries": {"mode": settings.STORAGE_RETRY_MODE, "total_max_attempts": settings.STORAGE_MAX_ATTEMPTS},
+        "tcp_keepalive": settings.STORAGE_TCP_KEEPALIVE,
+        "connect_timeout": settings.STORAGE_CONNECT_TIMEOUT,
+        "read_timeout": settings.STORAGE_READ_TIMEOUT,
+        "s3": {"addressing_style": getattr(settings, "AWS_S3_ADDRESSING_STYLE", None)},
+        "signature_version": getattr(settings, "AWS_S3_SIGNATURE_VERSION", None),
+    }
+    options.update(overrides)
+    return Config(**options)
+
+
+def storage_transfer_config() -> TransferConfig:
+    """Multipart thresholds and concurrency for ``upload_fileobj``/``download_fileobj``."""
+    return TransferConfig(
+        multipart_threshold=settings.STORAGE_MULTIPART_THRESHOLD,
+        multipart_chunksize=settings.STORAGE_MULTIPART_CHUNKSIZE,
+        max_concurrency=settings.STORAGE_TRANSFER_CONCURRENCY,
+        use_threads=settings.STORAGE_TRANSFER_CONCURRENCY > 1,
+    )
+
+
+def create_storage_client(
+    *,
+    endpoint_url: Optional[str],
+    access_key: Optional[str],
+    secret_key: Optional[str],
+    region_name: Optional[str] = None,
+    **config_overrides,
+):
+    """Build a new S3 client with :func:`storage_client_config`."""
+    return boto3.session.Session().client(
+        "s3",
+        endpoint_url=endpoint_url,
+        aws_access_key_id=access_key,
+        aws_secret_access_key=secret_key,
+        region_name=region_name or "us-east-1",
+        config=storage_client_config(**config_overrides),
+    )
+
+
+def get_storage_client():
+    """
+    Process-wide S3 client for Supabase Storage, created on first use.
+
+    boto3 clients are thread-safe, so worker threads share it and its
+    connection pool. Returns None when the Supabase env vars are not configured
+    (e.g. tests/local).
+    """
+    global _storage_client
+    if _storage_client is not None:
+        return _storage_client
+
+    endpoint = getattr(settings, "AWS_S3_ENDPOINT_URL", None)
+    access_key = getattr(settings, "AWS_ACCESS_KEY_ID", None)
+    secret = getattr(settings, "AWS_SECRET_ACCESS_KEY", None)
+    if not endpoint or not access_key or not secret:
+        return None
+
+    with _storage_client_lock:
+        if _storage_client is None:
+            _storage_client = create_storage_client(
+                endpoint_url=endpoint,
+                access_key=access_key,
+                secret_key=secret,
+                region_name=getattr(settings, "AWS_S3_REGION_NAME", None),
+            )
+    return _storage_client
+
+
+def reset_storage_client() -> None:
+    """Drop the shared client so the next call picks up changed settings."""
+    global _storage_client
+    with _storage_client_lock:
+        _storage_client = None
+
+
+__all__ = [
+    "create_storage_client",
+    "get_storage_client",
+    "reset_storage_client",
+    "storage_client_config",
+    "storage_transfer_config",
+]
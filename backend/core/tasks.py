@@ -0,0 +1,21 @@
+"""Background job handlers for shared core services."""
+
+from backend.core.chunked_uploads import EXPIRE_UPLOAD_JOB, expire_upload
+from backend.core.content_store import COLLECT_JOB, collect_unreferenced_objects
+from backend.core.direct_uploads import EXPIRE_SLOT_JOB, expire_upload_slot
+from backend.jobs.registry import job
+
+
+@job(EXPIRE_UPLOAD_JOB)
+def expire_chunked_upload(*, upload_id: str) -> None:
+    expire_upload(upload_id)
+
+
+@job(EXPIRE_SLOT_JOB)
+def expire_direct_upload(*, slot_id: str) -> None:
+    expire_upload_slot(slot_id)
+
+
+@job(COLLECT_JOB)
+def collect_stored_objects() -> None:
+    collect_unreferenced_objects()
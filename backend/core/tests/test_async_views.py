@@ -0,0 +1,42 @@
+import pytest
+from django.core.files.uploadedfile import SimpleUploadedFile
+from django.test import override_settings
+from rest_framework.test import APIClient
+
+from backend.catalog.tests.factories import UserFactory
+
+URL = "/api/v1/core/upload/"
+
+
+@pytest.fixture
+def client(db):
+    client = APIClient()
+    client.force_authenticate(user=UserFactory.create())
+    return client
+
+
+def test_upload_saves_file_off_the_event_loop(client, tmp_path):
+    storages = {"default": {"BACKEND": "django.core.files.storage.FileSystemStorage"}}
+    with override_settings(MEDIA_ROOT=str(tmp_path), STORAGES=storages):
+        response = client.post(URL, {"file": SimpleUploadedFile("card.PNG", b"\x89PNG data")}, format="multipart")
+
+    assert response.status_code == 201
+    assert response.data["url"].startswith("http://testserver/")
+    saved = list((tmp_path / "uploads").iterdir())
+    assert len(saved) == 1 and saved[0].suffix == ".png"
+    assert saved[0].read_bytes() == b"\x89PNG data"
+
+
+def test_upload_validation_errors(client):
+    assert client.post(URL, {}, format="multipart").status_code == 400
+
+    big = SimpleUploadedFile("big.bin", b"0" * (5 * 1024 * 1024 + 1))
+    response = client.post(URL, {"file": big}, format="multipart")
+    assert response.status_code == 400
+    assert "too large" in response.data["error"]
+
+
+@pytest.mark.django_db
+def test_async_view_still_enforces_authentication():
+    response = APIClient().post(URL, {}, format="multipart")
+    assert response.status_code == 401
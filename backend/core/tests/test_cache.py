@@ -0,0 +1,42 @@
+from backend.core.cache import LocalTTLCache
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self):
+        return self.now
+
+
+def test_local_ttl_cache_expires_entries():
+    clock = FakeClock()
+    cache = LocalTTLCache(maxsize=4, ttl=5, timer=clock)
+    cache.set("a", 1)
+
+    clock.now = 4.9
+    assert cache.get("a") == 1
+    clock.now = 5.0
+    assert cache.get("a") is None
+
+
+def test_local_ttl_cache_evicts_least_recently_used():
+    cache = LocalTTLCache(maxsize=2, ttl=60)
+    cache.set("a", 1)
+    cache.set("b", 2)
+    cache.get("a")
+    cache.set("c", 3)
+
+    assert cache.get("a") == 1
+    assert cache.get("b") is None
+    assert cache.get("c") == 3
+
+
+def test_local_ttl_cache_delete_where():
+    cache = LocalTTLCache(maxsize=4, ttl=60)
+    cache.set(("v1", "sku", "A"), {"id": 1})
+    cache.set(("v1", "tcg", "9"), {"id": 1})
+    cache.set(("v1", "sku", "B"), {"id": 2})
+
+    assert cache.delete_where(lambda key, value: value["id"] == 1) == 2
+    assert len(cache) == 1
@@ -0,0 +1,192 @@
+import os
+
+import boto3
+import pytest
+from django.test.utils import override_settings
+from django.utils import timezone
+from moto import mock_aws
+from rest_framework.test import APIClient
+
+from backend.catalog.tests.factories import UserFactory
+from backend.core.models import ChunkedUpload, ChunkedUploadStatus
+from backend.jobs.models import Job
+from backend.jobs.services.worker import run_pending_jobs
+
+START_URL = "/api/v1/core/uploads/chunked/"
+CONTENT = b"0123456789abcdefghij-tail"  # 25 bytes: six 4-byte chunks and a 1-byte tail
+
+
+@pytest.fixture
+def local_storage(tmp_path):
+    with override_settings(
+        CHUNKED_UPLOAD_CHUNK_SIZE=4,
+        CHUNKED_UPLOAD_TEMP_DIR=str(tmp_path / "chunks"),
+        MEDIA_ROOT=str(tmp_path / "media"),
+    ):
+        yield tmp_path
+
+
+@pytest.fixture
+def s3(monkeypatch):
+    with mock_aws(), override_settings(AWS_STORAGE_BUCKET_NAME="media"):
+        client = boto3.client("s3", region_name="us-east-1")
+        client.create_bucket(Bucket="media")
+        monkeypatch.setattr("backend.core.chunked_uploads.get_storage_client", lambda: client)
+        yield client
+
+
+@pytest.fixture
+def api(db):
+    client = APIClient()
+    client.force_authenticate(user=UserFactory.create())
+    return client
+
+
+def _start(api, size, **overrides):
+    body = {"filename": "scan.JPG", "content_type": "image/jpeg", "size": size, **overrides}
+    response = api.post(START_URL, body, format="json")
+    assert response.status_code == 201, response.data
+    return response.data
+
+
+def _put(api, upload, offset, data):
+    return api.put(
+        f"{START_URL}{upload['id']}/?offset={offset}",
+        data=data,
+        content_type="application/octet-stream",
+    )
+
+
+def test_chunks_in_any_order_resume_and_complete_locally(api, local_storage):
+    upload = _start(api, len(CONTENT))
+    assert upload["chunk_size"] == 4
+    assert upload["total_chunks"] == 7
+    assert upload["missing_offsets"] == [0, 4, 8, 12, 16, 20, 24]
+
+    for offset in (24, 0, 8):
+        assert _put(api, upload, offset, CONTENT[offset:offset + 4]).status_code == 200
+
+    # A client resuming after a dropped connection asks what is still missing.
+    state = api.get(f"{START_URL}{upload['id']}/").data
+    assert state["received_chunks"] == [0, 2, 6]
+    assert state["missing_offsets"] == [4, 12, 16, 20]
+
+    # A retried chunk is acknowledged but not written again.
+    response = _put(api, upload, 0, b"XXXX")
+    assert response.status_code == 200
+    assert response.data["received_bytes"] == 9
+
+    for offset in state["missing_offsets"]:
+        assert _put(api, upload, offset, CONTENT[offset:offset + 4]).status_code == 200
+
+    response = api.post(f"{START_URL}{upload['id']}/complete/")
+    assert response.status_code == 200, response.data
+    assert response.data["status"] == "complete"
+    assert response.data["url"].startswith("http://testserver/")
+
+    stored = ChunkedUpload.objects.get(pk=upload["id"])
+    with open(local_storage / "media" / stored.key, "rb") as handle:
+        assert handle.read() == CONTENT
+    assert os.listdir(local_storage / "chunks") == []
+
+    # Completing again (e.g. after a lost response) returns the same result.
+    again = api.post(f"{START_URL}{upload['id']}/complete/")
+    assert again.status_code == 200
+    assert again.data["url"] == response.data["url"]
+
+
+def test_rejects_bad_offsets_lengths_and_early_complete(api, local_storage):
+    upload = _start(api, len(CONTENT))
+
+    assert _put(api, upload, 2, b"2345").status_code == 400
+    assert _put(api, upload, 28, b"x").status_code == 400
+    assert _put(api, upload, 0, b"012").status_code == 400
+    assert _put(api, upload, 24, b"tl").status_code == 400
+    assert api.put(f"{START_URL}{upload['id']}/", data=b"0123", content_type="application/octet-stream").status_code == 400
+
+    _put(api, upload, 0, b"0123")
+    response = api.post(f"{START_URL}{upload['id']}/complete/")
+    assert response.status_code == 400
+    assert "6 chunk(s) missing" in response.data["error"]
+
+
+def test_start_validation_and_ownership(api, local_storage):
+    assert api.post(START_URL, {"filename": "a.exe", "content_type": "application/x-msdownload", "size": 10}, format="json").status_code == 400
+    with override_settings(CHUNKED_UPLOAD_MAX_SIZE=10):
+        assert api.post(START_URL, {"filename": "a.jpg", "content_type": "image/jpeg", "size": 11}, format="json").status_code == 400
+
+    upload = _start(api, len(CONTENT))
+    other = APIClient()
+    other.force_authenticate(user=UserFactory.create())
+    assert other.get(f"{START_URL}{upload['id']}/").status_code == 404
+    assert _put(other, upload, 0, b"0123").status_code == 404
+    assert other.post(f"{START_URL}{upload['id']}/complete/").status_code == 404
+
+
+def test_expired_upload_is_aborted_by_job(api, local_storage):
+    with override_settings(CHUNKED_UPLOAD_EXPIRY=1):
+        upload = _start(api, len(CONTENT))
+    assert _put(api, upload, 0, b"0123").status_code == 200
+    assert len(os.listdir(local_storage / "chunks")) == 1
+
+    ChunkedUpload.objects.filter(pk=upload["id"]).update(expires_at=timezone.now())
+    Job.objects.update(run_at=timezone.now())
+    assert _put(api, upload, 4, b"4567").status_code == 400
+    assert run_pending_jobs() == 1
+    assert ChunkedUpload.objects.get(pk=upload["id"]).status == ChunkedUploadStatus.ABORTED
+    assert os.listdir(local_storage / "chunks") == []
+
+
+def test_part_file_is_created_by_the_first_chunk(api, local_storage):
+    upload = _start(api, len(CONTENT))
+    assert not (local_storage / "chunks").exists()
+
+    assert _put(api, upload, 24, b"l").status_code == 200
+    assert os.listdir(local_storage / "chunks") == [f"{upload['id']}.part"]
+
+
+def test_open_uploads_per_user_are_capped(api, local_storage):
+    with override_settings(CHUNKED_UPLOAD_MAX_OPEN_PER_USER=2):
+        first = _start(api, len(CONTENT))
+        _start(api, len(CONTENT))
+        response = api.post(START_URL, {"filename": "a.jpg", "content_type": "image/jpeg", "size": 10}, format="json")
+        assert response.status_code == 400
+        assert "Too many unfinished uploads" in response.data["error"]
+
+        # Cancelling one frees a place; other users are not affected.
+        assert api.delete(f"{START_URL}{first['id']}/").status_code == 204
+        _start(api, len(CONTENT))
+        other = APIClient()
+        other.force_authenticate(user=UserFactory.create())
+        _start(other, len(CONTENT))
+
+
+def test_s3_multipart_upload(api, s3):
+    size = 5 * 1024 * 1024 + 10
+    with override_settings(CHUNKED_UPLOAD_CHUNK_SIZE=1024):
+        upload = _start(api, size)
+    # Raised to the S3 minimum part size.
+    assert upload["chunk_size"] == 5 * 1024 * 1024
+    assert upload["total_chunks"] == 2
+
+    first, tail = os.urandom(5 * 1024 * 1024), b"0123456789"
+    assert _put(api, upload, 5 * 1024 * 1024, tail).status_code == 200
+    assert _put(api, upload, 0, first).status_code == 200
+    assert _put(api, upload, 0, first).status_code == 200
+
+    response = api.post(f"{START_URL}{upload['id']}/complete/")
+    assert response.status_code == 200, response.data
+
+    stored = ChunkedUpload.objects.get(pk=upload["id"])
+    obj = s3.get_object(Bucket="media", Key=stored.key)
+    assert obj["ContentType"] == "image/jpeg"
+    assert obj["Body"].read() == first + tail
+
+
+def test_s3_cancel_aborts_multipart_upload(api, s3):
+    upload = _start(api, 100)
+    assert len(s3.list_multipart_uploads(Bucket="media").get("Uploads", [])) == 1
+
+    assert api.delete(f"{START_URL}{upload['id']}/").status_code == 204
+    assert s3.list_multipart_uploads(Bucket="media").get("Uploads", []) == []
+    assert _put(api, upload, 0, b"x" * 100).status_code == 400
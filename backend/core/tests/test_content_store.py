@@ -0,0 +1,231 @@
+import hashlib
+import threading
+from datetime import timedelta
+
+import boto3
+import pytest
+from django.conf import settings
+from django.core.files.base import ContentFile
+from django.core.files.storage import default_storage
+from django.core.files.uploadedfile import SimpleUploadedFile
+from django.db import connection, transaction
+from django.test.utils import override_settings
+from django.utils import timezone
+from moto import mock_aws
+from rest_framework.test import APIClient
+
+from backend.catalog.services.create_item import create_item
+from backend.catalog.services.delete_item import delete_item
+from backend.catalog.services.media import sync_item_media
+from backend.catalog.services.update_item import update_item
+from backend.catalog.tests.factories import CatalogItemFactory, StoreFactory, UserFactory
+from backend.core.content_store import (
+    COLLECT_JOB,
+    _live_references,
+    collect_unreferenced_objects,
+    register_upload,
+)
+from backend.core.models import StoredObject
+from backend.core.query_plans import capture_plans, plan_regressions
+from backend.core.storage_cleanup import delete_objects_or_raise
+from backend.jobs.models import Job
+from backend.jobs.services.worker import run_pending_jobs
+from backend.users.services.user_media import remove_user_media, upsert_user_media
+
+pytestmark = pytest.mark.django_db
+
+URL = "/api/v1/core/upload/"
+SCAN = b"\x89PNG card scan"
+
+
+@pytest.fixture
+def media_root(tmp_path):
+    storages = {"default": {"BACKEND": "django.core.files.storage.FileSystemStorage"}}
+    with override_settings(MEDIA_ROOT=str(tmp_path), STORAGES=storages, CATALOG_MEDIA_PROCESSING=False):
+        yield tmp_path
+
+
+@pytest.fixture
+def client():
+    client = APIClient()
+    client.force_authenticate(user=UserFactory.create())
+    return client
+
+
+def _item_fields():
+    item = CatalogItemFactory.build(store=StoreFactory.create())
+    return {"vendor": item.store.vendor, "store": item.store, "name": item.name, "sku": item.sku, "price": item.price}
+
+
+def _upload(client, data=SCAN, name="scan.png"):
+    response = client.post(URL, {"file": SimpleUploadedFile(name, data)}, format="multipart")
+    assert response.status_code == 201, response.data
+    return response.data
+
+
+def test_identical_uploads_are_stored_once(client, media_root):
+    first = _upload(client)
+    second = _upload(client, name="same-scan.PNG")
+    _upload(client, data=b"another card")
+
+    digest = hashlib.sha256(SCAN).hexdigest()
+    assert first["url"] == second["url"] == f"http://testserver/media/uploads/{digest}.png"
+    # Whether the bytes were already stored (maybe by another tenant) is not disclosed.
+    assert set(first) == set(second) == {"url"}
+    assert sorted(path.name for path in (media_root / "uploads").iterdir()) == sorted(
+        [f"{digest}.png", f"{hashlib.sha256(b'another card').hexdigest()}.png"]
+    )
+    stored = StoredObject.objects.get(sha256=digest)
+    assert (stored.size, stored.ref_count) == (len(SCAN), 0)
+
+
+def test_references_follow_media_rows_and_gc_removes_orphans(client, media_root):
+    url = _upload(client)["url"]
+    stored = StoredObject.objects.get()
+    first, second = CatalogItemFactory.create(), CatalogItemFactory.create()
+    user = UserFactory.create()
+
+    sync_item_media(item=first, media_payloads=[{"url": url}])
+    sync_item_media(item=second, media_payloads=[{"url": url}])
+    upsert_user_media(user_id=user.id, media_type="profile_avatar", payload={"url": url})
+    stored.refresh_from_db()
+    # A media row and the image_url of each item, plus the avatar.
+    assert (stored.ref_count, stored.orphaned_at) == (5, None)
+
+    # Re-saving a gallery with the same image keeps the count.
+    sync_item_media(item=first, media_payloads=[{"url": url}])
+    delete_item(instance=second)
+    remove_user_media(user_id=user.id, media_type="profile_avatar")
+    stored.refresh_from_db()
+    assert stored.ref_count == 2
+
+    sync_item_media(item=first, media_payloads=[])
+    stored.refresh_from_db()
+    assert stored.ref_count == 0 and stored.orphaned_at is not None
+    assert Job.objects.filter(name=COLLECT_JOB, status="queued").count() == 1
+
+    # Nothing is collected during the grace period...
+    assert collect_unreferenced_objects() == 0
+    assert default_storage.exists(stored.key)
+
+    # ...and the file goes once it has passed.
+    StoredObject.objects.update(orphaned_at=timezone.now() - timedelta(days=2))
+    Job.objects.update(run_at=timezone.now())
+    run_pending_jobs()
+    assert not StoredObject.objects.exists()
+    assert not default_storage.exists(stored.key)
+
+
+def test_gc_repairs_counts_for_objects_still_in_use(client, media_root):
+    url = _upload(client)["url"]
+    # Set outside the services, so the count does not know about it.
+    item = CatalogItemFactory.create(image_url=url)
+    StoredObject.objects.update(orphaned_at=timezone.now() - timedelta(days=2))
+
+    with override_settings(CONTENT_STORE_GC_BATCH_SIZE=1):
+        assert collect_unreferenced_objects() == 0
+    stored = StoredObject.objects.get()
+    assert (stored.ref_count, stored.orphaned_at) == (1, None)
+    assert default_storage.exists(stored.key)
+    assert item.image_url == url
+
+
+def test_replacing_an_items_image_url_moves_the_reference(client, media_root):
+    old_url = _upload(client)["url"]
+    new_url = _upload(client, data=b"rescanned card")["url"]
+    item = create_item(data={**_item_fields(), "image_url": old_url})
+    old, new = (StoredObject.objects.get(key__endswith=url.rsplit("/", 1)[1]) for url in (old_url, new_url))
+    assert (old.refresh_from_db(), old.ref_count) == (None, 1)
+
+    update_item(instance=item, data={"image_url": new_url})
+    old.refresh_from_db()
+    new.refresh_from_db()
+    assert (old.ref_count, new.ref_count) == (0, 1)
+    assert old.orphaned_at is not None and new.orphaned_at is None
+
+    StoredObject.objects.update(orphaned_at=timezone.now() - timedelta(days=2))
+    assert collect_unreferenced_objects() == 1
+    assert list(StoredObject.objects.values_list("key", flat=True)) == [new.key]
+    assert not default_storage.exists(old.key) and default_storage.exists(new.key)
+
+    delete_item(instance=item)
+    new.refresh_from_db()
+    assert new.ref_count == 0
+
+
+def test_reupload_restarts_the_grace_period(client, media_root):
+    url = _upload(client)["url"]
+    StoredObject.objects.update(orphaned_at=timezone.now() - timedelta(days=2))
+
+    assert _upload(client)["url"] == url
+    assert collect_unreferenced_objects() == 0
+    assert default_storage.exists(StoredObject.objects.get().key)
+
+
+@pytest.mark.django_db(transaction=True)
+def test_gc_skips_objects_locked_by_an_upload(media_root):
+    digest = hashlib.sha256(SCAN).hexdigest()
+    key = default_storage.save(f"uploads/{digest}.png", ContentFile(SCAN))
+    stored = StoredObject.objects.create(
+        sha256=digest, key=key, size=len(SCAN), orphaned_at=timezone.now() - timedelta(days=2)
+    )
+    locked, release = threading.Event(), threading.Event()
+
+    def hold_lock():
+        # What find_upload holds while it claims the object.
+        with transaction.atomic():
+            StoredObject.objects.select_for_update().get(pk=stored.pk)
+            locked.set()
+            release.wait(10)
+        connection.close()
+
+    thread = threading.Thread(target=hold_lock)
+    thread.start()
+    try:
+        assert locked.wait(10)
+        assert collect_unreferenced_objects() == 0
+        assert default_storage.exists(key)
+    finally:
+        release.set()
+        thread.join()
+
+
+@pytest.mark.skipif(connection.vendor != "postgresql", reason="EXPLAIN (FORMAT JSON) needs Postgres")
+def test_live_reference_checks_use_indexes():
+    batch = [StoredObject(key=f"uploads/{n:064x}.png") for n in range(3)]
+    plans = capture_plans(lambda: _live_references(batch))
+
+    assert len(plans) == len(settings.CONTENT_STORE_REFERENCES)
+    assert [problem for plan in plans for problem in plan_regressions([plan], max_cost=1e9)] == []
+    for plan in plans:
+        assert plan.index_names and all(name.endswith("_url_suffix_idx") for name in plan.index_names)
+
+
+def test_concurrent_registration_keeps_one_copy(media_root):
+    digest = hashlib.sha256(SCAN).hexdigest()
+    winner_key = default_storage.save(f"uploads/{digest}.png", ContentFile(SCAN))
+    loser_key = default_storage.save(f"uploads/{digest}.png", ContentFile(SCAN))
+    assert winner_key != loser_key
+
+    register_upload(sha256=digest, key=winner_key, size=len(SCAN))
+    stored = register_upload(sha256=digest, key=loser_key, size=len(SCAN))
+
+    assert stored.key == winner_key
+    assert not default_storage.exists(loser_key)
+
+
+def test_row_cleanup_jobs_leave_indexed_objects_to_the_collector():
+    digest = hashlib.sha256(SCAN).hexdigest()
+    with mock_aws():
+        s3 = boto3.client("s3", region_name="us-east-1")
+        s3.create_bucket(Bucket="media")
+        for key in (f"uploads/{digest}.png", "uploads/legacy.png"):
+            s3.put_object(Bucket="media", Key=key, Body=SCAN)
+        StoredObject.objects.create(sha256=digest, key=f"uploads/{digest}.png", size=len(SCAN))
+
+        delete_objects_or_raise(
+            [{"bucket": "media", "key": f"uploads/{digest}.png"}, {"bucket": "media", "key": "uploads/legacy.png"}],
+            client=s3,
+        )
+        keys = [obj["Key"] for obj in s3.list_objects_v2(Bucket="media")["Contents"]]
+    assert keys == [f"uploads/{digest}.png"]
@@ -0,0 +1,191 @@
+from urllib.parse import parse_qs, urlparse
+
+import boto3
+import pytest
+import requests
+from botocore.config import Config
+from django.test.utils import override_settings
+from moto import mock_aws
+from rest_framework.test import APIClient
+
+from backend.catalog.models import CatalogMedia
+from backend.catalog.tests.factories import CatalogItemFactory, UserFactory
+from backend.catalog.tests.utils import ensure_vendor_admin
+from backend.core.direct_uploads import EXPIRE_SLOT_JOB, expire_upload_slot
+from backend.core.models import DirectUpload, DirectUploadStatus
+from backend.jobs.models import Job
+from backend.users.models import UserMedia, UserMediaType
+
+SLOT_URL = "/api/v1/core/uploads/"
+CONFIRM_URL = "/api/v1/core/uploads/confirm/"
+PNG = b"\x89PNG\r\n\x1a\n" + b"0" * 2048
+
+
+@pytest.fixture
+def s3(monkeypatch):
+    with mock_aws(), override_settings(AWS_STORAGE_BUCKET_NAME="media"):
+        client = boto3.client("s3", region_name="us-east-1", config=Config(signature_version="s3v4"))
+        client.create_bucket(Bucket="media")
+        monkeypatch.setattr("backend.core.direct_uploads.get_storage_client", lambda: client)
+        yield client
+
+
+@pytest.fixture
+def user(db):
+    return UserFactory.create()
+
+
+@pytest.fixture
+def api(user):
+    client = APIClient()
+    client.force_authenticate(user=user)
+    return client
+
+
+def _slot(api, **overrides):
+    body = {"filename": "card.PNG", "content_type": "image/png", "size": len(PNG), **overrides}
+    response = api.post(SLOT_URL, body, format="json")
+    assert response.status_code == 201, response.data
+    return response.data
+
+
+def _keys(s3):
+    return [obj["Key"] for obj in s3.list_objects_v2(Bucket="media").get("Contents", [])]
+
+
+def test_presigned_put_then_confirm(api, s3):
+    slot = _slot(api)
+    assert slot["method"] == "PUT"
+    assert slot["key"].startswith("uploads/") and slot["key"].endswith(".png")
+    assert slot["headers"] == {"Content-Type": "image/png", "Content-Length": str(len(PNG))}
+    signed = parse_qs(urlparse(slot["upload_url"]).query)["X-Amz-SignedHeaders"][0].split(";")
+    assert {"content-length", "content-type"} <= set(signed)
+
+    upload = requests.put(slot["upload_url"], data=PNG, headers=slot["headers"])
+    assert upload.status_code == 200
+
+    response = api.post(CONFIRM_URL, {"token": slot["token"]}, format="json")
+    assert response.status_code == 200
+    assert response.data["key"] == slot["key"]
+    assert response.data["size"] == len(PNG)
+    assert response.data["content_type"] == "image/png"
+    assert response.data["url"].startswith("http://testserver/")
+
+    # Tokens are single use.
+    replay = api.post(CONFIRM_URL, {"token": slot["token"]}, format="json")
+    assert replay.status_code == 400
+    assert "already confirmed" in replay.data["error"]
+
+
+def test_confirm_rejects_mismatched_upload_and_deletes_it(api, s3):
+    slot = _slot(api)
+    s3.put_object(Bucket="media", Key=slot["key"], Body=PNG + b"extra", ContentType="image/png")
+
+    response = api.post(CONFIRM_URL, {"token": slot["token"]}, format="json")
+    assert response.status_code == 400
+    assert "does not match" in response.data["error"]
+    assert _keys(s3) == []
+
+    slot = _slot(api)
+    s3.put_object(Bucket="media", Key=slot["key"], Body=PNG, ContentType="text/html")
+    assert api.post(CONFIRM_URL, {"token": slot["token"]}, format="json").status_code == 400
+    assert _keys(s3) == []
+
+
+def test_confirm_requires_the_upload_and_the_same_user(api, s3):
+    slot = _slot(api)
+    response = api.post(CONFIRM_URL, {"token": slot["token"]}, format="json")
+    assert response.status_code == 400
+    assert "not been uploaded" in response.data["error"]
+    assert DirectUpload.objects.get(key=slot["key"]).status == DirectUploadStatus.PENDING
+
+    other = APIClient()
+    other.force_authenticate(user=UserFactory.create())
+    s3.put_object(Bucket="media", Key=slot["key"], Body=PNG, ContentType="image/png")
+    assert other.post(CONFIRM_URL, {"token": slot["token"]}, format="json").status_code == 400
+    assert api.post(CONFIRM_URL, {"token": slot["token"] + "x"}, format="json").status_code == 400
+
+    # The slot stayed open, so the owner can still confirm once the file is there.
+    assert api.post(CONFIRM_URL, {"token": slot["token"]}, format="json").status_code == 200
+
+
+def test_unconfirmed_uploads_are_expired_and_deleted(api, s3):
+    slot = _slot(api)
+    s3.put_object(Bucket="media", Key=slot["key"], Body=PNG, ContentType="image/png")
+    pending = DirectUpload.objects.get(key=slot["key"])
+    job = Job.objects.get(name=EXPIRE_SLOT_JOB)
+    assert job.payload == {"slot_id": str(pending.pk)}
+    assert job.run_at >= pending.expires_at
+
+    expire_upload_slot(str(pending.pk))
+
+    assert _keys(s3) == []
+    pending.refresh_from_db()
+    assert pending.status == DirectUploadStatus.EXPIRED
+    assert api.post(CONFIRM_URL, {"token": slot["token"]}, format="json").status_code == 400
+
+
+def test_expiry_leaves_confirmed_uploads_alone(api, s3):
+    slot = _slot(api)
+    s3.put_object(Bucket="media", Key=slot["key"], Body=PNG, ContentType="image/png")
+    assert api.post(CONFIRM_URL, {"token": slot["token"]}, format="json").status_code == 200
+
+    expire_upload_slot(str(DirectUpload.objects.get(key=slot["key"]).pk))
+    assert _keys(s3) == [slot["key"]]
+
+
+def test_slot_validation(api, s3):
+    assert api.post(SLOT_URL, {"filename": "a.exe", "content_type": "application/x-msdownload", "size": 10}, format="json").status_code == 400
+    with override_settings(DIRECT_UPLOAD_MAX_SIZE=1024):
+        response = api.post(SLOT_URL, {"filename": "a.png", "content_type": "image/png", "size": 2048}, format="json")
+    assert response.status_code == 400
+
+
+def test_slot_needs_s3_storage(api, monkeypatch):
+    monkeypatch.setattr("backend.core.direct_uploads.get_storage_client", lambda: None)
+    response = api.post(SLOT_URL, {"filename": "a.png", "content_type": "image/png", "size": 10}, format="json")
+    assert response.status_code == 503
+
+
+def test_attach_upload_to_catalog_item(api, user, s3):
+    vendor, store = ensure_vendor_admin(user)
+    item = CatalogItemFactory.create(vendor=vendor, store=store, image_url=None)
+    slot = _slot(api)
+    s3.put_object(Bucket="media", Key=slot["key"], Body=PNG, ContentType="image/png")
+
+    url = f"/api/v1/catalog/items/{item.id}/media/"
+    response = api.post(url, {"token": slot["token"], "width": 600, "height": 825}, format="json")
+    assert response.status_code == 201, response.data
+    media = CatalogMedia.objects.get(item=item)
+    assert response.data["id"] == media.id
+    assert media.is_primary and media.width == 600 and media.size_kb == 2
+    assert media.metadata == {"bucket": "media", "path": slot["key"], "content_type": "image/png"}
+    item.refresh_from_db()
+    assert item.image_url == media.url
+
+    # The token is used up: it cannot attach the object again, here or to another item.
+    other = CatalogItemFactory.create(vendor=vendor, store=store)
+    assert api.post(url, {"token": slot["token"]}, format="json").status_code == 400
+    assert api.post(f"/api/v1/catalog/items/{other.id}/media/", {"token": slot["token"]}, format="json").status_code == 400
+    assert CatalogMedia.objects.count() == 1
+
+
+def test_attach_upload_to_other_vendors_item_is_rejected(api, s3):
+    item = CatalogItemFactory.create()
+    slot = _slot(api)
+    s3.put_object(Bucket="media", Key=slot["key"], Body=PNG, ContentType="image/png")
+
+    response = api.post(f"/api/v1/catalog/items/{item.id}/media/", {"token": slot["token"]}, format="json")
+    assert response.status_code in (403, 404)
+    assert not CatalogMedia.objects.exists()
+
+
+def test_confirm_upload_as_user_avatar(api, user, s3):
+    slot = _slot(api)
+    s3.put_object(Bucket="media", Key=slot["key"], Body=PNG, ContentType="image/png")
+
+    response = api.post(f"/api/v1/auth/me/media/{UserMediaType.PROFILE_AVATAR}/", {"token": slot["token"]}, format="json")
+    assert response.status_code == 201, response.data
+    media = UserMedia.objects.get(user=user)
+    assert media.url == response.data["url"]
+    assert media.metadata["path"] == slot["key"]
@@ -0,0 +1,63 @@
+from io import BytesIO
+
+import pytest
+from django.test.utils import override_settings
+from PIL import Image
+
+from backend.core.image_processing import (
+    EXIF_ORIENTATION,
+    ImageProcessingError,
+    process_images,
+    render_derivatives,
+    shutdown_pool,
+)
+
+
+def _jpeg(size=(800, 400), orientation=None):
+    image = Image.new("RGB", size, (200, 30, 30))
+    exif = Image.Exif()
+    if orientation:
+        exif[EXIF_ORIENTATION] = orientation
+    buffer = BytesIO()
+    image.save(buffer, "JPEG", exif=exif.tobytes())
+    return buffer.getvalue()
+
+
+def test_render_applies_exif_orientation_and_never_upscales():
+    result = render_derivatives(_jpeg(orientation=6), {"thumb": 320, "display": 1280})
+
+    # Orientation 6 is a 90 degree rotation: the upright image is portrait.
+    assert (result["width"], result["height"], result["orientation"]) == (400, 800, 6)
+    assert result["format"] == "JPEG"
+    assert (result["derivatives"]["thumb"]["width"], result["derivatives"]["thumb"]["height"]) == (160, 320)
+    assert (result["derivatives"]["display"]["width"], result["derivatives"]["display"]["height"]) == (400, 800)
+
+    thumb = Image.open(BytesIO(result["derivatives"]["thumb"]["data"]))
+    assert thumb.format == "WEBP"
+    assert thumb.size == (160, 320)
+
+
+def test_render_keeps_transparency():
+    buffer = BytesIO()
+    Image.new("RGBA", (64, 64), (0, 0, 0, 0)).save(buffer, "PNG")
+    result = render_derivatives(buffer.getvalue(), {"thumb": 32})
+    assert Image.open(BytesIO(result["derivatives"]["thumb"]["data"])).mode == "RGBA"
+
+
+def test_render_rejects_non_images():
+    with pytest.raises(ImageProcessingError):
+        render_derivatives(b"not an image", {"thumb": 32})
+    with pytest.raises(ImageProcessingError):
+        render_derivatives(_jpeg()[:200], {"thumb": 32})
+
+
+def test_process_images_in_worker_processes():
+    try:
+        with override_settings(IMAGE_PROCESSING_WORKERS=2):
+            results = process_images([_jpeg(), b"broken", _jpeg(size=(100, 50))], {"thumb": 64})
+    finally:
+        shutdown_pool()
+
+    assert results[0]["derivatives"]["thumb"]["width"] == 64
+    assert isinstance(results[1], ImageProcessingError)
+    assert (results[2]["width"], results[2]["height"]) == (100, 50)
@@ -0,0 +1,26 @@
+from backend.core.instrumentation import Metrics
+
+
+def test_counters_and_timers_are_aggregated():
+    metrics = Metrics()
+    metrics.incr("hits")
+    metrics.incr("hits", 2)
+    metrics.observe("render", 10)
+    metrics.observe("render", 30)
+    with metrics.timer("block"):
+        pass
+
+    snapshot = metrics.snapshot()
+    assert snapshot["counters"] == {"hits": 3}
+    assert snapshot["timers"]["render"] == {"count": 2, "total_ms": 40, "max_ms": 30, "mean_ms": 20}
+    assert snapshot["timers"]["block"]["count"] == 1
+    assert metrics.mean_ms("render") == 20
+    assert metrics.mean_ms("missing") == 0
+
+
+def test_reset_clears_everything():
+    metrics = Metrics()
+    metrics.incr("hits")
+    metrics.observe("render", 1)
+    metrics.reset()
+    assert (metrics.snapshot()["counters"], metrics.snapshot()["timers"]) == ({}, {})
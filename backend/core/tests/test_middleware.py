@@ -0,0 +1,117 @@
+import asyncio
+import gzip
+import json
+
+import brotli
+import pytest
+from django.http import FileResponse, HttpResponse, StreamingHttpResponse
+from django.test import RequestFactory, override_settings
+from rest_framework.test import APIClient
+
+from backend.catalog.tests.factories import CatalogItemFactory, UserFactory
+from backend.catalog.tests.utils import ensure_vendor_admin
+from backend.core.middleware import CompressionMiddleware, choose_encoding, parse_accept_encoding
+
+BODY = json.dumps([{"id": i, "name": f"Card {i}", "price": "10.00"} for i in range(200)]).encode()
+
+
+def _process(response, accept="gzip, deflate, br", **extra):
+    request = RequestFactory().get("/", HTTP_ACCEPT_ENCODING=accept, **extra)
+    return CompressionMiddleware(lambda req: response)(request)
+
+
+def test_accept_encoding_negotiation():
+    assert parse_accept_encoding("gzip;q=0.5, br , identity;q=0") == {"gzip": 0.5, "br": 1.0, "identity": 0.0}
+    assert choose_encoding("gzip, br") == "br"
+    assert choose_encoding("br;q=0.4, gzip;q=0.8") == "gzip"
+    assert choose_encoding("br;q=0, *") == "gzip"
+    assert choose_encoding("identity") is None
+    assert choose_encoding("br, gzip", allow_brotli=False) == "gzip"
+
+
+def test_json_is_compressed_with_preferred_encoding():
+    response = _process(HttpResponse(BODY, content_type="application/json"))
+    assert response["Content-Encoding"] == "br"
+    assert response["Vary"] == "Accept-Encoding"
+    assert int(response["Content-Length"]) == len(response.content) < len(BODY)
+    assert brotli.decompress(response.content) == BODY
+
+    response = _process(HttpResponse(BODY, content_type="application/json"), accept="gzip")
+    assert response["Content-Encoding"] == "gzip"
+    assert gzip.decompress(response.content) == BODY
+
+
+def test_html_is_never_brotli_encoded():
+    response = _process(HttpResponse(BODY, content_type="text/html; charset=utf-8"), accept="br, gzip")
+    assert response["Content-Encoding"] == "gzip"
+
+
+@pytest.mark.parametrize(
+    "response",
+    [
+        HttpResponse(b"{}" * 10, content_type="application/json"),
+        HttpResponse(BODY, content_type="image/png"),
+        HttpResponse(BODY, content_type="application/zip"),
+        HttpResponse(BODY, content_type="application/json", headers={"Content-Encoding": "gzip"}),
+    ],
+)
+def test_small_binary_or_encoded_responses_are_untouched(response):
+    original = response.content
+    result = _process(response)
+    assert not result.has_header("Vary") or "Accept-Encoding" not in result["Vary"]
+    assert result.content == original
+
+
+def test_strong_etag_is_weakened():
+    response = _process(HttpResponse(BODY, content_type="application/json", headers={"ETag": '"abc"'}))
+    assert response["ETag"] == 'W/"abc"'
+
+
+@override_settings(COMPRESSION_STREAM_FLUSH_SIZE=4096)
+def test_streaming_response_is_compressed_incrementally():
+    chunks = [BODY[i:i + 1000] for i in range(0, len(BODY), 1000)]
+    response = _process(StreamingHttpResponse(iter(chunks), content_type="text/csv"), accept="gzip")
+
+    assert response["Content-Encoding"] == "gzip"
+    assert not response.has_header("Content-Length")
+    parts = list(response.streaming_content)
+    # Output is flushed as input accumulates rather than emitted in one final block.
+    assert len([part for part in parts if part]) > 2
+    assert gzip.decompress(b"".join(parts)) == BODY
+
+
+def test_async_streaming_response_is_compressed():
+    async def chunks():
+        for i in range(0, len(BODY), 1000):
+            yield BODY[i:i + 1000]
+
+    response = _process(StreamingHttpResponse(chunks(), content_type="application/json"), accept="br")
+
+    async def collect():
+        return b"".join([part async for part in response.streaming_content])
+
+    assert brotli.decompress(asyncio.run(collect())) == BODY
+
+
+def test_file_media_is_not_recompressed(tmp_path):
+    path = tmp_path / "photo.jpg"
+    path.write_bytes(b"\xff\xd8" + b"0" * 5000)
+    with open(path, "rb") as handle:
+        response = _process(FileResponse(handle, content_type="image/jpeg"))
+        assert not response.has_header("Content-Encoding")
+
+
+@pytest.mark.django_db
+def test_catalog_list_is_compressed_end_to_end():
+    user = UserFactory.create()
+    vendor, store = ensure_vendor_admin(user)
+    CatalogItemFactory.create_batch(20, vendor=vendor, store=store, description="Near mint " * 20)
+    client = APIClient()
+    client.force_authenticate(user=user)
+
+    plain = client.get("/api/v1/catalog/items/")
+    compressed = client.get("/api/v1/catalog/items/", HTTP_ACCEPT_ENCODING="gzip")
+
+    assert not plain.has_header("Content-Encoding")
+    assert compressed["Content-Encoding"] == "gzip"
+    assert json.loads(gzip.decompress(compressed.content)) == plain.json()
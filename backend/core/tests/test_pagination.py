@@ -0,0 +1,57 @@
+import pytest
+from django.test.utils import override_settings
+from rest_framework.test import APIClient
+
+from backend.catalog.models import CatalogItem
+from backend.catalog.tests.factories import CatalogItemFactory, UserFactory
+from backend.catalog.tests.utils import ensure_vendor_admin
+from backend.core.pagination import estimate_count
+
+URL = "/api/v1/catalog/items/"
+
+pytestmark = pytest.mark.django_db
+
+
+@pytest.fixture
+def client():
+    user = UserFactory.create()
+    vendor, store = ensure_vendor_admin(user)
+    CatalogItemFactory.create_batch(5, vendor=vendor, store=store)
+    client = APIClient()
+    client.force_authenticate(user=user)
+    return client
+
+
+def test_small_results_get_an_exact_count(client):
+    body = client.get(URL, {"limit": 2}).json()
+    assert (body["count"], body["count_is_estimate"]) == (5, False)
+    assert len(body["results"]) == 2
+    assert body["next"] is not None
+
+
+def test_large_results_report_the_planner_estimate(client, monkeypatch):
+    monkeypatch.setattr("backend.core.pagination.estimate_count", lambda queryset: 4000)
+    with override_settings(PAGINATION_EXACT_COUNT_THRESHOLD=3):
+        first = client.get(URL, {"limit": 2}).json()
+        last = client.get(URL, {"limit": 2, "offset": 4}).json()
+        beyond = client.get(URL, {"limit": 2, "offset": 5000}).json()
+
+    assert (first["count"], first["count_is_estimate"]) == (4000, True)
+    assert first["next"] is not None
+    # The estimate overshoots: the last page still ends the listing.
+    assert len(last["results"]) == 1
+    assert last["next"] is None
+    assert (beyond["results"], beyond["next"]) == ([], None)
+
+
+def test_an_underestimate_never_hides_rows(client, monkeypatch):
+    monkeypatch.setattr("backend.core.pagination.estimate_count", lambda queryset: 1)
+    with override_settings(PAGINATION_EXACT_COUNT_THRESHOLD=3):
+        body = client.get(URL, {"limit": 2, "offset": 2}).json()
+    assert body["count"] >= 5
+    assert body["next"] is not None
+
+
+def test_estimate_count_reads_the_plan():
+    CatalogItemFactory.create_batch(3)
+    assert isinstance(estimate_count(CatalogItem.objects.filter(quantity__gte=0)), int)
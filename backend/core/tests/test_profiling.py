@@ -0,0 +1,90 @@
+import logging
+import re
+
+import pytest
+from django.test.utils import override_settings
+from rest_framework.test import APIClient
+from rest_framework_simplejwt.tokens import RefreshToken
+
+from backend.catalog.tests.factories import CatalogItemFactory, UserFactory
+from backend.catalog.tests.utils import ensure_vendor_admin
+from backend.core import profiling as profiling_module
+from backend.core.instrumentation import metrics
+
+URL = "/api/v1/catalog/items/"
+LOGGER = "backend.core.profiling"
+
+pytestmark = pytest.mark.django_db
+
+
+def _client(**user_fields):
+    user = UserFactory.create(**user_fields)
+    vendor, store = ensure_vendor_admin(user)
+    CatalogItemFactory.create_batch(3, vendor=vendor, store=store)
+    client = APIClient()
+    # A real token: the profiler authenticates before the view does.
+    client.credentials(HTTP_AUTHORIZATION=f"Bearer {RefreshToken.for_user(user).access_token}")
+    return client, user, vendor
+
+
+def test_slow_queries_are_logged_with_request_context(caplog):
+    client, user, vendor = _client()
+    metrics.reset()
+    with override_settings(SLOW_QUERY_THRESHOLD_MS=1e-6), caplog.at_level(logging.WARNING, LOGGER):
+        assert client.get(URL).status_code == 200
+
+    records = [record for record in caplog.records if record.name == LOGGER]
+    assert records
+    listing = next(record for record in records if 'FROM "catalog_item"' in record.sql)
+    assert listing.endpoint == "GET api/v1/catalog/items/"
+    assert (listing.user_id, listing.vendor_id) == (user.pk, vendor.pk)
+    assert listing.origin.startswith(("catalog/", "core/"))
+    assert metrics.snapshot()["counters"]["db.slow_queries"] == len(records)
+
+
+def test_fast_queries_are_not_logged(caplog):
+    client, *_ = _client()
+    with override_settings(SLOW_QUERY_THRESHOLD_MS=60_000), caplog.at_level(logging.WARNING, LOGGER):
+        client.get(URL)
+    assert [record for record in caplog.records if record.name == LOGGER] == []
+
+
+@pytest.fixture
+def profiling(tmp_path):
+    with override_settings(PROFILING_ENABLED=True, PROFILING_DIR=str(tmp_path), PROFILING_INTERVAL_MS=0.2):
+        yield tmp_path
+
+
+def test_staff_requests_with_the_header_are_profiled(profiling):
+    client, *_ = _client(is_staff=True)
+    response = client.get(URL, HTTP_X_PROFILE="1")
+
+    assert response.status_code == 200
+    assert re.fullmatch(r"view;dur=[\d.]+, serializer;dur=[\d.]+, orm;dur=[\d.]+", response["Server-Timing"])
+    lines = (profiling / response["X-Profile-Id"]).read_text().splitlines()
+    assert lines
+    assert all(re.fullmatch(r"(view|serializer|orm);\S+ \d+", line) for line in lines)
+
+
+def test_profiles_need_staff_the_header_and_the_setting(profiling):
+    client, *_ = _client()
+    assert "X-Profile-Id" not in client.get(URL, HTTP_X_PROFILE="1")
+
+    staff, *_ = _client(is_staff=True)
+    assert "X-Profile-Id" not in staff.get(URL)
+    with override_settings(PROFILING_ENABLED=False):
+        assert "X-Profile-Id" not in staff.get(URL, HTTP_X_PROFILE="1")
+    assert list(profiling.iterdir()) == []
+
+
+@pytest.mark.parametrize("authorization", [None, "Bearer not-a-token"])
+def test_unauthenticated_requests_never_start_the_sampler(profiling, monkeypatch, authorization):
+    monkeypatch.setattr(profiling_module, "_Sampler", None)
+    client = APIClient()
+    if authorization:
+        client.credentials(HTTP_AUTHORIZATION=authorization)
+
+    response = client.get(URL, HTTP_X_PROFILE="1")
+
+    assert response.status_code == 401
+    assert "X-Profile-Id" not in response
@@ -0,0 +1,110 @@
+"""
+Query plan regression tests for the canonical read paths.
+
+Every query a selector sends is explained on a seeded dataset. The test fails
+when one needs a sequential scan (no usable index) or when its estimated cost
+exceeds the selector's budget below. Raise a budget only together with a
+reviewed plan change.
+"""
+
+import pytest
+from django.db import connection
+
+from backend.catalog.models import CatalogItem, CatalogMedia, CatalogVariant
+from backend.catalog.selectors.get_store_items import get_store_items
+from backend.catalog.selectors.list_items import list_items
+from backend.catalog.selectors.search_items import search_items
+from backend.catalog.tests.factories import CatalogItemFactory, StoreFactory, UserFactory
+from backend.catalog.tests.utils import ensure_vendor_admin
+from backend.core.query_plans import capture_plans, plan_regressions
+from backend.inventory.selectors.overview import get_inventory_overview
+from backend.org.api.permissions import user_has_store_access
+from backend.org.models import StoreAccess, StoreAccessRole, VendorMember, VendorMemberRole
+from backend.org.selectors.list_vendors import list_vendors
+
+pytestmark = [
+    # Autocommit, so the fixture can VACUUM away earlier tests' dead rows.
+    pytest.mark.django_db(transaction=True),
+    pytest.mark.skipif(connection.vendor != "postgresql", reason="EXPLAIN (FORMAT JSON) needs Postgres"),
+]
+
+# Highest estimated total cost allowed for any single query of each selector.
+BUDGETS = {
+    "list_items": 300,
+    "search_items": 400,
+    "get_store_items": 250,
+    "get_inventory_overview": 100,
+    "list_vendors": 30,
+    "user_has_store_access": 50,
+}
+
+CATEGORIES = ["pokemon_card", "clothing", "video_game", "other"]
+
+
+@pytest.fixture
+def seeded():
+    """Three vendors with three stores and 300 items each; a member with one store assignment."""
+    owner = UserFactory.create()
+    vendor, store = ensure_vendor_admin(owner)
+    stores = [store, StoreFactory.create(vendor=vendor), StoreFactory.create(vendor=vendor)]
+    for _ in range(2):
+        first = StoreFactory.create()
+        stores += [first, StoreFactory.create(vendor=first.vendor), StoreFactory.create(vendor=first.vendor)]
+
+    items = CatalogItem.objects.bulk_create(
+        CatalogItemFactory.build(
+            vendor=stores[n % 9].vendor,
+            store=stores[n % 9],
+            category=CATEGORIES[n % 4],
+            sku=f"PLAN-{n}",
+            quantity=n % 7,
+        )
+        for n in range(900)
+    )
+    CatalogMedia.objects.bulk_create(
+        CatalogMedia(item=item, url=f"https://cdn.example.com/{item.sku}-{n}.jpg", sort_order=n, is_primary=n == 0)
+        for item in items
+        for n in range(2)
+    )
+    CatalogVariant.objects.bulk_create(CatalogVariant(item=item, condition="NM", quantity=1) for item in items[::3])
+
+    clerk = UserFactory.create()
+    member = VendorMember.objects.create(user=clerk, vendor=vendor, role=VendorMemberRole.MEMBER, is_active=True)
+    StoreAccess.objects.create(store=stores[1], member=member, role=StoreAccessRole.SALES)
+
+    with connection.cursor() as cursor:
+        # Costs follow table sizes: drop the bloat and stale statistics other tests leave behind.
+        cursor.execute("VACUUM ANALYZE")
+    return {"owner": owner, "clerk": clerk, "store": stores[1]}
+
+
+CANONICAL_QUERIES = {
+    "list_items": lambda seed: list(list_items(user=seed["owner"], filters={"sort_by": "price"})[:50]),
+    "search_items": lambda seed: list(search_items(user=seed["owner"], query="plan-12")[:50]),
+    "get_store_items": lambda seed: list(
+        get_store_items(user=seed["owner"], store_id=seed["store"].id, filters={"category": "clothing"})[:50]
+    ),
+    "get_inventory_overview": lambda seed: get_inventory_overview(user=seed["owner"]),
+    "list_vendors": lambda seed: list(list_vendors(user=seed["clerk"])),
+    "user_has_store_access": lambda seed: user_has_store_access(seed["clerk"], seed["store"]),
+}
+
+
+@pytest.mark.parametrize("name", sorted(CANONICAL_QUERIES))
+def test_canonical_queries_stay_on_indexes_and_within_budget(seeded, name):
+    plans = capture_plans(lambda: CANONICAL_QUERIES[name](seeded))
+
+    assert plans, f"{name} sent no queries"
+    assert plan_regressions(plans, max_cost=BUDGETS[name]) == []
+
+
+def test_regressions_report_seq_scans_and_cost_overruns():
+    # description has no index, so only a sequential scan can answer this.
+    plans = capture_plans(lambda: list(CatalogItem.objects.filter(description="x")))
+
+    assert plans[0].seq_scans == ["catalog_item"]
+    problems = plan_regressions(plans, max_cost=0)
+    assert [problem.split(":")[0] for problem in problems] == [
+        "Seq Scan on catalog_item",
+        f"Cost {plans[0].cost:.0f} exceeds 0",
+    ]
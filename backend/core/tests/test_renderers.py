@@ -0,0 +1,126 @@
+import datetime
+import io
+import json
+import uuid
+from decimal import Decimal
+
+import msgpack
+import pytest
+from django.utils import timezone
+from rest_framework.renderers import JSONRenderer
+from rest_framework.test import APIClient
+
+from backend.catalog.api.serializers import CatalogItemSerializer
+from backend.catalog.tests.factories import CatalogItemFactory, CatalogVariantFactory, UserFactory
+from backend.catalog.tests.utils import ensure_vendor_admin
+from backend.core.parsers import FastJSONParser, MessagePackParser
+from backend.core.renderers import FastJSONRenderer, MessagePackRenderer
+
+URL = "/api/v1/catalog/items/"
+
+
+def _both(data, **kwargs):
+    return JSONRenderer().render(data, **kwargs), FastJSONRenderer().render(data, **kwargs)
+
+
+def test_fast_renderer_matches_drf_for_awkward_types():
+    payload = {
+        "created": datetime.datetime(2024, 5, 1, 12, 30, 15, 123456, tzinfo=datetime.timezone.utc),
+        "naive": datetime.datetime(2024, 5, 1, 12, 30, 15),
+        "day": datetime.date(2024, 5, 1),
+        "at": datetime.time(9, 15, 0, 250000),
+        "price": Decimal("12.50"),
+        "id": uuid.UUID("12345678-1234-5678-1234-567812345678"),
+        "text": "Pokémon\u2028line\u2029break",
+        1: ["int keys", None, True, 3.5],
+        "nested": ({"a": 1}, {"b": [1, 2]}),
+    }
+    drf, fast = _both(payload)
+    assert fast == drf
+
+
+def test_fast_renderer_falls_back_for_indent_and_big_ints():
+    drf, fast = _both({"a": [1, 2]}, accepted_media_type="application/json; indent=4")
+    assert fast == drf and b"\n    " in fast
+
+    drf, fast = _both({"big": 2**70})
+    assert fast == drf
+
+    assert FastJSONRenderer().render(None) == b""
+
+
+@pytest.mark.django_db
+def test_catalog_payload_renders_the_same_bytes():
+    user = UserFactory.create()
+    vendor, store = ensure_vendor_admin(user)
+    items = CatalogItemFactory.create_batch(3, vendor=vendor, store=store, price=Decimal("19.99"))
+    CatalogVariantFactory.create(item=items[0], price_adjustment=Decimal("-1.25"))
+    items[1].updated_at = timezone.now().replace(microsecond=654321)
+
+    data = CatalogItemSerializer(items, many=True).data
+
+    drf, fast = _both(data)
+    assert fast == drf
+
+
+def test_floats_render_equivalent_json():
+    payload = {"ratio": [1e16, 1e-7, 0.1, 2.5], "price": Decimal("19.99")}
+    drf, fast = _both(payload)
+
+    # orjson spells exponents as 1e16 / 1e-7 where the stdlib writes 1e+16 / 1e-07.
+    assert fast != drf
+    assert json.loads(fast) == json.loads(drf)
+
+
+def test_fast_parser_round_trip_and_errors():
+    parser = FastJSONParser()
+    assert parser.parse(io.BytesIO('{"name": "Pikachu é", "qty": 3}'.encode())) == {"name": "Pikachu é", "qty": 3}
+
+    with pytest.raises(Exception) as excinfo:
+        parser.parse(io.BytesIO(b'{"price": NaN}'))
+    assert "JSON parse error" in str(excinfo.value)
+
+
+def test_msgpack_round_trip():
+    payload = {"price": "12.50", "created": datetime.datetime(2024, 5, 1, tzinfo=datetime.timezone.utc), "ids": [1, 2]}
+    packed = MessagePackRenderer().render(payload)
+
+    assert MessagePackParser().parse(io.BytesIO(packed)) == {
+        "price": "12.50",
+        "created": "2024-05-01T00:00:00Z",
+        "ids": [1, 2],
+    }
+
+
+@pytest.mark.django_db
+def test_api_negotiates_msgpack_by_accept_header():
+    user = UserFactory.create()
+    vendor, store = ensure_vendor_admin(user)
+    CatalogItemFactory.create(vendor=vendor, store=store, name="Charizard")
+    client = APIClient()
+    client.force_authenticate(user=user)
+
+    json_resp = client.get(URL)
+    packed_resp = client.get(URL, HTTP_ACCEPT="application/msgpack")
+
+    assert json_resp["Content-Type"] == "application/json"
+    assert packed_resp.status_code == 200
+    assert packed_resp["Content-Type"] == "application/msgpack"
+    assert msgpack.unpackb(packed_resp.content, raw=False) == json_resp.json()
+
+
+@pytest.mark.django_db
+def test_api_accepts_msgpack_request_bodies():
+    user = UserFactory.create()
+    ensure_vendor_admin(user)
+    client = APIClient()
+    client.force_authenticate(user=user)
+
+    resp = client.post(
+        "/api/v1/catalog/items/lookup-external/",
+        data=msgpack.packb({"provider": "tcgplayer", "ids": ["1"]}),
+        content_type="application/msgpack",
+    )
+
+    assert resp.status_code == 200
+    assert resp.json()["missing"] == ["1"]
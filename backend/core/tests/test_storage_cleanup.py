@@ -0,0 +1,121 @@
+import boto3
+import pytest
+from botocore.exceptions import EndpointConnectionError
+from django.test.utils import override_settings
+from moto import mock_aws
+
+from backend.core.storage_cleanup import (
+    StorageCleanupError,
+    delete_objects,
+    delete_objects_or_raise,
+    storage_object_for,
+)
+
+
+@pytest.fixture
+def s3():
+    with mock_aws():
+        client = boto3.client("s3", region_name="us-east-1")
+        for bucket in ("media", "avatars"):
+            client.create_bucket(Bucket=bucket)
+        yield client
+
+
+def _put(client, bucket, keys):
+    for key in keys:
+        client.put_object(Bucket=bucket, Key=key, Body=b"x")
+    return [{"bucket": bucket, "key": key} for key in keys]
+
+
+def _keys(client, bucket):
+    pages = client.get_paginator("list_objects_v2").paginate(Bucket=bucket)
+    return {obj["Key"] for page in pages for obj in page.get("Contents", [])}
+
+
+class CountingClient:
+    """Wraps a client to count DeleteObjects calls and report chosen keys as failed."""
+
+    def __init__(self, client, fail_once=(), fail_always=(), raise_once=False):
+        self._client = client
+        self.calls = []
+        self.fail_once = set(fail_once)
+        self.fail_always = set(fail_always)
+        self.raise_once = raise_once
+
+    def delete_objects(self, Bucket, Delete):
+        keys = [obj["Key"] for obj in Delete["Objects"]]
+        self.calls.append((Bucket, len(keys)))
+        if self.raise_once:
+            self.raise_once = False
+            raise EndpointConnectionError(endpoint_url="https://storage.test")
+        failing = [key for key in keys if key in self.fail_once or key in self.fail_always]
+        self.fail_once -= set(failing)
+        kept = [{"Key": key} for key in keys if key not in failing]
+        response = self._client.delete_objects(Bucket=Bucket, Delete={"Objects": kept, "Quiet": True}) if kept else {}
+        response.setdefault("Errors", [])
+        response["Errors"] += [{"Key": key, "Code": "SlowDown", "Message": "Reduce your request rate."} for key in failing]
+        return response
+
+
+@pytest.mark.parametrize("workers", [1, 4])
+def test_delete_objects_batches_per_bucket(s3, workers):
+    objects = _put(s3, "media", [f"items/{i}.jpg" for i in range(2001)]) + _put(s3, "avatars", ["u/1.png"])
+    client = CountingClient(s3)
+
+    failures = delete_objects(objects + objects[:5], client=client, max_workers=workers)
+
+    assert failures == []
+    assert sorted(client.calls) == [("avatars", 1), ("media", 1), ("media", 1000), ("media", 1000)]
+    assert _keys(s3, "media") == set() and _keys(s3, "avatars") == set()
+
+
+@override_settings(STORAGE_DELETE_RETRY_DELAY=0)
+def test_delete_objects_retries_only_failed_keys(s3):
+    objects = _put(s3, "media", ["a.jpg", "b.jpg", "c.jpg"])
+    client = CountingClient(s3, fail_once={"b.jpg"})
+
+    assert delete_objects(objects, client=client) == []
+    assert client.calls == [("media", 3), ("media", 1)]
+    assert _keys(s3, "media") == set()
+
+
+@override_settings(STORAGE_DELETE_RETRY_DELAY=0)
+def test_delete_objects_retries_transport_errors_and_reports_leftovers(s3):
+    objects = _put(s3, "media", ["a.jpg", "b.jpg"])
+
+    assert delete_objects(objects, client=CountingClient(s3, raise_once=True)) == []
+
+    objects = _put(s3, "media", ["c.jpg", "d.jpg"])
+    stubborn = CountingClient(s3, fail_once={"d.jpg"})
+    assert delete_objects(objects, client=stubborn, max_attempts=1) == [{"bucket": "media", "key": "d.jpg"}]
+    with pytest.raises(StorageCleanupError, match="media/d.jpg"):
+        delete_objects_or_raise(objects, client=CountingClient(s3, fail_always={"d.jpg"}))
+
+
+def test_deleting_missing_keys_succeeds(s3):
+    assert delete_objects([{"bucket": "media", "key": "gone.jpg"}], client=s3) == []
+
+
+@override_settings(
+    AWS_STORAGE_BUCKET_NAME="media",
+    AWS_S3_ENDPOINT_URL="https://proj.supabase.co/storage/v1/s3",
+    AWS_S3_CUSTOM_DOMAIN="proj.supabase.co/storage/v1/object/public/media",
+)
+def test_storage_object_for_prefers_metadata_then_known_urls():
+    assert storage_object_for("https://x/y.png", {"bucket": "avatars", "path": "u/1.png"}) == {
+        "bucket": "avatars",
+        "key": "u/1.png",
+    }
+    assert storage_object_for("https://proj.supabase.co/storage/v1/object/public/media/uploads/a%20b.jpg") == {
+        "bucket": "media",
+        "key": "uploads/a b.jpg",
+    }
+    assert storage_object_for("https://proj.supabase.co/storage/v1/s3/media/uploads/c.jpg?x=1") == {
+        "bucket": "media",
+        "key": "uploads/c.jpg",
+    }
+    assert storage_object_for("https://images.example.com/c.jpg") is None
+
+
+def test_storage_object_for_without_bucket_is_none():
+    assert storage_object_for("https://cdn.example.com/a.jpg", {"path": "a.jpg"}) is None
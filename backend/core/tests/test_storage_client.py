@@ -0,0 +1,85 @@
+from concurrent.futures import ThreadPoolExecutor
+
+import pytest
+from django.test.utils import override_settings
+
+from backend.core import storage_client
+from backend.core.storage_backends import SupabaseStorage
+from backend.core.storage_client import (
+    get_storage_client,
+    reset_storage_client,
+    storage_client_config,
+    storage_transfer_config,
+)
+
+SUPABASE_SETTINGS = {
+    "AWS_S3_ENDPOINT_URL": "https://proj.supabase.co/storage/v1/s3",
+    "AWS_ACCESS_KEY_ID": "key",
+    "AWS_SECRET_ACCESS_KEY": "secret",
+}
+
+
+@pytest.fixture(autouse=True)
+def fresh_client():
+    reset_storage_client()
+    yield
+    reset_storage_client()
+
+
+@override_settings(
+    STORAGE_MAX_POOL_CONNECTIONS=48,
+    STORAGE_RETRY_MODE="adaptive",
+    STORAGE_MAX_ATTEMPTS=6,
+    STORAGE_TCP_KEEPALIVE=True,
+    STORAGE_MULTIPART_THRESHOLD=32 * 1024 * 1024,
+    STORAGE_TRANSFER_CONCURRENCY=3,
+)
+def test_configs_follow_settings():
+    config = storage_client_config()
+    assert config.max_pool_connections == 48
+    assert config.retries == {"mode": "adaptive", "total_max_attempts": 6}
+    assert config.tcp_keepalive is True
+
+    transfer = storage_transfer_config()
+    assert transfer.multipart_threshold == 32 * 1024 * 1024
+    assert transfer.max_request_concurrency == 3
+    assert transfer.use_threads is True
+
+
+def test_shared_client_is_none_without_credentials():
+    with override_settings(AWS_S3_ENDPOINT_URL=None):
+        assert get_storage_client() is None
+
+
+@override_settings(STORAGE_MAX_POOL_CONNECTIONS=40, **SUPABASE_SETTINGS)
+def test_shared_client_is_built_once_across_threads(monkeypatch):
+    built = []
+    original = storage_client.create_storage_client
+
+    def counting(**kwargs):
+        built.append(kwargs)
+        return original(**kwargs)
+
+    monkeypatch.setattr(storage_client, "create_storage_client", counting)
+    with ThreadPoolExecutor(max_workers=8) as pool:
+        clients = set(map(id, pool.map(lambda _: get_storage_client(), range(32))))
+
+    assert len(clients) == 1
+    assert len(built) == 1
+    client = get_storage_client()
+    assert client.meta.config.max_pool_connections == 40
+    assert client.meta.endpoint_url == SUPABASE_SETTINGS["AWS_S3_ENDPOINT_URL"]
+
+
+@override_settings(STORAGE_MAX_POOL_CONNECTIONS=24, STORAGE_MULTIPART_CHUNKSIZE=5 * 1024 * 1024)
+def test_supabase_storage_uses_tuned_configs(monkeypatch):
+    monkeypatch.setenv("SUPABASE_STORAGE_ENDPOINT", SUPABASE_SETTINGS["AWS_S3_ENDPOINT_URL"])
+    monkeypatch.setenv("SUPABASE_STORAGE_ACCESS_KEY", "key")
+    monkeypatch.setenv("SUPABASE_STORAGE_SECRET_KEY", "secret")
+
+    storage = SupabaseStorage()
+
+    assert storage.client_config.max_pool_connections == 24
+    assert storage.client_config.retries["mode"] == "adaptive"
+    assert storage.transfer_config.multipart_chunksize == 5 * 1024 * 1024
+    assert storage.connection.meta.client.meta.config.max_pool_connections == 24
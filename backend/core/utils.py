@@ -1 +1,20 @@
-"""Core utility helpers placeholder."""
+"""Core utility helpers."""
+
+from typing import Sequence
+
+from django.db.models import F, QuerySet, Window
+from django.db.models.functions import RowNumber
+
+
+def first_per_group(queryset: QuerySet, *, group_by: str, order_by: Sequence[str], limit: int) -> QuerySet:
+    """
+    Keep the first ``limit`` rows of each ``group_by`` value, ranked by ``order_by``.
+
+    Uses a ``ROW_NUMBER()`` window, so the result can still be filtered (e.g. by
+    a prefetch), unlike a sliced queryset.
+    """
+    rank = Window(RowNumber(), partition_by=F(group_by), order_by=list(order_by))
+    return queryset.annotate(_group_rank=rank).filter(_group_rank__lte=limit).order_by(*order_by)
+
+
+__all__ = ["first_per_group"]
@@ -1,13 +1,39 @@
-import uuid
-
+from asgiref.sync import sync_to_async
+from django.core.exceptions import ObjectDoesNotExist
 from django.core.files.storage import default_storage
-from drf_spectacular.utils import extend_schema
+from django.http import Http404
+from drf_spectacular.types import OpenApiTypes
+from drf_spectacular.utils import OpenApiParameter, extend_schema
 from rest_framework import serializers, status
 from rest_framework.parsers import MultiPartParser
-from rest_framework.permissions import IsAuthenticated
+from rest_framework.permissions import IsAdminUser, IsAuthenticated
 from rest_framework.response import Response
 from rest_framework.views import APIView
 
+from backend.core.async_views import AsyncAPIView
+from backend.core.chunked_uploads import (
+    ChunkedUploadError,
+    abort_upload,
+    complete_upload,
+    start_upload,
+    write_chunk,
+)
+from backend.core.content_store import (
+    content_key,
+    find_upload,
+    install_hashing_handler,
+    register_upload,
+)
+from backend.core.direct_uploads import (
+    DirectUploadError,
+    DirectUploadsUnavailable,
+    claim_upload,
+    create_upload_slot,
+    inspect_upload,
+    release_upload,
+)
+from backend.core.instrumentation import metrics
+
 
 class UploadFileSerializer(serializers.Serializer):
     file = serializers.FileField()
@@ -15,11 +41,96 @@ class UploadFileSerializer(serializers.Serializer):
 class UploadFileResponseSerializer(serializers.Serializer):
     url = serializers.URLField()
 
-class UploadFileView(APIView):
+class UploadSlotRequestSerializer(serializers.Serializer):
+    filename = serializers.CharField(max_length=255)
+    content_type = serializers.CharField(max_length=100)
+    size = serializers.IntegerField(min_value=1)
+
+class UploadSlotSerializer(serializers.Serializer):
+    token = serializers.CharField()
+    upload_url = serializers.URLField()
+    method = serializers.CharField()
+    headers = serializers.DictField(child=serializers.CharField())
+    key = serializers.CharField()
+    expires_in = serializers.IntegerField()
+
+class UploadConfirmSerializer(serializers.Serializer):
+    token = serializers.CharField()
+
+class ConfirmedUploadSerializer(serializers.Serializer):
+    url = serializers.URLField()
+    key = serializers.CharField()
+    size = serializers.IntegerField()
+    content_type = serializers.CharField()
+
+class ChunkedUploadSerializer(serializers.Serializer):
+    id = serializers.UUIDField()
+    filename = serializers.CharField()
+    content_type = serializers.CharField()
+    size = serializers.IntegerField()
+    chunk_size = serializers.IntegerField()
+    total_chunks = serializers.IntegerField()
+    received_chunks = serializers.ListField(child=serializers.IntegerField())
+    missing_offsets = serializers.SerializerMethodField()
+    received_bytes = serializers.IntegerField()
+    status = serializers.CharField()
+    url = serializers.SerializerMethodField()
+    expires_at = serializers.DateTimeField()
+
+    def get_missing_offsets(self, obj) -> list[int]:
+        return [index * obj.chunk_size for index in obj.missing_chunks]
+
+    def get_url(self, obj) -> str | None:
+        if not obj.url:
+            return None
+        request = self.context.get("request")
+        if request is not None and not obj.url.startswith('http'):
+            return request.build_absolute_uri(obj.url)
+        return obj.url
+
+class TimerSnapshotSerializer(serializers.Serializer):
+    count = serializers.IntegerField()
+    total_ms = serializers.FloatField()
+    max_ms = serializers.FloatField()
+    mean_ms = serializers.FloatField()
+
+class MetricsSnapshotSerializer(serializers.Serializer):
+    pid = serializers.IntegerField(help_text="Worker process the figures belong to.")
+    since = serializers.FloatField(help_text="Unix time the figures were last reset.")
+    counters = serializers.DictField(child=serializers.FloatField())
+    timers = serializers.DictField(child=TimerSnapshotSerializer())
+
+
+def direct_upload_error_response(exc: DirectUploadError) -> Response:
+    """Map direct upload failures to API responses (503 when S3 is not configured)."""
+    if isinstance(exc, DirectUploadsUnavailable):
+        return Response({"error": str(exc)}, status=status.HTTP_503_SERVICE_UNAVAILABLE)
+    return Response({"error": str(exc)}, status=status.HTTP_400_BAD_REQUEST)
+
+
+async def confirm_direct_upload(request, token: str) -> dict:
+    """Verify a direct upload for ``request.user``; the HEAD request runs in a worker thread."""
+    slot = await sync_to_async(claim_upload)(token=token, user_id=request.user.id)
+    try:
+        upload = await sync_to_async(inspect_upload, thread_sensitive=False)(slot)
+    except Exception as exc:
+        await sync_to_async(release_upload)(slot, exc)
+        raise
+    if not upload["url"].startswith('http'):
+        upload["url"] = request.build_absolute_uri(upload["url"])
+    return upload
+
+class UploadFileView(AsyncAPIView):
     """
     Generic file upload endpoint.
     Saves files using the configured default storage (Local or Supabase).
     Returns the public URL of the uploaded file.
+
+    Files are stored under their SHA-256, so uploading bytes that are already
+    stored returns the existing URL without writing anything.
+
+    Body parsing and the storage write run in worker threads so a slow
+    upload does not block other requests on an ASGI worker.
     """
     parser_classes = [MultiPartParser]
     permission_classes = [IsAuthenticated]
@@ -31,23 +142,33 @@ class UploadFileView(APIView):
         summary="Upload a file",
         description="Upload a file to the configured storage backend (S3 or Local) and get a public URL."
     )
-    def post(self, request, *args, **kwargs):
-        file_obj = request.FILES.get('file')
+    async def post(self, request, *args, **kwargs):
+        # Hash the file while the body is parsed so repeat uploads can be deduplicated.
+        hasher = install_hashing_handler(request)
+        files = await sync_to_async(lambda: request.FILES, thread_sensitive=False)()
+        file_obj = files.get('file')
         if not file_obj:
             return Response({"error": "No file provided"}, status=status.HTTP_400_BAD_REQUEST)
         
         # Basic validation
         if file_obj.size > 5 * 1024 * 1024:  # 5MB limit
-             return Response({"error": "File too large (max 5MB)"}, status=status.HTTP_400_BAD_REQUEST)
+             return Response(
+                 {"error": "File too large (max 5MB); use /api/v1/core/uploads/chunked/ for larger files"},
+                 status=status.HTTP_400_BAD_REQUEST,
+             )
 
-        # Generate unique filename to prevent collisions
-        ext = file_obj.name.split('.')[-1].lower() if '.' in file_obj.name else 'bin'
-        filename = f"uploads/{uuid.uuid4()}.{ext}"
-        
-        # Save file
         try:
-            saved_path = default_storage.save(filename, file_obj)
-            file_url = default_storage.url(saved_path)
+            digest = hasher.digests['file']
+            stored = await sync_to_async(find_upload)(digest)
+            if stored is None:
+                # Content-addressed name: identical files map to the same object
+                saved_path = await sync_to_async(default_storage.save, thread_sensitive=False)(
+                    content_key(digest, file_obj.name), file_obj
+                )
+                stored = await sync_to_async(register_upload)(
+                    sha256=digest, key=saved_path, size=file_obj.size, content_type=file_obj.content_type
+                )
+            file_url = default_storage.url(stored.key)
             
             # Ensure we return a full URL for local dev
             if not file_url.startswith('http'):
@@ -56,3 +177,161 @@ class UploadFileView(APIView):
             return Response({"url": file_url}, status=status.HTTP_201_CREATED)
         except Exception as e:
             return Response({"error": str(e)}, status=status.HTTP_500_INTERNAL_SERVER_ERROR)
+
+
+class DirectUploadView(AsyncAPIView):
+    """
+    Request a presigned upload slot.
+
+    The client PUTs the file to ``upload_url`` with ``headers``, then confirms
+    the ``token`` at /api/v1/core/uploads/confirm/ (or attaches it to an item or
+    profile). The file never passes through a Django worker.
+    """
+    permission_classes = [IsAuthenticated]
+    serializer_class = UploadSlotRequestSerializer
+
+    @extend_schema(
+        request=UploadSlotRequestSerializer,
+        responses={201: UploadSlotSerializer},
+        summary="Request a direct upload slot",
+        description="Returns a presigned PUT URL for uploading straight to object storage.",
+    )
+    async def post(self, request, *args, **kwargs):
+        serializer = UploadSlotRequestSerializer(data=request.data)
+        serializer.is_valid(raise_exception=True)
+        try:
+            slot = await sync_to_async(create_upload_slot)(user_id=request.user.id, **serializer.validated_data)
+        except DirectUploadError as exc:
+            return direct_upload_error_response(exc)
+        return Response(slot, status=status.HTTP_201_CREATED)
+
+
+class DirectUploadConfirmView(AsyncAPIView):
+    """Confirm a direct upload and get its public URL, e.g. to reference when creating an item."""
+    permission_classes = [IsAuthenticated]
+    serializer_class = UploadConfirmSerializer
+
+    @extend_schema(
+        request=UploadConfirmSerializer,
+        responses={200: ConfirmedUploadSerializer},
+        summary="Confirm a direct upload",
+    )
+    async def post(self, request, *args, **kwargs):
+        serializer = UploadConfirmSerializer(data=request.data)
+        serializer.is_valid(raise_exception=True)
+        try:
+            upload = await confirm_direct_upload(request, serializer.validated_data["token"])
+        except DirectUploadError as exc:
+            return direct_upload_error_response(exc)
+        return Response({field: upload[field] for field in ("url", "key", "size", "content_type")})
+
+
+def _get_chunked_upload(request, upload_id):
+    try:
+        return request.user.chunked_uploads.get(pk=upload_id)
+    except ObjectDoesNotExist:
+        raise Http404 from None
+
+
+def _chunked_upload_response(request, upload, status_code=status.HTTP_200_OK) -> Response:
+    return Response(ChunkedUploadSerializer(upload, context={"request": request}).data, status=status_code)
+
+
+class ChunkedUploadView(AsyncAPIView):
+    """
+    Start a resumable chunked upload (for files above the 5MB single-shot limit).
+
+    Send each ``chunk_size`` slice with ``PUT /api/v1/core/uploads/chunked/<id>/?offset=<n>``,
+    then ``POST .../complete/``.
+    """
+    permission_classes = [IsAuthenticated]
+    serializer_class = UploadSlotRequestSerializer
+
+    @extend_schema(
+        request=UploadSlotRequestSerializer,
+        responses={201: ChunkedUploadSerializer},
+        summary="Start a chunked upload",
+    )
+    async def post(self, request, *args, **kwargs):
+        serializer = UploadSlotRequestSerializer(data=request.data)
+        serializer.is_valid(raise_exception=True)
+        try:
+            upload = await sync_to_async(start_upload)(user=request.user, **serializer.validated_data)
+        except ChunkedUploadError as exc:
+            return Response({"error": str(exc)}, status=status.HTTP_400_BAD_REQUEST)
+        return _chunked_upload_response(request, upload, status.HTTP_201_CREATED)
+
+
+class ChunkedUploadDetailView(AsyncAPIView):
+    """
+    Upload state, chunk PUTs and cancellation for one chunked upload.
+
+    ``GET`` lists the received chunks and the offsets still missing, so a client
+    that lost its connection resumes from there instead of starting over.
+    ``PUT ?offset=<n>`` takes the raw chunk bytes as the request body; chunks
+    already received are acknowledged without being stored again.
+    """
+    permission_classes = [IsAuthenticated]
+    serializer_class = ChunkedUploadSerializer
+
+    @extend_schema(responses={200: ChunkedUploadSerializer}, summary="Get chunked upload progress")
+    async def get(self, request, upload_id, *args, **kwargs):
+        upload = await sync_to_async(_get_chunked_upload)(request, upload_id)
+        return _chunked_upload_response(request, upload)
+
+    @extend_schema(
+        request={"application/octet-stream": OpenApiTypes.BINARY},
+        parameters=[OpenApiParameter("offset", int, required=True, description="Byte offset of the chunk.")],
+        responses={200: ChunkedUploadSerializer},
+        summary="Upload one chunk",
+    )
+    async def put(self, request, upload_id, *args, **kwargs):
+        try:
+            offset = int(request.query_params["offset"])
+            length = int(request.META.get("CONTENT_LENGTH") or 0)
+        except (KeyError, ValueError):
+            return Response({"error": "An integer offset query parameter is required."}, status=status.HTTP_400_BAD_REQUEST)
+
+        def store():
+            upload = _get_chunked_upload(request, upload_id)
+            # The body is read straight from the request stream, never via request.data.
+            return write_chunk(upload=upload, offset=offset, stream=request.stream, length=length)
+
+        try:
+            upload = await sync_to_async(store)()
+        except ChunkedUploadError as exc:
+            return Response({"error": str(exc)}, status=status.HTTP_400_BAD_REQUEST)
+        return _chunked_upload_response(request, upload)
+
+    @extend_schema(responses={204: None}, summary="Cancel a chunked upload")
+    async def delete(self, request, upload_id, *args, **kwargs):
+        upload = await sync_to_async(_get_chunked_upload)(request, upload_id)
+        await sync_to_async(abort_upload)(upload=upload)
+        return Response(status=status.HTTP_204_NO_CONTENT)
+
+
+class ChunkedUploadCompleteView(AsyncAPIView):
+    """Assemble the received chunks into the stored file and return its URL."""
+    permission_classes = [IsAuthenticated]
+    serializer_class = ChunkedUploadSerializer
+
+    @extend_schema(request=None, responses={200: ChunkedUploadSerializer}, summary="Complete a chunked upload")
+    async def post(self, request, upload_id, *args, **kwargs):
+        def complete():
+            return complete_upload(upload=_get_chunked_upload(request, upload_id))
+
+        try:
+            upload = await sync_to_async(complete)()
+        except ChunkedUploadError as exc:
+            return Response({"error": str(exc)}, status=status.HTTP_400_BAD_REQUEST)
+        return _chunked_upload_response(request, upload)
+
+
+class MetricsView(APIView):
+    """Counters and timers recorded by this worker process (staff only)."""
+    permission_classes = [IsAdminUser]
+    serializer_class = MetricsSnapshotSerializer
+
+    @extend_schema(responses={200: MetricsSnapshotSerializer}, summary="Get in-process metrics")
+    def get(self, request, *args, **kwargs):
+        return Response(metrics.snapshot())
@@ -2,6 +2,7 @@
 
 from typing import Any
 
+from asgiref.sync import sync_to_async
 from django.db.models import Count, Q, Sum
 from django.db.models.functions import Coalesce
 
@@ -43,33 +44,53 @@ def get_inventory_overview(*, user) -> dict[str, Any]:
     if vendor is None:
         return _empty_response()
 
-    # Vendor-wide aggregates
     vendor_items = CatalogItem.objects.filter(vendor=vendor)
-    totals = vendor_items.aggregate(
-        total_skus=Count("id"),
-        total_units=Coalesce(Sum("quantity"), 0),
-        low_stock=Count("id", filter=Q(quantity__gt=0, quantity__lte=LOW_STOCK_THRESHOLD)),
-    )
-
-    # Per-store breakdown
-    stores_qs = Store.objects.filter(vendor=vendor).order_by("name")
+    totals = vendor_items.aggregate(**_item_aggregates())
+    per_store = {row["store_id"]: row for row in _per_store_aggregates(vendor_items)}
+    stores = Store.objects.filter(vendor=vendor).order_by("name")
+    return _build_response(totals, stores, per_store)
+
+
+async def aget_inventory_overview(*, user) -> dict[str, Any]:
+    """Async variant of :func:`get_inventory_overview` using the async ORM."""
+    vendor = await sync_to_async(resolve_user_vendor)(user)
+    if vendor is None:
+        return _empty_response()
+
+    vendor_items = CatalogItem.objects.filter(vendor=vendor)
+    totals = await vendor_items.aaggregate(**_item_aggregates())
+    per_store = {row["store_id"]: row async for row in _per_store_aggregates(vendor_items)}
+    stores = [store async for store in Store.objects.filter(vendor=vendor).order_by("name")]
+    return _build_response(totals, stores, per_store)
+
+
+def _item_aggregates() -> dict[str, Any]:
+    return {
+        "total_skus": Count("id"),
+        "total_units": Coalesce(Sum("quantity"), 0),
+        "low_stock": Count("id", filter=Q(quantity__gt=0, quantity__lte=LOW_STOCK_THRESHOLD)),
+    }
+
+
+def _per_store_aggregates(vendor_items):
+    # One grouped query instead of an aggregate per store; clear the model's
+    # default ordering so it does not leak into GROUP BY.
+    return vendor_items.order_by().values("store_id").annotate(**_item_aggregates())
+
+
+def _build_response(totals: dict[str, Any], stores, per_store: dict[Any, dict[str, Any]]) -> dict[str, Any]:
     stores_list = []
-    for store in stores_qs:
-        store_items = vendor_items.filter(store=store)
-        store_agg = store_items.aggregate(
-            total_skus=Count("id"),
-            units_on_hand=Coalesce(Sum("quantity"), 0),
-            low_stock=Count("id", filter=Q(quantity__gt=0, quantity__lte=LOW_STOCK_THRESHOLD)),
-        )
+    for store in stores:
+        store_agg = per_store.get(store.id, {})
         stores_list.append({
             "id": str(store.id),
             "name": store.name,
             "location": store.address or None,
             "isDefault": False,  # TODO: derive from VendorMember.active_store
             "status": "active" if store.is_active else "paused",
-            "totalSkus": store_agg["total_skus"] or 0,
-            "unitsOnHand": store_agg["units_on_hand"] or 0,
-            "lowStock": store_agg["low_stock"] or 0,
+            "totalSkus": store_agg.get("total_skus") or 0,
+            "unitsOnHand": store_agg.get("total_units") or 0,
+            "lowStock": store_agg.get("low_stock") or 0,
         })
 
     return {
@@ -0,0 +1,46 @@
+import pytest
+from asgiref.sync import async_to_sync
+from rest_framework.test import APIClient
+
+from backend.catalog.tests.factories import CatalogItemFactory, StoreFactory, UserFactory
+from backend.catalog.tests.utils import ensure_vendor_admin
+from backend.inventory.selectors.overview import aget_inventory_overview, get_inventory_overview
+
+
+@pytest.fixture
+def vendor_user(db):
+    user = UserFactory.create()
+    vendor, store = ensure_vendor_admin(user)
+    empty = StoreFactory.create(vendor=vendor, name="Zz Empty")
+    CatalogItemFactory.create(vendor=vendor, store=store, quantity=3)
+    CatalogItemFactory.create(vendor=vendor, store=store, quantity=40)
+    CatalogItemFactory.create(vendor=vendor, store=store, quantity=0)
+    return user, store, empty
+
+
+def test_overview_aggregates_per_store(vendor_user):
+    user, store, empty = vendor_user
+
+    data = get_inventory_overview(user=user)
+
+    assert data["stats"] == {"totalSkus": 3, "totalUnits": 43, "lowStock": 1, "pendingTransfers": 0}
+    by_id = {row["id"]: row for row in data["stores"]}
+    assert by_id[str(store.id)]["unitsOnHand"] == 43
+    empty_row = by_id[str(empty.id)]
+    assert (empty_row["totalSkus"], empty_row["unitsOnHand"], empty_row["lowStock"]) == (0, 0, 0)
+
+
+def test_async_overview_matches_sync(vendor_user):
+    user, _, _ = vendor_user
+    assert async_to_sync(aget_inventory_overview)(user=user) == get_inventory_overview(user=user)
+
+
+def test_overview_endpoint(vendor_user):
+    user, _, _ = vendor_user
+    client = APIClient()
+    client.force_authenticate(user=user)
+
+    response = client.get("/api/v1/inventory/overview/")
+
+    assert response.status_code == 200
+    assert response.json()["stats"]["totalSkus"] == 3
@@ -0,0 +1,25 @@
+from django.contrib import admin
+from django.utils import timezone
+
+from backend.jobs.models import Job, JobStatus
+
+
+@admin.action(description="Retry selected jobs now")
+def retry_jobs(modeladmin, request, queryset):
+    queryset.exclude(status=JobStatus.RUNNING).update(
+        status=JobStatus.QUEUED,
+        attempts=0,
+        run_at=timezone.now(),
+        locked_at=None,
+        locked_by="",
+        finished_at=None,
+    )
+
+
+@admin.register(Job)
+class JobAdmin(admin.ModelAdmin):
+    list_display = ("id", "name", "status", "attempts", "max_attempts", "run_at", "finished_at")
+    list_filter = ("status", "name")
+    search_fields = ("name", "last_error")
+    readonly_fields = ("created_at", "updated_at", "locked_at", "locked_by", "finished_at")
+    actions = [retry_jobs]
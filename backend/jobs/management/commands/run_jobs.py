@@ -0,0 +1,77 @@
+import signal
+import time
+
+from django.conf import settings
+from django.core.management.base import BaseCommand
+from django.db import close_old_connections, connection
+
+from backend.jobs.services.worker import (
+    claim_jobs,
+    default_worker_id,
+    purge_finished_jobs,
+    requeue_stale_jobs,
+    run_job,
+)
+
+# How often the worker recovers stale locks and purges old jobs.
+MAINTENANCE_INTERVAL = 60
+
+
+class Command(BaseCommand):
+    help = 'Runs queued background jobs (password reset emails, remote media deletes, ...)'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--burst', action='store_true', help='Exit once no due jobs are left.')
+        parser.add_argument('--max-jobs', type=int, default=None, help='Exit after running this many jobs.')
+        parser.add_argument(
+            '--sleep',
+            type=float,
+            default=None,
+            help='Seconds to wait when the queue is empty (default: JOBS_POLL_INTERVAL).',
+        )
+        parser.add_argument('--worker-id', default=None, help='Name recorded on claimed jobs.')
+
+    def handle(self, *args, **options):
+        worker_id = options['worker_id'] or default_worker_id()
+        sleep = options['sleep'] if options['sleep'] is not None else settings.JOBS_POLL_INTERVAL
+        self._stopping = False
+        previous = {sig: signal.signal(sig, self._request_stop) for sig in (signal.SIGINT, signal.SIGTERM)}
+        try:
+            self._work(worker_id, sleep, options['burst'], options['max_jobs'])
+        finally:
+            for sig, handler in previous.items():
+                signal.signal(sig, handler)
+
+    def _work(self, worker_id, sleep, burst, max_jobs):
+        self.stdout.write(f"Job worker {worker_id} started")
+        processed = failed = 0
+        next_maintenance = 0.0
+        while not self._stopping and (max_jobs is None or processed < max_jobs):
+            self._recycle_connections()
+            if time.monotonic() >= next_maintenance:
+                requeue_stale_jobs()
+                purge_finished_jobs()
+                next_maintenance = time.monotonic() + MAINTENANCE_INTERVAL
+
+            jobs = claim_jobs(worker_id=worker_id)
+            if not jobs:
+                if burst:
+                    break
+                time.sleep(sleep)
+                continue
+            if not run_job(jobs[0]):
+                failed += 1
+            processed += 1
+
+        self._recycle_connections()
+        self.stdout.write(self.style.SUCCESS(f"Job worker {worker_id} stopped: {processed} run, {failed} failed"))
+
+    def _recycle_connections(self):
+        # Like the request cycle: drop broken or expired connections between
+        # jobs. Skipped when called inside a transaction (e.g. from tests).
+        if not connection.in_atomic_block:
+            close_old_connections()
+
+    def _request_stop(self, signum, frame):
+        # Finish the current job, then exit.
+        self._stopping = True
@@ -0,0 +1,37 @@
+"""Registry mapping job names to handler callables."""
+
+from typing import Callable, Dict
+
+_handlers: Dict[str, Callable[..., None]] = {}
+
+
+class UnknownJob(LookupError):
+    """Raised when a job row names a handler that is not registered."""
+
+
+def job(name: str):
+    """
+    Register the decorated function as the handler for ``name``.
+
+    Handlers receive the job payload as keyword arguments and must be
+    idempotent: a job may run again if a worker dies mid-way or a retry
+    follows a partial failure.
+    """
+
+    def decorator(func):
+        if name in _handlers and _handlers[name] is not func:
+            raise ValueError(f"Job {name!r} is already registered")
+        _handlers[name] = func
+        return func
+
+    return decorator
+
+
+def get_handler(name: str) -> Callable[..., None]:
+    try:
+        return _handlers[name]
+    except KeyError:
+        raise UnknownJob(name) from None
+
+
+__all__ = ["job", "get_handler", "UnknownJob"]
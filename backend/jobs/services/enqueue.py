@@ -0,0 +1,43 @@
+"""Service for queueing background jobs."""
+
+from datetime import timedelta
+from typing import Any, Dict, Optional
+
+from django.conf import settings
+from django.db import transaction
+from django.utils import timezone
+
+from backend.jobs.models import Job
+from backend.jobs.registry import get_handler
+from backend.jobs.services.worker import run_job_by_id
+
+
+def enqueue(
+    name: str,
+    payload: Optional[Dict[str, Any]] = None,
+    *,
+    delay: Optional[timedelta] = None,
+    max_attempts: Optional[int] = None,
+) -> Job:
+    """
+    Queue the registered job ``name`` with a JSON-serialisable ``payload``.
+
+    The row is written inside the caller's transaction, so workers only see it
+    once that transaction commits and it disappears with a rollback - the same
+    guarantee as ``transaction.on_commit`` without a window where a crash after
+    commit could lose the job. With ``JOBS_RUN_INLINE`` the job runs in-process
+    from an ``on_commit`` hook instead of waiting for a worker.
+    """
+    get_handler(name)  # fail fast on typos rather than in the worker
+    job = Job.objects.create(
+        name=name,
+        payload=payload or {},
+        run_at=timezone.now() + (delay or timedelta()),
+        max_attempts=max_attempts or settings.JOBS_MAX_ATTEMPTS,
+    )
+    if settings.JOBS_RUN_INLINE and delay is None:
+        transaction.on_commit(lambda: run_job_by_id(job.pk))
+    return job
+
+
+__all__ = ["enqueue"]
@@ -0,0 +1,146 @@
+"""Services for claiming and running queued jobs."""
+
+import logging
+import os
+import random
+import socket
+import traceback
+from datetime import timedelta
+from typing import List, Optional
+
+from django.conf import settings
+from django.db import transaction
+from django.db.models import F
+from django.utils import timezone
+
+from backend.jobs.models import Job, JobStatus
+from backend.jobs.registry import get_handler
+
+logger = logging.getLogger(__name__)
+
+MAX_ERROR_LENGTH = 4000
+
+
+def default_worker_id() -> str:
+    return f"{socket.gethostname()}:{os.getpid()}"
+
+
+def backoff_delay(attempts: int) -> timedelta:
+    """Exponential backoff with up to 10% jitter, capped at ``JOBS_RETRY_MAX_DELAY``."""
+    base = settings.JOBS_RETRY_BASE_DELAY * (2 ** max(attempts - 1, 0))
+    seconds = min(base, settings.JOBS_RETRY_MAX_DELAY)
+    return timedelta(seconds=seconds * (1 + random.random() * 0.1))
+
+
+def claim_jobs(*, worker_id: str, limit: int = 1, job_id: Optional[int] = None) -> List[Job]:
+    """
+    Lock up to ``limit`` due jobs for ``worker_id`` and mark them running.
+
+    ``SKIP LOCKED`` lets several workers poll the same table without blocking
+    each other or claiming the same row.
+    """
+    now = timezone.now()
+    with transaction.atomic():
+        qs = Job.objects.select_for_update(skip_locked=True).filter(
+            status=JobStatus.QUEUED, run_at__lte=now
+        )
+        if job_id is not None:
+            qs = qs.filter(pk=job_id)
+        jobs = list(qs.order_by("run_at", "id")[:limit])
+        if not jobs:
+            return []
+        Job.objects.filter(pk__in=[job.pk for job in jobs]).update(
+            status=JobStatus.RUNNING,
+            attempts=F("attempts") + 1,
+            locked_at=now,
+            locked_by=worker_id,
+        )
+    for job in jobs:
+        job.status = JobStatus.RUNNING
+        job.attempts += 1
+        job.locked_at = now
+        job.locked_by = worker_id
+    return jobs
+
+
+def run_job(job: Job) -> bool:
+    """Run a claimed job and record the outcome; returns True on success."""
+    try:
+        handler = get_handler(job.name)
+        handler(**job.payload)
+    except Exception as exc:
+        _record_failure(job, exc)
+        return False
+
+    job.status = JobStatus.SUCCEEDED
+    job.finished_at = timezone.now()
+    job.last_error = ""
+    job.locked_at = None
+    job.save(update_fields=["status", "finished_at", "last_error", "locked_at", "updated_at"])
+    return True
+
+
+def _record_failure(job: Job, exc: Exception) -> None:
+    job.last_error = "".join(traceback.format_exception(exc))[-MAX_ERROR_LENGTH:]
+    job.locked_at = None
+    if job.attempts >= job.max_attempts:
+        job.status = JobStatus.FAILED
+        job.finished_at = timezone.now()
+        logger.error("Job %s failed permanently after %s attempts: %s", job, job.attempts, exc)
+    else:
+        job.status = JobStatus.QUEUED
+        job.run_at = timezone.now() + backoff_delay(job.attempts)
+        logger.warning("Job %s failed (attempt %s/%s), retrying at %s: %s", job, job.attempts, job.max_attempts, job.run_at, exc)
+    job.save(update_fields=["status", "finished_at", "run_at", "last_error", "locked_at", "updated_at"])
+
+
+def run_job_by_id(job_id: int, *, worker_id: Optional[str] = None) -> bool:
+    """Claim and run one specific job (used by ``JOBS_RUN_INLINE``); False if it was not claimable."""
+    jobs = claim_jobs(worker_id=worker_id or default_worker_id(), job_id=job_id)
+    return bool(jobs) and run_job(jobs[0])
+
+
+def run_pending_jobs(*, worker_id: Optional[str] = None, limit: Optional[int] = None) -> int:
+    """Run due jobs one at a time until none are left (or ``limit`` ran); returns how many ran."""
+    worker_id = worker_id or default_worker_id()
+    processed = 0
+    while limit is None or processed < limit:
+        jobs = claim_jobs(worker_id=worker_id)
+        if not jobs:
+            break
+        run_job(jobs[0])
+        processed += 1
+    return processed
+
+
+def requeue_stale_jobs(*, timeout: Optional[timedelta] = None) -> int:
+    """Return jobs whose worker died mid-run to the queue (or fail them if out of attempts)."""
+    cutoff = timezone.now() - (timeout or timedelta(seconds=settings.JOBS_LOCK_TIMEOUT))
+    stale = Job.objects.filter(status=JobStatus.RUNNING, locked_at__lt=cutoff)
+    failed = stale.filter(attempts__gte=F("max_attempts")).update(
+        status=JobStatus.FAILED,
+        finished_at=timezone.now(),
+        locked_at=None,
+        last_error="Worker lock expired",
+    )
+    requeued = stale.update(status=JobStatus.QUEUED, run_at=timezone.now(), locked_at=None, locked_by="")
+    return failed + requeued
+
+
+def purge_finished_jobs(*, older_than: Optional[timedelta] = None) -> int:
+    """Delete succeeded jobs past the retention window; failed jobs are kept for inspection."""
+    cutoff = timezone.now() - (older_than or timedelta(days=settings.JOBS_RETENTION_DAYS))
+    deleted, _ = Job.objects.filter(status=JobStatus.SUCCEEDED, finished_at__lt=cutoff).delete()
+    return deleted
+
+
+__all__ = [
+    "backoff_delay",
+    "claim_jobs",
+    "default_worker_id",
+    "purge_finished_jobs",
+    "requeue_stale_jobs",
+    "run_job",
+    "run_job_by_id",
+    "run_pending_jobs",
+]
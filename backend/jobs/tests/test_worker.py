@@ -0,0 +1,154 @@
+from datetime import timedelta
+from io import StringIO
+
+import pytest
+from django.core.management import call_command
+from django.db import transaction
+from django.test.utils import override_settings
+from django.utils import timezone
+
+from backend.jobs.models import Job, JobStatus
+from backend.jobs.registry import UnknownJob, job
+from backend.jobs.services.enqueue import enqueue
+from backend.jobs.services.worker import (
+    backoff_delay,
+    purge_finished_jobs,
+    requeue_stale_jobs,
+    run_pending_jobs,
+)
+
+calls = []
+
+
+@job("tests.record")
+def record(**payload):
+    calls.append(payload)
+
+
+@job("tests.explode")
+def explode(**payload):
+    raise RuntimeError("boom")
+
+
+@pytest.fixture(autouse=True)
+def reset_calls():
+    calls.clear()
+
+
+@pytest.mark.django_db
+def test_enqueued_job_runs_once_with_payload():
+    enqueue("tests.record", {"user_id": 7})
+
+    assert run_pending_jobs() == 1
+    assert run_pending_jobs() == 0
+    assert calls == [{"user_id": 7}]
+    job_row = Job.objects.get()
+    assert job_row.status == JobStatus.SUCCEEDED
+    assert job_row.attempts == 1
+    assert job_row.finished_at is not None
+
+
+@pytest.mark.django_db
+def test_enqueue_is_discarded_with_rolled_back_transaction():
+    with pytest.raises(ValueError):
+        with transaction.atomic():
+            enqueue("tests.record", {})
+            raise ValueError("rollback")
+
+    assert not Job.objects.exists()
+
+
+@pytest.mark.django_db
+def test_enqueue_rejects_unregistered_job():
+    with pytest.raises(UnknownJob):
+        enqueue("tests.missing")
+
+
+@pytest.mark.django_db
+def test_delayed_job_waits_until_due():
+    enqueue("tests.record", delay=timedelta(minutes=5))
+
+    assert run_pending_jobs() == 0
+    Job.objects.update(run_at=timezone.now())
+    assert run_pending_jobs() == 1
+
+
+@pytest.mark.django_db
+@override_settings(JOBS_RETRY_BASE_DELAY=10, JOBS_RETRY_MAX_DELAY=3600)
+def test_failed_job_is_retried_with_backoff_then_marked_failed():
+    enqueue("tests.explode", max_attempts=2)
+
+    before = timezone.now()
+    assert run_pending_jobs() == 1
+    job_row = Job.objects.get()
+    assert job_row.status == JobStatus.QUEUED
+    assert job_row.attempts == 1
+    assert job_row.run_at >= before + timedelta(seconds=10)
+    assert "RuntimeError: boom" in job_row.last_error
+
+    Job.objects.update(run_at=timezone.now())
+    assert run_pending_jobs() == 1
+    job_row.refresh_from_db()
+    assert job_row.status == JobStatus.FAILED
+    assert job_row.attempts == 2
+    assert run_pending_jobs() == 0
+
+
+@override_settings(JOBS_RETRY_BASE_DELAY=10, JOBS_RETRY_MAX_DELAY=60)
+def test_backoff_delay_grows_exponentially_and_is_capped():
+    assert timedelta(seconds=10) <= backoff_delay(1) <= timedelta(seconds=11)
+    assert timedelta(seconds=40) <= backoff_delay(3) <= timedelta(seconds=44)
+    assert backoff_delay(10) <= timedelta(seconds=66)
+
+
+@pytest.mark.django_db
+def test_stale_running_jobs_are_requeued_or_failed():
+    long_ago = timezone.now() - timedelta(hours=1)
+    retryable = Job.objects.create(name="tests.record", status=JobStatus.RUNNING, attempts=1, locked_at=long_ago)
+    exhausted = Job.objects.create(
+        name="tests.record", status=JobStatus.RUNNING, attempts=5, max_attempts=5, locked_at=long_ago
+    )
+    fresh = Job.objects.create(name="tests.record", status=JobStatus.RUNNING, attempts=1, locked_at=timezone.now())
+
+    assert requeue_stale_jobs() == 2
+
+    statuses = dict(Job.objects.values_list("id", "status"))
+    assert statuses == {
+        retryable.id: JobStatus.QUEUED,
+        exhausted.id: JobStatus.FAILED,
+        fresh.id: JobStatus.RUNNING,
+    }
+
+
+@pytest.mark.django_db
+def test_purge_keeps_failed_and_recent_jobs():
+    old = timezone.now() - timedelta(days=30)
+    Job.objects.create(name="tests.record", status=JobStatus.SUCCEEDED, finished_at=old)
+    Job.objects.create(name="tests.record", status=JobStatus.SUCCEEDED, finished_at=timezone.now())
+    Job.objects.create(name="tests.record", status=JobStatus.FAILED, finished_at=old)
+
+    assert purge_finished_jobs() == 1
+    assert Job.objects.count() == 2
+
+
+@pytest.mark.django_db
+@override_settings(JOBS_RUN_INLINE=True)
+def test_inline_mode_runs_job_after_commit(django_capture_on_commit_callbacks):
+    with django_capture_on_commit_callbacks(execute=True):
+        enqueue("tests.record", {"n": 1})
+        assert calls == []
+
+    assert calls == [{"n": 1}]
+    assert Job.objects.get().status == JobStatus.SUCCEEDED
+
+
+@pytest.mark.django_db
+def test_run_jobs_command_burst_mode():
+    enqueue("tests.record", {"n": 1})
+    enqueue("tests.explode", max_attempts=1)
+    out = StringIO()
+
+    call_command("run_jobs", "--burst", stdout=out)
+
+    assert calls == [{"n": 1}]
+    assert "2 run, 1 failed" in out.getvalue()
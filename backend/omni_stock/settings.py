@@ -3,7 +3,9 @@ Django settings for omni_stock project.
 
 Generated by 'django-admin startproject' using Django 5.0.6.
 """
+import importlib.util
 import os
+import tempfile
 from datetime import timedelta
 from pathlib import Path
 from urllib.parse import urlparse
@@ -99,6 +101,7 @@ INSTALLED_APPS = [
     'django.contrib.sessions',
     'django.contrib.messages',
     'django.contrib.staticfiles',
+    'django.contrib.postgres',
     # Third-party Apps
     'rest_framework',
     'rest_framework_simplejwt',
@@ -112,6 +115,7 @@ INSTALLED_APPS = [
     'backend.users.apps.UsersConfig',
     'backend.org.apps.OrgConfig',
     'backend.catalog.apps.CatalogConfig',
+    'backend.jobs.apps.JobsConfig',
 ]
 
 AUTH_USER_MODEL = 'users.User'
@@ -120,6 +124,10 @@ MIDDLEWARE = [
     # CORS middleware should be placed as high as possible
     'corsheaders.middleware.CorsMiddleware',
     'django.middleware.security.SecurityMiddleware',
+    # Outermost body-touching middleware so it compresses the final response.
+    'backend.core.middleware.CompressionMiddleware',
+    # Request context for slow-query logs; samples opted-in staff requests.
+    'backend.core.profiling.ProfilingMiddleware',
     'django.contrib.sessions.middleware.SessionMiddleware',
     'django.middleware.common.CommonMiddleware',
     'django.middleware.csrf.CsrfViewMiddleware',
@@ -128,6 +136,24 @@ MIDDLEWARE = [
     'django.middleware.clickjacking.XFrameOptionsMiddleware',
 ]
 
+# Response compression (backend.core.middleware.CompressionMiddleware). Brotli is
+# used when the `brotli` package is installed and the client accepts it.
+COMPRESSION_MIN_SIZE = int(env('COMPRESSION_MIN_SIZE', default=1024))
+COMPRESSION_BROTLI_QUALITY = int(env('COMPRESSION_BROTLI_QUALITY', default=4))
+COMPRESSION_STREAM_FLUSH_SIZE = int(env('COMPRESSION_STREAM_FLUSH_SIZE', default=64 * 1024))
+
+# Statements slower than SLOW_QUERY_THRESHOLD_MS are logged (backend.core.profiling)
+# with the endpoint, user, vendor and calling code; 0 turns the check off.
+SLOW_QUERY_THRESHOLD_MS = float(env('SLOW_QUERY_THRESHOLD_MS', default=500))
+SLOW_QUERY_MAX_SQL_LENGTH = int(env('SLOW_QUERY_MAX_SQL_LENGTH', default=2000))
+
+# Opt-in sampling profiler: staff requests sending PROFILING_HEADER are sampled
+# every PROFILING_INTERVAL_MS and written as folded stacks to PROFILING_DIR.
+PROFILING_ENABLED = env.bool('PROFILING_ENABLED', default=False)
+PROFILING_HEADER = env('PROFILING_HEADER', default='X-Profile')
+PROFILING_INTERVAL_MS = float(env('PROFILING_INTERVAL_MS', default=5))
+PROFILING_DIR = env('PROFILING_DIR', default=os.path.join(tempfile.gettempdir(), 'omni-stock-profiles'))
+
 # CORS: allow requests from frontend during development. For production,
 # set specific origins via `CORS_ALLOWED_ORIGINS`.
 _default_cors_origins = [
@@ -345,9 +371,86 @@ else:
         },
     }
 
+# S3 client tuning shared by SupabaseStorage and direct storage calls
+# (backend.core.storage_client). The pool should cover the web server's
+# threads plus STORAGE_DELETE_CONCURRENCY and STORAGE_TRANSFER_CONCURRENCY.
+STORAGE_MAX_POOL_CONNECTIONS = int(env('STORAGE_MAX_POOL_CONNECTIONS', default=32))
+STORAGE_RETRY_MODE = env('STORAGE_RETRY_MODE', default='adaptive')
+STORAGE_MAX_ATTEMPTS = int(env('STORAGE_MAX_ATTEMPTS', default=5))
+STORAGE_TCP_KEEPALIVE = env.bool('STORAGE_TCP_KEEPALIVE', default=True)
+STORAGE_CONNECT_TIMEOUT = float(env('STORAGE_CONNECT_TIMEOUT', default=5))
+STORAGE_READ_TIMEOUT = float(env('STORAGE_READ_TIMEOUT', default=30))
+STORAGE_MULTIPART_THRESHOLD = int(env('STORAGE_MULTIPART_THRESHOLD', default=16 * 1024 * 1024))
+STORAGE_MULTIPART_CHUNKSIZE = int(env('STORAGE_MULTIPART_CHUNKSIZE', default=8 * 1024 * 1024))
+STORAGE_TRANSFER_CONCURRENCY = int(env('STORAGE_TRANSFER_CONCURRENCY', default=4))
+
+# Presigned direct-to-storage uploads (backend.core.direct_uploads). Clients
+# PUT straight to the bucket and confirm; needs USE_SUPABASE_STORAGE.
+DIRECT_UPLOAD_MAX_SIZE = int(env('DIRECT_UPLOAD_MAX_SIZE', default=5 * 1024 * 1024))
+DIRECT_UPLOAD_EXPIRY = int(env('DIRECT_UPLOAD_EXPIRY', default=900))
+DIRECT_UPLOAD_CONTENT_TYPES = env.list(
+    'DIRECT_UPLOAD_CONTENT_TYPES',
+    default=['image/jpeg', 'image/png', 'image/webp', 'image/gif', 'image/avif'],
+)
+
+# Resumable chunked uploads (backend.core.chunked_uploads) for files above the
+# single-shot limit. Chunks become S3 multipart parts (minimum 5 MiB) or are
+# written into a part file under CHUNKED_UPLOAD_TEMP_DIR for local storage.
+CHUNKED_UPLOAD_CHUNK_SIZE = int(env('CHUNKED_UPLOAD_CHUNK_SIZE', default=8 * 1024 * 1024))
+CHUNKED_UPLOAD_MAX_SIZE = int(env('CHUNKED_UPLOAD_MAX_SIZE', default=50 * 1024 * 1024))
+CHUNKED_UPLOAD_EXPIRY = int(env('CHUNKED_UPLOAD_EXPIRY', default=24 * 3600))
+# Unfinished uploads a user may have open at once; bounds the part files and
+# multipart uploads one account can pin until they expire.
+CHUNKED_UPLOAD_MAX_OPEN_PER_USER = int(env('CHUNKED_UPLOAD_MAX_OPEN_PER_USER', default=5))
+CHUNKED_UPLOAD_TEMP_DIR = env(
+    'CHUNKED_UPLOAD_TEMP_DIR', default=os.path.join(tempfile.gettempdir(), 'omni-stock-chunked-uploads')
+)
+CHUNKED_UPLOAD_CONTENT_TYPES = env.list(
+    'CHUNKED_UPLOAD_CONTENT_TYPES',
+    default=DIRECT_UPLOAD_CONTENT_TYPES,
+)
+
+# Files sent to /api/v1/core/upload/ are stored under their SHA-256 and shared
+# by every identical upload (backend.core.content_store). Objects nothing
+# references are deleted in batches after the grace period, once the columns
+# below no longer point at them.
+CONTENT_STORE_GRACE_PERIOD = int(env('CONTENT_STORE_GRACE_PERIOD', default=24 * 3600))
+CONTENT_STORE_GC_BATCH_SIZE = int(env('CONTENT_STORE_GC_BATCH_SIZE', default=500))
+CONTENT_STORE_REFERENCES = [
+    'collectibles.CatalogMedia.url',
+    'collectibles.CatalogItem.image_url',
+    'users.UserMedia.url',
+]
+
+# Media rows that are removed or replaced queue a job that deletes their stored
+# objects in DeleteObjects batches (backend.core.storage_cleanup).
+STORAGE_DELETE_CONCURRENCY = int(env('STORAGE_DELETE_CONCURRENCY', default=4))
+STORAGE_DELETE_MAX_ATTEMPTS = int(env('STORAGE_DELETE_MAX_ATTEMPTS', default=3))
+STORAGE_DELETE_RETRY_DELAY = float(env('STORAGE_DELETE_RETRY_DELAY', default=0.5))
+
 # Default primary key field type
 DEFAULT_AUTO_FIELD = 'django.db.models.BigAutoField'
 
+# JSON is encoded/decoded with orjson when installed (equivalent JSON to DRF's
+# JSONRenderer; only float spelling may differ); set API_FAST_JSON=False to use
+# the stdlib encoder.
+# MessagePack is negotiated via `Accept: application/msgpack` when msgpack is installed.
+API_FAST_JSON = env.bool('API_FAST_JSON', default=True)
+API_ENABLE_MSGPACK = env.bool('API_ENABLE_MSGPACK', default=True) and importlib.util.find_spec('msgpack') is not None
+
+API_RENDERER_CLASSES = [
+    'backend.core.renderers.FastJSONRenderer' if API_FAST_JSON else 'rest_framework.renderers.JSONRenderer',
+    'rest_framework.renderers.BrowsableAPIRenderer',
+]
+API_PARSER_CLASSES = [
+    'backend.core.parsers.FastJSONParser' if API_FAST_JSON else 'rest_framework.parsers.JSONParser',
+    'rest_framework.parsers.FormParser',
+    'rest_framework.parsers.MultiPartParser',
+]
+if API_ENABLE_MSGPACK:
+    API_RENDERER_CLASSES.append('backend.core.renderers.MessagePackRenderer')
+    API_PARSER_CLASSES.append('backend.core.parsers.MessagePackParser')
+
 REST_FRAMEWORK = {
     # Set JWT as the default authentication class globally
     'DEFAULT_AUTHENTICATION_CLASSES': (
@@ -360,16 +463,91 @@ REST_FRAMEWORK = {
     ),
 
     # Add default pagination to prevent timeouts on large datasets
-    'DEFAULT_PAGINATION_CLASS': 'rest_framework.pagination.LimitOffsetPagination',
+    'DEFAULT_PAGINATION_CLASS': 'backend.core.pagination.EstimatedCountPagination',
     'PAGE_SIZE': 50,
 
     # Use drf-spectacular for schema generation when installed
-    'DEFAULT_SCHEMA_CLASS': 'drf_spectacular.openapi.AutoSchema'
+    'DEFAULT_SCHEMA_CLASS': 'drf_spectacular.openapi.AutoSchema',
+
+    'DEFAULT_RENDERER_CLASSES': API_RENDERER_CLASSES,
+    'DEFAULT_PARSER_CLASSES': API_PARSER_CLASSES,
 }
 
-# Optional drf-spectacular settings can be added here if needed later
-# SPECTACULAR_SETTINGS = {
-# }
+# Shared cache. Without REDIS_URL each worker process gets its own in-memory
+# cache, which is fine for a single worker but does not share invalidations.
+REDIS_URL = env('REDIS_URL', default='')
+if REDIS_URL:
+    CACHES = {'default': {'BACKEND': 'django.core.cache.backends.redis.RedisCache', 'LOCATION': REDIS_URL}}
+
+# Reference data (eras, sets, products) is cached per catalog version in the
+# Django cache and in each worker (backend.catalog.selectors.reference_data).
+# The version is derived from the tables, so it works without a shared cache.
+# Workers check the version every CATALOG_REFERENCE_VERSION_TTL seconds; clients
+# may reuse responses for CATALOG_REFERENCE_MAX_AGE seconds and revalidate by ETag.
+CATALOG_REFERENCE_VERSION_TTL = int(env('CATALOG_REFERENCE_VERSION_TTL', default=5))
+CATALOG_REFERENCE_CACHE_TIMEOUT = int(env('CATALOG_REFERENCE_CACHE_TIMEOUT', default=7 * 24 * 3600))
+CATALOG_REFERENCE_MAX_AGE = int(env('CATALOG_REFERENCE_MAX_AGE', default=3600))
+
+# List responses count at most this many rows exactly; bigger results report the
+# Postgres planner's estimate with "count_is_estimate": true. 0 always counts exactly.
+PAGINATION_EXACT_COUNT_THRESHOLD = int(env('PAGINATION_EXACT_COUNT_THRESHOLD', default=10000))
+
+# POS scan lookups cache compact item payloads per worker process. Saves evict
+# entries locally; the TTL bounds how stale other workers can be.
+CATALOG_SCAN_CACHE_TTL = int(env('CATALOG_SCAN_CACHE_TTL', default=10))
+CATALOG_SCAN_CACHE_SIZE = int(env('CATALOG_SCAN_CACHE_SIZE', default=2048))
+
+# GET /catalog/items/facets/ counts are cached per worker, keyed by vendor and
+# filter set, for CATALOG_FACET_CACHE_TTL seconds (no explicit invalidation).
+CATALOG_FACET_CACHE_TTL = int(env('CATALOG_FACET_CACHE_TTL', default=30))
+CATALOG_FACET_CACHE_SIZE = int(env('CATALOG_FACET_CACHE_SIZE', default=1024))
+
+# Images returned per item by GET /catalog/items/ (primary image first). Detail
+# responses always carry the whole gallery; 0 returns whole galleries in lists too.
+CATALOG_LIST_IMAGE_LIMIT = int(env('CATALOG_LIST_IMAGE_LIMIT', default=1))
+
+# GET /catalog/items/ renders rows from .values() through a precompiled mapper
+# instead of CatalogItemSerializer; the output is identical.
+CATALOG_FAST_LIST = env.bool('CATALOG_FAST_LIST', default=True)
+
+# Opt-in: serialized GET /catalog/items/ pages are kept in the shared cache per
+# vendor, query and catalog version. Catalog writes bump the vendor's version,
+# which needs REDIS_URL with more than one worker (check collectibles.W001).
+CATALOG_LIST_CACHE = env.bool('CATALOG_LIST_CACHE', default=False)
+CATALOG_LIST_CACHE_TTL = int(env('CATALOG_LIST_CACHE_TTL', default=60))
+
+# New catalog images get WebP derivatives (longest edge in pixels per name) plus
+# dimensions and EXIF orientation from a background job
+# (backend.catalog.services.media_processing). Pillow runs in a pool of
+# IMAGE_PROCESSING_WORKERS processes; 0 processes images in the job worker itself.
+CATALOG_MEDIA_PROCESSING = env.bool('CATALOG_MEDIA_PROCESSING', default=True)
+CATALOG_MEDIA_DERIVATIVES = {
+    'thumb': int(env('CATALOG_MEDIA_THUMB_SIZE', default=320)),
+    'display': int(env('CATALOG_MEDIA_DISPLAY_SIZE', default=1280)),
+}
+CATALOG_MEDIA_WEBP_QUALITY = int(env('CATALOG_MEDIA_WEBP_QUALITY', default=80))
+CATALOG_MEDIA_MAX_SOURCE_BYTES = int(env('CATALOG_MEDIA_MAX_SOURCE_BYTES', default=25 * 1024 * 1024))
+IMAGE_PROCESSING_WORKERS = int(env('IMAGE_PROCESSING_WORKERS', default=2))
+
+# Background jobs (backend.jobs) are stored in the database and run by
+# `python manage.py run_jobs`; no broker is needed. JOBS_RUN_INLINE runs each
+# job in-process right after the enqueueing transaction commits instead.
+JOBS_RUN_INLINE = env.bool('JOBS_RUN_INLINE', default=False)
+JOBS_POLL_INTERVAL = float(env('JOBS_POLL_INTERVAL', default=1.0))
+JOBS_MAX_ATTEMPTS = int(env('JOBS_MAX_ATTEMPTS', default=5))
+JOBS_RETRY_BASE_DELAY = int(env('JOBS_RETRY_BASE_DELAY', default=10))
+JOBS_RETRY_MAX_DELAY = int(env('JOBS_RETRY_MAX_DELAY', default=3600))
+JOBS_LOCK_TIMEOUT = int(env('JOBS_LOCK_TIMEOUT', default=600))
+JOBS_RETENTION_DAYS = int(env('JOBS_RETENTION_DAYS', default=7))
+
+# drf-spectacular settings
+SPECTACULAR_SETTINGS = {
+    # Several serializers expose these choices; keep stable component names.
+    'ENUM_NAME_OVERRIDES': {
+        'CatalogMediaMediaTypeEnum': 'backend.catalog.models.CatalogMediaType',
+        'UserMediaMediaTypeEnum': 'backend.users.models.UserMediaType',
+    },
+}
 
 SIMPLE_JWT = {
     # JWT lifespan settings
@@ -20,7 +20,15 @@ from django.contrib import admin
 from django.urls import include, path
 from rest_framework_simplejwt.views import TokenObtainPairView, TokenRefreshView, TokenVerifyView
 
-from backend.core.views import UploadFileView
+from backend.core.views import (
+    ChunkedUploadCompleteView,
+    ChunkedUploadDetailView,
+    ChunkedUploadView,
+    DirectUploadConfirmView,
+    DirectUploadView,
+    MetricsView,
+    UploadFileView,
+)
 from backend.users.api.viewsets import (
     ChangePasswordView,
     CheckEmailView,
@@ -30,6 +38,7 @@ from backend.users.api.viewsets import (
     PasswordResetConfirmView,
     PasswordResetRequestView,
     RegisterView,
+    UserMediaView,
 )
 
 urlpatterns = [
@@ -39,13 +48,28 @@ urlpatterns = [
     path('api/v1/', include('backend.catalog.api.urls')),
     path('api/v1/', include('backend.org.api.urls')),
     path('api/v1/', include('backend.inventory.api.urls')),
+    path('api/v1/core/metrics/', MetricsView.as_view(), name='core_metrics'),
     path('api/v1/core/upload/', UploadFileView.as_view(), name='core_upload'),
+    path('api/v1/core/uploads/', DirectUploadView.as_view(), name='core_direct_upload'),
+    path('api/v1/core/uploads/confirm/', DirectUploadConfirmView.as_view(), name='core_direct_upload_confirm'),
+    path('api/v1/core/uploads/chunked/', ChunkedUploadView.as_view(), name='core_chunked_upload'),
+    path(
+        'api/v1/core/uploads/chunked/<uuid:upload_id>/',
+        ChunkedUploadDetailView.as_view(),
+        name='core_chunked_upload_detail',
+    ),
+    path(
+        'api/v1/core/uploads/chunked/<uuid:upload_id>/complete/',
+        ChunkedUploadCompleteView.as_view(),
+        name='core_chunked_upload_complete',
+    ),
     # JWT token endpoints under /api/v1/auth/
     path('api/v1/auth/token/', TokenObtainPairView.as_view(), name='token_obtain_pair'),
     path('api/v1/auth/token/refresh/', TokenRefreshView.as_view(), name='token_refresh'),
     path('api/v1/auth/token/verify/', TokenVerifyView.as_view(), name='token_verify'),
     path('api/v1/auth/register/', RegisterView.as_view(), name='auth_register'),
     path('api/v1/auth/me/', CurrentUserView.as_view(), name='current_user'),
+    path('api/v1/auth/me/media/<str:media_type>/', UserMediaView.as_view(), name='user_media'),
     path('api/v1/auth/logout/', LogoutView.as_view(), name='auth_logout'),
     path('api/v1/auth/password/change/', ChangePasswordView.as_view(), name='password_change'),
     path('api/v1/auth/password/reset/', PasswordResetRequestView.as_view(), name='password_reset_request'),
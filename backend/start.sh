@@ -5,5 +5,27 @@ set -e
 echo "Running migrations..."
 python manage.py migrate --noinput
 
+# SERVER_MODE=asgi serves backend.omni_stock.asgi with uvicorn workers so the
+# async views (uploads, password reset, media deletion, overview) can overlap
+# their I/O. The default stays on sync WSGI workers.
+WEB_CONCURRENCY="${WEB_CONCURRENCY:-2}"
+
+# Background jobs (emails, remote media deletes) are run by `manage.py run_jobs`.
+# By default one runs alongside the web server, so queued jobs (password reset
+# emails) go out without extra setup. Set JOB_WORKER=external when a separate
+# worker service runs them.
+if [ "${JOB_WORKER:-embedded}" = "embedded" ]; then
+    echo "Starting embedded job worker..."
+    python manage.py run_jobs &
+else
+    echo "JOB_WORKER=${JOB_WORKER}: expecting a separate run_jobs worker."
+fi
+
+if [ "${SERVER_MODE:-wsgi}" = "asgi" ]; then
+    echo "Starting Gunicorn (ASGI, uvicorn workers)..."
+    exec gunicorn backend.omni_stock.asgi:application --bind 0.0.0.0:8000 --workers "$WEB_CONCURRENCY" \
+        --worker-class uvicorn.workers.UvicornWorker --timeout 120
+fi
+
 echo "Starting Gunicorn..."
-exec gunicorn backend.omni_stock.wsgi:application --bind 0.0.0.0:8000 --workers 2 --timeout 120
+exec gunicorn backend.omni_stock.wsgi:application --bind 0.0.0.0:8000 --workers "$WEB_CONCURRENCY" --timeout 120
@@ -162,6 +162,14 @@ class UserMediaSerializer(serializers.Serializer):
     metadata = serializers.DictField(required=False, default=dict)
 
 
+class UserMediaConfirmSerializer(serializers.Serializer):
+    """Confirm a direct upload (see /api/v1/core/uploads/) as the user's media."""
+
+    token = serializers.CharField()
+    width = serializers.IntegerField(min_value=0, required=False, allow_null=True)
+    height = serializers.IntegerField(min_value=0, required=False, allow_null=True)
+
+
 class UpdateProfileSerializer(serializers.Serializer):
     """
     Serializer for updating user profile via PUT/PATCH.
@@ -1,5 +1,6 @@
 """User domain viewsets and API endpoints."""
 
+from asgiref.sync import sync_to_async
 from drf_spectacular.utils import OpenApiExample, extend_schema
 from rest_framework import status
 from rest_framework.generics import GenericAPIView, RetrieveUpdateAPIView
@@ -7,6 +8,9 @@ from rest_framework.parsers import FormParser, JSONParser
 from rest_framework.permissions import AllowAny, IsAuthenticated
 from rest_framework.response import Response
 
+from backend.core.async_views import AsyncAPIView, AsyncGenericAPIView
+from backend.core.direct_uploads import DirectUploadError, media_payload
+from backend.core.views import confirm_direct_upload, direct_upload_error_response
 from backend.users.api.serializers import (
     ChangePasswordSerializer,
     CheckEmailExistsSerializer,
@@ -17,8 +21,13 @@ from backend.users.api.serializers import (
     PasswordResetRequestSerializer,
     RegisterSerializer,
     UpdateProfileSerializer,
+    UserMediaConfirmSerializer,
+    UserMediaSerializer,
 )
+from backend.users.models import UserMediaType
 from backend.users.selectors.get_current_user import get_current_user_with_profile
+from backend.users.services.password_reset import arequest_password_reset
+from backend.users.services.user_media import aremove_user_media, upsert_user_media
 
 
 class RegisterView(GenericAPIView):
@@ -168,7 +177,7 @@ class ChangePasswordView(GenericAPIView):
 
 
 @extend_schema(tags=["auth"])
-class PasswordResetRequestView(GenericAPIView):
+class PasswordResetRequestView(AsyncGenericAPIView):
     """
     POST /api/v1/auth/password/reset/
     
@@ -190,16 +199,61 @@ class PasswordResetRequestView(GenericAPIView):
     permission_classes = [AllowAny]
     serializer_class = PasswordResetRequestSerializer
     
-    def post(self, request, *args, **kwargs):
+    async def post(self, request, *args, **kwargs):
         serializer = self.get_serializer(data=request.data)
         serializer.is_valid(raise_exception=True)
-        serializer.save()
+        # Email delivery runs off the event loop; see PasswordResetService.arequest_reset.
+        await arequest_password_reset(email=serializer.validated_data["email"])
         return Response(
             {"detail": "If an account with that email exists, a password reset link has been sent."},
             status=status.HTTP_200_OK
         )
 
 
+@extend_schema(tags=["auth"])
+class UserMediaView(AsyncAPIView):
+    """
+    POST /api/v1/auth/me/media/<media_type>/
+    DELETE /api/v1/auth/me/media/<media_type>/
+
+    POST confirms a direct upload (see /api/v1/core/uploads/) and sets it as
+    the user's media of that type, replacing any previous file. DELETE removes
+    the media, including the stored object, and responds 204 whether or not
+    media existed.
+    """
+
+    permission_classes = [IsAuthenticated]
+
+    @extend_schema(request=UserMediaConfirmSerializer, responses={201: UserMediaSerializer})
+    async def post(self, request, media_type, *args, **kwargs):
+        if media_type not in UserMediaType.values:
+            return Response(
+                {"detail": f"Unknown media type: {media_type}"}, status=status.HTTP_404_NOT_FOUND
+            )
+        serializer = UserMediaConfirmSerializer(data=request.data)
+        serializer.is_valid(raise_exception=True)
+        data = serializer.validated_data
+        try:
+            upload = await confirm_direct_upload(request, data["token"])
+        except DirectUploadError as exc:
+            return direct_upload_error_response(exc)
+        media = await sync_to_async(upsert_user_media)(
+            user_id=request.user.id,
+            media_type=media_type,
+            payload=media_payload(upload, width=data.get("width"), height=data.get("height")),
+        )
+        return Response(UserMediaSerializer(media).data, status=status.HTTP_201_CREATED)
+
+    @extend_schema(request=None, responses={204: None})
+    async def delete(self, request, media_type, *args, **kwargs):
+        if media_type not in UserMediaType.values:
+            return Response(
+                {"detail": f"Unknown media type: {media_type}"}, status=status.HTTP_404_NOT_FOUND
+            )
+        await aremove_user_media(user_id=request.user.id, media_type=media_type)
+        return Response(status=status.HTTP_204_NO_CONTENT)
+
+
 @extend_schema(tags=["auth"])
 class PasswordResetConfirmView(GenericAPIView):
     """
@@ -298,6 +352,7 @@ __all__ = [
     "ChangePasswordView",
     "PasswordResetRequestView",
     "PasswordResetConfirmView",
+    "UserMediaView",
     "LogoutView",
     "CheckEmailView",
 ]
@@ -0,0 +1,24 @@
+# Generated by Django 5.0.6 on 2026-10-19 07:56
+
+import django.contrib.postgres.indexes
+import django.db.models.functions.text
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("users", "0004_alter_usermedia_metadata"),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name="usermedia",
+            index=models.Index(
+                django.contrib.postgres.indexes.OpClass(
+                    django.db.models.functions.text.Reverse("url"), name="text_pattern_ops"
+                ),
+                name="user_media_url_suffix_idx",
+            ),
+        ),
+    ]
@@ -2,7 +2,9 @@
 
 from django.conf import settings
 from django.contrib.auth.models import AbstractUser
+from django.contrib.postgres.indexes import OpClass
 from django.db import models
+from django.db.models.functions import Reverse
 
 from backend.users.validators import validate_birthdate, validate_phone_number
 
@@ -154,6 +156,12 @@ class UserMedia(models.Model):
     created_at = models.DateTimeField(auto_now_add=True)
     updated_at = models.DateTimeField(auto_now=True)
 
+    class Meta:
+        indexes = [
+            # Reversed URL prefix matches: the content store's indexed "ends with key" lookup.
+            models.Index(OpClass(Reverse("url"), name="text_pattern_ops"), name="user_media_url_suffix_idx"),
+        ]
+
     def __str__(self):
         return f"{self.get_media_type_display()} for {self.user.username}"
 
@@ -1,6 +1,7 @@
 """Service for password reset operations."""
 
 
+from asgiref.sync import sync_to_async
 from django.conf import settings
 from django.contrib.auth import get_user_model
 from django.contrib.auth.password_validation import validate_password
@@ -9,9 +10,14 @@ from django.core.cache import cache
 from django.core.exceptions import ValidationError
 from django.core.mail import send_mail
 
+from backend.jobs.services.enqueue import enqueue
+
 User = get_user_model()
 
 
+SEND_RESET_EMAIL_JOB = "users.send_password_reset_email"
+
+
 class PasswordResetService:
     """
     Service for handling password reset flow.
@@ -30,8 +36,8 @@ class PasswordResetService:
         """
         Request a password reset for the given email.
         
-        Sends a password reset email if the user exists.
-        Always returns True to prevent email enumeration.
+        Queues a password reset email if the user exists; the job worker
+        sends it. Always returns True to prevent email enumeration.
         
         Args:
             email: Email address to send reset link to
@@ -51,6 +57,40 @@ class PasswordResetService:
             # Already sent recently, silently succeed
             return True
         
+        enqueue(SEND_RESET_EMAIL_JOB, {"user_id": user.id})
+
+        # Set rate limit
+        cache.set(cache_key, True, timeout=self.RATE_LIMIT_MINUTES * 60)
+        
+        return True
+    
+    async def arequest_reset(self, email: str) -> bool:
+        """
+        Async variant of :meth:`request_reset` for ASGI views.
+
+        Uses the async ORM and cache APIs; queueing the email job is a single
+        insert run from a worker thread.
+        """
+        try:
+            user = await User.objects.aget(email__iexact=email)
+        except User.DoesNotExist:
+            return True
+
+        cache_key = f"password_reset_{user.id}"
+        if await cache.aget(cache_key):
+            return True
+
+        await sync_to_async(enqueue)(SEND_RESET_EMAIL_JOB, {"user_id": user.id})
+
+        await cache.aset(cache_key, True, timeout=self.RATE_LIMIT_MINUTES * 60)
+        return True
+
+    def send_reset_email(self, user) -> None:
+        """
+        Build the reset link for ``user`` and email it.
+
+        Runs in the job worker; delivery errors propagate so the job is retried.
+        """
         # Generate token
         token = self.token_generator.make_token(user)
         
@@ -58,11 +98,9 @@ class PasswordResetService:
         frontend_url = getattr(settings, 'FRONTEND_URL', 'http://localhost:5173')
         reset_url = f"{frontend_url}/reset-password?uid={user.id}&token={token}"
         
-        # Send email
-        try:
-            send_mail(
-                subject="Password Reset Request - Omni Stock",
-                message=f"""
+        send_mail(
+            subject="Password Reset Request - Omni Stock",
+            message=f"""
 Hello {user.username},
 
 You requested a password reset for your Omni Stock account.
@@ -76,20 +114,11 @@ If you didn't request this, you can safely ignore this email.
 
 Best regards,
 The Omni Stock Team
-                """.strip(),
-                from_email=settings.DEFAULT_FROM_EMAIL,
-                recipient_list=[user.email],
-                fail_silently=True,  # Don't expose email sending failures
-            )
-        except Exception:
-            # Log but don't expose failures
-            pass
-        
-        # Set rate limit
-        cache.set(cache_key, True, timeout=self.RATE_LIMIT_MINUTES * 60)
-        
-        return True
-    
+            """.strip(),
+            from_email=settings.DEFAULT_FROM_EMAIL,
+            recipient_list=[user.email],
+        )
+
     def confirm_reset(self, user_id: int, token: str, new_password: str) -> bool:
         """
         Confirm password reset with token and set new password.
@@ -136,9 +165,14 @@ def request_password_reset(*, email: str) -> bool:
     return password_reset_service.request_reset(email)
 
 
+async def arequest_password_reset(*, email: str) -> bool:
+    """Request a password reset email without blocking the event loop."""
+    return await password_reset_service.arequest_reset(email)
+
+
 def confirm_password_reset(*, user_id: int, token: str, new_password: str) -> bool:
     """Confirm password reset with token."""
     return password_reset_service.confirm_reset(user_id, token, new_password)
 
 
-__all__ = ["request_password_reset", "confirm_password_reset"]
+__all__ = ["request_password_reset", "arequest_password_reset", "confirm_password_reset"]
@@ -1,63 +1,36 @@
 """Services for storing user media metadata."""
 
-import logging
-from typing import Iterable, Optional
+from typing import Dict, Iterable, List
 
-import boto3
-from botocore.exceptions import BotoCoreError, ClientError
-from django.conf import settings
+from asgiref.sync import sync_to_async
 from django.db import transaction
 
+from backend.core.content_store import update_references
+from backend.core.storage_cleanup import delete_objects_or_raise, storage_object_for
+from backend.jobs.services.enqueue import enqueue
 from backend.users.models import UserMedia, UserMediaType
 
-logger = logging.getLogger(__name__)
+DELETE_REMOTE_MEDIA_JOB = "users.delete_remote_media"
 
-_storage_client: Optional[object] = None
 
+def _remote_objects(records: Iterable[UserMedia]) -> List[Dict[str, str]]:
+    """Bucket/key pairs of the storage objects behind ``records``."""
+    objects = []
+    for media in records:
+        obj = storage_object_for(media.url, media.metadata)
+        if obj:
+            objects.append(obj)
+    return objects
 
-def _get_storage_client():
-    """
-    Lazily construct an S3 client for Supabase Storage.
 
-    Returns None when the Supabase env vars are not configured (e.g. tests/local).
+def _delete_remote_media(objects: Iterable[Dict[str, str]]) -> None:
     """
-    global _storage_client
-    if _storage_client is not None:
-        return _storage_client
-
-    endpoint = getattr(settings, "AWS_S3_ENDPOINT_URL", None)
-    access_key = getattr(settings, "AWS_ACCESS_KEY_ID", None)
-    secret = getattr(settings, "AWS_SECRET_ACCESS_KEY", None)
-    region = getattr(settings, "AWS_S3_REGION_NAME", "us-east-1")
-
-    if not endpoint or not access_key or not secret:
-        return None
-
-    _storage_client = boto3.client(
-        "s3",
-        endpoint_url=endpoint,
-        aws_access_key_id=access_key,
-        aws_secret_access_key=secret,
-        region_name=region,
-    )
-    return _storage_client
+    Delete storage objects in per-bucket batches; runs in the job worker.
 
-
-def _delete_remote_media(records: Iterable[UserMedia]):
-    client = _get_storage_client()
-    if not client:
-        return
-
-    for media in records:
-        metadata = media.metadata or {}
-        bucket = metadata.get("bucket") or getattr(settings, "AWS_STORAGE_BUCKET_NAME", None)
-        path = metadata.get("path")
-        if not bucket or not path:
-            continue
-        try:
-            client.delete_object(Bucket=bucket, Key=path)
-        except (ClientError, BotoCoreError) as exc:
-            logger.warning("Failed to delete Supabase object %s/%s: %s", bucket, path, exc)
+    Raises when any object survives the batch retries so the job is retried.
+    Deleting an object that is already gone succeeds, so that is safe.
+    """
+    delete_objects_or_raise(objects)
 
 
 @transaction.atomic
@@ -73,20 +46,37 @@ def upsert_user_media(*, user_id: int, media_type: str, payload: dict) -> UserMe
         'metadata': payload.get('metadata', {}),
     }
 
+    previous = UserMedia.objects.filter(user_id=user_id, media_type=media_type).first()
     media, _ = UserMedia.objects.update_or_create(
         user_id=user_id,
         media_type=media_type,
         defaults=defaults,
     )
 
+    update_references(added=[media.url], removed=[previous.url] if previous else [])
+
+    # The replaced file is no longer referenced once this commits.
+    stale = [obj for obj in _remote_objects([previous] if previous else []) if obj not in _remote_objects([media])]
+    if stale:
+        enqueue(DELETE_REMOTE_MEDIA_JOB, {"objects": stale})
+
     return media
 
 @transaction.atomic
 def remove_user_media(*, user_id: int, media_type: str) -> None:
     qs = UserMedia.objects.filter(user_id=user_id, media_type=media_type)
-    media_records = list(qs)
-    if media_records:
-        _delete_remote_media(media_records)
+    records = list(qs)
+    objects = _remote_objects(records)
+    update_references(removed=[media.url for media in records])
     qs.delete()
+    if objects:
+        # Queued with the delete, so the objects are only removed if it commits.
+        enqueue(DELETE_REMOTE_MEDIA_JOB, {"objects": objects})
+
+
+async def aremove_user_media(*, user_id: int, media_type: str) -> None:
+    """Async wrapper for ASGI views; the transaction runs in a worker thread."""
+    await sync_to_async(remove_user_media)(user_id=user_id, media_type=media_type)
+
 
-__all__ = ["upsert_user_media", "remove_user_media"]
+__all__ = ["upsert_user_media", "remove_user_media", "aremove_user_media"]
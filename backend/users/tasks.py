@@ -0,0 +1,22 @@
+"""Background job handlers for the user domain."""
+
+from django.contrib.auth import get_user_model
+
+from backend.jobs.registry import job
+from backend.users.services.password_reset import SEND_RESET_EMAIL_JOB, password_reset_service
+from backend.users.services.user_media import DELETE_REMOTE_MEDIA_JOB, _delete_remote_media
+
+User = get_user_model()
+
+
+@job(SEND_RESET_EMAIL_JOB)
+def send_password_reset_email(*, user_id: int) -> None:
+    user = User.objects.filter(pk=user_id).first()
+    if user is None:
+        return
+    password_reset_service.send_reset_email(user)
+
+
+@job(DELETE_REMOTE_MEDIA_JOB)
+def delete_remote_media(*, objects: list) -> None:
+    _delete_remote_media(objects)
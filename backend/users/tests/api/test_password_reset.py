@@ -6,6 +6,8 @@ from django.contrib.auth.tokens import PasswordResetTokenGenerator
 from rest_framework import status
 from rest_framework.test import APIClient
 
+from backend.jobs.services.worker import run_pending_jobs
+
 User = get_user_model()
 
 
@@ -169,3 +171,18 @@ def test_password_reset_token_invalid_after_use(api_client, user, token_generato
         format="json"
     )
     assert response.status_code == status.HTTP_400_BAD_REQUEST
+
+
+@pytest.mark.django_db
+def test_password_reset_request_sends_one_email_per_rate_window(api_client, user, mailoutbox):
+    from django.core.cache import cache
+
+    cache.delete(f"password_reset_{user.id}")
+    for _ in range(2):
+        response = api_client.post("/api/v1/auth/password/reset/", data={"email": "TEST@example.com"}, format="json")
+        assert response.status_code == status.HTTP_200_OK
+
+    assert mailoutbox == []  # sent by the job worker, not the request
+    assert run_pending_jobs() == 1
+    assert len(mailoutbox) == 1
+    assert f"uid={user.id}&token=" in mailoutbox[0].body
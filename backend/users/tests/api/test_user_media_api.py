@@ -0,0 +1,47 @@
+"""Tests for the user media deletion endpoint."""
+
+import pytest
+from rest_framework.test import APIClient
+
+from backend.catalog.tests.factories import UserFactory
+from backend.jobs.services.worker import run_pending_jobs
+from backend.users.models import UserMedia, UserMediaType
+from backend.users.services.user_media import upsert_user_media
+
+
+@pytest.mark.django_db
+def test_delete_user_media_removes_record_and_remote_object(monkeypatch):
+    deleted = []
+
+    class StubClient:
+        def delete_objects(self, Bucket, Delete):
+            deleted.extend((Bucket, obj["Key"]) for obj in Delete["Objects"])
+            return {}
+
+    monkeypatch.setattr("backend.core.storage_cleanup.get_storage_client", lambda: StubClient())
+    user = UserFactory.create()
+    upsert_user_media(
+        user_id=user.id,
+        media_type=UserMediaType.PROFILE_AVATAR,
+        payload={"url": "https://cdn.dev/a.png", "metadata": {"bucket": "avatars", "path": "u/a.png"}},
+    )
+    client = APIClient()
+    client.force_authenticate(user=user)
+
+    response = client.delete(f"/api/v1/auth/me/media/{UserMediaType.PROFILE_AVATAR}/")
+
+    assert response.status_code == 204
+    assert not UserMedia.objects.filter(user=user).exists()
+    run_pending_jobs()
+    assert deleted == [("avatars", "u/a.png")]
+
+
+@pytest.mark.django_db
+def test_delete_user_media_rejects_unknown_type_and_anonymous():
+    user = UserFactory.create()
+    client = APIClient()
+
+    assert client.delete("/api/v1/auth/me/media/profile_avatar/").status_code == 401
+
+    client.force_authenticate(user=user)
+    assert client.delete("/api/v1/auth/me/media/not_a_type/").status_code == 404
@@ -1,6 +1,9 @@
+import boto3
 import pytest
+from moto import mock_aws
 
 from backend.catalog.tests.factories import UserFactory
+from backend.jobs.services.worker import run_pending_jobs
 from backend.users.models import UserMedia, UserMediaType
 from backend.users.services.user_media import remove_user_media, upsert_user_media
 
@@ -32,18 +35,22 @@ def test_upsert_creates_and_updates_media():
     assert UserMedia.objects.count() == 1  # still a single row
 
 
-@pytest.mark.django_db
-def test_remove_user_media_deletes_record(monkeypatch):
-    class StubClient:
-        def __init__(self):
-            self.deleted = []
+@pytest.fixture
+def s3(monkeypatch):
+    with mock_aws():
+        client = boto3.client("s3", region_name="us-east-1")
+        client.create_bucket(Bucket="profile-avatars")
+        monkeypatch.setattr("backend.core.storage_cleanup.get_storage_client", lambda: client)
+        yield client
+
 
-        def delete_object(self, Bucket, Key):
-            self.deleted.append((Bucket, Key))
+def _stored_keys(client):
+    return [obj["Key"] for obj in client.list_objects_v2(Bucket="profile-avatars").get("Contents", [])]
 
-    stub = StubClient()
-    monkeypatch.setattr('backend.users.services.user_media._get_storage_client', lambda: stub)
 
+@pytest.mark.django_db
+def test_remove_user_media_deletes_record(s3):
+    s3.put_object(Bucket="profile-avatars", Key="avatars/logo.png", Body=b"png")
     user = UserFactory.create()
     upsert_user_media(
         user_id=user.id,
@@ -57,4 +64,23 @@ def test_remove_user_media_deletes_record(monkeypatch):
 
     remove_user_media(user_id=user.id, media_type=UserMediaType.VENDOR_LOGO)
     assert not UserMedia.objects.filter(media_type=UserMediaType.VENDOR_LOGO).exists()
-    assert stub.deleted == [('profile-avatars', 'avatars/logo.png')]
+    assert _stored_keys(s3) == ["avatars/logo.png"]  # deferred to the job worker
+
+    assert run_pending_jobs() == 1
+    assert _stored_keys(s3) == []
+
+
+@pytest.mark.django_db
+def test_replacing_user_media_deletes_previous_object(s3):
+    for key in ("avatars/old.png", "avatars/new.png"):
+        s3.put_object(Bucket="profile-avatars", Key=key, Body=b"png")
+    user = UserFactory.create()
+    for key in ("avatars/old.png", "avatars/new.png", "avatars/new.png"):
+        upsert_user_media(
+            user_id=user.id,
+            media_type=UserMediaType.PROFILE_AVATAR,
+            payload={"url": f"https://cdn.dev/{key}", "metadata": {"bucket": "profile-avatars", "path": key}},
+        )
+
+    assert run_pending_jobs() == 1
+    assert _stored_keys(s3) == ["avatars/new.png"]
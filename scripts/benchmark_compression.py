@@ -0,0 +1,54 @@
+"""
+Measure bytes on the wire and CPU cost of response compression.
+
+Compresses typical catalog list pages (see benchmark_renderers.build_page) and
+the OpenAPI schema with the same settings CompressionMiddleware uses, plus a
+few alternative brotli qualities for tuning COMPRESSION_BROTLI_QUALITY.
+
+Usage:
+    PYTHONPATH=. python scripts/benchmark_compression.py [--repeat 50]
+"""
+
+import argparse
+import timeit
+from pathlib import Path
+
+from benchmark_renderers import build_page  # noqa  # pylint: disable=wrong-import-position
+from django.utils.text import compress_string  # noqa  # pylint: disable=wrong-import-position
+
+from backend.core.middleware import BROTLI_AVAILABLE  # noqa  # pylint: disable=wrong-import-position
+from backend.core.renderers import FastJSONRenderer  # noqa  # pylint: disable=wrong-import-position
+
+if BROTLI_AVAILABLE:
+    import brotli
+
+SCHEMA_PATH = Path(__file__).resolve().parents[1] / "api_schema.json"
+
+
+def codecs():
+    yield "gzip-6", lambda body: compress_string(body, max_random_bytes=100)
+    if BROTLI_AVAILABLE:
+        for quality in (1, 4, 6, 11):
+            yield f"br-{quality}", lambda body, q=quality: brotli.compress(body, mode=brotli.MODE_TEXT, quality=q)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--repeat", type=int, default=50, help="Compressions per timing sample.")
+    args = parser.parse_args()
+
+    payloads = {f"catalog page x{count}": FastJSONRenderer().render(build_page(count)) for count in (1, 50, 200)}
+    if SCHEMA_PATH.exists():
+        payloads["openapi schema"] = SCHEMA_PATH.read_bytes()
+
+    print(f"{'payload':<20}{'codec':<8}{'bytes':>10}{'ratio':>8}{'ms':>9}")
+    for label, body in payloads.items():
+        print(f"{label:<20}{'none':<8}{len(body):>10}{1.0:>8.2f}{0.0:>9.3f}")
+        for name, compress in codecs():
+            size = len(compress(body))
+            seconds = min(timeit.repeat(lambda: compress(body), number=args.repeat, repeat=3)) / args.repeat
+            print(f"{'':<20}{name:<8}{size:>10}{len(body) / size:>8.2f}{seconds * 1000:>9.3f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,127 @@
+"""
+Compare API renderer/parser throughput on a catalog list page.
+
+The payload mirrors CatalogItemSerializer output (decimals as strings, nested
+card details, images and variants) so no database is needed.
+
+Usage:
+    PYTHONPATH=. python scripts/benchmark_renderers.py [--items 50] [--repeat 200]
+"""
+
+import argparse
+import io
+import os
+import timeit
+from datetime import datetime, timezone
+
+import django
+
+os.environ.setdefault("DJANGO_SETTINGS_MODULE", "backend.omni_stock.settings")
+django.setup()
+
+from rest_framework.parsers import JSONParser  # noqa  # pylint: disable=wrong-import-position
+from rest_framework.renderers import JSONRenderer  # noqa  # pylint: disable=wrong-import-position
+
+from backend.core.parsers import FastJSONParser, MessagePackParser  # noqa  # pylint: disable=wrong-import-position
+from backend.core.renderers import (  # noqa  # pylint: disable=wrong-import-position
+    MSGPACK_AVAILABLE,
+    ORJSON_AVAILABLE,
+    FastJSONRenderer,
+    MessagePackRenderer,
+)
+
+
+def build_page(count: int) -> dict:
+    """Build a LimitOffsetPagination-shaped page of serialized catalog items."""
+    stamp = datetime(2024, 5, 1, 12, 30, 15, 123456, tzinfo=timezone.utc).isoformat().replace("+00:00", "Z")
+    results = []
+    for pk in range(1, count + 1):
+        results.append(
+            {
+                "id": pk,
+                "user": 1,
+                "vendor": 1,
+                "store": 1,
+                "product": pk % 7 or None,
+                "product_details": {"id": 3, "name": "Booster Box", "type": "booster_box", "set": {"id": 2, "name": "Base Set"}},
+                "name": f"Charizard Holo #{pk}",
+                "sku": f"SKU-{pk:06d}",
+                "description": "Near mint, pulled from a sealed booster. Sleeved immediately.",
+                "condition": "near_mint",
+                "category": "Pokémon",
+                "status": "active",
+                "image_url": f"https://cdn.example.com/items/{pk}.jpg",
+                "quantity": pk % 12,
+                "intake_price": "120.00",
+                "price": "249.99",
+                "projected_price": "275.50",
+                "search_text": f"Charizard Holo #{pk} SKU-{pk:06d} Pokémon",
+                "card_details": {
+                    "language": "English",
+                    "market_region": "NA",
+                    "rarity": "Holo Rare",
+                    "external_ids": {"tcgplayer": str(100000 + pk)},
+                    "print_run": "1st Edition",
+                },
+                "images": [
+                    {
+                        "id": pk * 10 + i,
+                        "media_type": "image",
+                        "url": f"https://cdn.example.com/items/{pk}-{i}.jpg",
+                        "sort_order": i,
+                        "is_primary": i == 0,
+                        "width": 1200,
+                        "height": 1600,
+                        "size_kb": 412,
+                        "metadata": {},
+                        "created_at": stamp,
+                        "updated_at": stamp,
+                    }
+                    for i in range(2)
+                ],
+                "variants": [
+                    {"id": pk * 10 + i, "condition": "LP", "grade": None, "quantity": 1, "price_adjustment": "-5.00"}
+                    for i in range(2)
+                ],
+                "created_at": stamp,
+                "updated_at": stamp,
+            }
+        )
+    return {"count": count, "next": None, "previous": None, "results": results}
+
+
+def bench(label: str, func, repeat: int, baseline: float = None) -> float:
+    seconds = min(timeit.repeat(func, number=repeat, repeat=3)) / repeat
+    ratio = f"  ({baseline / seconds:.1f}x)" if baseline else ""
+    print(f"{label:<28}{seconds * 1e6:>10.1f} us/page{ratio}")
+    return seconds
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--items", type=int, default=50, help="Items per page (default: 50, the API page size).")
+    parser.add_argument("--repeat", type=int, default=200, help="Renders per timing sample.")
+    args = parser.parse_args()
+
+    page = build_page(args.items)
+    drf_json = JSONRenderer().render(page)
+    print(f"orjson: {'yes' if ORJSON_AVAILABLE else 'no'}  msgpack: {'yes' if MSGPACK_AVAILABLE else 'no'}")
+    print(f"Payload: {args.items} items, {len(drf_json)} bytes JSON")
+
+    base = bench("render JSONRenderer", lambda: JSONRenderer().render(page), args.repeat)
+    bench("render FastJSONRenderer", lambda: FastJSONRenderer().render(page), args.repeat, base)
+    if MSGPACK_AVAILABLE:
+        packed = MessagePackRenderer().render(page)
+        print(f"MessagePack payload: {len(packed)} bytes")
+        bench("render MessagePackRenderer", lambda: MessagePackRenderer().render(page), args.repeat, base)
+
+    base = bench("parse JSONParser", lambda: JSONParser().parse(io.BytesIO(drf_json)), args.repeat)
+    bench("parse FastJSONParser", lambda: FastJSONParser().parse(io.BytesIO(drf_json)), args.repeat, base)
+    if MSGPACK_AVAILABLE:
+        bench("parse MessagePackParser", lambda: MessagePackParser().parse(io.BytesIO(packed)), args.repeat, base)
+
+    assert FastJSONRenderer().render(page) == drf_json, "FastJSONRenderer output diverged from JSONRenderer"
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,137 @@
+"""
+Benchmark concurrent uploads and deletes against an S3 emulator.
+
+Compares a default boto3 client with the tuned client from
+backend.core.storage_client (pool size, keep-alive, adaptive retries), and
+per-object DeleteObject calls with the batched deletes in
+backend.core.storage_cleanup. Besides wall time it counts new TCP connections
+opened, which is where the pool size shows up against a remote endpoint.
+
+Without --endpoint-url an in-process moto server is started
+(pip install "moto[server]"); point it at MinIO or a Supabase project to
+include real network latency.
+
+Usage:
+    PYTHONPATH=. python scripts/benchmark_storage.py [--objects 400] [--size 65536] [--concurrency 32]
+"""
+
+import argparse
+import logging
+import os
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+import boto3
+import django
+
+os.environ.setdefault("DJANGO_SETTINGS_MODULE", "backend.omni_stock.settings")
+django.setup()
+
+from backend.core.storage_cleanup import delete_objects  # noqa  # pylint: disable=wrong-import-position
+from backend.core.storage_client import create_storage_client  # noqa  # pylint: disable=wrong-import-position
+
+BUCKET = "benchmark"
+
+
+class ConnectionCounter(logging.Handler):
+    """Counts urllib3's "Starting new HTTP(S) connection" debug records."""
+
+    def __init__(self):
+        super().__init__(logging.DEBUG)
+        self.count = 0
+
+    def emit(self, record):
+        if record.getMessage().startswith("Starting new"):
+            self.count += 1
+
+
+def start_emulator():
+    from moto.server import ThreadedMotoServer
+
+    logging.getLogger("werkzeug").setLevel(logging.ERROR)
+    server = ThreadedMotoServer(ip_address="127.0.0.1", port=0, verbose=False)
+    server.start()
+    host, port = server.get_host_and_port()
+    return server, f"http://{host}:{port}"
+
+
+def build_clients(endpoint):
+    credentials = {"aws_access_key_id": "bench", "aws_secret_access_key": "bench", "region_name": "us-east-1"}
+    default = boto3.session.Session().client("s3", endpoint_url=endpoint, **credentials)
+    tuned = create_storage_client(
+        endpoint_url=endpoint,
+        access_key=credentials["aws_access_key_id"],
+        secret_key=credentials["aws_secret_access_key"],
+    )
+    return {"default": default, "tuned": tuned}
+
+
+def timed(counter, func):
+    counter.count = 0
+    started = time.perf_counter()
+    func()
+    return time.perf_counter() - started, counter.count
+
+
+def report(name, operation, count, seconds, conns):
+    print(f"{name:<9}{operation:<24}{seconds:>9.2f}{count / seconds:>9.0f}{conns:>11}")
+
+
+def bench_client(name, client, keys, body, concurrency, counter):
+    with ThreadPoolExecutor(max_workers=concurrency) as pool:
+        seconds, conns = timed(
+            counter, lambda: list(pool.map(lambda key: client.put_object(Bucket=BUCKET, Key=key, Body=body), keys))
+        )
+        report(name, "put_object", len(keys), seconds, conns)
+        seconds, conns = timed(
+            counter, lambda: list(pool.map(lambda key: client.delete_object(Bucket=BUCKET, Key=key), keys))
+        )
+        report(name, "delete_object x N", len(keys), seconds, conns)
+
+    for key in keys:
+        client.put_object(Bucket=BUCKET, Key=key, Body=b"")
+    objects = [{"bucket": BUCKET, "key": key} for key in keys]
+    seconds, conns = timed(counter, lambda: delete_objects(objects, client=client))
+    report(name, "delete_objects batched", len(keys), seconds, conns)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--endpoint-url", default=None, help="S3 endpoint; defaults to a local moto server.")
+    parser.add_argument("--objects", type=int, default=400)
+    parser.add_argument("--size", type=int, default=64 * 1024, help="Bytes per uploaded object.")
+    parser.add_argument("--concurrency", type=int, default=32)
+    args = parser.parse_args()
+
+    server = None
+    endpoint = args.endpoint_url
+    if endpoint is None:
+        server, endpoint = start_emulator()
+
+    counter = ConnectionCounter()
+    urllib3_logger = logging.getLogger("urllib3.connectionpool")
+    urllib3_logger.setLevel(logging.DEBUG)
+    urllib3_logger.addHandler(counter)
+    # Silence "Connection pool is full" warnings; the connection count shows them.
+    urllib3_logger.propagate = False
+
+    body = os.urandom(args.size)
+    keys = [f"bench/{index:06d}.bin" for index in range(args.objects)]
+    clients = build_clients(endpoint)
+    try:
+        clients["tuned"].create_bucket(Bucket=BUCKET)
+    except clients["tuned"].exceptions.BucketAlreadyOwnedByYou:
+        pass
+
+    print(f"endpoint={endpoint} objects={args.objects} size={args.size} concurrency={args.concurrency}")
+    print(f"{'client':<9}{'operation':<24}{'seconds':>9}{'ops/s':>9}{'new conns':>11}")
+    try:
+        for name, client in clients.items():
+            bench_client(name, client, keys, body, args.concurrency, counter)
+    finally:
+        if server is not None:
+            server.stop()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,179 @@
+"""
+Minimal HTTP load generator for comparing WSGI and ASGI worker setups.
+
+Keeps ``--concurrency`` requests in flight against one endpoint for
+``--duration`` seconds and reports throughput, latency percentiles, errors and
+(optionally) the resident memory of the server processes, so sync and async
+deployments can be compared under the same memory budget. Standard library only.
+
+Usage:
+    python scripts/load_test.py --url http://localhost:8000/api/v1/core/upload/ \\
+        --header "Authorization: Bearer <token>" --upload-bytes 200000 \\
+        --concurrency 32 --duration 20 --pid <gunicorn master pid>
+"""
+
+import argparse
+import asyncio
+import json
+import os
+import statistics
+import time
+import uuid
+from urllib.parse import urlsplit
+
+
+def build_request(args) -> bytes:
+    parts = urlsplit(args.url)
+    path = parts.path or "/"
+    if parts.query:
+        path = f"{path}?{parts.query}"
+    headers = {"Host": parts.netloc, "Connection": "keep-alive", "Accept": "application/json"}
+    body = b""
+    if args.upload_bytes:
+        boundary = uuid.uuid4().hex
+        body = (
+            f"--{boundary}\r\nContent-Disposition: form-data; name=\"file\"; filename=\"load.bin\"\r\n"
+            f"Content-Type: application/octet-stream\r\n\r\n"
+        ).encode() + os.urandom(args.upload_bytes) + f"\r\n--{boundary}--\r\n".encode()
+        headers["Content-Type"] = f"multipart/form-data; boundary={boundary}"
+    elif args.json is not None:
+        body = json.dumps(json.loads(args.json)).encode()
+        headers["Content-Type"] = "application/json"
+    if body or args.method in ("POST", "PUT", "PATCH"):
+        headers["Content-Length"] = str(len(body))
+    for raw in args.header:
+        name, _, value = raw.partition(":")
+        headers[name.strip()] = value.strip()
+    head = f"{args.method} {path} HTTP/1.1\r\n" + "".join(f"{k}: {v}\r\n" for k, v in headers.items())
+    return head.encode() + b"\r\n" + body
+
+
+async def read_response(reader) -> tuple:
+    status_line = await reader.readline()
+    if not status_line:
+        raise ConnectionError("connection closed")
+    status = int(status_line.split()[1])
+    length, chunked, close = 0, False, False
+    while True:
+        line = await reader.readline()
+        if line in (b"\r\n", b""):
+            break
+        name, _, value = line.decode("latin-1").partition(":")
+        name = name.strip().lower()
+        if name == "content-length":
+            length = int(value)
+        elif name == "transfer-encoding" and "chunked" in value.lower():
+            chunked = True
+        elif name == "connection" and "close" in value.lower():
+            close = True
+    if chunked:
+        while True:
+            size = int((await reader.readline()).split(b";")[0], 16)
+            await reader.readexactly(size + 2)
+            if size == 0:
+                break
+    elif length:
+        await reader.readexactly(length)
+    return status, close
+
+
+async def worker(host, port, payload, deadline, latencies, errors, statuses):
+    reader = writer = None
+    while time.monotonic() < deadline:
+        try:
+            if writer is None:
+                reader, writer = await asyncio.open_connection(host, port)
+            started = time.perf_counter()
+            writer.write(payload)
+            await writer.drain()
+            status, close = await read_response(reader)
+            latencies.append(time.perf_counter() - started)
+            statuses[status] = statuses.get(status, 0) + 1
+            if close:
+                writer.close()
+                writer = None
+        except (OSError, ConnectionError, asyncio.IncompleteReadError, ValueError, IndexError):
+            errors.append(1)
+            if writer is not None:
+                writer.close()
+            writer = None
+            await asyncio.sleep(0.05)
+    if writer is not None:
+        writer.close()
+
+
+def process_tree_rss_kb(pid: int) -> int:
+    """Resident memory of ``pid`` and its direct children, from /proc (Linux only)."""
+    pids = [pid]
+    try:
+        with open(f"/proc/{pid}/task/{pid}/children") as handle:
+            pids += [int(child) for child in handle.read().split()]
+    except OSError:
+        pass
+    total = 0
+    for member in pids:
+        try:
+            with open(f"/proc/{member}/status") as handle:
+                for line in handle:
+                    if line.startswith("VmRSS:"):
+                        total += int(line.split()[1])
+        except OSError:
+            continue
+    return total
+
+
+async def sample_memory(pids, deadline, peaks):
+    while time.monotonic() < deadline:
+        for pid in pids:
+            peaks[pid] = max(peaks.get(pid, 0), process_tree_rss_kb(pid))
+        await asyncio.sleep(0.5)
+
+
+async def run(args):
+    parts = urlsplit(args.url)
+    host, port = parts.hostname, parts.port or 80
+    payload = build_request(args)
+    latencies, errors, statuses, peaks = [], [], {}, {}
+    deadline = time.monotonic() + args.duration
+    tasks = [worker(host, port, payload, deadline, latencies, errors, statuses) for _ in range(args.concurrency)]
+    if args.pid:
+        tasks.append(sample_memory(args.pid, deadline, peaks))
+    started = time.monotonic()
+    await asyncio.gather(*tasks)
+    elapsed = time.monotonic() - started
+
+    print(f"concurrency={args.concurrency} duration={elapsed:.1f}s requests={len(latencies)} errors={len(errors)}")
+    print(f"throughput={len(latencies) / elapsed:.1f} req/s statuses={dict(sorted(statuses.items()))}")
+    if latencies:
+        ordered = sorted(latencies)
+
+        def pct(p):
+            return ordered[min(len(ordered) - 1, int(p / 100 * len(ordered)))] * 1000
+
+        print(
+            f"latency ms: mean={statistics.mean(ordered) * 1000:.1f} p50={pct(50):.1f} "
+            f"p95={pct(95):.1f} p99={pct(99):.1f} max={ordered[-1] * 1000:.1f}"
+        )
+    for pid, peak in peaks.items():
+        print(f"peak RSS pid {pid} (+children): {peak / 1024:.1f} MiB")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--url", required=True)
+    parser.add_argument("--method", default=None, help="Defaults to POST when a body is given, else GET.")
+    parser.add_argument("--header", action="append", default=[], help="Extra header, e.g. 'Authorization: Bearer x'.")
+    parser.add_argument("--json", default=None, help="JSON request body.")
+    parser.add_argument("--upload-bytes", type=int, default=0, help="Send a multipart 'file' of this many bytes.")
+    parser.add_argument("--concurrency", type=int, default=16)
+    parser.add_argument("--duration", type=float, default=10.0)
+    parser.add_argument("--pid", type=int, action="append", default=[], help="Server PID to sample RSS from.")
+    args = parser.parse_args()
+    if args.method is None:
+        args.method = "POST" if (args.json is not None or args.upload_bytes) else "GET"
+    args.method = args.method.upper()
+    asyncio.run(run(args))
+
+
+if __name__ == "__main__":
+    main()